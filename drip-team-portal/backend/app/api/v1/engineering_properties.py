@@ -1,18 +1,28 @@
 """API endpoints for Engineering Properties lookups."""
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
+import json
 
+from app.core.concurrency import run_blocking
 from app.services.properties import (
     lookup,
+    lookup_batch,
     list_sources,
     list_views,
     get_source,
     generate_view
 )
+from app.services.properties.registry import (
+    generate_view_window,
+    iter_view_rows,
+    view_header
+)
 from app.services.properties.router import (
     LookupError,
+    lookup_cache,
     get_available_outputs,
     get_required_inputs
 )
@@ -37,6 +47,48 @@ class LookupResponse(BaseModel):
     inputs: Dict[str, Any]
 
 
+class BatchLookupQuery(BaseModel):
+    """One source and its outputs over many points.
+
+    Give either `inputs` (input name -> value or array, scalars broadcast)
+    or `points` (a list of {input name: value}).
+    """
+    source_id: str
+    outputs: List[str]
+    inputs: Optional[Dict[str, Any]] = None
+    points: Optional[List[Dict[str, Any]]] = None
+
+
+class BatchLookupRequest(BaseModel):
+    """Request for a batch of lookups."""
+    queries: List[BatchLookupQuery]
+
+
+class PointError(BaseModel):
+    """Why one point of a batch query could not be resolved."""
+    index: int
+    output: str
+    error: str
+
+
+class BatchLookupResult(BaseModel):
+    """Columnar result for one batch query; `error` is set if the whole query failed."""
+    source_id: str
+    count: int = 0
+    outputs: Dict[str, List[Optional[Union[float, str]]]] = {}
+    errors: List[PointError] = []
+    error: Optional[str] = None
+
+
+class BatchLookupResponse(BaseModel):
+    """Response from a batch lookup, one result per query."""
+    results: List[BatchLookupResult]
+
+
+# Upper bound on points across all queries of one batch request
+MAX_BATCH_POINTS = 100_000
+
+
 class SourceSummary(BaseModel):
     """Summary info about a property source."""
     id: str
@@ -143,19 +195,44 @@ async def get_source_views(source_id: str):
 
 
 @router.get("/sources/{source_id}/views/{view_id}")
-async def get_view_data(source_id: str, view_id: str):
+async def get_view_data(
+    source_id: str,
+    view_id: str,
+    offset: int = Query(0, ge=0, description="First row to return"),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Maximum rows to return"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
     """
     Generate and return a table view.
 
     Returns a structured table with headers and rows that can be
     displayed directly in the UI.
+
+    With `offset`/`limit` only that window of rows is generated, and the
+    response adds `total_rows` and `next_offset` (null on the last page).
+
+    `format=ndjson` streams the view as newline-delimited JSON: one line
+    with metadata, headers and total_rows, then one line per row. Rows are
+    generated in chunks as the response is written.
     """
     try:
+        if format == "ndjson":
+            header = view_header(source_id, view_id)
+            rows = iter_view_rows(source_id, view_id, offset=offset, limit=limit)
+            return StreamingResponse(_ndjson_lines(header, rows), media_type="application/x-ndjson")
+        if offset or limit is not None:
+            return generate_view_window(source_id, view_id, offset=offset, limit=limit)
         return generate_view(source_id, view_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _ndjson_lines(header: dict, rows):
+    yield json.dumps(header) + "\n"
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
 @router.post("/lookup", response_model=LookupResponse)
 async def lookup_property(request: LookupRequest):
     """
@@ -187,6 +264,95 @@ async def lookup_property(request: LookupRequest):
         raise HTTPException(status_code=500, detail=f"Lookup failed: {str(e)}")
 
 
+@router.post("/lookup/batch", response_model=BatchLookupResponse)
+async def lookup_property_batch(request: BatchLookupRequest):
+    """
+    Look up several outputs over many points in one request.
+
+    Each query is evaluated through the vectorized backend path and returned
+    as one array per output. Points that cannot be resolved are null in the
+    arrays and listed in `errors`; a query with an unknown source, output or
+    input reports `error` without failing the others.
+
+    Example request:
+    ```json
+    {
+        "queries": [
+            {"source_id": "steam", "outputs": ["h", "s"],
+             "inputs": {"T": [300, 350, 400], "P": 101325}},
+            {"source_id": "metric_bolt_torque", "outputs": ["pitch"],
+             "points": [{"size": "M8"}, {"size": "M10"}]}
+        ]
+    }
+    ```
+    """
+    total = sum(_query_size(index, query) for index, query in enumerate(request.queries))
+    if total > MAX_BATCH_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch has {total} points; the limit is {MAX_BATCH_POINTS}"
+        )
+
+    # CPU-bound (up to MAX_BATCH_POINTS points, CoolProp sweeps): off the event loop
+    results = await run_blocking(_lookup_batch_queries, request.queries)
+    return BatchLookupResponse(results=results)
+
+
+def _query_size(index: int, query: BatchLookupQuery) -> int:
+    """Number of points in one query; 400 if its input columns don't line up."""
+    if query.points is not None:
+        return len(query.points)
+    if not query.inputs:
+        return 0
+
+    lengths = set()
+    for name, value in query.inputs.items():
+        if isinstance(value, list):
+            if any(isinstance(v, (list, dict)) for v in value):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Query {index} ('{query.source_id}'): input '{name}' must be a value or a flat array"
+                )
+            lengths.add(len(value))
+        elif isinstance(value, dict):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Query {index} ('{query.source_id}'): input '{name}' must be a value or a flat array"
+            )
+    # Scalars and length-1 arrays broadcast against the rest
+    lengths.discard(1)
+    if len(lengths) > 1:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Query {index} ('{query.source_id}'): input arrays have different lengths {sorted(lengths)}"
+        )
+    return lengths.pop() if lengths else 1
+
+
+def _lookup_batch_queries(queries: List[BatchLookupQuery]) -> List[BatchLookupResult]:
+    results = []
+    for query in queries:
+        if (query.inputs is None) == (query.points is None):
+            results.append(BatchLookupResult(
+                source_id=query.source_id, error="Provide exactly one of 'inputs' or 'points'"
+            ))
+            continue
+        try:
+            batch = lookup_batch(
+                query.source_id, query.outputs,
+                query.points if query.points is not None else query.inputs
+            )
+        except LookupError as e:
+            results.append(BatchLookupResult(source_id=query.source_id, error=str(e)))
+            continue
+        except Exception as e:
+            results.append(BatchLookupResult(source_id=query.source_id, error=f"Lookup failed: {str(e)}"))
+            continue
+        results.append(BatchLookupResult(source_id=query.source_id, **batch))
+
+    return results
+
+
 @router.get("/fluids")
 async def get_coolprop_fluids():
     """
@@ -223,11 +389,23 @@ async def get_categories():
     }
 
 
+@router.get("/cache/stats")
+async def get_lookup_cache_stats():
+    """
+    Hit-rate statistics for the lookup result cache.
+
+    Continuous inputs are rounded to `significant_digits` for the cache key;
+    failed lookups are cached for `error_ttl` seconds.
+    """
+    return lookup_cache.stats()
+
+
 @router.post("/reload")
 async def reload_sources():
     """
     Reload all property sources from disk.
 
+    Re-parses every YAML file and rebuilds the compiled registry cache.
     Useful during development when YAML files are modified.
     """
     from app.services.properties.registry import reload_sources as do_reload
@@ -8,15 +8,18 @@ Provides:
 - Create model instances with input bindings
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy import func, or_, and_
+from typing import Optional, List, Dict, Union
 from pydantic import BaseModel
 from datetime import datetime
+import base64
 import json
+import math
 import re
 
+from app.core.concurrency import run_blocking, spawn
 from app.db.database import get_db
 from app.models.physics_model import (
     PhysicsModel,
@@ -38,13 +41,24 @@ from app.services.dimensional_analysis import (
 )
 from app.services.model_evaluation import (
     evaluate_and_attach,
+    sweep_model_instance,
+    compiled_models,
     ModelEvaluationError,
     CircularDependencyError,
 )
+from app.services.analysis_scheduler import reevaluate_downstream
 from app.services.websocket_manager import manager as ws_manager
 
 router = APIRouter(prefix="/api/v1")
 
+# Handlers that touch the database run their body through run_blocking(), so
+# queries and model evaluation happen in worker threads, not on the event loop
+
+
+def _broadcast(analysis_id: int, event_type: str, data: dict):
+    """Fire-and-forget analysis broadcast (callable from run_blocking() work)."""
+    spawn(ws_manager.broadcast_analysis_update(analysis_id, event_type, data))
+
 
 # =============================================================================
 # PYDANTIC SCHEMAS
@@ -184,6 +198,10 @@ async def list_physics_models(
 
     Optional filter by category (thermal, mechanical, fluid, electrical).
     """
+    return await run_blocking(_list_physics_models, category, db)
+
+
+def _list_physics_models(category: Optional[str], db: Session):
     query = db.query(PhysicsModel)
     if category:
         query = query.filter(PhysicsModel.category == category)
@@ -246,6 +264,10 @@ async def get_physics_model(
     """
     Get a single physics model with all its versions.
     """
+    return await run_blocking(_get_physics_model, model_id, db)
+
+
+def _get_physics_model(model_id: int, db: Session):
     model = db.query(PhysicsModel).filter(PhysicsModel.id == model_id).first()
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
@@ -304,6 +326,10 @@ async def get_physics_model_by_name(
     Raises:
         404 if model not found
     """
+    return await run_blocking(_get_physics_model_by_name, model_name, db)
+
+
+def _get_physics_model_by_name(model_name: str, db: Session):
     model = db.query(PhysicsModel).filter(
         func.lower(PhysicsModel.name) == model_name.lower()
     ).first()
@@ -362,10 +388,16 @@ async def update_physics_model(
     Updates name/category/description on the model itself.
     If inputs/outputs/equations change, creates a new version.
     """
+    return await run_blocking(_update_physics_model, model_id, data, db)
+
+
+def _update_physics_model(model_id: int, data: ModelUpdateRequest, db: Session):
     model = db.query(PhysicsModel).filter(PhysicsModel.id == model_id).first()
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
 
+    previous_name = model.name
+
     # Update model metadata
     if data.name is not None:
         # Check for name conflicts
@@ -452,6 +484,10 @@ async def update_physics_model(
     db.commit()
     db.refresh(model)
 
+    # MODEL() calls resolve names through the compiled model cache
+    compiled_models.invalidate(previous_name)
+    compiled_models.invalidate(model.name)
+
     # Get updated current version
     updated_version = next((v for v in model.versions if v.is_current), None)
 
@@ -483,6 +519,10 @@ async def delete_physics_model(
 
     WARNING: Cannot delete if any instances are using this model.
     """
+    return await run_blocking(_delete_physics_model, model_id, db)
+
+
+def _delete_physics_model(model_id: int, db: Session):
     # Check if model exists
     model = db.query(PhysicsModel).filter(PhysicsModel.id == model_id).first()
     if not model:
@@ -514,6 +554,7 @@ async def delete_physics_model(
     # Delete the model
     db.delete(model)
     db.commit()
+    compiled_models.invalidate(model_name)
 
     return {
         "success": True,
@@ -643,6 +684,10 @@ async def create_physics_model(
 
     Should be called after validation passes.
     """
+    return await run_blocking(_create_physics_model, data, db)
+
+
+def _create_physics_model(data: ModelCreateRequest, db: Session):
     # Normalize equations to dict format
     equations_dict = normalize_equations(data.equations)
 
@@ -701,6 +746,7 @@ async def create_physics_model(
     db.add(model)
     db.commit()
     db.refresh(model)
+    compiled_models.invalidate(model.name)
 
     return {
         "id": model.id,
@@ -727,6 +773,10 @@ async def create_model_instance(
     NOTE: This endpoint creates the instance structure.
     Instance 2's model evaluation service will be called to compute outputs.
     """
+    return await run_blocking(_create_model_instance, data, db)
+
+
+def _create_model_instance(data: InstanceCreateRequest, db: Session):
     # Get model version
     version = db.query(PhysicsModelVersion).filter(
         PhysicsModelVersion.id == data.model_version_id
@@ -837,10 +887,7 @@ async def create_model_instance(
 
     # Broadcast via WebSocket if this is an analysis (no component_id)
     if instance.component_id is None:
-        import asyncio
-        asyncio.create_task(ws_manager.broadcast_analysis_update(
-            instance.id, "created", response
-        ))
+        _broadcast(instance.id, "created", response)
 
     return response
 
@@ -853,6 +900,10 @@ async def get_model_instance(
     """
     Get a model instance with its inputs and output values.
     """
+    return await run_blocking(_get_model_instance, instance_id, db)
+
+
+def _get_model_instance(instance_id: int, db: Session):
     from app.models.values import ValueNode
 
     instance = db.query(ModelInstance).filter(
@@ -920,6 +971,128 @@ class AnalysisUpdateRequest(BaseModel):
     bindings: Optional[dict] = None  # Optional: update input bindings
 
 
+class SweepRange(BaseModel):
+    """Evenly spaced values from start to stop (inclusive)."""
+    start: float
+    stop: float
+    num: int = 50
+
+
+class AnalysisSweepRequest(BaseModel):
+    """Request body for sweeping analysis inputs."""
+    inputs: Dict[str, Union[List[float], SweepRange]]  # {"delta_T": {"start": 0, "stop": 500, "num": 1000}}
+    grid: bool = False  # True: every combination of the swept values; False: zipped
+
+
+# Points evaluated per sweep request
+MAX_SWEEP_POINTS = 100_000
+
+# Page size limit for GET /analyses
+MAX_ANALYSES_PAGE = 500
+
+
+def _analysis_query(db: Session):
+    """
+    Analyses with model version, physics model and inputs loaded up front.
+
+    The version and model are joined (so filters can use them) and
+    populated from the same row; inputs come from one selectin query.
+    """
+    return db.query(ModelInstance).outerjoin(
+        ModelInstance.model_version
+    ).outerjoin(
+        PhysicsModelVersion.physics_model
+    ).options(
+        contains_eager(ModelInstance.model_version).contains_eager(PhysicsModelVersion.physics_model),
+        selectinload(ModelInstance.inputs),
+    ).filter(
+        ModelInstance.component_id.is_(None)
+    )
+
+
+def _output_nodes_by_instance(db: Session, instance_ids: List[int]) -> Dict[int, list]:
+    """Output ValueNodes of several instances in one query, grouped by instance."""
+    from app.models.values import ValueNode
+
+    grouped: Dict[int, list] = {instance_id: [] for instance_id in instance_ids}
+    if instance_ids:
+        nodes = db.query(ValueNode).filter(
+            ValueNode.source_model_instance_id.in_(instance_ids)
+        ).order_by(ValueNode.id).all()
+        for node in nodes:
+            grouped[node.source_model_instance_id].append(node)
+    return grouped
+
+
+def _output_node_dict(node) -> dict:
+    return {
+        "id": node.id,
+        "name": node.source_output_name,
+        "computed_value": node.computed_value,
+        "computed_unit": node.computed_unit_symbol,
+        "computation_status": node.computation_status.value if node.computation_status else None,
+    }
+
+
+def _analysis_dict(instance: ModelInstance, output_nodes: list) -> dict:
+    """Response body for one analysis (list and detail views)."""
+    version = instance.model_version
+    physics_model = version.physics_model if version else None
+
+    # Get model info and input schema for units
+    model_info = None
+    input_units = {}  # Map input_name -> unit
+    if version:
+        model_info = {
+            "id": version.physics_model_id,
+            "name": physics_model.name if physics_model else None,
+            "version": version.version,
+        }
+        for inp_schema in version.inputs or []:
+            if isinstance(inp_schema, dict):
+                input_units[inp_schema.get("name", "")] = inp_schema.get("unit", "")
+
+    return {
+        "id": instance.id,
+        "name": instance.name,
+        "description": instance.description,
+        "model_version_id": instance.model_version_id,
+        "model": model_info,
+        "model_name": physics_model.name if physics_model else None,
+        "model_category": physics_model.category if physics_model else None,
+        "computation_status": instance.computation_status.value if instance.computation_status else None,
+        "error_message": instance.error_message,
+        "last_computed": instance.last_computed.isoformat() if instance.last_computed else None,
+        "created_at": instance.created_at.isoformat() if instance.created_at else None,
+        "created_by": instance.created_by,
+        "inputs": [
+            {
+                "input_name": inp.input_name,
+                "unit": input_units.get(inp.input_name, ""),
+                "literal_value": inp.literal_value,
+                "source_lookup": inp.source_lookup,
+                "source_value_node_id": inp.source_value_node_id,
+            }
+            for inp in instance.inputs
+        ],
+        "output_value_nodes": [_output_node_dict(node) for node in output_nodes],
+    }
+
+
+def _encode_cursor(instance: ModelInstance) -> str:
+    raw = f"{instance.created_at.isoformat()}|{instance.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    """(created_at, id) from a cursor; 400 if it is malformed."""
+    try:
+        created_at, instance_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(instance_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.post("/analyses")
 async def create_analysis(
     data: AnalysisCreateRequest,
@@ -931,6 +1104,10 @@ async def create_analysis(
     An analysis is a model instance without a component_id.
     Names must be unique among analyses.
     """
+    return await run_blocking(_create_analysis, data, db)
+
+
+def _create_analysis(data: AnalysisCreateRequest, db: Session):
     from app.models.values import ValueNode, ComputationStatus
     import logging
 
@@ -1054,86 +1231,89 @@ async def create_analysis(
         response_data["evaluation_error"] = evaluation_error
 
     # Broadcast creation via WebSocket
-    import asyncio
-    asyncio.create_task(ws_manager.broadcast_analysis_update(
-        instance.id, "created", response_data
-    ))
+    _broadcast(instance.id, "created", response_data)
 
     return response_data
 
 
 @router.get("/analyses")
 async def list_analyses(
+    response: Response,
+    model_id: Optional[int] = None,
+    model_name: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_ANALYSES_PAGE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     List all analyses (model instances where component_id IS NULL).
 
     Analyses are standalone model instances that can be referenced by name.
+    Newest first. Optional filters: model_id, model_name (case-insensitive
+    substring), category, status (computation status).
+
+    Keyset pagination: pass limit to get one page; when there are more, the
+    X-Next-Cursor response header holds the cursor for the next page (exposed
+    to browsers through CORS).
     """
-    from app.models.values import ValueNode
+    analyses, next_cursor = await run_blocking(
+        _list_analyses, model_id, model_name, category, status, limit, cursor, db
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return analyses
+
+
+def _list_analyses(
+    model_id: Optional[int],
+    model_name: Optional[str],
+    category: Optional[str],
+    status: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    db: Session
+):
+    from app.models.values import ComputationStatus
 
-    instances = db.query(ModelInstance).filter(
-        ModelInstance.component_id.is_(None)
-    ).order_by(ModelInstance.created_at.desc()).all()
+    query = _analysis_query(db)
 
-    result = []
-    for instance in instances:
-        # Get output nodes for this instance
-        output_nodes = db.query(ValueNode).filter(
-            ValueNode.source_model_instance_id == instance.id
-        ).all()
-
-        # Get model info and input schema for units
-        model_info = None
-        input_units = {}  # Map input_name -> unit
-        if instance.model_version:
-            model_info = {
-                "id": instance.model_version.physics_model_id,
-                "name": instance.model_version.physics_model.name if instance.model_version.physics_model else None,
-                "version": instance.model_version.version,
-            }
-            # Build unit lookup from model inputs schema
-            model_inputs = instance.model_version.inputs or []
-            for inp_schema in model_inputs:
-                if isinstance(inp_schema, dict):
-                    input_units[inp_schema.get("name", "")] = inp_schema.get("unit", "")
+    if model_id is not None:
+        query = query.filter(PhysicsModelVersion.physics_model_id == model_id)
+    if model_name:
+        query = query.filter(PhysicsModel.name.ilike(f"%{model_name}%"))
+    if category:
+        query = query.filter(PhysicsModel.category == category)
+    if status:
+        try:
+            query = query.filter(ModelInstance.computation_status == ComputationStatus(status.lower()))
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid status '{status}'. Expected one of: {[s.value for s in ComputationStatus]}"
+            )
 
-        result.append({
-            "id": instance.id,
-            "name": instance.name,
-            "description": instance.description,
-            "model_version_id": instance.model_version_id,
-            "model": model_info,
-            "model_name": instance.model_version.physics_model.name if instance.model_version and instance.model_version.physics_model else None,
-            "model_category": instance.model_version.physics_model.category if instance.model_version and instance.model_version.physics_model else None,
-            "computation_status": instance.computation_status.value if instance.computation_status else None,
-            "error_message": instance.error_message,
-            "last_computed": instance.last_computed.isoformat() if instance.last_computed else None,
-            "created_at": instance.created_at.isoformat() if instance.created_at else None,
-            "created_by": instance.created_by,
-            "inputs": [
-                {
-                    "input_name": inp.input_name,
-                    "unit": input_units.get(inp.input_name, ""),
-                    "literal_value": inp.literal_value,
-                    "source_lookup": inp.source_lookup,
-                }
-                for inp in instance.inputs
-            ],
-            "output_value_nodes": [
-                {
-                    "id": node.id,
-                    "name": node.source_output_name,
-                    "computed_value": node.computed_value,
-                    "computed_unit": node.computed_unit_symbol,
-                    "computation_status": node.computation_status.value if node.computation_status else None,
-                }
-                for node in output_nodes
-            ],
-        })
+    if cursor:
+        created_at, instance_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            ModelInstance.created_at < created_at,
+            and_(ModelInstance.created_at == created_at, ModelInstance.id < instance_id)
+        ))
 
-    return result
+    query = query.order_by(ModelInstance.created_at.desc(), ModelInstance.id.desc())
+    if limit is not None:
+        # One extra row tells whether there is a next page
+        query = query.limit(limit + 1)
+
+    instances = query.all()
+    next_cursor = None
+    if limit is not None and len(instances) > limit:
+        instances = instances[:limit]
+        next_cursor = _encode_cursor(instances[-1])
+
+    outputs = _output_nodes_by_instance(db, [instance.id for instance in instances])
+    return [_analysis_dict(instance, outputs[instance.id]) for instance in instances], next_cursor
 
 
 @router.get("/analyses/{analysis_id}")
@@ -1144,70 +1324,42 @@ async def get_analysis(
     """
     Get a single analysis by ID.
     """
-    from app.models.values import ValueNode
+    return await run_blocking(_get_analysis, analysis_id, db)
 
-    instance = db.query(ModelInstance).filter(
-        ModelInstance.id == analysis_id,
-        ModelInstance.component_id.is_(None)
-    ).first()
+
+def _get_analysis(analysis_id: int, db: Session):
+    instance = _analysis_query(db).filter(ModelInstance.id == analysis_id).first()
 
     if not instance:
         raise HTTPException(status_code=404, detail="Analysis not found")
 
-    # Get output nodes
-    output_nodes = db.query(ValueNode).filter(
-        ValueNode.source_model_instance_id == analysis_id
-    ).all()
+    return _analysis_dict(instance, _output_nodes_by_instance(db, [analysis_id])[analysis_id])
 
-    # Get model info and input schema for units
-    model_info = None
-    input_units = {}  # Map input_name -> unit
-    if instance.model_version:
-        model_info = {
-            "id": instance.model_version.physics_model_id,
-            "name": instance.model_version.physics_model.name if instance.model_version.physics_model else None,
-            "version": instance.model_version.version,
-        }
-        # Build unit lookup from model inputs schema
-        model_inputs = instance.model_version.inputs or []
-        for inp_schema in model_inputs:
-            if isinstance(inp_schema, dict):
-                input_units[inp_schema.get("name", "")] = inp_schema.get("unit", "")
 
-    return {
-        "id": instance.id,
-        "name": instance.name,
-        "description": instance.description,
-        "model_version_id": instance.model_version_id,
-        "model": model_info,
-        "model_name": instance.model_version.physics_model.name if instance.model_version and instance.model_version.physics_model else None,
-        "model_category": instance.model_version.physics_model.category if instance.model_version and instance.model_version.physics_model else None,
-        "computation_status": instance.computation_status.value if instance.computation_status else None,
-        "error_message": instance.error_message,
-        "last_computed": instance.last_computed.isoformat() if instance.last_computed else None,
-        "created_at": instance.created_at.isoformat() if instance.created_at else None,
-        "created_by": instance.created_by,
-        "inputs": [
-            {
-                "input_name": inp.input_name,
-                "unit": input_units.get(inp.input_name, ""),
-                "literal_value": inp.literal_value,
-                "source_lookup": inp.source_lookup,
-                "source_value_node_id": inp.source_value_node_id,
-            }
-            for inp in instance.inputs
-        ],
-        "output_value_nodes": [
-            {
-                "id": node.id,
-                "name": node.source_output_name,
-                "computed_value": node.computed_value,
-                "computed_unit": node.computed_unit_symbol,
-                "computation_status": node.computation_status.value if node.computation_status else None,
-            }
-            for node in output_nodes
-        ],
-    }
+def _broadcast_downstream(source_id: int, downstream: Optional[dict], db: Session):
+    """
+    Notify clients of analyses re-evaluated because source_id changed.
+
+    Each event carries the analysis' full body (as GET /analyses/{id}
+    returns it, so it can stand in for any event coalesced with it) plus
+    triggered_by and outcome: evaluated, failed, skipped or cyclic.
+    """
+    if not downstream:
+        return
+    outcomes = dict(
+        [(i, "evaluated") for i in downstream["evaluated"]]
+        + [(f["id"], "failed") for f in downstream["failed"]]
+        + [(i, "skipped") for i in downstream["skipped"]]
+        + [(i, "cyclic") for i in downstream["cyclic"]]
+    )
+    if not outcomes:
+        return
+    instances = _analysis_query(db).filter(ModelInstance.id.in_(outcomes)).populate_existing().all()
+    outputs = _output_nodes_by_instance(db, [instance.id for instance in instances])
+    for instance in instances:
+        data = _analysis_dict(instance, outputs[instance.id])
+        data.update(triggered_by=source_id, outcome=outcomes[instance.id])
+        _broadcast(instance.id, "evaluated", data)
 
 
 @router.patch("/analyses/{analysis_id}")
@@ -1222,6 +1374,10 @@ async def update_analysis(
     If bindings are updated, the model will be re-evaluated.
     Broadcasts update via WebSocket.
     """
+    return await run_blocking(_update_analysis, analysis_id, data, db)
+
+
+def _update_analysis(analysis_id: int, data: AnalysisUpdateRequest, db: Session):
     from app.models.values import ValueNode
 
     instance = db.query(ModelInstance).filter(
@@ -1276,6 +1432,10 @@ async def update_analysis(
 
             db.add(model_input)
 
+        # Reload instance.inputs so evaluation sees the new bindings
+        db.flush()
+        db.expire(instance, ["inputs"])
+
         # Re-evaluate the model
         try:
             evaluate_and_attach(instance, db)
@@ -1284,6 +1444,13 @@ async def update_analysis(
             logging.warning(f"Re-evaluation failed for analysis {analysis_id}: {e}")
 
     db.commit()
+
+    # Refresh analyses that consume this one's outputs
+    downstream = None
+    if data.bindings:
+        downstream = reevaluate_downstream(db, [analysis_id])
+        db.commit()
+
     db.refresh(instance)
 
     # Get output nodes
@@ -1320,11 +1487,12 @@ async def update_analysis(
         ],
     }
 
+    if downstream is not None:
+        response_data["downstream"] = downstream
+
     # Broadcast update via WebSocket
-    import asyncio
-    asyncio.create_task(ws_manager.broadcast_analysis_update(
-        analysis_id, "updated", response_data
-    ))
+    _broadcast(analysis_id, "updated", response_data)
+    _broadcast_downstream(analysis_id, downstream, db)
 
     return response_data
 
@@ -1340,6 +1508,10 @@ async def delete_analysis(
     Also deletes associated inputs and output ValueNodes.
     Broadcasts deletion via WebSocket.
     """
+    return await run_blocking(_delete_analysis, analysis_id, db)
+
+
+def _delete_analysis(analysis_id: int, db: Session):
     from app.models.values import ValueNode
 
     instance = db.query(ModelInstance).filter(
@@ -1364,10 +1536,7 @@ async def delete_analysis(
     db.commit()
 
     # Broadcast deletion via WebSocket
-    import asyncio
-    asyncio.create_task(ws_manager.broadcast_analysis_update(
-        analysis_id, "deleted", {"id": analysis_id}
-    ))
+    _broadcast(analysis_id, "deleted", {"id": analysis_id})
 
     return {"deleted": True, "id": analysis_id}
 
@@ -1383,6 +1552,10 @@ async def reset_analysis_bindings(
     Use when model schema has changed and bindings are orphaned/stale.
     Deletes all ModelInputs and output ValueNodes, leaving a clean slate.
     """
+    return await run_blocking(_reset_analysis_bindings, analysis_id, db)
+
+
+def _reset_analysis_bindings(analysis_id: int, db: Session):
     from app.models.values import ValueNode
 
     instance = db.query(ModelInstance).filter(
@@ -1412,10 +1585,7 @@ async def reset_analysis_bindings(
     db.refresh(instance)
 
     # Broadcast update
-    import asyncio
-    asyncio.create_task(ws_manager.broadcast_analysis_update(
-        analysis_id, "bindings_reset", {"id": analysis_id}
-    ))
+    _broadcast(analysis_id, "bindings_reset", {"id": analysis_id})
 
     return {
         "id": analysis_id,
@@ -1437,12 +1607,11 @@ async def evaluate_analysis(
     Useful when dependencies have changed or for manual refresh.
     Broadcasts evaluation result via WebSocket.
     """
-    from app.models.values import ValueNode
+    return await run_blocking(_evaluate_analysis, analysis_id, db)
 
-    instance = db.query(ModelInstance).filter(
-        ModelInstance.id == analysis_id,
-        ModelInstance.component_id.is_(None)
-    ).first()
+
+def _evaluate_analysis(analysis_id: int, db: Session):
+    instance = _analysis_query(db).filter(ModelInstance.id == analysis_id).first()
 
     if not instance:
         raise HTTPException(status_code=404, detail="Analysis not found")
@@ -1471,30 +1640,24 @@ async def evaluate_analysis(
         evaluation_error = f"Unexpected error: {str(e)}"
 
     db.commit()
-    db.refresh(instance)
 
-    # Get output nodes
-    output_nodes = db.query(ValueNode).filter(
-        ValueNode.source_model_instance_id == analysis_id
-    ).all()
+    # Refresh analyses that consume this one's outputs
+    downstream = reevaluate_downstream(db, [analysis_id])
+    db.commit()
+
+    # Reload with model and version in the same query
+    instance = _analysis_query(db).filter(ModelInstance.id == analysis_id).populate_existing().one()
+    physics_model = instance.model_version.physics_model if instance.model_version else None
+    output_nodes = _output_nodes_by_instance(db, [analysis_id])[analysis_id]
 
     response_data = {
         "id": instance.id,
         "name": instance.name,
-        "model_name": instance.model_version.physics_model.name if instance.model_version and instance.model_version.physics_model else None,
-        "model_category": instance.model_version.physics_model.category if instance.model_version and instance.model_version.physics_model else None,
+        "model_name": physics_model.name if physics_model else None,
+        "model_category": physics_model.category if physics_model else None,
         "computation_status": instance.computation_status.value if instance.computation_status else None,
         "last_computed": instance.last_computed.isoformat() if instance.last_computed else None,
-        "output_value_nodes": [
-            {
-                "id": node.id,
-                "name": node.source_output_name,
-                "computed_value": node.computed_value,
-                "computed_unit": node.computed_unit_symbol,
-                "computation_status": node.computation_status.value if node.computation_status else None,
-            }
-            for node in output_nodes
-        ],
+        "output_value_nodes": [_output_node_dict(node) for node in output_nodes],
     }
 
     if evaluation_error:
@@ -1503,10 +1666,109 @@ async def evaluate_analysis(
     if binding_warnings:
         response_data["binding_warnings"] = binding_warnings
 
+    response_data["downstream"] = downstream
+
     # Broadcast evaluation result via WebSocket
-    import asyncio
-    asyncio.create_task(ws_manager.broadcast_analysis_update(
-        analysis_id, "evaluated", response_data
-    ))
+    _broadcast(analysis_id, "evaluated", response_data)
+    _broadcast_downstream(analysis_id, downstream, db)
 
     return response_data
+
+
+@router.post("/analyses/{analysis_id}/sweep")
+async def sweep_analysis(
+    analysis_id: int,
+    data: AnalysisSweepRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Evaluate an analysis over arrays of input values in one call.
+
+    Swept inputs override their bindings; the rest resolve as in evaluate.
+    Results are not persisted. Elements that fail (division by zero, domain
+    errors) are null in "values" and listed by reason under "errors".
+    """
+    return await run_blocking(_sweep_analysis, analysis_id, data, db)
+
+
+def _sweep_analysis(analysis_id: int, data: AnalysisSweepRequest, db: Session):
+    import numpy as np
+
+    instance = db.query(ModelInstance).filter(
+        ModelInstance.id == analysis_id,
+        ModelInstance.component_id.is_(None)
+    ).first()
+
+    if not instance:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    if not data.inputs:
+        raise HTTPException(status_code=400, detail="No inputs to sweep")
+
+    sweep = {}
+    for name, spec in data.inputs.items():
+        if isinstance(spec, SweepRange):
+            if spec.num < 1:
+                raise HTTPException(status_code=400, detail=f"Sweep of '{name}' needs num >= 1")
+            if spec.num > MAX_SWEEP_POINTS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Sweep of '{name}' exceeds {MAX_SWEEP_POINTS} points"
+                )
+            sweep[name] = np.linspace(spec.start, spec.stop, spec.num)
+        else:
+            sweep[name] = np.asarray(spec, dtype=float)
+
+    if data.grid:
+        count = 1
+        for values in sweep.values():
+            count *= values.size
+    else:
+        sizes = {values.size for values in sweep.values()} - {1}
+        if len(sizes) > 1:
+            raise HTTPException(
+                status_code=400,
+                detail="Swept inputs must have the same length (or set grid=true)"
+            )
+        count = sizes.pop() if sizes else 1
+    if count > MAX_SWEEP_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep has {count} points; the limit is {MAX_SWEEP_POINTS}"
+        )
+
+    if data.grid:
+        grids = np.meshgrid(*sweep.values(), indexing="ij")
+        sweep = {name: grid.ravel() for name, grid in zip(sweep, grids)}
+    else:
+        sweep = {name: np.broadcast_to(values, (count,)) for name, values in sweep.items()}
+
+    try:
+        results = sweep_model_instance(instance, sweep, db)
+    except CircularDependencyError as e:
+        raise HTTPException(status_code=400, detail=f"Circular dependency: {str(e)}")
+    except ModelEvaluationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    output_units = {
+        out.get("name"): out.get("unit", "")
+        for out in (instance.model_version.outputs or [])
+    }
+
+    return {
+        "id": instance.id,
+        "name": instance.name,
+        "count": count,
+        "inputs": {name: values.tolist() for name, values in sweep.items()},
+        "outputs": {
+            name: {
+                # Failed elements are NaN; JSON has no NaN/inf, so send null
+                "values": [
+                    value if math.isfinite(value) else None
+                    for value in result.values.tolist()
+                ],
+                "unit": output_units.get(name, ""),
+                "errors": result.errors(),
+            }
+            for name, result in results.items()
+        },
+    }
@@ -8,10 +8,9 @@ Provides endpoints for searching:
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import or_
 from typing import List, Optional
 import logging
-import re
 
 from app.db.database import get_db
 import os
@@ -20,6 +19,7 @@ if os.getenv("DEV_MODE") == "true":
 else:
     from app.core.security import get_current_user
 from app.models.component import Component
+from app.models.generated_code import generate_code_from_name
 from app.models.material import Material
 from app.models.property import PropertyDefinition, ComponentProperty
 
@@ -27,26 +27,36 @@ router = APIRouter(prefix="/api/v1/search")
 logger = logging.getLogger(__name__)
 
 
-def generate_code_from_name(name: str) -> str:
-    """Generate a code from entity name if no code exists (Python version for results)."""
-    code = re.sub(r'[^a-zA-Z0-9]', '_', name.upper())
-    code = re.sub(r'_+', '_', code)
-    code = code.strip('_')
-    return code
+def _match_entities(db: Session, model, q: str, limit: int) -> list:
+    """
+    Components or materials whose code matches q, code prefixes first.
 
+    Codes are upper-case, so a prefix of the normalized query matches with
+    LIKE 'Q%', which the varchar_pattern_ops indexes on code and
+    generated_code serve. The unanchored ILIKE '%q%' over code and name
+    (a sequential scan) only runs when prefixes don't fill the page.
+    """
+    prefix = generate_code_from_name(q) or ""
+    # Normalized codes only hold [A-Z0-9_]; '_' is a LIKE wildcard
+    pattern = prefix.replace("_", "\\_") + "%"
+    found = db.query(model).filter(
+        or_(
+            model.code.like(pattern, escape="\\"),
+            model.generated_code.like(pattern, escape="\\")
+        )
+    ).limit(limit).all()
 
-def get_generated_code_sql(name_column):
-    """Get SQL expression for generating code from name column (PostgreSQL)."""
-    return func.trim(
-        func.regexp_replace(
-            func.regexp_replace(
-                func.upper(name_column),
-                '[^a-zA-Z0-9]', '_', 'g'
+    if len(found) < limit and q:
+        found += db.query(model).filter(
+            or_(
+                model.code.ilike(f"%{q}%"),
+                model.name.ilike(f"%{q}%"),
+                model.generated_code.ilike(f"%{q}%")
             ),
-            '_+', '_', 'g'
-        ),
-        '_'
-    )
+            model.id.notin_([entity.id for entity in found])
+        ).limit(limit - len(found)).all()
+
+    return found
 
 
 @router.get("/entities")
@@ -68,17 +78,11 @@ async def search_entities(
     query_lower = q.lower()
 
     # Search components by code, name, OR generated code
-    components = db.query(Component).filter(
-        or_(
-            Component.code.ilike(f"%{q}%"),
-            Component.name.ilike(f"%{q}%"),
-            get_generated_code_sql(Component.name).ilike(f"%{q}%")
-        )
-    ).limit(limit).all()
+    components = _match_entities(db, Component, q, limit)
 
     for comp in components:
-        # Use existing code or generate from name
-        code = comp.code if comp.code else generate_code_from_name(comp.name)
+        # Use existing code or the one generated from name
+        code = comp.code or comp.generated_code
         results.append({
             "code": code,
             "name": comp.name,
@@ -87,17 +91,11 @@ async def search_entities(
         })
 
     # Search materials by code, name, OR generated code
-    materials = db.query(Material).filter(
-        or_(
-            Material.code.ilike(f"%{q}%"),
-            Material.name.ilike(f"%{q}%"),
-            get_generated_code_sql(Material.name).ilike(f"%{q}%")
-        )
-    ).limit(limit).all()
+    materials = _match_entities(db, Material, q, limit)
 
     for mat in materials:
-        # Use existing code or generate from name
-        code = mat.code if mat.code else generate_code_from_name(mat.name)
+        # Use existing code or the one generated from name
+        code = mat.code or mat.generated_code
         results.append({
             "code": code,
             "name": mat.name,
@@ -147,10 +145,10 @@ async def get_entity_properties(
     # Try component by code first
     component = db.query(Component).filter(Component.code == entity_code).first()
 
-    # If not found, try by generated code from name using SQL
+    # If not found, try by generated code from name
     if not component:
         component = db.query(Component).filter(
-            get_generated_code_sql(Component.name) == entity_code
+            Component.generated_code == entity_code
         ).first()
 
     if component:
@@ -174,10 +172,10 @@ async def get_entity_properties(
     # Try material by code
     material = db.query(Material).filter(Material.code == entity_code).first()
 
-    # If not found, try by generated code from name using SQL
+    # If not found, try by generated code from name
     if not material:
         material = db.query(Material).filter(
-            get_generated_code_sql(Material.name) == entity_code
+            Material.generated_code == entity_code
         ).first()
 
     if material:
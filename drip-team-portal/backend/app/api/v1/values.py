@@ -24,7 +24,10 @@ else:
 from app.models.values import ValueNode, ValueDependency, NodeType, ComputationStatus
 from app.models.units import Unit
 from app.models.user import User
-from app.services.value_engine import ValueEngine, ExpressionError, CircularDependencyError
+from app.services.value_engine import (
+    ValueEngine, ExpressionError, CircularDependencyError, compiled_expressions
+)
+from app.services.dependency_graph import dependency_graph
 
 router = APIRouter(prefix="/api/v1/values")
 logger = logging.getLogger(__name__)
@@ -135,6 +138,8 @@ class RecalculateResponse(BaseModel):
     unit_symbol: Optional[str] = None
     error: Optional[str] = None
     nodes_recalculated: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
 
 
 class BulkRecalculateResponse(BaseModel):
@@ -143,11 +148,14 @@ class BulkRecalculateResponse(BaseModel):
     successful: int
     failed: int
     errors: List[Dict[str, Any]] = []
+    elapsed_ms: float = 0.0
+    nodes_per_second: float = 0.0
 
 
 class ExpressionValidateRequest(BaseModel):
     """Request to validate an expression."""
     expression: str
+    node_id: Optional[int] = None  # Node being edited, to check for circular references
 
 
 class ExpressionValidateResponse(BaseModel):
@@ -156,6 +164,7 @@ class ExpressionValidateResponse(BaseModel):
     references: List[str] = []
     error: Optional[str] = None
     parsed_preview: Optional[str] = None
+    circular: bool = False
 
 
 # ============== Value Node CRUD ==============
@@ -324,12 +333,14 @@ async def delete_value(
         )
 
     # Delete dependencies where this node is the dependent
+    dependency_graph.remove_node(node_id, session=db)
     db.query(ValueDependency).filter(
         ValueDependency.dependent_id == node_id
     ).delete()
 
     db.delete(node)
     db.commit()
+    compiled_expressions.invalidate(node_id)
 
     return {"success": True, "message": f"Value node {node_id} deleted"}
 
@@ -354,10 +365,14 @@ async def recalculate_value(
     try:
         success, error = engine.recalculate(node)
         nodes_recalculated = 1
+        # The cascade runs its own pass, which resets the counters
+        cache_hits, cache_misses = engine.cache_stats["hits"], engine.cache_stats["misses"]
 
         if cascade and success:
             recalculated = engine.recalculate_stale(node)
             nodes_recalculated += len(recalculated)
+            cache_hits += engine.cache_stats["hits"]
+            cache_misses += engine.cache_stats["misses"]
 
         db.commit()
 
@@ -372,7 +387,9 @@ async def recalculate_value(
             value=node.computed_value,
             unit_symbol=unit_symbol,
             error=error,
-            nodes_recalculated=nodes_recalculated
+            nodes_recalculated=nodes_recalculated,
+            cache_hits=cache_hits,
+            cache_misses=cache_misses
         )
 
     except CircularDependencyError as e:
@@ -388,39 +405,38 @@ async def recalculate_all_stale(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Recalculate all stale value nodes."""
-    stale_nodes = db.query(ValueNode).filter(
-        ValueNode.computation_status.in_([
-            ComputationStatus.STALE,
-            ComputationStatus.PENDING
-        ])
-    ).all()
+    """
+    Recalculate all stale value nodes.
+
+    Every STALE/PENDING node is evaluated exactly once, in dependency order,
+    and results are written back in bulk.
+    """
+    stale_ids = [
+        node_id for (node_id,) in db.query(ValueNode.id).filter(
+            ValueNode.computation_status.in_([
+                ComputationStatus.STALE,
+                ComputationStatus.PENDING
+            ])
+        ).all()
+    ]
 
     user_id = _get_user_id(db, current_user)
     engine = ValueEngine(db, user_id=user_id)
-    successful = 0
-    failed = 0
-    errors = []
-
-    for node in stale_nodes:
-        try:
-            success, error = engine.recalculate(node)
-            if success:
-                successful += 1
-            else:
-                failed += 1
-                errors.append({"node_id": node.id, "error": error})
-        except Exception as e:
-            failed += 1
-            errors.append({"node_id": node.id, "error": str(e)})
+    result = engine.recalculate_batch(stale_ids)
 
     db.commit()
 
+    logger.info(
+        f"recalculate_all_stale: {result['total']} nodes, {result['nodes_per_second']:.0f} nodes/sec"
+    )
+
     return BulkRecalculateResponse(
-        total_nodes=len(stale_nodes),
-        successful=successful,
-        failed=failed,
-        errors=errors[:20]  # Limit errors returned
+        total_nodes=result["total"],
+        successful=result["successful"],
+        failed=result["failed"],
+        errors=result["errors"][:20],  # Limit errors returned
+        elapsed_ms=result["elapsed_seconds"] * 1000,
+        nodes_per_second=result["nodes_per_second"]
     )
 
 
@@ -448,6 +464,7 @@ async def get_dependencies(
 @router.get("/{node_id}/dependents", response_model=List[ValueNodeBrief])
 async def get_dependents(
     node_id: int,
+    transitive: bool = Query(False, description="Include indirect dependents"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -456,12 +473,20 @@ async def get_dependents(
     if not node:
         raise HTTPException(status_code=404, detail="Value node not found")
 
-    # Get direct dependents
-    deps = db.query(ValueDependency).filter(
-        ValueDependency.source_id == node_id
-    ).all()
+    if transitive:
+        # From the in-memory index, which may lag other workers' writes
+        dependent_ids = ValueEngine(db).graph.downstream([node_id])
+        dependent_nodes = (
+            db.query(ValueNode).filter(ValueNode.id.in_(dependent_ids)).order_by(ValueNode.id).all()
+            if dependent_ids else []
+        )
+    else:
+        # Get direct dependents
+        deps = db.query(ValueDependency).filter(
+            ValueDependency.source_id == node_id
+        ).all()
 
-    dependent_nodes = [dep.dependent_node for dep in deps]
+        dependent_nodes = [dep.dependent_node for dep in deps]
 
     return [
         ValueNodeBrief(
@@ -491,6 +516,21 @@ async def validate_expression(
         parsed = engine._parse_expression(data.expression)
         references = engine._extract_references(data.expression)
 
+        if data.node_id is not None and references:
+            # Read-only: don't create literals for unlinked properties (a new
+            # literal has no dependencies, so it can't close a cycle anyway)
+            sources = engine.resolve_references(references, create_literals=False)
+            downstream = engine.graph.downstream([data.node_id], include_seeds=True, session=db)
+            for ref in references:
+                source = sources.get(ref)
+                if source is not None and source.id in downstream:
+                    return ExpressionValidateResponse(
+                        valid=False,
+                        references=references,
+                        error=f"Circular reference: #{ref} depends on this value",
+                        circular=True
+                    )
+
         return ExpressionValidateResponse(
             valid=True,
             references=references,
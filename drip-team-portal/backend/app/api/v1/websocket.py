@@ -5,11 +5,13 @@ Provides real-time notifications when analyses are created, updated, deleted, or
 
 Client Connection:
     ws://localhost:8000/ws/analyses
+    ws://localhost:8000/ws/analyses?subscriptions_only=true  (only subscribed analyses)
 
 Message Protocol:
     Incoming (client -> server):
         {"action": "subscribe", "analysis_id": 123}
         {"action": "unsubscribe", "analysis_id": 123}
+        {"action": "subscriptions_only", "enabled": true}
         {"action": "ping"}
 
     Outgoing (server -> client):
@@ -23,6 +25,11 @@ Message Protocol:
         {"type": "error", "message": "..."}
         {"type": "subscribed", "analysis_id": 123}
         {"type": "unsubscribed", "analysis_id": 123}
+        {"type": "subscriptions_only", "enabled": true}
+
+    Rapid "updated"/"evaluated" events for one analysis are coalesced into
+    the latest one. Clients that fall too far behind are closed with code
+    1013 and should reconnect.
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
@@ -42,9 +49,11 @@ async def websocket_analyses(websocket: WebSocket):
     WebSocket endpoint for real-time analysis updates.
 
     All connected clients receive updates when any analysis changes.
-    Clients can also subscribe to specific analyses for targeted updates.
+    Clients can also subscribe to specific analyses for targeted updates,
+    and opt into receiving only those (subscriptions_only).
     """
-    await manager.connect(websocket)
+    subscriptions_only = websocket.query_params.get("subscriptions_only", "").lower() in ("1", "true", "yes")
+    await manager.connect(websocket, subscriptions_only=subscriptions_only)
     try:
         while True:
             # Receive and parse message
@@ -87,6 +96,15 @@ async def websocket_analyses(websocket: WebSocket):
                             "message": "analysis_id required for unsubscribe action"
                         })
 
+                elif action == "subscriptions_only":
+                    # Only receive updates for subscribed analyses (or all again)
+                    enabled = bool(message.get("enabled", True))
+                    manager.set_subscriptions_only(websocket, enabled)
+                    await manager.send_personal_message(websocket, {
+                        "type": "subscriptions_only",
+                        "enabled": enabled
+                    })
+
                 else:
                     await manager.send_personal_message(websocket, {
                         "type": "error",
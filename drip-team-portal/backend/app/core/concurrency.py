@@ -0,0 +1,199 @@
+"""
+Blocking work off the event loop
+
+Analysis endpoints run synchronous SQLAlchemy queries and CPU-bound model
+evaluation. Run directly in an async handler, one slow evaluation stalls
+every other request and all /ws/analyses traffic in the worker process.
+
+- run_blocking(): run a sync function in a worker thread. A per-process
+  CapacityLimiter (BLOCKING_WORK_CONCURRENCY) caps how many run at once;
+  callers beyond the cap wait for a slot without blocking the loop.
+- spawn(): schedule a coroutine (e.g. a WebSocket broadcast) on the event
+  loop, from the loop or from run_blocking() work.
+- LoopLagMonitor: samples how late the loop wakes from a fixed sleep, so
+  stalls show up in /health and in the logs.
+
+Threads rather than processes: evaluation needs the request's SQLAlchemy
+session, and NumPy sweeps release the GIL.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Coroutine, Dict, Optional, Set, TypeVar
+
+import anyio
+import anyio.from_thread
+import anyio.to_thread
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# One limiter per event loop (the app has one; tests create several)
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, anyio.CapacityLimiter]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Strong references so fire-and-forget tasks are not garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+# Work currently running / waiting for a slot (all loops)
+_counts = {"running": 0, "waiting": 0}
+_counts_lock = threading.Lock()
+
+
+def _limiter() -> anyio.CapacityLimiter:
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = anyio.CapacityLimiter(settings.BLOCKING_WORK_CONCURRENCY)
+        _limiters[loop] = limiter
+    return limiter
+
+
+def _count(key: str, delta: int):
+    with _counts_lock:
+        _counts[key] += delta
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run fn(*args, **kwargs) in a worker thread and await its result.
+
+    Exceptions (including HTTPException) propagate to the caller. At most
+    BLOCKING_WORK_CONCURRENCY calls run at once per process.
+    """
+    call = functools.partial(fn, *args, **kwargs)
+    started = False
+    _count("waiting", 1)
+
+    def run():
+        nonlocal started
+        started = True
+        _count("waiting", -1)
+        _count("running", 1)
+        try:
+            return call()
+        finally:
+            _count("running", -1)
+
+    try:
+        return await anyio.to_thread.run_sync(run, limiter=_limiter())
+    finally:
+        if not started:
+            # Cancelled while waiting for a slot
+            _count("waiting", -1)
+
+
+def blocking_stats() -> Dict[str, int]:
+    """Configured cap and current running / waiting counts."""
+    with _counts_lock:
+        return {
+            "max_concurrency": settings.BLOCKING_WORK_CONCURRENCY,
+            "running": _counts["running"],
+            "waiting": _counts["waiting"],
+        }
+
+
+def spawn(coro: Coroutine) -> None:
+    """
+    Schedule a coroutine on the event loop without waiting for it.
+
+    Works from the loop thread and from run_blocking() worker threads.
+    """
+    def create():
+        task = asyncio.get_running_loop().create_task(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        create()
+        return
+
+    try:
+        anyio.from_thread.run_sync(create)
+    except RuntimeError:
+        # Not on the loop nor in one of its worker threads (e.g. a script)
+        coro.close()
+        logger.debug("spawn: no event loop to schedule on; dropped")
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a sleep of `interval` seconds wakes up.
+
+    Lag is time the loop spent running other callbacks instead of this one -
+    i.e. blocking work done on the loop. Samples over warn_ms are logged.
+    """
+
+    def __init__(self, interval: float = 0.5, warn_ms: float = 100.0, window: int = 120):
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self.samples: deque = deque(maxlen=window)
+        self.max_ms = 0.0
+        self.stalls = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start sampling on the running loop (no-op if already started)."""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    def record(self, lag_ms: float):
+        self.samples.append(lag_ms)
+        self.max_ms = max(self.max_ms, lag_ms)
+        if lag_ms >= self.warn_ms:
+            self.stalls += 1
+            logger.warning(f"Event loop lag {lag_ms:.0f}ms (blocking work on the loop?)")
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"samples": 0, "last_ms": None, "mean_ms": None, "p95_ms": None,
+                    "max_ms": None, "stalls": self.stalls}
+        return {
+            "samples": len(samples),
+            "last_ms": round(self.samples[-1], 2),
+            "mean_ms": round(sum(samples) / len(samples), 2),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+            "max_ms": round(self.max_ms, 2),
+            "stalls": self.stalls,
+        }
+
+
+loop_lag = LoopLagMonitor(
+    interval=settings.LOOP_LAG_INTERVAL,
+    warn_ms=settings.LOOP_LAG_WARN_MS,
+)
@@ -67,6 +67,23 @@ class Settings(BaseSettings):
     ]
     
     ALLOWED_EMAIL_DOMAIN: str = "@drip-3d.com"
+
+    # Blocking work (DB queries, model evaluation) run off the event loop
+    BLOCKING_WORK_CONCURRENCY: int = 8
+    # Worker sessions shared by every concurrent analysis wave in the process.
+    # Request sessions (BLOCKING_WORK_CONCURRENCY) plus these must fit the
+    # connection pool in app/db/database.py (pool_size 5 + max_overflow 10)
+    ANALYSIS_WORKER_SESSIONS: int = 4
+    LOOP_LAG_INTERVAL: float = 0.5  # seconds between event-loop lag samples
+    LOOP_LAG_WARN_MS: float = 100.0
+
+    # WebSocket broadcast pipeline (/ws/analyses)
+    WS_SEND_QUEUE_SIZE: int = 256  # messages buffered per client before it is dropped as too slow
+    WS_SEND_TIMEOUT: float = 10.0  # seconds one send may take before the client is dropped
+    WS_COALESCE_WINDOW: float = 0.05  # seconds; repeated updated/evaluated events per analysis merge
+    WS_BACKPLANE: str = "local"  # local | memory | postgres (LISTEN/NOTIFY across workers)
+    WS_BACKPLANE_CHANNEL: str = "analysis_updates"
+    WS_BACKPLANE_BATCH_WINDOW: float = 0.02  # seconds of updates compacted into one publish
     
     class Config:
         env_file = find_env_file()
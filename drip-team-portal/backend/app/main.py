@@ -5,6 +5,9 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
 from app.core.rate_limit import limiter
+from app.core.concurrency import loop_lag, blocking_stats
+from app.services.websocket_manager import manager as ws_manager
+from app.services.event_backplane import create_backplane
 from app.db.database import engine
 from app.models import Base
 import logging
@@ -88,6 +91,33 @@ async def general_exception_handler(request: Request, exc: Exception):
     return response
 
 
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    """Sample event-loop lag for /health"""
+    loop_lag.start()
+
+
+@app.on_event("shutdown")
+async def stop_loop_lag_monitor():
+    await loop_lag.stop()
+
+
+@app.on_event("startup")
+async def start_ws_backplane():
+    """Share analysis WebSocket events across workers (settings.WS_BACKPLANE)"""
+    try:
+        backplane = create_backplane(settings.WS_BACKPLANE, engine, settings.WS_BACKPLANE_CHANNEL)
+        if backplane is not None:
+            await ws_manager.start_backplane(backplane)
+    except Exception as e:
+        logging.error(f"WebSocket backplane unavailable, broadcasting to this worker only: {e}")
+
+
+@app.on_event("shutdown")
+async def close_ws_manager():
+    await ws_manager.close()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database tables on startup"""
@@ -207,6 +237,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Next-page cursor for GET /api/v1/analyses
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth_router, tags=["auth"])
@@ -244,7 +276,14 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "4.0-units-system", "updated": "2025-12-15"}
+    return {
+        "status": "healthy",
+        "version": "4.0-units-system",
+        "updated": "2025-12-15",
+        "event_loop_lag": loop_lag.stats(),
+        "blocking_work": blocking_stats(),
+        "websocket": ws_manager.stats(),
+    }
 
 # Redirect company site routes to the frontend if they hit the backend
 @app.get("/team")
@@ -1,8 +1,9 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, JSON, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
 import enum
 from app.db.database import Base
+from app.models.generated_code import generate_code_from_name
 
 class ComponentStatus(str, enum.Enum):
     NOT_TESTED = "NOT_TESTED"
@@ -32,6 +33,8 @@ class Component(Base):
     # Auto-generated unique code for formula references (e.g., "HEATBED_001")
     # Used in expressions like: #HEATBED_001.thermal_conductivity
     code = Column(String, unique=True, index=True)
+    # Code derived from name (e.g., "Heat Bed" -> "HEAT_BED"), kept in sync on insert/rename
+    generated_code = Column(String, index=True)
     part_number = Column(String)
     category = Column(Enum(ComponentCategory), nullable=False)
     status = Column(Enum(ComponentStatus), default=ComponentStatus.NOT_TESTED, index=True)
@@ -67,4 +70,9 @@ class Component(Base):
     from app.models.material import component_materials
     materials = relationship("Material", secondary=component_materials, back_populates="components")
     primary_material_id = Column(Integer, ForeignKey("materials.id"))
-    primary_material = relationship("Material", foreign_keys=[primary_material_id])
\ No newline at end of file
+    primary_material = relationship("Material", foreign_keys=[primary_material_id])
+
+    @validates("name")
+    def _sync_generated_code(self, key, name):
+        self.generated_code = generate_code_from_name(name)
+        return name
@@ -0,0 +1,21 @@
+"""
+Generated entity codes for formula references.
+
+Components and materials without an explicit code can still be referenced
+by a code derived from their name ("Heat Bed #2" -> "HEAT_BED_2"). The
+derived code is persisted in an indexed `generated_code` column on both
+tables so lookups don't have to recompute it per row.
+"""
+
+import re
+from typing import Optional
+
+
+def generate_code_from_name(name: Optional[str]) -> Optional[str]:
+    """Generate a reference code from an entity name."""
+    if not name:
+        return None
+    code = re.sub(r'[^a-zA-Z0-9]', '_', name.upper())
+    code = re.sub(r'_+', '_', code)
+    code = code.strip('_')
+    return code
@@ -1,8 +1,9 @@
 from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Boolean, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
 
 from app.db.database import Base
+from app.models.generated_code import generate_code_from_name
 
 # Association table for component materials (many-to-many)
 component_materials = Table(
@@ -25,6 +26,8 @@ class Material(Base):
     # Auto-generated unique code for formula references (e.g., "SS304_001")
     # Used in expressions like: #SS304_001.density
     code = Column(String, unique=True, index=True)
+    # Code derived from name (e.g., "SS 304" -> "SS_304"), kept in sync on insert/rename
+    generated_code = Column(String, index=True)
     subcategory = Column(String)  # Aluminum Alloy, Steel Alloy, etc.
     
     # Common identifiers
@@ -45,6 +48,11 @@ class Material(Base):
     property_values = relationship("MaterialProperty", back_populates="material", cascade="all, delete-orphan")
     components = relationship("Component", secondary=component_materials, back_populates="materials")
 
+    @validates("name")
+    def _sync_generated_code(self, key, name):
+        self.generated_code = generate_code_from_name(name)
+        return name
+
 
 class MaterialProperty(Base):
     __tablename__ = "material_properties"
@@ -15,7 +15,7 @@ Architecture:
                                         └──> ValueNode (N) [outputs via source_model_instance_id]
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, Float, DateTime, ForeignKey, JSON, UniqueConstraint, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, Float, DateTime, ForeignKey, JSON, UniqueConstraint, Index, func
 from sqlalchemy.orm import relationship, selectinload, Session
 from sqlalchemy import Enum as SQLEnum
 from typing import Optional, TYPE_CHECKING
@@ -163,6 +163,25 @@ class PhysicsModelVersion(Base):
     def __repr__(self):
         return f"<PhysicsModelVersion {self.id}: v{self.version} of model {self.physics_model_id}>"
 
+    def compiled_equation(self, output_name: str):
+        """
+        equation_ast[output_name] compiled to closures, or None if there is no AST.
+
+        Compiled once per loaded version object and recompiled only if
+        equation_ast is replaced.
+        """
+        from app.services.equation_engine import compile_equation
+
+        ast = (self.equation_ast or {}).get(output_name)
+        if not ast:
+            return None
+        cache = self.__dict__.setdefault('_compiled_equations', {})
+        compiled = cache.get(output_name)
+        if compiled is None or compiled.ast is not ast:
+            compiled = compile_equation(ast)
+            cache[output_name] = compiled
+        return compiled
+
 
 class ModelInstance(Base):
     """
@@ -186,7 +205,9 @@ class ModelInstance(Base):
     description = Column(Text)  # Optional description for analyses
 
     created_by = Column(String(100))
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Non-null: /analyses pages by (created_at, id)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc),
+                        server_default=func.now())
     last_computed = Column(DateTime)  # When outputs were last calculated
     computation_status = Column(SQLEnum(ComputationStatus))  # Reuse from values.py
     error_message = Column(Text, nullable=True)  # Detailed error message when computation_status is ERROR
@@ -200,6 +221,11 @@ class ModelInstance(Base):
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Keyset pagination of /analyses (newest first)
+        Index('ix_model_instances_created_at_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<ModelInstance {self.id}: {self.name or 'unnamed'} (version {self.model_version_id})>"
 
@@ -284,7 +310,7 @@ class ModelInput(Base):
     __tablename__ = "model_inputs"
 
     id = Column(Integer, primary_key=True)
-    model_instance_id = Column(Integer, ForeignKey("model_instances.id"), nullable=False)
+    model_instance_id = Column(Integer, ForeignKey("model_instances.id"), nullable=False, index=True)
     input_name = Column(String(100), nullable=False)  # Must match an input name in version schema
 
     # Source binding - ONE of these should be set
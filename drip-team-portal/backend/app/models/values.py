@@ -86,7 +86,7 @@ class ValueNode(Base):
 
     # Physics Model output tracking
     # When a ModelInstance computes, it creates ValueNodes with these set
-    source_model_instance_id = Column(Integer, ForeignKey("model_instances.id"), nullable=True)
+    source_model_instance_id = Column(Integer, ForeignKey("model_instances.id"), nullable=True, index=True)
     source_output_name = Column(String(100), nullable=True)  # Which output this represents
 
     # Relationships
@@ -157,10 +157,10 @@ class ValueDependency(Base):
     id = Column(Integer, primary_key=True)
 
     # The node that uses another value (the dependent)
-    dependent_id = Column(Integer, ForeignKey("value_nodes.id"), nullable=False)
+    dependent_id = Column(Integer, ForeignKey("value_nodes.id"), nullable=False, index=True)
 
     # The node being used (the source/dependency)
-    source_id = Column(Integer, ForeignKey("value_nodes.id"), nullable=False)
+    source_id = Column(Integer, ForeignKey("value_nodes.id"), nullable=False, index=True)
 
     # How it's referenced in the expression (e.g., "cmp001.length")
     variable_name = Column(String, nullable=True)
@@ -0,0 +1,364 @@
+"""
+Analysis Scheduler - Cascading re-evaluation over the analysis DAG
+
+Analyses consume each other's outputs through ModelInput bindings:
+- source_value_node_id pointing at another instance's output ValueNode
+- source_lookup {"expression": "#REF:{valueNodeId}"}
+
+AnalysisGraph derives instance -> instance edges from those bindings with
+two queries, and finds cycles once when it is built. reevaluate_downstream()
+then re-evaluates everything downstream of the analyses that changed, in
+topological waves: each wave only depends on earlier waves, so its members
+can be evaluated concurrently, each on its own session.
+
+Concurrent waves share one process-wide pool of ANALYSIS_WORKER_SESSIONS
+threads, so however many requests cascade at once, the worker sessions they
+open stay within the connection pool alongside the request sessions that
+run_blocking() allows.
+
+Analyses on a cycle are marked ERROR without being evaluated. Analyses
+downstream of a failed (or cyclic) analysis are not evaluated; their outputs
+are marked STALE. evaluate_model_instance()'s evaluation_stack remains the
+backstop for callers that evaluate a single instance directly.
+"""
+
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Any
+import logging
+import threading
+import time
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.physics_model import ModelInstance, ModelInput
+from app.models.values import ValueNode, ComputationStatus
+from app.services.model_evaluation import evaluate_and_attach, invalidate_instance_outputs
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per wave when no max_workers is given
+DEFAULT_MAX_WORKERS = 4
+
+# Shared by every reevaluate_downstream() call in the process
+_wave_executor: Optional[ThreadPoolExecutor] = None
+_wave_executor_lock = threading.Lock()
+
+
+class AnalysisGraph:
+    """
+    Instance-level dependency graph.
+
+    upstream[instance_id]   -> ids of instances whose outputs it reads
+    downstream[instance_id] -> ids of instances that read its outputs
+    cyclic                  -> ids of instances on a dependency cycle
+    """
+
+    def __init__(self, edges: Iterable[Tuple[int, int]] = ()):
+        self.upstream: Dict[int, Set[int]] = defaultdict(set)
+        self.downstream: Dict[int, Set[int]] = defaultdict(set)
+        for source_id, dependent_id in edges:
+            self.upstream[dependent_id].add(source_id)
+            self.downstream[source_id].add(dependent_id)
+        self.cyclic: Set[int] = self._find_cycles()
+
+    @classmethod
+    def build(cls, db: Session) -> "AnalysisGraph":
+        """Load every analysis-to-analysis binding from the database."""
+        bindings = db.query(
+            ModelInput.model_instance_id,
+            ModelInput.source_value_node_id,
+            ModelInput.source_lookup,
+        ).filter(
+            or_(ModelInput.source_value_node_id.isnot(None), ModelInput.source_lookup.isnot(None))
+        ).all()
+
+        reads: List[Tuple[int, int]] = []  # (dependent instance, ValueNode id)
+        for instance_id, value_node_id, source_lookup in bindings:
+            if value_node_id:
+                reads.append((instance_id, value_node_id))
+                continue
+            value_node_id = _ref_node_id(source_lookup)
+            if value_node_id is not None:
+                reads.append((instance_id, value_node_id))
+
+        owners: Dict[int, int] = {}
+        node_ids = list({node_id for _, node_id in reads})
+        if node_ids:
+            owners = dict(db.query(ValueNode.id, ValueNode.source_model_instance_id).filter(
+                ValueNode.id.in_(node_ids),
+                ValueNode.source_model_instance_id.isnot(None)
+            ).all())
+
+        return cls(
+            (owners[node_id], instance_id)
+            for instance_id, node_id in reads
+            if node_id in owners
+        )
+
+    def _find_cycles(self) -> Set[int]:
+        """Instances that can reach themselves (Kahn's leftovers, then reachability)."""
+        nodes = set(self.upstream) | set(self.downstream)
+        in_degree = {n: len(self.upstream.get(n, ())) for n in nodes}
+        queue = deque(n for n, degree in in_degree.items() if degree == 0)
+        while queue:
+            n = queue.popleft()
+            for dependent in self.downstream.get(n, ()):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        # Leftovers are on a cycle or downstream of one; keep the former
+        leftover = {n for n, degree in in_degree.items() if degree > 0}
+        return {n for n in leftover if n in self._reachable(self.downstream.get(n, ()), within=leftover)}
+
+    def _reachable(self, start: Iterable[int], within: Optional[Set[int]] = None) -> Set[int]:
+        seen: Set[int] = set()
+        stack = list(start)
+        while stack:
+            n = stack.pop()
+            if n in seen or (within is not None and n not in within):
+                continue
+            seen.add(n)
+            stack.extend(self.downstream.get(n, ()))
+        return seen
+
+    def affected(self, root_ids: Iterable[int]) -> Set[int]:
+        """The roots plus everything transitively downstream of them."""
+        root_ids = set(root_ids)
+        return root_ids | self._reachable(
+            dependent for root in root_ids for dependent in self.downstream.get(root, ())
+        )
+
+    def waves(self, instance_ids: Iterable[int]) -> Tuple[List[List[int]], List[int]]:
+        """
+        Order instances into topological waves (Kahn's algorithm by level).
+
+        Only edges between the given instances constrain the order. Members of
+        one wave never depend on each other.
+
+        Returns:
+            (waves, unordered) - unordered holds instances on, or downstream
+            of, a cycle within the set
+        """
+        ids = set(instance_ids)
+        in_degree = {n: len(self.upstream.get(n, set()) & ids) for n in ids}
+        wave = sorted(n for n, degree in in_degree.items() if degree == 0)
+        waves: List[List[int]] = []
+        while wave:
+            waves.append(wave)
+            following = []
+            for n in wave:
+                for dependent in self.downstream.get(n, ()):
+                    if dependent in ids:
+                        in_degree[dependent] -= 1
+                        if in_degree[dependent] == 0:
+                            following.append(dependent)
+            wave = sorted(following)
+        unordered = sorted(n for n, degree in in_degree.items() if degree > 0)
+        return waves, unordered
+
+
+def _ref_node_id(source_lookup: Any) -> Optional[int]:
+    """The ValueNode id of a {"expression": "#REF:{id}"} binding, else None."""
+    if not isinstance(source_lookup, dict):
+        return None
+    expression = source_lookup.get('expression') or ''
+    if not expression.startswith('#REF:'):
+        return None
+    try:
+        return int(expression[5:])
+    except ValueError:
+        return None
+
+
+def reevaluate_downstream(
+    db: Session,
+    root_ids: Iterable[int],
+    include_roots: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    session_factory: Optional[Callable[[], Session]] = None,
+    graph: Optional[AnalysisGraph] = None,
+) -> Dict[str, Any]:
+    """
+    Re-evaluate every instance downstream of root_ids in dependency order.
+
+    Waves with more than one instance are evaluated concurrently when
+    max_workers > 1: each worker evaluates and commits on its own session,
+    on the process-wide wave pool (at most max_workers of this call's
+    members at once), and the caller's session is expired afterwards so it
+    reads the new results. Single-instance waves run on the caller's session.
+
+    Workers only see committed data, so the caller's session is committed
+    before each concurrent wave. That commit includes whatever the caller
+    has pending: callers commit their own changes before cascading (as the
+    analysis endpoints do) and must not expect to roll back afterwards.
+
+    Args:
+        db: Database session
+        root_ids: Instances that changed (already evaluated by the caller
+                  unless include_roots is set; a root left in ERROR
+                  blocks its downstream)
+        include_roots: Evaluate the roots as well
+        max_workers: Concurrent evaluations per wave (1 = sequential)
+        session_factory: Creates worker sessions (default: bound to db's engine)
+        graph: Prebuilt AnalysisGraph (default: built from db)
+
+    Returns:
+        Dict with evaluated, failed ({id, error}), skipped, cyclic (lists of
+        instance ids), waves and elapsed_ms
+    """
+    started = time.perf_counter()
+    root_ids = set(root_ids)
+    graph = graph or AnalysisGraph.build(db)
+
+    affected = graph.affected(root_ids)
+    targets = affected if include_roots else affected - root_ids
+
+    evaluated: List[int] = []
+    failed: List[Dict[str, Any]] = []
+    skipped: List[int] = []
+
+    # Cycles were found when the graph was built: flag their members
+    # (roots included) instead of evaluating them
+    cyclic = sorted(affected & graph.cyclic)
+    for instance_id in cyclic:
+        _mark_circular(db, instance_id)
+    # Instances whose outputs must not be trusted downstream
+    broken: Set[int] = set(cyclic)
+    if not include_roots:
+        for instance_id in root_ids:
+            root = db.get(ModelInstance, instance_id)
+            if root is not None and root.computation_status == ComputationStatus.ERROR:
+                broken.add(instance_id)
+
+    waves, unordered = graph.waves(targets - broken)
+    for instance_id in unordered:
+        _mark_stale(db, instance_id)
+        skipped.append(instance_id)
+        broken.add(instance_id)
+
+    if session_factory is None and max_workers > 1:
+        session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+
+    for wave in waves:
+        runnable = []
+        for instance_id in wave:
+            if graph.upstream.get(instance_id, set()) & broken:
+                _mark_stale(db, instance_id)
+                skipped.append(instance_id)
+                broken.add(instance_id)
+            else:
+                runnable.append(instance_id)
+
+        if len(runnable) > 1 and max_workers > 1:
+            # Upstream results and STALE/ERROR marks must be visible to workers
+            db.commit()
+            errors = _evaluate_concurrently(session_factory, runnable, max_workers)
+            db.expire_all()
+        else:
+            errors = [_evaluate(db, instance_id) for instance_id in runnable]
+
+        for instance_id, error in zip(runnable, errors):
+            if error is None:
+                evaluated.append(instance_id)
+            else:
+                failed.append({"id": instance_id, "error": error})
+                broken.add(instance_id)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"reevaluate_downstream: roots={sorted(root_ids)} {len(evaluated)} evaluated, "
+        f"{len(failed)} failed, {len(skipped)} skipped, {len(cyclic)} cyclic "
+        f"in {len(waves)} waves ({elapsed_ms:.1f}ms)"
+    )
+    return {
+        "evaluated": evaluated,
+        "failed": failed,
+        "skipped": skipped,
+        "cyclic": cyclic,
+        "waves": len(waves),
+        "elapsed_ms": elapsed_ms,
+    }
+
+
+def _evaluate(db: Session, instance_id: int) -> Optional[str]:
+    """Evaluate one instance on db; returns the error message, or None."""
+    instance = db.get(ModelInstance, instance_id)
+    if instance is None:
+        return f"ModelInstance {instance_id} not found"
+    try:
+        evaluate_and_attach(instance, db)
+    except Exception as e:
+        # evaluate_model_instance() has already recorded the error on the instance
+        logger.warning(f"reevaluate_downstream: instance {instance_id} failed: {e}")
+        return str(e)
+    return None
+
+
+def _evaluate_concurrently(
+    session_factory: Callable[[], Session],
+    instance_ids: List[int],
+    max_workers: int,
+) -> List[Optional[str]]:
+    """
+    Evaluate instance_ids on the shared wave pool, at most max_workers at a
+    time; returns each one's error message (or None), in order.
+    """
+    executor = _get_wave_executor()
+    slots = threading.BoundedSemaphore(min(max_workers, len(instance_ids)))
+    futures = []
+    for instance_id in instance_ids:
+        slots.acquire()
+        future = executor.submit(_evaluate_in_session, session_factory, instance_id)
+        future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+    return [future.result() for future in futures]
+
+
+def _get_wave_executor() -> ThreadPoolExecutor:
+    global _wave_executor
+    if _wave_executor is None:
+        with _wave_executor_lock:
+            if _wave_executor is None:
+                _wave_executor = ThreadPoolExecutor(
+                    max_workers=settings.ANALYSIS_WORKER_SESSIONS, thread_name_prefix="analysis-wave"
+                )
+    return _wave_executor
+
+
+def _evaluate_in_session(session_factory: Callable[[], Session], instance_id: int) -> Optional[str]:
+    """Evaluate one instance on a fresh session and commit (worker thread)."""
+    session = session_factory()
+    try:
+        error = _evaluate(session, instance_id)
+        session.commit()
+        return error
+    except Exception as e:
+        session.rollback()
+        logger.error(f"reevaluate_downstream: worker for instance {instance_id} raised {e}")
+        return str(e)
+    finally:
+        session.close()
+
+
+def _mark_circular(db: Session, instance_id: int):
+    instance = db.get(ModelInstance, instance_id)
+    if instance is None:
+        return
+    instance.computation_status = ComputationStatus.ERROR
+    instance.error_message = (
+        f"Circular dependency: Analysis '{instance.name or instance.id}' "
+        f"references itself through its dependencies."
+    )
+    for node in db.query(ValueNode).filter(ValueNode.source_model_instance_id == instance_id).all():
+        node.computation_status = ComputationStatus.ERROR
+    db.flush()
+
+
+def _mark_stale(db: Session, instance_id: int):
+    instance = db.get(ModelInstance, instance_id)
+    if instance is not None:
+        invalidate_instance_outputs(instance, db)
@@ -0,0 +1,313 @@
+"""
+Dependency Graph Index - In-memory adjacency index over value_dependencies
+
+Keeps forward (dependent -> sources) and reverse (source -> dependents)
+adjacency as compact int arrays so cycle checks, closures and depth queries
+never touch the database.
+
+The index is loaded once per process from the first session that needs it
+and then maintained incrementally from committed changes only:
+- ValueDependency rows inserted, deleted or re-pointed through the ORM are
+  recorded per session in an after_flush hook
+- Bulk deletes that bypass the ORM (query(...).delete()) must call
+  remove_sources() / remove_node() with the session *before* deleting
+- Recorded changes are applied to the shared index in after_commit and
+  dropped on rollback, so no request sees another's uncommitted edges
+
+Other processes' writes are picked up when the index ages out (max_age),
+so answers may lag by that long; cycle checks overlay the checking session's
+own uncommitted edges. The direct /dependents listing queries the database,
+and evaluation-time CIRCULAR detection in ValueEngine remains the backstop.
+"""
+
+from array import array
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+import logging
+import threading
+import time
+
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.values import ValueDependency
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding edge changes not yet committed:
+# a list of (added, dependent_id, source_id)
+_PENDING_KEY = "dependency_graph_pending"
+
+
+class DependencyGraph:
+    """
+    Forward and reverse adjacency for the value dependency graph.
+
+    forward[dependent_id] -> array of source ids
+    reverse[source_id]    -> array of dependent ids
+    """
+
+    def __init__(self, max_age: float = 300.0):
+        self.max_age = max_age
+        self._forward: Dict[int, array] = {}
+        self._reverse: Dict[int, array] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    # ==================== LOADING ====================
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def ensure_loaded(self, db: Session):
+        """
+        Load the index from the database if it is missing or too old.
+
+        Edges the loading session has changed but not committed are backed
+        out again, so the index only ever holds committed state.
+        """
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_age:
+                return
+            start = time.perf_counter()
+            rows = db.execute(select(ValueDependency.dependent_id, ValueDependency.source_id)).all()
+            self._forward = {}
+            self._reverse = {}
+            for dependent_id, source_id in rows:
+                self._add(dependent_id, source_id)
+            for added, dependent_id, source_id in reversed(db.info.get(_PENDING_KEY, ())):
+                if added:
+                    self._discard(dependent_id, source_id)
+                else:
+                    self._add(dependent_id, source_id)
+            self._loaded_at = time.monotonic()
+            logger.info(
+                f"DependencyGraph: loaded {len(rows)} edges in "
+                f"{(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+
+    def invalidate(self):
+        """Drop the index; it is reloaded on next use."""
+        with self._lock:
+            self._forward = {}
+            self._reverse = {}
+            self._loaded_at = None
+
+    # ==================== INCREMENTAL MAINTENANCE ====================
+
+    def _add(self, dependent_id: int, source_id: int):
+        self._forward.setdefault(dependent_id, array("q")).append(source_id)
+        self._reverse.setdefault(source_id, array("q")).append(dependent_id)
+
+    def _discard(self, dependent_id: int, source_id: int):
+        for index, key, value in (
+            (self._forward, dependent_id, source_id),
+            (self._reverse, source_id, dependent_id),
+        ):
+            ids = index.get(key)
+            if ids is None:
+                continue
+            try:
+                ids.remove(value)
+            except ValueError:
+                continue
+            if not ids:
+                del index[key]
+
+    def add_edge(self, dependent_id: int, source_id: int):
+        """Record that dependent_id reads source_id."""
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            self._add(dependent_id, source_id)
+
+    def remove_edge(self, dependent_id: int, source_id: int):
+        """Forget one dependent_id -> source_id edge."""
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            self._discard(dependent_id, source_id)
+
+    def apply(self, changes: Iterable[tuple]):
+        """Apply committed (added, dependent_id, source_id) changes in order."""
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            for added, dependent_id, source_id in changes:
+                if added:
+                    self._add(dependent_id, source_id)
+                else:
+                    self._discard(dependent_id, source_id)
+
+    def remove_sources(self, dependent_id: int, session: Session):
+        """
+        Record the removal of every edge where dependent_id is the dependent.
+
+        Call before the bulk delete; the edges are read from the session and
+        leave the index when it commits.
+        """
+        rows = session.execute(
+            select(ValueDependency.dependent_id, ValueDependency.source_id)
+            .where(ValueDependency.dependent_id == dependent_id)
+        ).all()
+        _record(session, ((False, d, s) for d, s in rows))
+
+    def remove_node(self, node_id: int, session: Session):
+        """Record the removal of every edge touching node_id (see remove_sources)."""
+        rows = session.execute(
+            select(ValueDependency.dependent_id, ValueDependency.source_id)
+            .where(or_(ValueDependency.dependent_id == node_id, ValueDependency.source_id == node_id))
+        ).all()
+        _record(session, ((False, d, s) for d, s in rows))
+
+    # ==================== QUERIES ====================
+
+    def sources(self, node_id: int) -> List[int]:
+        """Ids this node reads directly."""
+        return list(self._forward.get(node_id, ()))
+
+    def dependents(self, node_id: int) -> List[int]:
+        """Ids that read this node directly."""
+        return list(self._reverse.get(node_id, ()))
+
+    def upstream(self, node_ids: Iterable[int], include_seeds: bool = False) -> Set[int]:
+        """Every node the given nodes depend on, transitively."""
+        return self._closure(self._forward, node_ids, include_seeds)
+
+    def downstream(
+        self, node_ids: Iterable[int], include_seeds: bool = False, session: Optional[Session] = None
+    ) -> Set[int]:
+        """
+        Every node that depends on the given nodes, transitively.
+
+        With a session, the edges it has flushed but not yet committed are
+        taken into account as well.
+        """
+        added: Dict[int, List[int]] = {}
+        removed: Set[tuple] = set()
+        if session is not None:
+            net: Counter = Counter()
+            for is_add, dependent_id, source_id in session.info.get(_PENDING_KEY, ()):
+                net[(source_id, dependent_id)] += 1 if is_add else -1
+            for (source_id, dependent_id), count in net.items():
+                if count > 0:
+                    added.setdefault(source_id, []).append(dependent_id)
+                elif count < 0:
+                    removed.add((source_id, dependent_id))
+        return self._closure(self._reverse, node_ids, include_seeds, added, removed)
+
+    def _closure(
+        self,
+        index: Dict[int, array],
+        node_ids: Iterable[int],
+        include_seeds: bool,
+        added: Optional[Dict[int, List[int]]] = None,
+        removed: Optional[Set[tuple]] = None,
+    ) -> Set[int]:
+        seeds = [node_id for node_id in node_ids if node_id is not None]
+        seen: Set[int] = set()
+        queue = deque(seeds)
+        while queue:
+            current = queue.popleft()
+            next_ids = index.get(current, ())
+            if added:
+                next_ids = list(next_ids) + added.get(current, [])
+            for next_id in next_ids:
+                if removed and (current, next_id) in removed:
+                    continue
+                if next_id not in seen:
+                    seen.add(next_id)
+                    queue.append(next_id)
+        if include_seeds:
+            seen.update(seeds)
+        return seen
+
+    def depth(self, node_id: int) -> int:
+        """
+        Length of the longest dependency chain below node_id (0 for a leaf).
+
+        Edges that close a cycle are ignored.
+        """
+        depths: Dict[int, int] = {}
+        on_path: Set[int] = set()
+        # Iterative post-order DFS over sources
+        stack = [(node_id, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                on_path.discard(current)
+                depths[current] = max(
+                    (depths[s] + 1 for s in self._forward.get(current, ()) if s in depths),
+                    default=0,
+                )
+                continue
+            if current in depths or current in on_path:
+                continue
+            on_path.add(current)
+            stack.append((current, True))
+            for source_id in self._forward.get(current, ()):
+                if source_id not in depths and source_id not in on_path:
+                    stack.append((source_id, False))
+        return depths[node_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "nodes": len(self._forward.keys() | self._reverse.keys()),
+            "edges": sum(len(ids) for ids in self._forward.values()),
+        }
+
+
+dependency_graph = DependencyGraph()
+
+
+# ==================== SESSION HOOKS ====================
+
+def _record(session: Session, changes: Iterable[tuple]):
+    session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_dependencies(session: Session, flush_context):
+    """Record ValueDependency inserts, deletes and re-points for commit time."""
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, ValueDependency):
+            changes.append((True, obj.dependent_id, obj.source_id))
+
+    for obj in session.deleted:
+        if isinstance(obj, ValueDependency):
+            changes.append((False, obj.dependent_id, obj.source_id))
+
+    for obj in session.dirty:
+        if not isinstance(obj, ValueDependency):
+            continue
+        state = inspect(obj)
+        dependent_hist = state.attrs.dependent_id.history
+        source_hist = state.attrs.source_id.history
+        if not (dependent_hist.has_changes() or source_hist.has_changes()):
+            continue
+        old_dependent = dependent_hist.deleted[0] if dependent_hist.deleted else obj.dependent_id
+        old_source = source_hist.deleted[0] if source_hist.deleted else obj.source_id
+        changes.append((False, old_dependent, old_source))
+        changes.append((True, obj.dependent_id, obj.source_id))
+
+    if changes:
+        _record(session, changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_dependencies(session: Session):
+    """Publish this session's edge changes to the shared index."""
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        dependency_graph.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _rollback_dependencies(session: Session):
+    """The recorded changes never happened."""
+    session.info.pop(_PENDING_KEY, None)
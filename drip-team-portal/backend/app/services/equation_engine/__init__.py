@@ -4,7 +4,7 @@ Equation Engine - Expression Parsing, Evaluation, and LaTeX Generation
 This module provides tools for working with mathematical equations in physics models:
 - Parse equation text into structured AST (Abstract Syntax Tree)
 - Validate equation structure and input references
-- Evaluate equations given input values
+- Evaluate equations given input values (or arrays of them, for sweeps)
 - Generate LaTeX for display
 
 Key difference from value_engine: This handles MODEL equations (templates with
@@ -41,6 +41,8 @@ Example Usage:
 
 from .parser import parse_equation, get_ast_inputs
 from .evaluator import evaluate_equation, evaluate_with_result
+from .compiler import compile_equation, CompiledEquation
+from .vectorized import evaluate_equation_many, VectorEvaluation
 from .latex_generator import (
     generate_latex,
     generate_latex_from_ast,
@@ -58,6 +60,14 @@ __all__ = [
     'evaluate_equation',
     'evaluate_with_result',
 
+    # Compiler
+    'compile_equation',
+    'CompiledEquation',
+
+    # Vectorized
+    'evaluate_equation_many',
+    'VectorEvaluation',
+
     # LaTeX
     'generate_latex',
     'generate_latex_from_ast',
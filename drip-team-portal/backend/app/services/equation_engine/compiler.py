@@ -0,0 +1,220 @@
+"""
+Equation Compiler - AST to Python closures
+
+Turns an equation AST into a tree of closures once, so evaluating it is a
+chain of direct calls instead of a dict-dispatching walk per node.
+
+Error behaviour matches evaluate_equation(): the same checks run in the same
+order (division by zero, negative base to a fractional power, domain errors
+in functions) and raise the same EvaluationError / UnknownInputError. A
+malformed node raises when it is reached, not when it is compiled.
+"""
+
+import math
+import logging
+from typing import Dict, Any, Callable, Optional
+
+from .exceptions import EvaluationError, UnknownInputError
+from .evaluator import _evaluate_function, _evaluation_error
+
+logger = logging.getLogger(__name__)
+
+# Inputs dict -> float
+Closure = Callable[[Dict[str, float]], float]
+
+# Functions without domain checks are called directly
+_PLAIN_FUNCTIONS = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "abs": abs,
+}
+
+
+class CompiledEquation:
+    """
+    A compiled equation AST; call it with input values like evaluate_equation().
+
+    Example:
+        compiled = compile_equation(parse_equation("a * b")["ast"])
+        compiled({"a": 2, "b": 3})  # 6.0
+    """
+
+    __slots__ = ("ast", "expression", "_fn")
+
+    def __init__(self, ast: Dict[str, Any], expression: Optional[str] = None):
+        self.ast = ast
+        self.expression = expression
+        self._fn = _compile_node(ast, expression)
+
+    def __call__(self, input_values: Dict[str, float]) -> float:
+        try:
+            return self._fn(input_values)
+        except (UnknownInputError, EvaluationError):
+            raise
+        except Exception as e:
+            raise _evaluation_error(e, self.expression, input_values)
+
+
+def compile_equation(ast: Dict[str, Any], expression: Optional[str] = None) -> CompiledEquation:
+    """Compile an AST (from parse_equation result["ast"]) to a CompiledEquation."""
+    return CompiledEquation(ast, expression)
+
+
+def _compile_node(node: Dict[str, Any], expression: Optional[str]) -> Closure:
+    try:
+        return _compile(node, expression)
+    except Exception as e:
+        # Malformed node (missing keys, bad constant): fail when evaluated,
+        # as the tree walker does
+        def fail(input_values, error=e):
+            raise error
+        return fail
+
+
+def _compile(node: Dict[str, Any], expression: Optional[str]) -> Closure:
+    node_type = node.get("type")
+
+    if node_type is None:
+        def missing_type(input_values):
+            logger.error(f"_evaluate_node: Invalid AST node with no 'type': {node}")
+            raise EvaluationError(
+                "Invalid AST node: missing 'type'",
+                expression=expression,
+                node_type=None,
+                details={"node": node}
+            )
+        return missing_type
+
+    if node_type == "const":
+        value = float(node["value"])
+        return lambda input_values: value
+
+    if node_type == "input":
+        return _compile_input(node["name"], expression)
+
+    if node_type == "add":
+        operands = [_compile_node(operand, expression) for operand in node.get("operands", [])]
+        if not operands:
+            return lambda input_values: 0.0
+        if len(operands) == 2:
+            a, b = operands
+            return lambda input_values: 0.0 + a(input_values) + b(input_values)
+
+        def add(input_values):
+            result = 0.0
+            for operand in operands:
+                result += operand(input_values)
+            return result
+        return add
+
+    if node_type == "mul":
+        operands = [_compile_node(operand, expression) for operand in node.get("operands", [])]
+        if not operands:
+            return lambda input_values: 1.0
+        if len(operands) == 2:
+            a, b = operands
+            return lambda input_values: 1.0 * a(input_values) * b(input_values)
+
+        def mul(input_values):
+            result = 1.0
+            for operand in operands:
+                result *= operand(input_values)
+            return result
+        return mul
+
+    if node_type == "div":
+        numerator_fn = _compile_node(node["numerator"], expression)
+        denominator_fn = _compile_node(node["denominator"], expression)
+
+        def div(input_values):
+            numerator = numerator_fn(input_values)
+            denominator = denominator_fn(input_values)
+            if denominator == 0:
+                logger.error(f"_evaluate_node: Division by zero - numerator={numerator}")
+                raise EvaluationError(
+                    "Division by zero",
+                    expression=expression,
+                    input_values=input_values,
+                    node_type="div",
+                    details={"numerator": numerator}
+                )
+            return numerator / denominator
+        return div
+
+    if node_type == "pow":
+        return _compile_pow(node, expression)
+
+    if node_type == "neg":
+        operand = _compile_node(node["operand"], expression)
+        return lambda input_values: -operand(input_values)
+
+    if node_type == "func":
+        func_name = node["name"]
+        arg = _compile_node(node["arg"], expression)
+        plain = _PLAIN_FUNCTIONS.get(func_name)
+        if plain is not None:
+            return lambda input_values: plain(arg(input_values))
+        return lambda input_values: _evaluate_function(func_name, arg(input_values), expression, input_values)
+
+    def unknown(input_values):
+        logger.error(f"_evaluate_node: Unknown node type '{node_type}'")
+        raise EvaluationError(
+            f"Unknown AST node type: {node_type}",
+            expression=expression,
+            node_type=node_type
+        )
+    return unknown
+
+
+def _compile_input(name: str, expression: Optional[str]) -> Closure:
+    normalized_name = name.replace(' ', '_').lower()
+
+    def read_input(input_values):
+        # Exact match first, then case-insensitive with spaces as underscores
+        if name in input_values:
+            return float(input_values[name])
+        normalized_inputs = {
+            k.replace(' ', '_').lower(): v
+            for k, v in input_values.items()
+        }
+        if normalized_name in normalized_inputs:
+            return float(normalized_inputs[normalized_name])
+        logger.error(
+            f"_evaluate_node: Unknown input '{name}'. "
+            f"Available inputs: {list(input_values.keys())}"
+        )
+        raise UnknownInputError(name, list(input_values.keys()), expression=expression)
+    return read_input
+
+
+def _compile_pow(node: Dict[str, Any], expression: Optional[str]) -> Closure:
+    base_fn = _compile_node(node["base"], expression)
+    exponent_fn = _compile_node(node["exponent"], expression)
+
+    def power(input_values):
+        base = base_fn(input_values)
+        exponent = exponent_fn(input_values)
+
+        if base < 0 and not float(exponent).is_integer():
+            logger.error(
+                f"_evaluate_node: Cannot raise negative {base} to non-integer power {exponent}"
+            )
+            raise EvaluationError(
+                f"Cannot raise negative number {base} to non-integer power {exponent}",
+                expression=expression,
+                input_values=input_values,
+                node_type="pow",
+                details={"base": base, "exponent": exponent}
+            )
+        if base == 0 and exponent < 0:
+            logger.error("_evaluate_node: Cannot raise zero to negative power")
+            raise EvaluationError(
+                "Cannot raise zero to negative power",
+                expression=expression,
+                input_values=input_values,
+                node_type="pow",
+                details={"base": base, "exponent": exponent}
+            )
+
+        return math.pow(base, exponent)
+    return power
@@ -3,6 +3,9 @@ Equation Evaluator - AST Tree Walker
 
 Evaluates equation AST given input values.
 Handles math errors gracefully with EvaluationError.
+
+For equations evaluated repeatedly, compile_equation() (compiler.py) builds
+closures once with the same results and errors.
 """
 
 import math
@@ -68,35 +71,44 @@ def evaluate_equation(
         raise
     except EvaluationError:
         raise
-    except ZeroDivisionError as e:
+    except Exception as e:
+        raise _evaluation_error(e, expression, input_values)
+
+
+def _evaluation_error(
+    e: Exception,
+    expression: Optional[str],
+    input_values: Dict[str, float]
+) -> EvaluationError:
+    """Translate a Python arithmetic error into an EvaluationError (and log it)."""
+    if isinstance(e, ZeroDivisionError):
         logger.error(f"evaluate_equation: Division by zero in '{expression}' with inputs {input_values}")
-        raise EvaluationError(
+        return EvaluationError(
             "Division by zero",
             expression=expression,
             input_values=input_values
         )
-    except ValueError as e:
+    if isinstance(e, ValueError):
         logger.error(f"evaluate_equation: Math domain error in '{expression}': {e}")
-        raise EvaluationError(
+        return EvaluationError(
             f"Math domain error: {e}",
             expression=expression,
             input_values=input_values
         )
-    except OverflowError as e:
+    if isinstance(e, OverflowError):
         logger.error(f"evaluate_equation: Numeric overflow in '{expression}' with inputs {input_values}")
-        raise EvaluationError(
+        return EvaluationError(
             "Numeric overflow - result too large",
             expression=expression,
             input_values=input_values
         )
-    except Exception as e:
-        logger.error(f"evaluate_equation: Unexpected error in '{expression}': {type(e).__name__}: {e}")
-        raise EvaluationError(
-            f"Evaluation failed: {type(e).__name__}: {e}",
-            expression=expression,
-            input_values=input_values,
-            details={"error_type": type(e).__name__}
-        )
+    logger.error(f"evaluate_equation: Unexpected error in '{expression}': {type(e).__name__}: {e}")
+    return EvaluationError(
+        f"Evaluation failed: {type(e).__name__}: {e}",
+        expression=expression,
+        input_values=input_values,
+        details={"error_type": type(e).__name__}
+    )
 
 
 def _evaluate_node(
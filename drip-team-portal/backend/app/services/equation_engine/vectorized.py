@@ -0,0 +1,228 @@
+"""
+Vectorized Equation Evaluator - AST over NumPy arrays
+
+Evaluates an equation AST for whole arrays of input values at once (e.g. a
+parameter sweep of delta_T over 1000 steps). Any subset of the inputs may be
+arrays; they are broadcast against each other and against scalar inputs.
+
+Numeric failures do not raise. Each element that would have raised an
+EvaluationError in evaluate_equation() is NaN in the result and flagged in
+an error mask, with the reason of the first failing operation (the same
+checks, in the same order, as the scalar tree walker). Structural problems
+(unknown input, unknown node type or function) still raise, since they
+affect every element.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .exceptions import EvaluationError, UnknownInputError
+
+logger = logging.getLogger(__name__)
+
+
+class VectorEvaluation:
+    """
+    Result of evaluate_equation_many().
+
+    Attributes:
+        values: Float array of results (NaN where error_mask is set)
+        error_mask: Bool array, True where the element failed
+        reasons: Object array with the failure reason per element (None if ok)
+    """
+
+    __slots__ = ("values", "error_mask", "reasons")
+
+    def __init__(self, values: np.ndarray, error_mask: np.ndarray, reasons: np.ndarray):
+        self.values = values
+        self.error_mask = error_mask
+        self.reasons = reasons
+
+    @property
+    def error_count(self) -> int:
+        return int(np.count_nonzero(self.error_mask))
+
+    def errors(self) -> Dict[str, List[int]]:
+        """Reason -> flat indices of the elements that failed with it."""
+        grouped: Dict[str, List[int]] = {}
+        flat = self.reasons.ravel()
+        for index in np.flatnonzero(self.error_mask.ravel()).tolist():
+            grouped.setdefault(flat[index], []).append(index)
+        return grouped
+
+
+class _Masks:
+    """Tracks the first failure per element while the AST is evaluated."""
+
+    def __init__(self, shape: tuple):
+        self.mask = np.zeros(shape, dtype=bool)
+        self.reasons = np.full(shape, None, dtype=object)
+
+    def flag(self, condition: np.ndarray, reason: str):
+        new = np.broadcast_to(condition, self.mask.shape) & ~self.mask
+        if new.any():
+            self.reasons[new] = reason
+            self.mask |= new
+
+
+def evaluate_equation_many(
+    ast: Dict[str, Any],
+    input_values: Dict[str, Any],
+    expression: Optional[str] = None
+) -> VectorEvaluation:
+    """
+    Evaluate an equation AST over arrays of input values.
+
+    Args:
+        ast: The AST dict (from parse_equation result["ast"])
+        input_values: Dict mapping input names to scalars or arrays
+                     Example: {"CTE": 2.3e-5, "delta_T": np.linspace(0, 500, 1000), "L0": 1.0}
+        expression: Optional original expression string for error context
+
+    Returns:
+        VectorEvaluation with values, error_mask and reasons, all shaped like
+        the broadcast of the inputs
+
+    Raises:
+        UnknownInputError: AST references an input not in input_values
+        EvaluationError: Malformed AST, unknown function, or inputs that are
+                         not numeric / cannot be broadcast together
+    """
+    try:
+        arrays = {k: np.asarray(v, dtype=float) for k, v in input_values.items()}
+        shape = np.broadcast_shapes(*[a.shape for a in arrays.values()]) if arrays else ()
+    except (TypeError, ValueError) as e:
+        raise EvaluationError(
+            f"Input arrays must be numeric and broadcastable: {e}",
+            expression=expression
+        )
+
+    normalized_inputs = {k.replace(' ', '_').lower(): v for k, v in arrays.items()}
+    masks = _Masks(shape)
+
+    with np.errstate(all="ignore"):
+        result = _evaluate_node(ast, arrays, normalized_inputs, masks, expression)
+        values = np.array(np.broadcast_to(result, shape), dtype=float)
+    values[masks.mask] = np.nan
+    return VectorEvaluation(values, masks.mask, masks.reasons)
+
+
+def _evaluate_node(
+    node: Dict[str, Any],
+    arrays: Dict[str, np.ndarray],
+    normalized_inputs: Dict[str, np.ndarray],
+    masks: _Masks,
+    expression: Optional[str]
+) -> np.ndarray:
+    node_type = node.get("type")
+
+    def child(key: str) -> np.ndarray:
+        return _evaluate_node(node[key], arrays, normalized_inputs, masks, expression)
+
+    if node_type is None:
+        raise EvaluationError(
+            "Invalid AST node: missing 'type'",
+            expression=expression,
+            node_type=None,
+            details={"node": node}
+        )
+
+    if node_type == "const":
+        return np.float64(node["value"])
+
+    if node_type == "input":
+        name = node["name"]
+        if name in arrays:
+            return arrays[name]
+        normalized_name = name.replace(' ', '_').lower()
+        if normalized_name in normalized_inputs:
+            return normalized_inputs[normalized_name]
+        raise UnknownInputError(name, list(arrays.keys()), expression=expression)
+
+    if node_type == "add":
+        result = np.float64(0.0)
+        for operand in node.get("operands", []):
+            result = result + _evaluate_node(operand, arrays, normalized_inputs, masks, expression)
+        return result
+
+    if node_type == "mul":
+        result = np.float64(1.0)
+        for operand in node.get("operands", []):
+            result = result * _evaluate_node(operand, arrays, normalized_inputs, masks, expression)
+        return result
+
+    if node_type == "div":
+        numerator = child("numerator")
+        denominator = child("denominator")
+        masks.flag(denominator == 0, "Division by zero")
+        return numerator / denominator
+
+    if node_type == "pow":
+        base = child("base")
+        exponent = child("exponent")
+        integer = np.isfinite(exponent) & (np.floor(exponent) == exponent)
+        masks.flag((base < 0) & ~integer, "Cannot raise negative number to non-integer power")
+        masks.flag((base == 0) & (exponent < 0), "Cannot raise zero to negative power")
+        result = np.power(base, exponent)
+        # math.pow raises where a finite base and exponent overflow
+        masks.flag(
+            np.isinf(result) & np.isfinite(base) & np.isfinite(exponent),
+            "Numeric overflow - result too large"
+        )
+        return result
+
+    if node_type == "neg":
+        return -child("operand")
+
+    if node_type == "func":
+        return _evaluate_function(node["name"], child("arg"), masks, expression)
+
+    raise EvaluationError(
+        f"Unknown AST node type: {node_type}",
+        expression=expression,
+        node_type=node_type
+    )
+
+
+def _evaluate_function(
+    func_name: str,
+    arg: np.ndarray,
+    masks: _Masks,
+    expression: Optional[str]
+) -> np.ndarray:
+    """Evaluate a mathematical function element-wise, flagging domain errors."""
+
+    if func_name == "sqrt":
+        masks.flag(arg < 0, "Cannot take square root of negative number")
+        return np.sqrt(arg)
+
+    if func_name == "exp":
+        result = np.exp(arg)
+        masks.flag(np.isinf(result) & np.isfinite(arg), "Overflow in exp() - argument too large")
+        return result
+
+    if func_name in ("ln", "log"):
+        # log is natural log in our system (same as ln)
+        masks.flag(arg <= 0, "Cannot take logarithm of non-positive number")
+        return np.log(arg)
+
+    if func_name in ("sin", "cos", "tan"):
+        # math.sin/cos/tan raise a domain error for infinite arguments
+        masks.flag(np.isinf(arg), "Math domain error: math domain error")
+        if func_name == "sin":
+            return np.sin(arg)
+        if func_name == "cos":
+            return np.cos(arg)
+        masks.flag(np.abs(np.cos(arg)) < 1e-15, "tan undefined (near asymptote, cos(x) ≈ 0)")
+        return np.tan(arg)
+
+    if func_name == "abs":
+        return np.abs(arg)
+
+    raise EvaluationError(
+        f"Unknown function: {func_name}",
+        expression=expression,
+        node_type=f"func:{func_name}"
+    )
@@ -0,0 +1,290 @@
+"""
+Event Backplane - Cross-worker pub/sub for analysis WebSocket events
+
+WebSocket connections live in one worker process. With several uvicorn /
+gunicorn workers, an analysis evaluated in worker A must still reach
+clients connected to worker B. A backplane carries analysis events
+between workers; every worker (the publisher included) receives each
+event and fans it out to its own connections.
+
+Backends:
+- InMemoryBackplane: workers sharing an InMemoryHub in one process (tests)
+- PostgresBackplane: NOTIFY to publish, a dedicated LISTEN connection to
+  receive; needs no infrastructure beyond the app database
+
+Events are published in batches: compact_events() keeps only the latest
+"updated"/"evaluated" event per analysis (and none before a "deleted"),
+and pack_events() splits the batch into payloads under the backend's size
+limit (NOTIFY payloads must be < 8000 bytes).
+"""
+
+from typing import Callable, List, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+
+from sqlalchemy import text
+
+from app.core.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Events where only the latest state matters (same as the connection manager)
+COMPACTABLE_EVENTS = frozenset({"updated", "evaluated"})
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_MAX_BYTES = 7900
+
+# Called on the event loop with each received batch
+EventHandler = Callable[[List[dict]], None]
+
+
+def compact_events(events: List[dict]) -> List[dict]:
+    """
+    Drop events superseded later in the same batch.
+
+    Only the last "updated"/"evaluated" event per (analysis, event) is kept,
+    at the position of that last occurrence; events of those types before a
+    "deleted" of the same analysis are dropped. Other events are kept.
+    """
+    kept: List[dict] = []
+    seen: Set[Tuple[int, str]] = set()
+    deleted: Set[int] = set()
+    for event in reversed(events):
+        analysis_id = event["analysis_id"]
+        if event["event"] in COMPACTABLE_EVENTS:
+            key = (analysis_id, event["event"])
+            if key in seen or analysis_id in deleted:
+                continue
+            seen.add(key)
+        elif event["event"] == "deleted":
+            deleted.add(analysis_id)
+        kept.append(event)
+    kept.reverse()
+    return kept
+
+
+def pack_events(events: List[dict], max_bytes: Optional[int] = None) -> List[str]:
+    """
+    Serialize events into JSON payloads of at most max_bytes each.
+
+    An event that does not fit on its own is sent without its data
+    ({"id": analysis_id} plus "truncated": true); clients reload it.
+    """
+    payloads: List[str] = []
+    batch: List[str] = []
+    size = 2  # "[]"
+
+    for event in events:
+        encoded = json.dumps(event, separators=(",", ":"))
+        if max_bytes is not None and len(encoded.encode()) + 2 > max_bytes:
+            logger.warning(
+                f"Analysis {event['analysis_id']} {event['event']} event too large for the "
+                f"backplane ({len(encoded)} bytes); sending it without data"
+            )
+            encoded = json.dumps(
+                {**event, "data": {"id": event["analysis_id"]}, "truncated": True},
+                separators=(",", ":")
+            )
+        added = len(encoded.encode()) + (1 if batch else 0)
+        if max_bytes is not None and batch and size + added > max_bytes:
+            payloads.append("[" + ",".join(batch) + "]")
+            batch, size = [], 2
+            added = len(encoded.encode())
+        batch.append(encoded)
+        size += added
+
+    if batch:
+        payloads.append("[" + ",".join(batch) + "]")
+    return payloads
+
+
+class Backplane:
+    """
+    Base class for backplanes.
+
+    start() registers the handler that receives every published batch,
+    from this worker and all others, as a list of event dicts.
+    """
+
+    # Largest payload publish() accepts (None = unlimited)
+    max_payload_bytes: Optional[int] = None
+
+    async def start(self, handler: EventHandler) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    async def publish(self, payloads: List[str]) -> None:
+        """Publish payloads built by pack_events()."""
+        raise NotImplementedError
+
+
+class InMemoryHub:
+    """Stands in for the database between InMemoryBackplanes (one per "worker")."""
+
+    def __init__(self):
+        self.subscribers: List["InMemoryBackplane"] = []
+        self.published: List[str] = []
+
+    def publish(self, payload: str) -> None:
+        self.published.append(payload)
+        for subscriber in list(self.subscribers):
+            subscriber._receive(payload)
+
+
+class InMemoryBackplane(Backplane):
+    """Backplane between managers in one process; payloads are still JSON-encoded."""
+
+    def __init__(self, hub: Optional[InMemoryHub] = None):
+        self.hub = hub or InMemoryHub()
+        self._handler: Optional[EventHandler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self, handler: EventHandler) -> None:
+        self._handler = handler
+        self._loop = asyncio.get_running_loop()
+        self.hub.subscribers.append(self)
+
+    async def stop(self) -> None:
+        if self in self.hub.subscribers:
+            self.hub.subscribers.remove(self)
+        self._handler = None
+
+    async def publish(self, payloads: List[str]) -> None:
+        for payload in payloads:
+            self.hub.publish(payload)
+
+    def _receive(self, payload: str) -> None:
+        if self._handler is None or self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._handler, json.loads(payload))
+
+
+class PostgresBackplane(Backplane):
+    """
+    Postgres LISTEN/NOTIFY backplane.
+
+    Publishing runs pg_notify() through the app's SQLAlchemy engine (pooled,
+    off the event loop). Receiving uses one dedicated psycopg2 connection
+    in autocommit mode, watched with loop.add_reader() so notifications are
+    read without a thread. If that connection drops, it is re-established
+    with backoff; events published meanwhile are missed (clients reload on
+    reconnect anyway).
+    """
+
+    max_payload_bytes = NOTIFY_MAX_BYTES
+
+    def __init__(self, engine, channel: str = "analysis_updates", reconnect_delay: float = 1.0):
+        if not (channel.isidentifier() and len(channel) < 64):
+            raise ValueError(f"Invalid channel name: {channel!r}")
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._handler: Optional[EventHandler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._conn = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    async def start(self, handler: EventHandler) -> None:
+        self._handler = handler
+        self._loop = asyncio.get_running_loop()
+        await self._listen()
+
+    async def stop(self) -> None:
+        self._handler = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._close_listener()
+
+    async def publish(self, payloads: List[str]) -> None:
+        await run_blocking(self._notify, payloads)
+
+    def _notify(self, payloads: List[str]) -> None:
+        with self.engine.connect() as conn:
+            for payload in payloads:
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                             {"channel": self.channel, "payload": payload})
+            conn.commit()
+
+    async def _listen(self) -> None:
+        self._conn = await run_blocking(self._connect)
+        self._loop.add_reader(self._conn.fileno(), self._on_readable)
+        logger.info(f"Backplane listening on Postgres channel '{self.channel}'")
+
+    def _connect(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        dsn = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.warning(f"Backplane listener connection lost: {e}")
+            self._close_listener()
+            if self._handler is not None:
+                self._reconnect_task = self._loop.create_task(self._reconnect())
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            try:
+                events = json.loads(notify.payload)
+            except ValueError:
+                logger.warning(f"Backplane: ignoring malformed payload on '{self.channel}'")
+                continue
+            if self._handler is not None:
+                self._handler(events)
+
+    async def _reconnect(self) -> None:
+        delay = self.reconnect_delay
+        while self._handler is not None:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                logger.warning(f"Backplane reconnect failed: {e}")
+                delay = min(delay * 2, 30.0)
+
+    def _close_listener(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._conn.fileno())
+        except Exception:
+            pass
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+def create_backplane(kind: str, engine=None, channel: str = "analysis_updates") -> Optional[Backplane]:
+    """
+    Backplane for settings.WS_BACKPLANE.
+
+    "local" (or empty) means no backplane: events only reach this worker's
+    clients. "postgres" falls back to local when the database is not Postgres.
+    """
+    kind = (kind or "local").lower()
+    if kind == "local":
+        return None
+    if kind == "memory":
+        return InMemoryBackplane()
+    if kind == "postgres":
+        if engine is None or engine.dialect.name != "postgresql":
+            logger.error("WS_BACKPLANE=postgres needs a PostgreSQL DATABASE_URL; using local broadcasts")
+            return None
+        return PostgresBackplane(engine, channel=channel)
+    raise ValueError(f"Unknown WS_BACKPLANE '{kind}'. Expected one of: local, memory, postgres")
@@ -9,15 +9,22 @@ Evaluates ModelInstances by:
 This service bridges the physics model system with the value/expression system.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
+import threading
+import time
 
 from app.models.physics_model import ModelInstance, ModelInput, PhysicsModelVersion
 from app.models.values import ValueNode, ComputationStatus, NodeType
 from app.models.component import Component
-from app.services.equation_engine import parse_equation, evaluate_equation, EvaluationError
+from app.services.equation_engine import (
+    parse_equation, evaluate_equation, compile_equation, CompiledEquation, EvaluationError,
+    evaluate_equation_many, VectorEvaluation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -248,10 +255,14 @@ def resolve_model_input(
 
             component_code, property_name = ref_parts
 
-            # Find component by code
+            # Find component by code, then by code generated from its name
             component = db.query(Component).filter(
                 Component.code == component_code
             ).first()
+            if not component:
+                component = db.query(Component).filter(
+                    Component.generated_code == component_code
+                ).first()
 
             if not component:
                 raise ModelEvaluationError(
@@ -454,12 +465,11 @@ def evaluate_model_instance(
                 logger.warning(f"No equation for output '{output_name}', skipping")
                 continue
 
-            # Get pre-parsed AST if available
+            # Pre-parsed AST, compiled once per version
+            compiled = version.compiled_equation(output_name)
             equation_ast = None
-            if version.equation_ast and output_name in version.equation_ast:
-                equation_ast = version.equation_ast[output_name]
 
-            if not equation_ast:
+            if compiled is None:
                 # Parse equation now
                 try:
                     parsed = parse_equation(equation, allowed_inputs=list(input_values.keys()))
@@ -471,7 +481,10 @@ def evaluate_model_instance(
 
             # Evaluate
             try:
-                result = evaluate_equation(equation_ast, input_values)
+                if compiled is not None:
+                    result = compiled(input_values)
+                else:
+                    result = evaluate_equation(equation_ast, input_values)
                 logger.debug(f"  Evaluated output '{output_name}' = {result}")
             except EvaluationError as e:
                 raise ModelEvaluationError(
@@ -551,6 +564,96 @@ def evaluate_model_instance(
         evaluation_stack.discard(instance.id)
 
 
+def sweep_model_instance(
+    instance: ModelInstance,
+    sweep: Dict[str, Any],
+    db: Session
+) -> Dict[str, VectorEvaluation]:
+    """
+    Evaluate every output of a ModelInstance over arrays of input values.
+
+    Swept inputs replace their bindings; all other inputs are resolved from
+    the instance's bindings once. Nothing is written: this is for design
+    studies ("sweep delta_T from 0-500 K in 1000 steps") in one call.
+
+    Args:
+        instance: ModelInstance to evaluate
+        sweep: Input name (case-insensitive) -> array of values; arrays are
+               broadcast against each other
+        db: Database session
+
+    Returns:
+        Output name -> VectorEvaluation (values plus per-element error mask)
+
+    Raises:
+        ModelEvaluationError: Unknown swept input, unresolvable binding,
+                              missing required input or malformed equation
+    """
+    version = instance.model_version
+    if not version:
+        raise ModelEvaluationError(
+            f"ModelInstance {instance.id} has no associated model version"
+        )
+    if not version.inputs:
+        raise ModelEvaluationError(
+            f"Model version {version.id} has no input schema defined"
+        )
+
+    expected_inputs_map = {inp['name'].lower(): inp['name'] for inp in version.inputs}
+
+    input_values: Dict[str, Any] = {}
+    for name, values in sweep.items():
+        canonical_name = expected_inputs_map.get(name.lower())
+        if canonical_name is None:
+            raise ModelEvaluationError(
+                f"Cannot sweep '{name}': not an input of this model",
+                input_name=name
+            )
+        input_values[canonical_name] = values
+
+    swept_lower = {name.lower() for name in input_values}
+    for model_input in instance.inputs:
+        input_name_lower = model_input.input_name.lower()
+        if input_name_lower not in expected_inputs_map or input_name_lower in swept_lower:
+            continue
+        canonical_name = expected_inputs_map[input_name_lower]
+        try:
+            input_values[canonical_name] = resolve_model_input(model_input, db, {instance.id})
+        except CircularDependencyError:
+            raise
+        except Exception as e:
+            raise ModelEvaluationError(
+                f"Failed to resolve input '{model_input.input_name}': {str(e)}"
+            )
+
+    input_values_lower = {k.lower() for k in input_values.keys()}
+    for inp in version.inputs:
+        if inp.get('required', True) and inp['name'].lower() not in input_values_lower:
+            raise ModelEvaluationError(
+                f"Required input '{inp['name']}' is not bound in instance {instance.id}"
+            )
+
+    equations = dict(version.equations or {})
+    for output in version.outputs or []:
+        output_name = output.get('name')
+        if output_name and 'expression' in output and output_name not in equations:
+            equations[output_name] = output['expression']
+
+    results: Dict[str, VectorEvaluation] = {}
+    for output_name, equation in equations.items():
+        equation_ast = (version.equation_ast or {}).get(output_name)
+        try:
+            if not equation_ast:
+                equation_ast = parse_equation(equation, allowed_inputs=list(input_values.keys()))['ast']
+            results[output_name] = evaluate_equation_many(equation_ast, input_values, expression=equation)
+        except Exception as e:
+            raise ModelEvaluationError(
+                f"Sweep failed for output '{output_name}': {str(e)}",
+                output_name=output_name
+            )
+    return results
+
+
 def create_component_properties_for_outputs(
     instance: ModelInstance,
     output_nodes: List[ValueNode],
@@ -733,6 +836,217 @@ def invalidate_instance_outputs(
     return count
 
 
+class CompiledModel:
+    """
+    What evaluate_inline_model() needs from one PhysicsModelVersion.
+
+    Versions are immutable (a PATCH that changes inputs/outputs/equations
+    creates a new version), so everything here is derived once per version:
+    the case-insensitive input map, required inputs, equations merged from
+    outputs, and compiled equations. Results are memoized per (output, bindings).
+    """
+
+    def __init__(self, version: PhysicsModelVersion, max_results: int = 256):
+        self.version_id = version.id
+        self.version_number = version.version
+        self.has_inputs = bool(version.inputs)
+
+        inputs = version.inputs or []
+        # Lowercase -> canonical input name
+        self.input_name_map = {inp.get('name', '').lower(): inp.get('name') for inp in inputs}
+        self.required_inputs = {inp.get('name') for inp in inputs if inp.get('required', True)}
+
+        # Equations dict, plus inline expressions from outputs
+        self.equations: Dict[str, str] = dict(version.equations or {})
+        for output in version.outputs or []:
+            out_name = output.get('name')
+            if out_name and 'expression' in output and out_name not in self.equations:
+                self.equations[out_name] = output['expression']
+        self.output_keys = list(self.equations.keys())
+
+        # Output -> compiled stored AST
+        self.compiled: Dict[str, CompiledEquation] = {
+            out_name: compile_equation(ast)
+            for out_name, ast in (version.equation_ast or {}).items() if ast
+        }
+        # (output, allowed input names) -> compiled AST parsed here for outputs without one
+        self._parsed: Dict[Tuple[str, frozenset], CompiledEquation] = {}
+
+        self.max_results = max_results
+        self._results: "OrderedDict[tuple, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalize_bindings(self, bindings: Dict[str, float]) -> Dict[str, float]:
+        """Rename bindings to the canonical (schema) case of each input."""
+        if not self.has_inputs:
+            return bindings
+        normalized = {}
+        for key, value in bindings.items():
+            normalized[self.input_name_map.get(key.lower()) or key] = value
+        return normalized
+
+    def missing_inputs(self, normalized_bindings: Dict[str, float]) -> set:
+        provided_lower = {k.lower() for k in normalized_bindings.keys()}
+        return {r for r in self.required_inputs if r.lower() not in provided_lower}
+
+    def equation_for(self, output_name: str, allowed_inputs: List[str]) -> CompiledEquation:
+        """Compiled equation for an output, parsing it once if no AST is stored (raises on parse errors)."""
+        compiled = self.compiled.get(output_name)
+        if compiled is not None:
+            return compiled
+
+        key = (output_name, frozenset(allowed_inputs))
+        with self._lock:
+            compiled = self._parsed.get(key)
+        if compiled is None:
+            parsed = parse_equation(self.equations[output_name], allowed_inputs=allowed_inputs)
+            compiled = compile_equation(parsed['ast'])
+            with self._lock:
+                self._parsed[key] = compiled
+        return compiled
+
+    def cached_result(self, key: tuple) -> Optional[float]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def store_result(self, key: tuple, result: float):
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+
+class CompiledModelCache:
+    """
+    Process-wide LRU of CompiledModel keyed by (model name lowercased, version id).
+
+    Also remembers which version is current for each name and when that was
+    last confirmed. Within recheck_seconds a MODEL() call that hits the cache
+    needs no database query; after that the caller re-reads the current
+    version id (one small query, see _compiled_model) and gets the cached
+    compilation back if it is unchanged. That bounds how long another worker
+    process serves a version replaced by PATCH there. Names patched, renamed
+    or deleted in this process are invalidated at once (see
+    api/v1/physics_models.py); unknown names are never cached.
+    """
+
+    def __init__(self, maxsize: int = 512, recheck_seconds: float = 1.0):
+        self.maxsize = maxsize
+        self.recheck_seconds = recheck_seconds
+        self._entries: "OrderedDict[Tuple[str, int], CompiledModel]" = OrderedDict()
+        # name -> (current version id, time.monotonic() it was confirmed)
+        self._current: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_name: str) -> Optional[CompiledModel]:
+        """The compiled current version, if confirmed within recheck_seconds."""
+        name = model_name.lower()
+        with self._lock:
+            current = self._current.get(name)
+            if current is None or time.monotonic() - current[1] > self.recheck_seconds:
+                return None
+            compiled = self._entries.get((name, current[0]))
+            if compiled is None:
+                return None
+            self._entries.move_to_end((name, current[0]))
+            self.hits += 1
+            return compiled
+
+    def get_version(self, model_name: str, version_id: int) -> Optional[CompiledModel]:
+        """The compiled version_id, which the caller just read as current."""
+        name = model_name.lower()
+        key = (name, version_id)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is None:
+                self.misses += 1
+                return None
+            self._current[name] = (version_id, time.monotonic())
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+    def put(self, model_name: str, compiled: CompiledModel):
+        name = model_name.lower()
+        key = (name, compiled.version_id)
+        with self._lock:
+            self._current[name] = (compiled.version_id, time.monotonic())
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                (old_name, old_version), _ = self._entries.popitem(last=False)
+                if self._current.get(old_name, (None,))[0] == old_version:
+                    del self._current[old_name]
+
+    def invalidate(self, model_name: str):
+        """Forget a model name (patched, renamed or deleted)."""
+        name = model_name.lower()
+        with self._lock:
+            self._current.pop(name, None)
+            for key in [k for k in self._entries if k[0] == name]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+compiled_models = CompiledModelCache()
+
+
+def _compiled_model(model_name: str, db: Session) -> CompiledModel:
+    """The compiled current version of a model, loading it on a cache miss."""
+    compiled = compiled_models.get(model_name)
+    if compiled is not None:
+        return compiled
+
+    from app.models.physics_model import PhysicsModel
+
+    # Still current? (another worker may have published a new version)
+    version_id = db.query(PhysicsModelVersion.id).join(
+        PhysicsModel, PhysicsModelVersion.physics_model_id == PhysicsModel.id
+    ).filter(
+        func.lower(PhysicsModel.name) == model_name.lower(),
+        PhysicsModelVersion.is_current.is_(True)
+    ).limit(1).scalar()
+    if version_id is not None:
+        compiled = compiled_models.get_version(model_name, version_id)
+        if compiled is not None:
+            return compiled
+
+    # Look up model by name (case-insensitive)
+    model = PhysicsModel.find_by_name(db, model_name)
+
+    if not model:
+        raise ModelEvaluationError(f"Model '{model_name}' not found")
+
+    version = model.current_version
+    if not version:
+        raise ModelEvaluationError(f"Model '{model_name}' has no current version")
+
+    compiled = CompiledModel(version)
+    compiled_models.put(model_name, compiled)
+    return compiled
+
+
 def evaluate_inline_model(
     model_name: str,
     bindings: Dict[str, float],
@@ -743,7 +1057,9 @@ def evaluate_inline_model(
     Evaluate a model inline without creating a ModelInstance record.
 
     This function is used by the MODEL() expression function to evaluate
-    physics models directly within property expressions.
+    physics models directly within property expressions. The model's current
+    version is compiled once and cached (compiled_models), so repeated calls
+    do no database or SymPy work.
 
     Args:
         model_name: Name of the physics model (case-insensitive)
@@ -766,69 +1082,28 @@ def evaluate_inline_model(
         )
         # Returns: 0.0023
     """
-    from app.models.physics_model import PhysicsModel
-
-    # 1. Look up model by name (case-insensitive)
-    model = PhysicsModel.find_by_name(db, model_name)
-
-    if not model:
-        raise ModelEvaluationError(f"Model '{model_name}' not found")
-
-    # 2. Get current version
-    version = model.current_version
-    if not version:
-        raise ModelEvaluationError(f"Model '{model_name}' has no current version")
+    # 1-2. Current version of the model, compiled once per version
+    compiled = _compiled_model(model_name, db)
 
     # 3. Validate all required inputs are provided (case-insensitive)
     # Also normalize bindings to use canonical names from schema
-    normalized_bindings = {}
-    if version.inputs:
-        # Build case-insensitive map: lowercase -> canonical name
-        input_name_map = {
-            inp.get('name', '').lower(): inp.get('name')
-            for inp in version.inputs
-        }
-
-        # Normalize provided bindings to use canonical names
-        for key, value in bindings.items():
-            canonical = input_name_map.get(key.lower())
-            if canonical:
-                normalized_bindings[canonical] = value
-            else:
-                normalized_bindings[key] = value
-
-        required_inputs = {
-            inp.get('name') for inp in version.inputs
-            if inp.get('required', True)
-        }
-        provided_lower = {k.lower() for k in normalized_bindings.keys()}
-
-        missing = {r for r in required_inputs if r.lower() not in provided_lower}
+    normalized_bindings = compiled.normalize_bindings(bindings)
+    if compiled.has_inputs:
+        missing = compiled.missing_inputs(normalized_bindings)
         if missing:
             raise ModelEvaluationError(
                 f"Model '{model_name}' missing required inputs: {', '.join(sorted(missing))}"
             )
-    else:
-        normalized_bindings = bindings
-
-    # 4. Build equations dict (support both 'equations' dict and 'outputs' with expressions)
-    equations = version.equations or {}
-
-    # Also check outputs for inline expressions
-    if version.outputs:
-        for output in version.outputs:
-            out_name = output.get('name')
-            if out_name and 'expression' in output:
-                if out_name not in equations:
-                    equations[out_name] = output['expression']
 
+    # 4. Equations (from 'equations' and from 'outputs' with expressions)
+    equations = compiled.equations
     if not equations:
         raise ModelEvaluationError(
-            f"Model '{model_name}' version {version.version} has no equations defined"
+            f"Model '{model_name}' version {compiled.version_number} has no equations defined"
         )
 
     # 5. Determine which output to return
-    output_keys = list(equations.keys())
+    output_keys = compiled.output_keys
 
     if output_name:
         # Specific output requested
@@ -847,31 +1122,34 @@ def evaluate_inline_model(
             )
         target_output = output_keys[0]
 
-    # 6. Get equation AST for target output (prefer pre-parsed, fall back to parsing)
-    equation_ast = None
-    if version.equation_ast and target_output in version.equation_ast:
-        equation_ast = version.equation_ast[target_output]
-
-    if not equation_ast:
-        # Parse equation now
-        equation_text = equations[target_output]
-        try:
-            parsed = parse_equation(equation_text, allowed_inputs=list(normalized_bindings.keys()))
-            equation_ast = parsed['ast']
-        except Exception as e:
-            raise ModelEvaluationError(
-                f"Failed to parse equation for output '{target_output}': {str(e)}"
-            )
+    try:
+        result_key = (target_output, tuple(sorted(normalized_bindings.items())))
+        cached = compiled.cached_result(result_key)
+    except TypeError:
+        # Unhashable or unorderable binding values: evaluate without memoizing
+        result_key, cached = None, None
+    if cached is not None:
+        return cached
+
+    # 6. Get compiled equation for target output (prefer pre-parsed, fall back to parsing once)
+    try:
+        equation = compiled.equation_for(target_output, list(normalized_bindings.keys()))
+    except Exception as e:
+        raise ModelEvaluationError(
+            f"Failed to parse equation for output '{target_output}': {str(e)}"
+        )
 
     # 7. Evaluate equation with normalized bindings
     try:
-        result = evaluate_equation(equation_ast, normalized_bindings)
+        result = equation(normalized_bindings)
         logger.debug(
             f"evaluate_inline_model('{model_name}', output='{target_output}'): "
             f"inputs={bindings} -> {result}"
         )
-        return result
     except EvaluationError as e:
         raise ModelEvaluationError(
             f"Evaluation failed for model '{model_name}' output '{target_output}': {str(e)}"
         )
+    if result_key is not None:
+        compiled.store_result(result_key, result)
+    return result
@@ -1,11 +1,15 @@
 """Engineering Properties API - Unified lookup for engineering reference data."""
 
-from .router import lookup, LOOKUP
+from .router import lookup, lookup_many, lookup_many_outputs, lookup_outputs, lookup_batch, LOOKUP
 from .registry import get_source, list_sources, list_views, generate_view
 from .schemas import PropertySource, InputDef, OutputDef, ViewConfig
 
 __all__ = [
     'lookup',
+    'lookup_many',
+    'lookup_many_outputs',
+    'lookup_outputs',
+    'lookup_batch',
     'LOOKUP',
     'get_source',
     'list_sources',
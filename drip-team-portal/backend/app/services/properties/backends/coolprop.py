@@ -1,7 +1,18 @@
-"""CoolProp backend - thermodynamic property lookups via CoolProp library."""
+"""CoolProp backend - thermodynamic property lookups via CoolProp library.
 
-from typing import Dict, Any
-import re
+Lookups go through CoolProp's low-level AbstractState interface instead of
+PropsSI: states are pooled per (backend, fluid), each input point updates a
+state once, and every requested output is read from that one state. Sweeps
+(views, lookup_many) reuse a single checked-out state for all points.
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import math
+import threading
+
+import numpy as np
 
 from ..schemas import PropertySource
 
@@ -14,6 +25,8 @@ class CoolPropError(Exception):
 # Lazy import CoolProp to avoid import errors if not installed
 _coolprop = None
 
+DEFAULT_BACKEND = "HEOS"
+
 
 def _get_coolprop():
     """Lazy load CoolProp."""
@@ -29,6 +42,67 @@ def _get_coolprop():
     return _coolprop
 
 
+class AbstractStatePool:
+    """
+    Reusable CoolProp AbstractState objects keyed by (backend, fluid).
+
+    Constructing a state parses the fluid and loads its equation of state,
+    which dominates the cost of a PropsSI call. A state is not thread-safe,
+    so callers check one out for the duration of their work and return it;
+    at most `max_idle` idle states are kept per fluid.
+    """
+
+    def __init__(self, max_idle: int = 4):
+        self.max_idle = max_idle
+        self._idle: Dict[Tuple[str, str], List[Any]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @contextmanager
+    def state(self, backend: str, fluid: str):
+        """Check out a state for (backend, fluid), creating one if none is idle."""
+        key = (backend, fluid)
+        with self._lock:
+            idle = self._idle.get(key)
+            state = idle.pop() if idle else None
+            if state is not None:
+                self.reused += 1
+
+        if state is None:
+            CP = _get_coolprop()
+            try:
+                state = CP.AbstractState(backend, fluid)
+            except ValueError as e:
+                raise CoolPropError(f"CoolProp error for {fluid}: {str(e)}")
+            with self._lock:
+                self.created += 1
+
+        try:
+            yield state
+        finally:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle:
+                    idle.append(state)
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "fluids": [f"{backend}::{fluid}" for backend, fluid in self._idle],
+                "idle": sum(len(states) for states in self._idle.values()),
+                "created": self.created,
+                "reused": self.reused,
+            }
+
+
+state_pool = AbstractStatePool()
+
+
 def resolve_coolprop(
     source: PropertySource,
     output_name: str,
@@ -44,51 +118,105 @@ def resolve_coolprop(
     - P, H (pressure, enthalpy)
     - etc.
 
-    Example CoolProp call:
+    Example equivalent PropsSI call:
         CP.PropsSI('H', 'T', 300, 'P', 101325, 'Water')
         -> Returns enthalpy in J/kg
     """
-    CP = _get_coolprop()
+    backend, fluid = _fluid(source)
+    selected = _select_inputs(inputs)
+    output = _output_spec(source, output_name)
 
-    resolution = source.resolution
-    fluid = resolution.fluid
-    output_mapping = resolution.output_mapping
-    input_mapping = resolution.input_mapping
+    with state_pool.state(backend, fluid) as state:
+        _update(state, fluid, source.resolution.input_mapping, selected, inputs)
+        return _read(state, output, selected, inputs)
 
+
+def resolve_coolprop_outputs(
+    source: PropertySource,
+    output_names: Iterable[str],
+    inputs: Dict[str, Any]
+) -> Dict[str, Optional[float]]:
+    """
+    Resolve several outputs at one input point with a single state update.
+
+    Outputs that cannot be computed at this state are None.
+
+    Raises:
+        CoolPropError: If the state itself cannot be set from the inputs
+    """
+    backend, fluid = _fluid(source)
+    selected = _select_inputs(inputs)
+    outputs = [_output_spec(source, name) for name in output_names]
+
+    results: Dict[str, Optional[float]] = {}
+    with state_pool.state(backend, fluid) as state:
+        _update(state, fluid, source.resolution.input_mapping, selected, inputs)
+        for output in outputs:
+            try:
+                results[output[0]] = _read(state, output, selected, inputs)
+            except CoolPropError:
+                results[output[0]] = None
+    return results
+
+
+def resolve_coolprop_many(
+    source: PropertySource,
+    output_names: Iterable[str],
+    columns: Dict[str, Any]
+) -> Dict[str, np.ndarray]:
+    """
+    Resolve outputs over arrays of input points.
+
+    Args:
+        source: Library property source
+        output_names: Outputs to read at every point
+        columns: Input name -> array of values (scalars are broadcast)
+
+    Returns:
+        Output name -> float array, NaN wherever the point could not be resolved
+    """
+    backend, fluid = _fluid(source)
+    selected = _select_inputs(columns)
+    outputs = [_output_spec(source, name) for name in output_names]
+    input_mapping = source.resolution.input_mapping
+
+    arrays = np.broadcast_arrays(*[np.asarray(columns[name], dtype=float) for name in selected])
+    first, second = (np.atleast_1d(a).ravel() for a in arrays)
+    results = {output[0]: np.full(len(first), np.nan) for output in outputs}
+
+    with state_pool.state(backend, fluid) as state:
+        for index in range(len(first)):
+            point = {selected[0]: first[index], selected[1]: second[index]}
+            try:
+                _update(state, fluid, input_mapping, selected, point)
+            except CoolPropError:
+                continue
+            for output in outputs:
+                try:
+                    results[output[0]][index] = _read(state, output, selected, point)
+                except CoolPropError:
+                    continue
+    return results
+
+
+def _fluid(source: PropertySource) -> Tuple[str, str]:
+    """(backend, fluid) for a source; "IF97::Water" style prefixes win."""
+    fluid = source.resolution.fluid
     if not fluid:
         raise CoolPropError("No fluid specified in library resolution")
+    if "::" in fluid:
+        backend, fluid = fluid.split("::", 1)
+        return backend, fluid
+    return source.resolution.backend or DEFAULT_BACKEND, fluid
 
-    # Map our output name to CoolProp output key
-    cp_output = output_mapping.get(output_name, output_name.upper())
 
-    # Check for computed outputs like "1/D" (specific volume from density)
-    if '/' in cp_output:
-        parts = cp_output.split('/')
-        if len(parts) == 2 and parts[0].strip() == '1':
-            # It's a reciprocal: 1/D means specific volume = 1/density
-            base_output = parts[1].strip()
-            base_value = _call_coolprop(CP, base_output, inputs, input_mapping, fluid)
-            if base_value == 0:
-                raise CoolPropError(f"Cannot compute 1/{base_output}: division by zero")
-            return 1.0 / base_value
-
-    return _call_coolprop(CP, cp_output, inputs, input_mapping, fluid)
-
-
-def _call_coolprop(
-    CP,
-    output_key: str,
-    inputs: Dict[str, Any],
-    input_mapping: Dict[str, str],
-    fluid: str
-) -> float:
-    """Make the actual CoolProp PropsSI call."""
+def _select_inputs(inputs) -> List[str]:
+    """Choose the two inputs that define the state."""
 
-    # CoolProp.PropsSI requires exactly 2 input pairs
+    # CoolProp requires exactly 2 input pairs
     # Common pairs: (T, P), (T, Q), (P, Q), (P, H), etc.
     # Q is vapor quality (0=liquid, 1=vapor) - only valid at saturation
 
-    # Select the appropriate 2 inputs based on what's provided
     available_inputs = set(inputs.keys())
 
     # Priority order for input pair selection:
@@ -114,34 +242,79 @@ def _call_coolprop(
         raise CoolPropError(
             f"CoolProp requires exactly 2 inputs, got: {list(available_inputs)}"
         )
+    return selected
+
+
+def _output_spec(source: PropertySource, output_name: str) -> Tuple[str, str, int, bool]:
+    """(output_name, CoolProp key, parameter index, reciprocal) for an output."""
+    # Map our output name to CoolProp output key
+    cp_output = source.resolution.output_mapping.get(output_name, output_name.upper())
+    key, reciprocal = cp_output, False
+
+    # Check for computed outputs like "1/D" (specific volume from density)
+    if '/' in cp_output:
+        parts = cp_output.split('/')
+        if len(parts) == 2 and parts[0].strip() == '1':
+            key, reciprocal = parts[1].strip(), True
 
-    # Build input pairs
-    input_pairs = []
-    for name in selected:
-        cp_name = input_mapping.get(name, name.upper())
-        input_pairs.extend([cp_name, float(inputs[name])])
+    return output_name, key, _parameter_index(key), reciprocal
 
+
+@lru_cache(maxsize=256)
+def _parameter_index(key: str) -> int:
+    CP = _get_coolprop()
     try:
-        # PropsSI(output, name1, val1, name2, val2, fluid)
-        result = CP.PropsSI(output_key, *input_pairs, fluid)
+        return CP.get_parameter_index(key)
+    except ValueError:
+        raise CoolPropError(f"Unknown CoolProp parameter: '{key}'")
 
-        # Check for invalid results
-        import math
-        if math.isnan(result) or math.isinf(result):
-            raise CoolPropError(
-                f"CoolProp returned invalid value for {output_key}: "
-                f"inputs={dict(zip(input_pairs[::2], input_pairs[1::2]))}"
-            )
 
-        return float(result)
+def _update(state, fluid: str, input_mapping: Dict[str, str], selected: List[str], inputs: Dict[str, Any]):
+    """Set the state from the two selected inputs."""
+    CP = _get_coolprop()
+    (name1, name2) = selected
+    key1 = input_mapping.get(name1, name1.upper())
+    key2 = input_mapping.get(name2, name2.upper())
+    try:
+        pair, value1, value2 = CP.generate_update_pair(
+            _parameter_index(key1), float(inputs[name1]),
+            _parameter_index(key2), float(inputs[name2]),
+        )
+        state.update(pair, value1, value2)
+    except ValueError as e:
+        raise CoolPropError(
+            f"CoolProp error for {fluid}: {str(e)}. "
+            f"Inputs={_describe(input_mapping, selected, inputs)}"
+        )
 
-    except Exception as e:
-        if "CoolPropError" in str(type(e).__name__) or "ValueError" in str(type(e).__name__):
-            raise CoolPropError(
-                f"CoolProp error for {fluid}: {str(e)}. "
-                f"Output={output_key}, Inputs={dict(zip(input_pairs[::2], input_pairs[1::2]))}"
-            )
-        raise
+
+def _read(state, output: Tuple[str, str, int, bool], selected: List[str], inputs: Dict[str, Any]) -> float:
+    """Read one output from an updated state."""
+    _, key, index, reciprocal = output
+    try:
+        result = state.keyed_output(index)
+    except ValueError as e:
+        raise CoolPropError(
+            f"CoolProp error reading {key}: {str(e)}. "
+            f"Output={key}, Inputs={_describe({}, selected, inputs)}"
+        )
+
+    # Check for invalid results
+    if math.isnan(result) or math.isinf(result):
+        raise CoolPropError(
+            f"CoolProp returned invalid value for {key}: "
+            f"inputs={_describe({}, selected, inputs)}"
+        )
+
+    if reciprocal:
+        if result == 0:
+            raise CoolPropError(f"Cannot compute 1/{key}: division by zero")
+        return 1.0 / result
+    return float(result)
+
+
+def _describe(input_mapping: Dict[str, str], selected: List[str], inputs: Dict[str, Any]) -> Dict[str, float]:
+    return {input_mapping.get(name, name.upper()): float(inputs[name]) for name in selected}
 
 
 def get_saturation_property(
@@ -1,8 +1,25 @@
-"""Equation backend - evaluates mathematical formulas using sympy."""
+"""Equation backend - evaluates mathematical formulas compiled once per source.
 
-from typing import Dict, Any
+Each formula is rewritten and compiled the first time its source is
+prepared (normally at registry load), not on every lookup:
+- `^` becomes `**`
+- `a < b ? x : y` is lowered to a Python conditional
+- array constants indexed by a literal (alpha[copper]) are bound to their
+  value; those indexed by an input (alpha[material]) become a dict lookup
+- the result is a code object evaluated against pre-bound constants
+
+Formulas Python cannot parse (e.g. implicit multiplication "2T") are parsed
+with SymPy once and lambdified. A second, NumPy version of every formula
+(conditionals as np.where) evaluates whole input arrays in one call.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import ast
+import math
 import re
-from sympy import sympify, Symbol, N
+
+import numpy as np
+from sympy import Symbol, lambdify
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication
 
 from ..schemas import PropertySource
@@ -13,151 +30,335 @@ class EquationError(Exception):
     pass
 
 
-def resolve_equation(
-    source: PropertySource,
-    output_name: str,
-    inputs: Dict[str, Any]
-) -> float:
-    """
-    Resolve an equation-based lookup.
+# Functions and constants available to formulas (these shadow inputs and constants)
+_MATH_FUNCTIONS = {
+    'exp': math.exp,
+    'log': math.log,
+    'log10': math.log10,
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'abs': abs,
+    'pi': math.pi,
+    'e': math.e,
+}
 
-    Uses sympy to parse and evaluate mathematical formulas.
-    Supports:
-    - Basic math operations (+, -, *, /, ^, **)
-    - Common functions (exp, log, sin, cos, sqrt, abs)
-    - Array constant lookup: alpha[material]
-    - Conditional expressions: x if condition else y
-    """
-    resolution = source.resolution
-    formulas = resolution.formulas
-    constants = resolution.constants
+_NUMPY_FUNCTIONS = {
+    'exp': np.exp,
+    'log': np.log,
+    'log10': np.log10,
+    'sqrt': np.sqrt,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'abs': np.abs,
+    'pi': math.pi,
+    'e': math.e,
+    '_where': np.where,
+}
 
-    if output_name not in formulas:
-        raise EquationError(f"No formula defined for output '{output_name}'")
+# Pattern: name[key] where key might be a variable or literal
+_ARRAY_PATTERN = re.compile(r'(\w+)\[(\w+)\]')
 
-    formula = formulas[output_name]
+# C-style conditional: x < y ? a : b
+_TERNARY_PATTERN = re.compile(r'(\w+)\s*<\s*(\w+)\s*\?\s*([^:]+)\s*:\s*([^\s)]+)')
 
-    # Build evaluation scope
-    scope = {}
 
-    # Add constants (may be nested dicts for array constants)
-    for name, value in constants.items():
-        if isinstance(value, dict):
-            # Array constant like rho_0: {copper: 1.68e-8, aluminum: 2.65e-8}
-            scope[name] = value
-        else:
-            scope[name] = float(value)
+class _Vectorize(ast.NodeTransformer):
+    """Rewrite scalar-only constructs so the expression works on arrays."""
 
-    # Add inputs
-    for name, value in inputs.items():
-        # Keep string inputs as-is for array lookups
-        if isinstance(value, str):
-            scope[name] = value
-        else:
-            scope[name] = float(value)
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return ast.Call(
+            func=ast.Name(id='_where', ctx=ast.Load()),
+            args=[node.test, node.body, node.orelse],
+            keywords=[],
+        )
 
-    # Pre-process formula to handle array access: alpha[material] -> alpha_material_value
-    processed_formula = formula
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        func = 'logical_and' if isinstance(node.op, ast.And) else 'logical_or'
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.Call(
+                func=ast.Attribute(value=ast.Name(id='_np', ctx=ast.Load()), attr=func, ctx=ast.Load()),
+                args=[result, value],
+                keywords=[],
+            )
+        return result
 
-    # Pattern: name[key] where key might be a variable or literal
-    array_pattern = r'(\w+)\[(\w+)\]'
-    matches = re.findall(array_pattern, formula)
 
-    for arr_name, key_name in matches:
-        if arr_name in scope and isinstance(scope[arr_name], dict):
-            arr_dict = scope[arr_name]
+class CompiledFormula:
+    """One output formula compiled against its source's constants."""
 
-            # key_name might be a variable (e.g., "material") or literal
-            if key_name in scope:
-                key_value = scope[key_name]
-            else:
-                key_value = key_name
-
-            if key_value not in arr_dict:
-                raise EquationError(
-                    f"Key '{key_value}' not found in array constant '{arr_name}'"
-                )
-
-            # Replace array access with the actual value
-            replacement = str(arr_dict[key_value])
-            processed_formula = processed_formula.replace(
-                f"{arr_name}[{key_name}]",
-                replacement
-            )
+    def __init__(self, source: PropertySource, output_name: str):
+        self.output_name = output_name
+        self.formula = source.resolution.formulas[output_name]
+        self.input_names = {i.name for i in source.inputs}
+        self.error: Optional[EquationError] = None
+        self._code = None
+        self._vector_code = None
+        self._sympy_fn: Optional[Callable] = None
+        self._sympy_args: List[str] = []
+        self._sympy_defaults: Dict[str, float] = {}
+        self._scope: Dict[str, Any] = {}
+        self._vector_scope: Dict[str, Any] = {}
+        self._runtime_names: List[str] = []
 
-    # Handle conditional expressions: x < y ? a : b -> Piecewise((a, x < y), (b, True))
-    # Python style: a if x < y else b
-    ternary_pattern = r'(\w+)\s*<\s*(\w+)\s*\?\s*([^:]+)\s*:\s*([^\s)]+)'
-    ternary_matches = re.findall(ternary_pattern, processed_formula)
+        try:
+            self._compile(source.resolution.constants)
+        except EquationError as e:
+            self.error = e
 
-    for left, right, if_true, if_false in ternary_matches:
-        # Convert to Python conditional that sympy can handle
-        # Actually, let's just evaluate the condition and substitute
-        left_val = scope.get(left, left)
-        right_val = scope.get(right, right)
+    # ==================== COMPILATION ====================
 
+    def _compile(self, constants: Dict[str, Any]):
+        arrays = {name: value for name, value in constants.items() if isinstance(value, dict)}
         try:
-            left_num = float(left_val) if not isinstance(left_val, str) else float(left_val)
-            right_num = float(right_val) if not isinstance(right_val, str) else float(right_val)
-            condition_result = left_num < right_num
-        except (ValueError, TypeError):
-            condition_result = True  # Default to true branch
-
-        replacement = if_true.strip() if condition_result else if_false.strip()
-        original = f"{left} < {right} ? {if_true} : {if_false}"
-        processed_formula = processed_formula.replace(original, replacement)
-
-    # Also handle Python-style: value if condition else other
-    # Pattern: expr1 if expr2 else expr3
-    py_ternary = r'([^\s]+)\s+if\s+([^e]+)\s+else\s+([^\s)]+)'
-
-    # For now, let's use a simpler evaluation approach with exec
-    # Build a clean numeric scope
-    numeric_scope = {
-        k: v for k, v in scope.items()
-        if not isinstance(v, (dict, str)) or k in inputs
-    }
-
-    # Add math functions
-    import math
-    numeric_scope['exp'] = math.exp
-    numeric_scope['log'] = math.log
-    numeric_scope['log10'] = math.log10
-    numeric_scope['sqrt'] = math.sqrt
-    numeric_scope['sin'] = math.sin
-    numeric_scope['cos'] = math.cos
-    numeric_scope['tan'] = math.tan
-    numeric_scope['abs'] = abs
-    numeric_scope['pi'] = math.pi
-    numeric_scope['e'] = math.e
-
-    try:
-        # Try direct Python eval first (simpler, handles conditionals)
-        # Replace ^ with ** for exponentiation
-        eval_formula = processed_formula.replace('^', '**')
-        result = eval(eval_formula, {"__builtins__": {}}, numeric_scope)
-        return float(result)
-    except Exception as eval_error:
-        # Fall back to sympy
+            scalars = {name: float(value) for name, value in constants.items() if not isinstance(value, dict)}
+        except (TypeError, ValueError) as e:
+            raise EquationError(f"Invalid constant in formula '{self.formula}': {e}")
+
+        text = self._lower_arrays(self.formula, arrays, scalars)
+        text = self._lower_ternaries(text)
+        text = text.replace('^', '**')
+
         try:
-            # Create sympy symbols for all variables
-            symbols = {name: Symbol(name) for name in numeric_scope if isinstance(numeric_scope[name], (int, float))}
+            tree = ast.parse(text, mode='eval')
+        except SyntaxError:
+            self._compile_sympy(text, scalars)
+            return
+
+        names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        # Same precedence as before: functions over inputs over constants.
+        # Any input passed at call time binds, declared in the source or not
+        self._runtime_names = sorted(
+            n for n in names if n not in _MATH_FUNCTIONS and n != '_index'
+        )
+        # Constants stand in for inputs that are omitted
+        bound = {n: scalars[n] for n in names if n in scalars}
+        self._scope = {**bound, **{n: _MATH_FUNCTIONS[n] for n in names if n in _MATH_FUNCTIONS}}
+        self._vector_scope = {**bound, **{n: _NUMPY_FUNCTIONS[n] for n in names if n in _NUMPY_FUNCTIONS}}
+        if '_index' in names:
+            self._scope['_index'] = self._vector_scope['_index'] = _make_indexer(arrays)
+        self._vector_scope['_where'] = np.where
+        self._vector_scope['_np'] = np
+
+        self._code = compile(tree, f"<{self.output_name}>", 'eval')
+        vector_tree = ast.fix_missing_locations(_Vectorize().visit(ast.parse(text, mode='eval')))
+        self._vector_code = compile(vector_tree, f"<{self.output_name}:vector>", 'eval')
 
-            # Parse the expression
+    def _lower_arrays(self, text: str, arrays: Dict[str, dict], scalars: Dict[str, float]) -> str:
+        """Bind literal-keyed array constants now; input-keyed ones at call time."""
+        for arr_name, key_name in _ARRAY_PATTERN.findall(text):
+            if arr_name not in arrays:
+                continue
+            if key_name in self.input_names:
+                replacement = f"_index({arr_name!r}, {key_name})"
+            else:
+                key_value = scalars.get(key_name, key_name)
+                if key_value not in arrays[arr_name]:
+                    raise EquationError(
+                        f"Key '{key_value}' not found in array constant '{arr_name}'"
+                    )
+                replacement = repr(float(arrays[arr_name][key_value]))
+            text = text.replace(f"{arr_name}[{key_name}]", replacement)
+        return text
+
+    def _lower_ternaries(self, text: str) -> str:
+        return _TERNARY_PATTERN.sub(
+            lambda m: f"(({m[3].strip()}) if {m[1]} < {m[2]} else ({m[4].strip()}))", text
+        )
+
+    def _compile_sympy(self, text: str, scalars: Dict[str, float]):
+        """Fallback for formulas only SymPy can parse; runs once, not per call."""
+        symbols = {name: Symbol(name) for name in (*scalars, *self.input_names)}
+        try:
             transformations = standard_transformations + (implicit_multiplication,)
-            expr = parse_expr(processed_formula.replace('^', '**'), local_dict=symbols, transformations=transformations)
+            expr = parse_expr(text, local_dict=symbols, transformations=transformations)
+            # pi and e shadow inputs and constants, as in the Python path
+            expr = expr.subs({Symbol(n): _MATH_FUNCTIONS[n] for n in ('pi', 'e')})
+        except Exception as e:
+            raise EquationError(f"Failed to parse formula '{self.formula}': {e}")
+
+        # Constants stay symbols: an input of the same name overrides them
+        self._sympy_args = sorted(str(s) for s in expr.free_symbols)
+        self._sympy_defaults = {n: scalars[n] for n in self._sympy_args if n in scalars}
+        self._sympy_fn = lambdify([Symbol(n) for n in self._sympy_args], expr, modules='numpy')
 
-            # Substitute values
-            for name, value in numeric_scope.items():
-                if isinstance(value, (int, float)) and name in symbols:
-                    expr = expr.subs(symbols[name], value)
+    def _sympy_values(self, values: Dict[str, Any]) -> List[Any]:
+        """Arguments for the SymPy function: inputs, else same-named constants."""
+        args = []
+        for name in self._sympy_args:
+            if values.get(name) is not None:
+                args.append(values[name])
+            elif name in self._sympy_defaults:
+                args.append(self._sympy_defaults[name])
+            else:
+                raise EquationError(f"Formula '{self.formula}' has no value for '{name}'")
+        return args
+
+    # ==================== EVALUATION ====================
+
+    def evaluate(self, inputs: Dict[str, Any]) -> float:
+        """Evaluate at one input point."""
+        if self.error is not None:
+            raise self.error
 
-            # Evaluate
-            result = N(expr)
+        try:
+            if self._sympy_fn is not None:
+                result = self._sympy_fn(*[float(v) for v in self._sympy_values(inputs)])
+            else:
+                scope = dict(self._scope)
+                for name in self._runtime_names:
+                    if name not in inputs:
+                        continue
+                    value = inputs[name]
+                    # Keep string inputs as-is for array lookups
+                    scope[name] = value if isinstance(value, str) else float(value)
+                result = eval(self._code, {"__builtins__": {}}, scope)
             return float(result)
+        except EquationError:
+            raise
+        except Exception as e:
+            raise EquationError(f"Failed to evaluate formula '{self.formula}': {e}")
+
+    def evaluate_many(self, columns: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluate over arrays of input points (scalars broadcast).
+
+        Points whose result is not finite are NaN.
+        """
+        if self.error is not None:
+            raise self.error
+
+        names = self._sympy_args if self._sympy_fn is not None else self._runtime_names
+        names = [n for n in names if columns.get(n) is not None]
+
+        text_names = [n for n in names if np.asarray(columns[n]).dtype.kind in 'OUS']
+        numeric = {n: np.asarray(columns[n], dtype=float) for n in names if n not in text_names}
+        shape = np.broadcast_shapes(*[np.shape(v) for v in columns.values()])
+
+        if not text_names:
+            result = self._evaluate_arrays(numeric, shape)
+        else:
+            # Evaluate each distinct combination of text inputs as one group
+            texts = [np.broadcast_to(np.asarray(columns[n], dtype=object), shape).ravel() for n in text_names]
+            numeric = {n: np.broadcast_to(v, shape).ravel() for n, v in numeric.items()}
+            groups: Dict[tuple, List[int]] = {}
+            for index, key in enumerate(zip(*texts)):
+                groups.setdefault(key, []).append(index)
+
+            flat = np.full(len(texts[0]), np.nan)
+            for key, indices in groups.items():
+                group = {n: v[indices] for n, v in numeric.items()}
+                group.update(zip(text_names, key))
+                try:
+                    flat[indices] = self._evaluate_arrays(group, (len(indices),))
+                except EquationError:
+                    continue
+            result = flat.reshape(shape)
+
+        result = np.array(result, dtype=float)
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+    def _evaluate_arrays(self, values: Dict[str, Any], shape) -> np.ndarray:
+        with np.errstate(all='ignore'):
+            try:
+                if self._sympy_fn is not None:
+                    result = self._sympy_fn(*self._sympy_values(values))
+                else:
+                    scope = dict(self._vector_scope)
+                    scope.update(values)
+                    result = eval(self._vector_code, {"__builtins__": {}}, scope)
+            except EquationError:
+                raise
+            except Exception as e:
+                raise EquationError(f"Failed to evaluate formula '{self.formula}': {e}")
+        return np.broadcast_to(np.asarray(result, dtype=float), shape)
+
 
-        except Exception as sympy_error:
+def _make_indexer(arrays: Dict[str, dict]) -> Callable[[str, Any], float]:
+    def _index(arr_name: str, key_value: Any) -> float:
+        try:
+            return float(arrays[arr_name][key_value])
+        except (KeyError, TypeError):
             raise EquationError(
-                f"Failed to evaluate formula '{formula}': "
-                f"eval error: {eval_error}, sympy error: {sympy_error}"
+                f"Key '{key_value}' not found in array constant '{arr_name}'"
             )
+    return _index
+
+
+class CompiledEquations:
+    """Compiled formulas for every output of one equation source."""
+
+    def __init__(self, source: PropertySource):
+        self.source = source
+        self.formulas: Dict[str, CompiledFormula] = {
+            output_name: CompiledFormula(source, output_name)
+            for output_name in source.resolution.formulas
+        }
+
+    def get(self, output_name: str) -> CompiledFormula:
+        formula = self.formulas.get(output_name)
+        if formula is None:
+            raise EquationError(f"No formula defined for output '{output_name}'")
+        return formula
+
+
+# Compiled formulas by source id, i.e. one entry per (source_id, output)
+_compiled: Dict[str, CompiledEquations] = {}
+
+
+def prepare_equations(source: PropertySource) -> Optional[CompiledEquations]:
+    """Compile an equation source's formulas; None for other source types."""
+    if source.type != "equation":
+        return None
+    compiled = CompiledEquations(source)
+    _compiled[source.id] = compiled
+    return compiled
+
+
+def get_compiled_equations(source: PropertySource) -> CompiledEquations:
+    """The compiled formulas for this source, compiling them on first use."""
+    compiled = _compiled.get(source.id)
+    if compiled is not None and compiled.source is source:
+        return compiled
+    return prepare_equations(source) or CompiledEquations(source)
+
+
+def clear_compiled_equations():
+    """Drop all compiled formulas (the registry is reloading)."""
+    _compiled.clear()
+
+
+def resolve_equation(
+    source: PropertySource,
+    output_name: str,
+    inputs: Dict[str, Any]
+) -> float:
+    """
+    Resolve an equation-based lookup.
+
+    Supports:
+    - Basic math operations (+, -, *, /, ^, **)
+    - Common functions (exp, log, sin, cos, sqrt, abs)
+    - Array constant lookup: alpha[material]
+    - Conditional expressions: x if condition else y, x < y ? a : b
+    """
+    return get_compiled_equations(source).get(output_name).evaluate(inputs)
+
+
+def resolve_equation_many(
+    source: PropertySource,
+    output_name: str,
+    columns: Dict[str, Any]
+) -> np.ndarray:
+    """
+    Resolve an equation-based lookup over arrays of input points.
+
+    Returns a float array; points that cannot be evaluated are NaN.
+    """
+    return get_compiled_equations(source).get(output_name).evaluate_many(columns)
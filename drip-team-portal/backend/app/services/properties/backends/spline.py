@@ -0,0 +1,116 @@
+"""Spline engine for table interpolation.
+
+Piecewise cubic coefficients are computed once per (grid, output) and kept
+with the prepared table; evaluation is a binary search for the segment plus
+a Horner step, for one point or a whole array.
+
+- natural: C2 cubic spline with zero curvature at both ends
+- pchip: monotone piecewise cubic Hermite (Fritsch-Carlson slopes, with the
+  same end conditions as SciPy's PchipInterpolator); never overshoots the data
+"""
+
+import numpy as np
+
+
+class SplineError(ValueError):
+    """The grid cannot carry a spline."""
+    pass
+
+
+class CubicSpline:
+    """
+    Piecewise cubic y = a + b*t + c*t^2 + d*t^3 with t = x - xs[i] on segment i.
+
+    Points outside the grid are evaluated on the first/last segment's
+    polynomial; callers decide whether that is allowed (see table.py).
+    """
+
+    __slots__ = ("xs", "coeffs")
+
+    def __init__(self, xs: np.ndarray, coeffs: np.ndarray):
+        self.xs = xs
+        # Shape (4, n_segments): a, b, c, d
+        self.coeffs = coeffs
+
+    @classmethod
+    def natural(cls, xs, ys) -> "CubicSpline":
+        xs, ys, h, delta = _prepare(xs, ys)
+        n = len(xs)
+
+        # Second derivatives M with M[0] = M[-1] = 0 (tridiagonal, Thomas algorithm)
+        m = np.zeros(n)
+        if n > 2:
+            diag = 2.0 * (h[:-1] + h[1:])
+            rhs = 6.0 * (delta[1:] - delta[:-1])
+            upper = h[1:-1].copy()
+            lower = h[1:-1]
+            for i in range(1, n - 2):
+                w = lower[i - 1] / diag[i - 1]
+                diag[i] -= w * upper[i - 1]
+                rhs[i] -= w * rhs[i - 1]
+            interior = np.empty(n - 2)
+            interior[-1] = rhs[-1] / diag[-1]
+            for i in range(n - 4, -1, -1):
+                interior[i] = (rhs[i] - upper[i] * interior[i + 1]) / diag[i]
+            m[1:-1] = interior
+
+        a = ys[:-1]
+        b = delta - h * (2.0 * m[:-1] + m[1:]) / 6.0
+        c = m[:-1] / 2.0
+        d = (m[1:] - m[:-1]) / (6.0 * h)
+        return cls(xs, np.vstack([a, b, c, d]))
+
+    @classmethod
+    def pchip(cls, xs, ys) -> "CubicSpline":
+        xs, ys, h, delta = _prepare(xs, ys)
+        n = len(xs)
+
+        slopes = np.empty(n)
+        if n == 2:
+            slopes[:] = delta[0]
+        else:
+            # Weighted harmonic mean of neighbouring secants; 0 at local extrema
+            w1 = 2.0 * h[1:] + h[:-1]
+            w2 = h[1:] + 2.0 * h[:-1]
+            same_sign = np.sign(delta[:-1]) * np.sign(delta[1:]) > 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+            slopes[1:-1] = np.where(same_sign, harmonic, 0.0)
+            slopes[0] = _pchip_end(h[0], h[1], delta[0], delta[1])
+            slopes[-1] = _pchip_end(h[-1], h[-2], delta[-1], delta[-2])
+
+        a = ys[:-1]
+        b = slopes[:-1]
+        c = (3.0 * delta - 2.0 * slopes[:-1] - slopes[1:]) / h
+        d = (slopes[:-1] + slopes[1:] - 2.0 * delta) / (h * h)
+        return cls(xs, np.vstack([a, b, c, d]))
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        i = np.clip(np.searchsorted(self.xs, x, side="right") - 1, 0, len(self.xs) - 2)
+        t = x - self.xs[i]
+        a, b, c, d = self.coeffs[:, i]
+        return a + t * (b + t * (c + t * d))
+
+
+def _prepare(xs, ys):
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if xs.ndim != 1 or xs.shape != ys.shape:
+        raise SplineError("Spline interpolation needs 1D grid and value arrays of equal length")
+    if len(xs) < 2:
+        raise SplineError("Spline interpolation needs at least 2 grid points")
+    h = np.diff(xs)
+    if np.any(h <= 0):
+        raise SplineError("Spline grid must be strictly increasing")
+    return xs, ys, h, np.diff(ys) / h
+
+
+def _pchip_end(h0: float, h1: float, delta0: float, delta1: float) -> float:
+    """One-sided three-point end slope, limited to keep the end monotone."""
+    slope = ((2.0 * h0 + h1) * delta0 - h0 * delta1) / (h0 + h1)
+    if np.sign(slope) != np.sign(delta0):
+        return 0.0
+    if np.sign(delta0) != np.sign(delta1) and abs(slope) > abs(3.0 * delta0):
+        return 3.0 * delta0
+    return slope
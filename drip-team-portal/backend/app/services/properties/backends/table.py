@@ -1,9 +1,23 @@
-"""Table backend - handles discrete and continuous table lookups with interpolation."""
+"""Table backend - handles discrete and continuous table lookups with interpolation.
 
-from typing import Dict, Any, List, Union
+Continuous grids are converted to NumPy arrays once per source (prepare_table,
+called when the registry loads it) and bracketed by binary search, so a batch
+of points is interpolated in a single vectorized call (resolve_table_many).
+Spline coefficients (interp: spline / pchip) are computed at the same time.
+
+Out-of-grid points follow each continuous input's extrap setting: "error"
+(NaN in batches, TableLookupError for single points), "clamp" (held at the
+grid edge) or "extrapolate" (the end segment is continued).
+"""
+
+from typing import Dict, Any, List, Optional, Union
 import math
 
-from ..schemas import PropertySource, InputType, InterpMethod
+import numpy as np
+
+from ..schemas import PropertySource, InputType, InterpMethod, ExtrapMethod
+from .spline import CubicSpline, SplineError
+from ..discrete import get_discrete_index
 
 
 class TableLookupError(Exception):
@@ -11,22 +25,93 @@ class TableLookupError(Exception):
     pass
 
 
+# ==================== INTERPOLATION ====================
+#
+# The scalar functions validate their input and raise TableLookupError; the
+# underscore-prefixed kernels take float arrays and return NaN for points
+# outside the grid unless asked to extrapolate.
+
+def _bracket(grid: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Index i of the interval [grid[i], grid[i + 1]] that contains each v."""
+    return np.clip(np.searchsorted(grid, v, side="left") - 1, 0, len(grid) - 2)
+
+
+def _outside(grid: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return (v < grid[0]) | (v > grid[-1])
+
+
+def _linear(xs: np.ndarray, ys: np.ndarray, x: np.ndarray, extrapolate: bool = False) -> np.ndarray:
+    result = np.interp(x, xs, ys)
+    outside = _outside(xs, x)
+    if not extrapolate:
+        result[outside] = np.nan
+    elif outside.any() and len(xs) > 1:
+        # Continue the first/last segment
+        i = _bracket(xs, x[outside])
+        slope = (ys[i + 1] - ys[i]) / (xs[i + 1] - xs[i])
+        result[outside] = ys[i] + slope * (x[outside] - xs[i])
+    return result
+
+
+def _log(log_xs: np.ndarray, log_ys: np.ndarray, x: np.ndarray, extrapolate: bool = False) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_x = np.where(x > 0, np.log10(np.where(x > 0, x, 1.0)), np.nan)
+    return 10 ** _linear(log_xs, log_ys, log_x, extrapolate)
+
+
+def _step(xs: np.ndarray, ys: np.ndarray, x: np.ndarray, extrapolate: bool = False) -> np.ndarray:
+    i = np.searchsorted(xs, x, side="right") - 1
+    result = ys[np.clip(i, 0, len(xs) - 1)].astype(float)
+    if not extrapolate:
+        result[x < xs[0]] = np.nan
+    return result
+
+
+def _bilinear(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    zs: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    extrapolate: tuple = (False, False)
+) -> np.ndarray:
+    i = _bracket(xs, x)
+    j = _bracket(ys, y)
+
+    x0, x1 = xs[i], xs[i + 1]
+    y0, y1 = ys[j], ys[j + 1]
+    dx = x1 - x0
+    dy = y1 - y0
+    tx = np.divide(x - x0, dx, out=np.zeros_like(x), where=dx != 0)
+    ty = np.divide(y - y0, dy, out=np.zeros_like(y), where=dy != 0)
+
+    # zs is indexed [y][x]
+    z0 = zs[j, i] + tx * (zs[j, i + 1] - zs[j, i])
+    z1 = zs[j + 1, i] + tx * (zs[j + 1, i + 1] - zs[j + 1, i])
+    result = z0 + ty * (z1 - z0)
+    # tx/ty run past [0, 1] outside the grid, continuing the edge cells
+    if not extrapolate[0]:
+        result[_outside(xs, x)] = np.nan
+    if not extrapolate[1]:
+        result[_outside(ys, y)] = np.nan
+    return result
+
+
+def _log_grid(xs, ys):
+    """Log10 of the points where both coordinates are positive."""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    positive = (xs > 0) & (ys > 0)
+    return np.log10(xs[positive]), np.log10(ys[positive])
+
+
 def interp_1d_linear(xs: List[float], ys: List[float], x: float) -> float:
     """1D linear interpolation."""
+    xs = np.asarray(xs, dtype=float)
     if x < xs[0] or x > xs[-1]:
         raise TableLookupError(f"Value {x} outside range [{xs[0]}, {xs[-1]}]")
 
-    # Find bracketing indices
-    i = 0
-    while i < len(xs) - 1 and xs[i + 1] < x:
-        i += 1
-
-    if xs[i] == x:
-        return ys[i]
-
-    # Linear interpolation
-    t = (x - xs[i]) / (xs[i + 1] - xs[i])
-    return ys[i] + t * (ys[i + 1] - ys[i])
+    return float(np.interp(x, xs, np.asarray(ys, dtype=float)))
 
 
 def interp_1d_log(xs: List[float], ys: List[float], x: float) -> float:
@@ -35,25 +120,20 @@ def interp_1d_log(xs: List[float], ys: List[float], x: float) -> float:
         raise TableLookupError(f"Log interpolation requires positive values, got {x}")
 
     # Convert to log space
-    log_xs = [math.log10(xi) for xi in xs if xi > 0]
-    log_ys = [math.log10(yi) for yi in ys if yi > 0]
-    log_x = math.log10(x)
-
-    log_y = interp_1d_linear(log_xs, log_ys, log_x)
+    log_xs, log_ys = _log_grid(xs, ys)
+    log_y = interp_1d_linear(log_xs, log_ys, math.log10(x))
     return 10 ** log_y
 
 
 def interp_1d_step(xs: List[float], ys: List[float], x: float) -> float:
     """1D step interpolation (returns value of nearest lower point)."""
+    xs = np.asarray(xs, dtype=float)
     if x < xs[0]:
         raise TableLookupError(f"Value {x} below minimum {xs[0]}")
 
-    # Find largest x_i <= x
-    i = 0
-    while i < len(xs) - 1 and xs[i + 1] <= x:
-        i += 1
-
-    return ys[i]
+    # Largest x_i <= x
+    i = int(np.searchsorted(xs, x, side="right")) - 1
+    return float(ys[i])
 
 
 def interp_2d_bilinear(
@@ -64,49 +144,251 @@ def interp_2d_bilinear(
     y: float
 ) -> float:
     """2D bilinear interpolation."""
-    # Find bracketing indices in x
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
     if x < xs[0] or x > xs[-1]:
         raise TableLookupError(f"x={x} outside range [{xs[0]}, {xs[-1]}]")
     if y < ys[0] or y > ys[-1]:
         raise TableLookupError(f"y={y} outside range [{ys[0]}, {ys[-1]}]")
 
-    i = 0
-    while i < len(xs) - 1 and xs[i + 1] < x:
-        i += 1
+    zs = np.asarray(zs, dtype=float)
+    return float(_bilinear(xs, ys, zs, np.array([float(x)]), np.array([float(y)]))[0])
 
-    j = 0
-    while j < len(ys) - 1 and ys[j + 1] < y:
-        j += 1
 
-    # Handle exact matches
-    if i == len(xs) - 1:
-        i -= 1
-    if j == len(ys) - 1:
-        j -= 1
+# ==================== PREPARED GRIDS ====================
 
-    # Get the four corner values
-    x0, x1 = xs[i], xs[i + 1]
-    y0, y1 = ys[j], ys[j + 1]
+class TableGrid:
+    """The axes and output columns of one continuous table as float arrays."""
+
+    def __init__(self, data: Dict[str, Any], input_names: List[str]):
+        self.data = data
+        self.axes: List[np.ndarray] = []
+
+        # Data format: { "xs": [...], "ys": [...], "output": [...] }
+        # or { input_name: [...], output_name: [...] }
+        for name, default_key in zip(input_names, ("xs", "ys")):
+            key = name if name in data else default_key
+            if key not in data:
+                raise TableLookupError(f"Table data missing grid for {name}")
+            self.axes.append(np.asarray(data[key], dtype=float))
+
+        self._columns: Dict[str, np.ndarray] = {}
+        self._log_columns: Dict[str, tuple] = {}
+        self._splines: Dict[tuple, CubicSpline] = {}
+
+    def column(self, output_name: str) -> np.ndarray:
+        """Output values: 1D over the axis, or 2D indexed [y][x]."""
+        values = self._columns.get(output_name)
+        if values is None:
+            if output_name not in self.data:
+                raise TableLookupError(f"Output '{output_name}' not in table data")
+            values = np.asarray(self.data[output_name], dtype=float)
+            self._columns[output_name] = values
+        return values
+
+    def log_column(self, output_name: str) -> tuple:
+        """(log10 xs, log10 ys) for log-log interpolation of a 1D output."""
+        logs = self._log_columns.get(output_name)
+        if logs is None:
+            logs = _log_grid(self.axes[0], self.column(output_name))
+            self._log_columns[output_name] = logs
+        return logs
+
+    def spline(self, output_name: str, method: str) -> CubicSpline:
+        """Cubic coefficients for a 1D output (method: spline or pchip)."""
+        key = (output_name, method)
+        spline = self._splines.get(key)
+        if spline is None:
+            build = CubicSpline.pchip if method == InterpMethod.PCHIP else CubicSpline.natural
+            try:
+                spline = build(self.axes[0], self.column(output_name))
+            except SplineError as e:
+                raise TableLookupError(f"Cannot build spline for '{output_name}': {e}")
+            self._splines[key] = spline
+        return spline
+
+
+class PreparedTable:
+    """
+    Preconverted grids for a table source with continuous inputs.
+
+    Pure continuous sources have a single grid; mixed discrete + continuous
+    sources have one grid per discrete key ("M10|coarse" -> subset data).
+    """
+
+    def __init__(self, source: PropertySource):
+        self.source = source
+        self.data = source.resolution.data
+        self.discrete_inputs = [i for i in source.inputs if i.type == InputType.DISCRETE]
+        self.continuous_inputs = [i for i in source.inputs if i.type != InputType.DISCRETE]
+        self._grids: Dict[Optional[str], TableGrid] = {}
+
+        # Interpolation method per output (1D tables)
+        self.interp: Dict[str, str] = {
+            o.name: o.interp for o in source.outputs
+        }
+        # Out-of-grid handling per continuous input
+        self.extrap: List[str] = [i.extrap for i in self.continuous_inputs]
+
+    @property
+    def supported(self) -> bool:
+        return 1 <= len(self.continuous_inputs) <= 2
+
+    def grid(self, discrete_key: Optional[str] = None) -> TableGrid:
+        grid = self._grids.get(discrete_key)
+        if grid is None:
+            if discrete_key is None:
+                data = self.data
+            else:
+                if discrete_key not in self.data:
+                    raise TableLookupError(f"No data for {discrete_key}")
+                data = self.data[discrete_key]
+            grid = TableGrid(data, [i.name for i in self.continuous_inputs])
+            self._grids[discrete_key] = grid
+        return grid
+
+    def prepare_all(self):
+        """Convert every grid and output column up front."""
+        keys = [None] if not self.discrete_inputs else [
+            k for k, v in self.data.items() if isinstance(v, dict)
+        ]
+        output_names = [o.name for o in self.source.outputs]
+        for key in keys:
+            try:
+                grid = self.grid(key)
+                for name in output_names:
+                    if name in grid.data:
+                        grid.column(name)
+                        method = self._method(name)
+                        if method == InterpMethod.LOG:
+                            grid.log_column(name)
+                        elif method in _SPLINES and len(grid.axes) == 1:
+                            grid.spline(name, method)
+            except (TableLookupError, ValueError, TypeError):
+                # Surfaced again (with context) if this grid is ever looked up
+                continue
+
+    def _method(self, output_name: str) -> str:
+        return self.interp.get(output_name, self.continuous_inputs[0].interp)
+
+    def interpolate(self, discrete_key: Optional[str], output_name: str, coords: List[float]) -> float:
+        """Interpolate one point, raising TableLookupError if it cannot be resolved."""
+        grid = self.grid(discrete_key)
+        values = grid.column(output_name)
+        method = self._method(output_name)
+
+        if method not in _SPLINES and all(mode == ExtrapMethod.ERROR for mode in self.extrap):
+            if len(coords) == 1:
+                xs = grid.axes[0]
+                if method == InterpMethod.LOG:
+                    x = coords[0]
+                    if x <= 0:
+                        raise TableLookupError(f"Log interpolation requires positive values, got {x}")
+                    log_xs, log_ys = grid.log_column(output_name)
+                    return 10 ** interp_1d_linear(log_xs, log_ys, math.log10(x))
+                elif method == InterpMethod.STEP:
+                    return interp_1d_step(xs, values, coords[0])
+                else:
+                    return interp_1d_linear(xs, values, coords[0])
+
+            return interp_2d_bilinear(grid.axes[0], grid.axes[1], values, coords[0], coords[1])
+
+        # Splines, clamp and extrapolate: check the strict axes, then take the batch path
+        labels = ["Value "] if len(coords) == 1 else ["x=", "y="]
+        for axis, mode, label, value in zip(grid.axes, self.extrap, labels, coords):
+            if mode == ExtrapMethod.ERROR and (value < axis[0] or value > axis[-1]):
+                raise TableLookupError(f"{label}{value} outside range [{axis[0]}, {axis[-1]}]")
+        if len(coords) == 1 and method == InterpMethod.LOG and coords[0] <= 0:
+            raise TableLookupError(f"Log interpolation requires positive values, got {coords[0]}")
+
+        result = self.interpolate_many(discrete_key, output_name, [np.array([float(c)]) for c in coords])[0]
+        if np.isnan(result):
+            raise TableLookupError(f"Cannot interpolate '{output_name}' at {coords}")
+        return float(result)
+
+    def interpolate_many(self, discrete_key: Optional[str], output_name: str, coords: List[np.ndarray]) -> np.ndarray:
+        """Interpolate many points at once; NaN where a point is out of range."""
+        grid = self.grid(discrete_key)
+        values = grid.column(output_name)
+
+        coords = list(coords)
+        extrapolate = []
+        for index, (axis, mode) in enumerate(zip(grid.axes, self.extrap)):
+            if mode == ExtrapMethod.CLAMP:
+                coords[index] = np.clip(coords[index], axis[0], axis[-1])
+            extrapolate.append(mode == ExtrapMethod.EXTRAPOLATE)
+
+        if len(coords) == 1:
+            x = coords[0]
+            method = self._method(output_name)
+            if method == InterpMethod.LOG:
+                log_xs, log_ys = grid.log_column(output_name)
+                return _log(log_xs, log_ys, x, extrapolate[0])
+            elif method == InterpMethod.STEP:
+                return _step(grid.axes[0], values, x, extrapolate[0])
+            elif method in _SPLINES:
+                result = grid.spline(output_name, method)(x)
+                if not extrapolate[0]:
+                    result[_outside(grid.axes[0], x)] = np.nan
+                return result
+            else:
+                return _linear(grid.axes[0], values, x, extrapolate[0])
+
+        # 2D grids interpolate bilinearly whatever the output's method
+        return _bilinear(grid.axes[0], grid.axes[1], values, coords[0], coords[1], tuple(extrapolate))
+
+
+_SPLINES = (InterpMethod.SPLINE, InterpMethod.PCHIP)
+
+
+# Prepared tables by source id (rebuilt when the registry reloads)
+_prepared: Dict[str, PreparedTable] = {}
+
+
+def prepare_table(source: PropertySource) -> Optional[PreparedTable]:
+    """
+    Preconvert a table source's continuous grids to NumPy arrays.
+
+    Returns None for sources that have no continuous inputs.
+    """
+    if source.type != "table":
+        return None
+    prepared = PreparedTable(source)
+    if not prepared.supported:
+        return None
+    prepared.prepare_all()
+    _prepared[source.id] = prepared
+    return prepared
+
+
+def get_prepared_table(source: PropertySource) -> Optional[PreparedTable]:
+    """The prepared grids for this source, preparing them on first use."""
+    prepared = _prepared.get(source.id)
+    if prepared is not None and prepared.source is source:
+        return prepared
+    return prepare_table(source)
 
-    z00 = zs[j][i]
-    z01 = zs[j][i + 1]
-    z10 = zs[j + 1][i]
-    z11 = zs[j + 1][i + 1]
 
-    # Bilinear interpolation
-    if x1 == x0:
-        tx = 0
-    else:
-        tx = (x - x0) / (x1 - x0)
+def restore_prepared_table(prepared: PreparedTable):
+    """Register grids prepared elsewhere (e.g. unpickled from the registry cache)."""
+    _prepared[prepared.source.id] = prepared
 
-    if y1 == y0:
-        ty = 0
-    else:
-        ty = (y - y0) / (y1 - y0)
 
-    z0 = z00 + tx * (z01 - z00)
-    z1 = z10 + tx * (z11 - z10)
-    return z0 + ty * (z1 - z0)
+def clear_prepared_tables():
+    """Drop all prepared grids (the registry is reloading)."""
+    _prepared.clear()
+
+
+def _discrete_key(prepared: PreparedTable, inputs: Dict[str, Any]) -> Optional[str]:
+    if not prepared.discrete_inputs:
+        return None
+    key_parts = []
+    for input_def in prepared.discrete_inputs:
+        val = inputs.get(input_def.name)
+        if val is None:
+            raise TableLookupError(f"Missing required input: {input_def.name}")
+        key_parts.append(str(val))
+    return "|".join(key_parts)
 
 
 def resolve_table(
@@ -122,10 +404,10 @@ def resolve_table(
     - Single continuous input: 1D interpolation
     - Two continuous inputs: 2D bilinear interpolation
     - Mixed discrete + continuous: filter by discrete, interpolate continuous
-    """
-    resolution = source.resolution
-    data = resolution.data
 
+    Discrete rows come from the source's DiscreteIndex and continuous grids
+    from its PreparedTable.
+    """
     # Categorize inputs
     discrete_inputs = []
     continuous_inputs = []
@@ -137,28 +419,9 @@ def resolve_table(
             continuous_inputs.append(input_def)
 
     # Case 1: Single discrete input (e.g., AISC shapes)
-    if len(discrete_inputs) == 1 and len(continuous_inputs) == 0:
-        input_def = discrete_inputs[0]
-        key = inputs.get(input_def.name)
-        if key is None:
-            raise TableLookupError(f"Missing required input: {input_def.name}")
-
-        key_str = str(key)
-        if key_str not in data:
-            raise TableLookupError(f"No match for {input_def.name}='{key}'")
-
-        row = data[key_str]
-        if output_name not in row:
-            raise TableLookupError(f"Output '{output_name}' not found for {key_str}")
-
-        value = row[output_name]
-        # Return string values as-is, convert numeric values to float
-        if isinstance(value, str):
-            return value
-        return float(value)
-
-    # Case 2: Two discrete inputs (e.g., pipe schedules, tolerance grades)
-    if len(discrete_inputs) == 2 and len(continuous_inputs) == 0:
+    # Case 2: Two discrete inputs (e.g., pipe schedules, tolerance grades),
+    # as compound keys ("IT7|10-18") or nested (data["IT7"]["10-18"])
+    if len(discrete_inputs) in (1, 2) and len(continuous_inputs) == 0:
         key_parts = []
         for input_def in discrete_inputs:
             val = inputs.get(input_def.name)
@@ -166,127 +429,91 @@ def resolve_table(
                 raise TableLookupError(f"Missing required input: {input_def.name}")
             key_parts.append(str(val))
 
-        # Try compound key first (e.g., "IT7|10-18")
-        key_str = "|".join(key_parts)
-        if key_str in data:
-            row = data[key_str]
-            if output_name not in row:
-                raise TableLookupError(f"Output '{output_name}' not found")
-            value = row[output_name]
-            if isinstance(value, str):
-                return value
-            return float(value)
-
-        # Try nested lookup (e.g., data["IT7"]["10-18"])
-        key1, key2 = key_parts
-        if key1 in data and isinstance(data[key1], dict):
-            if key2 in data[key1]:
-                row = data[key1][key2]
-                if output_name not in row:
-                    raise TableLookupError(f"Output '{output_name}' not found")
-                value = row[output_name]
-                if isinstance(value, str):
-                    return value
-                return float(value)
-
-        raise TableLookupError(f"No match for {discrete_inputs[0].name}='{key1}', {discrete_inputs[1].name}='{key2}'")
-
-    # Case 3: Single continuous input (e.g., temp-dependent properties)
-    if len(discrete_inputs) == 0 and len(continuous_inputs) == 1:
-        input_def = continuous_inputs[0]
-        x = inputs.get(input_def.name)
-        if x is None:
-            raise TableLookupError(f"Missing required input: {input_def.name}")
-
-        x = float(x)
-
-        # Data format: { "xs": [...], "output1": [...], "output2": [...] }
-        # or { input_name: [...], output_name: [...] }
-        xs_key = input_def.name if input_def.name in data else "xs"
-        if xs_key not in data:
-            raise TableLookupError(f"Table data missing grid for {input_def.name}")
-
-        xs = [float(v) for v in data[xs_key]]
-        if output_name not in data:
-            raise TableLookupError(f"Output '{output_name}' not in table data")
+        row = get_discrete_index(source).row(tuple(key_parts))
+        if row is None:
+            matched = ", ".join(
+                f"{d.name}='{inputs[d.name]}'" for d in discrete_inputs
+            )
+            raise TableLookupError(f"No match for {matched}")
 
-        ys = [float(v) for v in data[output_name]]
-
-        # Get interpolation method for this output
-        output_def = next((o for o in source.outputs if o.name == output_name), None)
-        interp = output_def.interp if output_def else input_def.interp
-
-        if interp == InterpMethod.LOG:
-            return interp_1d_log(xs, ys, x)
-        elif interp == InterpMethod.STEP:
-            return interp_1d_step(xs, ys, x)
-        else:
-            return interp_1d_linear(xs, ys, x)
-
-    # Case 4: Two continuous inputs (e.g., steam tables with T, P)
-    if len(discrete_inputs) == 0 and len(continuous_inputs) == 2:
-        input1, input2 = continuous_inputs
-
-        x = inputs.get(input1.name)
-        y = inputs.get(input2.name)
-
-        if x is None:
-            raise TableLookupError(f"Missing required input: {input1.name}")
-        if y is None:
-            raise TableLookupError(f"Missing required input: {input2.name}")
-
-        x = float(x)
-        y = float(y)
-
-        # Data format: { "xs": [...], "ys": [...], "output": [[...], [...], ...] }
-        xs_key = input1.name if input1.name in data else "xs"
-        ys_key = input2.name if input2.name in data else "ys"
-
-        xs = [float(v) for v in data[xs_key]]
-        ys = [float(v) for v in data[ys_key]]
-
-        if output_name not in data:
-            raise TableLookupError(f"Output '{output_name}' not in table data")
+        if output_name not in row:
+            detail = f" for {key_parts[0]}" if len(key_parts) == 1 else ""
+            raise TableLookupError(f"Output '{output_name}' not found{detail}")
 
-        zs = [[float(v) for v in row] for row in data[output_name]]
+        value = row[output_name]
+        # Return string values as-is, convert numeric values to float
+        if isinstance(value, str):
+            return value
+        return float(value)
 
-        return interp_2d_bilinear(xs, ys, zs, x, y)
+    # Cases 3-5: one or two continuous inputs, optionally filtered by discrete
+    # inputs (e.g. temp-dependent properties, steam tables with T and P)
+    prepared = get_prepared_table(source)
+    if prepared is not None:
+        discrete_key = _discrete_key(prepared, inputs)
 
-    # Case 5: Mixed discrete + continuous
-    if len(discrete_inputs) >= 1 and len(continuous_inputs) >= 1:
-        # Build discrete key to filter data subset
-        key_parts = []
-        for input_def in discrete_inputs:
-            val = inputs.get(input_def.name)
-            if val is None:
+        coords = []
+        for input_def in prepared.continuous_inputs:
+            value = inputs.get(input_def.name)
+            if value is None:
                 raise TableLookupError(f"Missing required input: {input_def.name}")
-            key_parts.append(str(val))
-
-        discrete_key = "|".join(key_parts)
-
-        if discrete_key not in data:
-            raise TableLookupError(f"No data for {discrete_key}")
-
-        subset = data[discrete_key]
+            coords.append(float(value))
 
-        # Now interpolate on continuous inputs within this subset
-        # Recursively call with subset data
-        subset_source = PropertySource(
-            **{
-                **source.model_dump(),
-                'inputs': continuous_inputs,
-                'resolution': {'type': 'table', 'data': subset}
-            }
-        )
-
-        continuous_inputs_dict = {
-            k: v for k, v in inputs.items()
-            if k in [i.name for i in continuous_inputs]
-        }
-
-        return resolve_table(subset_source, output_name, continuous_inputs_dict)
+        return prepared.interpolate(discrete_key, output_name, coords)
 
     raise TableLookupError(
         f"Unsupported input configuration: {len(discrete_inputs)} discrete, "
         f"{len(continuous_inputs)} continuous"
     )
+
+
+def resolve_table_many(
+    source: PropertySource,
+    output_name: str,
+    columns: Dict[str, Any]
+) -> np.ndarray:
+    """
+    Resolve a table lookup for many points at once.
+
+    Args:
+        source: A table source with one or two continuous inputs
+        output_name: Output to interpolate
+        columns: Input name -> array of values (scalars are broadcast)
+
+    Returns:
+        Float array with one value per point; NaN where the point is outside
+        the grid or its discrete key has no data.
+    """
+    prepared = get_prepared_table(source)
+    if prepared is None:
+        raise TableLookupError("Batch lookup requires a table with continuous inputs")
+
+    names = [i.name for i in prepared.continuous_inputs + prepared.discrete_inputs]
+    for name in names:
+        if columns.get(name) is None:
+            raise TableLookupError(f"Missing required input: {name}")
+
+    arrays = np.broadcast_arrays(*[
+        np.asarray(columns[i.name], dtype=float) for i in prepared.continuous_inputs
+    ], *[
+        np.asarray(columns[i.name], dtype=object) for i in prepared.discrete_inputs
+    ])
+    arrays = [np.atleast_1d(a) for a in arrays]
+    coords = [np.array(a, dtype=float) for a in arrays[:len(prepared.continuous_inputs)]]
+
+    if not prepared.discrete_inputs:
+        return prepared.interpolate_many(None, output_name, coords)
+
+    # Group points by discrete key and interpolate each group in one call
+    discrete_columns = arrays[len(prepared.continuous_inputs):]
+    groups: Dict[str, List[int]] = {}
+    for index, parts in enumerate(zip(*discrete_columns)):
+        groups.setdefault("|".join(str(p) for p in parts), []).append(index)
+
+    result = np.full(len(coords[0]), np.nan)
+    for key, indices in groups.items():
+        if key not in prepared.data:
+            continue
+        indices = np.asarray(indices)
+        result[indices] = prepared.interpolate_many(key, output_name, [c[indices] for c in coords])
+    return result
@@ -0,0 +1,106 @@
+"""Hash indexes for discrete inputs.
+
+Built once per source when the registry loads it, so a lookup with discrete
+inputs is a couple of dict probes instead of a scan of input_def.values:
+
+- canonical values: lower-cased string (or the value itself) -> declared value
+- rows of discrete-only tables: compound keys ("IT7|10-18") and nested
+  layouts (data["IT7"]["10-18"]) flattened to one probe each
+
+Mixed discrete + continuous tables keep their per-key grids in PreparedTable.
+"""
+
+from typing import Dict, Any, Optional, Tuple
+
+from .schemas import PropertySource, InputType
+
+
+# Returned by canonical() when a value is not one of the declared values
+INVALID = object()
+
+
+class DiscreteIndex:
+    """Lookup indexes for the discrete inputs of one source."""
+
+    def __init__(self, source: PropertySource):
+        self.source = source
+        self.discrete_inputs = [i for i in source.inputs if i.type == InputType.DISCRETE]
+
+        # Input name -> value key -> canonical value (None: any value accepted)
+        self.values: Dict[str, Optional[Dict[Any, Any]]] = {}
+        for input_def in self.discrete_inputs:
+            if not input_def.values:
+                self.values[input_def.name] = None
+                continue
+            index = {}
+            for v in input_def.values:
+                # First declared spelling wins, as with a linear scan
+                index.setdefault(_value_key(v), v)
+            self.values[input_def.name] = index
+
+        # Rows of tables resolved by discrete inputs alone: compound keys
+        # ("IT7|10-18", or the single key) and pre-split nested keys
+        self.compound: Optional[Dict[str, Dict[str, Any]]] = None
+        self.nested: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        continuous = len(source.inputs) - len(self.discrete_inputs)
+        if source.type == "table" and continuous == 0 and len(self.discrete_inputs) in (1, 2):
+            data = source.resolution.data
+            self.compound = {k: row for k, row in data.items() if isinstance(row, dict)}
+            if len(self.discrete_inputs) == 2:
+                for key1, rows in self.compound.items():
+                    for key2, row in rows.items():
+                        if isinstance(row, dict):
+                            self.nested[(key1, key2)] = row
+
+    def canonical(self, name: str, value: Any) -> Any:
+        """The declared spelling of a discrete value, or INVALID."""
+        index = self.values.get(name)
+        if index is None:
+            return value
+        try:
+            return index.get(_value_key(value), INVALID)
+        except TypeError:
+            # Unhashable values cannot match a declared value
+            return INVALID
+
+    def row(self, parts: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """The row for these key parts; compound keys take precedence."""
+        if self.compound is None:
+            return None
+        row = self.compound.get("|".join(parts))
+        if row is None and len(parts) == 2:
+            row = self.nested.get(parts)
+        return row
+
+
+def _value_key(value: Any) -> Any:
+    # Strings match case-insensitively; other values by equality
+    if isinstance(value, str):
+        return ("str", value.lower())
+    return ("value", value)
+
+
+# Indexes by source id (rebuilt when the registry reloads)
+_indexes: Dict[str, DiscreteIndex] = {}
+
+
+def prepare_discrete_index(source: PropertySource) -> Optional[DiscreteIndex]:
+    """Build the indexes for a source with discrete inputs (None otherwise)."""
+    if not any(i.type == InputType.DISCRETE for i in source.inputs):
+        return None
+    index = DiscreteIndex(source)
+    _indexes[source.id] = index
+    return index
+
+
+def get_discrete_index(source: PropertySource) -> Optional[DiscreteIndex]:
+    """The indexes for this source, building them on first use."""
+    index = _indexes.get(source.id)
+    if index is not None and index.source is source:
+        return index
+    return prepare_discrete_index(source)
+
+
+def clear_discrete_indexes():
+    """Drop all indexes (the registry is reloading)."""
+    _indexes.clear()
@@ -1,11 +1,27 @@
-"""Registry for loading and managing PropertySource definitions from YAML files."""
+"""Registry for loading and managing PropertySource definitions from YAML files.
 
-import os
+Parsed sources (and their prepared table grids) are kept in a pickle cache
+next to the data, keyed per file by mtime and size. A worker starting up
+loads the cache and only re-parses YAML files that changed since it was
+written. Equation formulas are compiled at load time as well.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+import math
+import os
+import pickle
+import threading
+
+import numpy as np
 import yaml
 
 from .schemas import PropertySource, ViewConfig, GridSpec, ColumnDef
+from .backends.table import prepare_table, restore_prepared_table, clear_prepared_tables, get_prepared_table
+from .backends.equation import prepare_equations, clear_compiled_equations
+from .discrete import prepare_discrete_index, clear_discrete_indexes
 
 
 class RegistryError(Exception):
@@ -17,6 +33,30 @@ class RegistryError(Exception):
 _sources: Dict[str, PropertySource] = {}
 _loaded = False
 
+# Bump when PropertySource / PreparedTable change shape so old caches are ignored
+CACHE_VERSION = 2
+CACHE_FILENAME = ".property_sources.cache.pickle"
+
+# Bumped on every (re)load; part of the view cache key
+_registry_version = 0
+
+# Finished generate_view payloads keyed by (source_id, view_id, registry version)
+_view_cache: Dict[Tuple[str, str, int], dict] = {}
+_view_cache_lock = threading.Lock()
+VIEW_CACHE_SIZE = 256
+
+# View columns are evaluated on a thread pool only for grids with at least
+# this many cells; below that the pool costs more than it saves
+VIEW_WORKERS = int(os.getenv("PROPERTY_VIEW_WORKERS", "4"))
+VIEW_PARALLEL_MIN_CELLS = 2048
+
+# Grid points evaluated per batch when rows are generated lazily
+VIEW_CHUNK_ROWS = int(os.getenv("PROPERTY_VIEW_CHUNK_ROWS", "500"))
+_view_executor: Optional[ThreadPoolExecutor] = None
+
+# Use the C YAML loader when PyYAML was built with libyaml
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _get_data_dir() -> Path:
     """Get the path to the data directory."""
@@ -31,7 +71,7 @@ def _load_yaml_file(file_path: Path) -> Optional[dict]:
     """Load a single YAML file."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YAML_LOADER)
     except Exception as e:
         print(f"Warning: Failed to load {file_path}: {e}")
         return None
@@ -46,48 +86,131 @@ def _parse_source(data: dict, file_path: Path) -> Optional[PropertySource]:
         return None
 
 
-def load_all_sources(force_reload: bool = False) -> Dict[str, PropertySource]:
+def _get_cache_path() -> Path:
+    """Path of the compiled registry cache (PROPERTY_SOURCES_CACHE overrides)."""
+    override = os.getenv("PROPERTY_SOURCES_CACHE")
+    if override:
+        return Path(override)
+    return _get_data_dir() / CACHE_FILENAME
+
+
+def _source_files(data_dir: Path) -> List[Path]:
+    """All .yaml then .yml files under the data directory, in one scan."""
+    files = [p for p in data_dir.rglob("*") if p.suffix in (".yaml", ".yml") and p.is_file()]
+    return sorted(files, key=lambda p: (p.suffix != ".yaml", str(p)))
+
+
+def _read_cache(cache_path: Path) -> Dict[str, dict]:
+    """Per-file cache entries, or {} if the cache is missing, stale or unreadable."""
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable registry cache {cache_path}: {e}")
+        return {}
+
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def _write_cache(cache_path: Path, files: Dict[str, dict]):
+    """Write the cache atomically; failure only costs the next cold start."""
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"version": CACHE_VERSION, "files": files}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"Warning: Failed to write registry cache {cache_path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def load_all_sources(force_reload: bool = False, use_cache: bool = True) -> Dict[str, PropertySource]:
     """
     Load all PropertySource definitions from the data directory.
 
-    Scans all subdirectories for .yaml files and loads them.
+    Scans all subdirectories for .yaml/.yml files. Files whose mtime and size
+    match the compiled cache are taken from it; the rest are parsed and the
+    cache is rewritten. use_cache=False ignores the cache and rebuilds it.
+
+    The new sources are collected into a fresh dict that replaces the
+    registry in one step, so lookups running during a reload keep seeing
+    the previous sources rather than a partly filled registry.
     """
     global _sources, _loaded
 
     if _loaded and not force_reload:
         return _sources
 
-    _sources = {}
+    sources: Dict[str, PropertySource] = {}
     data_dir = _get_data_dir()
 
     if not data_dir.exists():
         print(f"Warning: Data directory not found: {data_dir}")
-        _loaded = True
+        _swap_sources(sources)
         return _sources
 
-    # Scan all subdirectories
-    for yaml_file in data_dir.rglob("*.yaml"):
-        data = _load_yaml_file(yaml_file)
-        if data:
-            source = _parse_source(data, yaml_file)
-            if source:
-                if source.id in _sources:
-                    print(f"Warning: Duplicate source ID '{source.id}' in {yaml_file}")
-                _sources[source.id] = source
-
-    # Also load .yml files
-    for yaml_file in data_dir.rglob("*.yml"):
-        data = _load_yaml_file(yaml_file)
-        if data:
-            source = _parse_source(data, yaml_file)
-            if source:
-                if source.id in _sources:
-                    print(f"Warning: Duplicate source ID '{source.id}' in {yaml_file}")
-                _sources[source.id] = source
+    cache_path = _get_cache_path()
+    cached_files = _read_cache(cache_path) if use_cache else {}
+    files: Dict[str, dict] = {}
+    parsed = 0
+
+    clear_prepared_tables()
+    clear_compiled_equations()
+    clear_discrete_indexes()
+    for yaml_file in _source_files(data_dir):
+        rel_path = yaml_file.relative_to(data_dir).as_posix()
+        stat = yaml_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        entry = cached_files.get(rel_path)
+        if entry is None or entry.get("stamp") != stamp:
+            parsed += 1
+            source = None
+            data = _load_yaml_file(yaml_file)
+            if data:
+                source = _parse_source(data, yaml_file)
+            # Preconvert continuous table grids to arrays once, not per lookup
+            prepared = prepare_table(source) if source and source.type == "table" else None
+            entry = {"stamp": stamp, "source": source, "prepared": prepared}
+        elif entry["prepared"] is not None:
+            restore_prepared_table(entry["prepared"])
+        files[rel_path] = entry
+
+        source = entry["source"]
+        if source:
+            # Code objects don't pickle, so formulas are compiled on every load
+            if source.type == "equation":
+                prepare_equations(source)
+            prepare_discrete_index(source)
+            if source.id in sources:
+                print(f"Warning: Duplicate source ID '{source.id}' in {yaml_file}")
+            sources[source.id] = source
+
+    if parsed or files.keys() != cached_files.keys():
+        _write_cache(cache_path, files)
+
+    _swap_sources(sources)
+    print(
+        f"Loaded {len(_sources)} property sources from {data_dir} "
+        f"({parsed} parsed, {len(files) - parsed} from cache)"
+    )
+    return _sources
+
 
+def _swap_sources(sources: Dict[str, PropertySource]):
+    """Install a fully loaded set of sources and retire views built from the old one."""
+    global _sources, _loaded, _registry_version
+    _sources = sources
+    _registry_version += 1
+    clear_view_cache()
     _loaded = True
-    print(f"Loaded {len(_sources)} property sources from {data_dir}")
-    return _sources
 
 
 def get_source(source_id: str) -> PropertySource:
@@ -161,12 +284,99 @@ def generate_view(source_id: str, view_id: str) -> dict:
     """
     Generate a table view for display.
 
-    Returns a structured table with headers and rows.
+    Returns a structured table with headers and rows. Finished payloads are
+    cached per (source_id, view_id, registry version) and shared between
+    callers, so treat the result as read-only.
+    """
+    source = get_source(source_id)
+
+    key = (source_id, view_id, _registry_version)
+    cached = _view_cache.get(key)
+    if cached is not None:
+        return cached
+
+    view = _find_view(source, view_id)
+    payload = _view_header(source, view, view_id)
+    payload['rows'] = _view_rows(source, view, list(_iter_grid(view)))
+    with _view_cache_lock:
+        if len(_view_cache) >= VIEW_CACHE_SIZE:
+            _view_cache.clear()
+        _view_cache[key] = payload
+    return payload
+
+
+def generate_view_window(source_id: str, view_id: str, offset: int = 0, limit: Optional[int] = None) -> dict:
+    """
+    Generate rows [offset, offset + limit) of a table view.
+
+    Only the requested window is evaluated (unless the whole view is already
+    cached). The payload adds `total_rows`, `offset`, `limit` and
+    `next_offset` (None on the last page) to the generate_view() shape.
+    """
+    source = get_source(source_id)
+    view = _find_view(source, view_id)
+
+    payload = _view_header(source, view, view_id)
+    total = _count_grid(view)
+    cached = _view_cache.get((source_id, view_id, _registry_version))
+    if cached is not None:
+        stop = None if limit is None else offset + limit
+        payload['rows'] = cached['rows'][offset:stop]
+    else:
+        payload['rows'] = list(iter_view_rows(source_id, view_id, offset=offset, limit=limit))
+
+    end = offset + len(payload['rows'])
+    payload.update({
+        'total_rows': total,
+        'offset': offset,
+        'limit': limit,
+        'next_offset': end if end < total else None,
+    })
+    return payload
+
+
+def iter_view_rows(
+    source_id: str,
+    view_id: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> Iterator[dict]:
     """
-    from .router import lookup
+    Yield a view's rows lazily, evaluating `chunk_size` grid points at a time.
 
+    Memory stays proportional to one chunk however large the grid is, and
+    the first rows are available before the rest have been computed.
+    """
     source = get_source(source_id)
+    view = _find_view(source, view_id)
+    chunk_size = chunk_size or VIEW_CHUNK_ROWS
+
+    stop = None if limit is None else offset + limit
+    grid = islice(_iter_grid(view), offset, stop)
+    while True:
+        chunk = list(islice(grid, chunk_size))
+        if not chunk:
+            return
+        yield from _view_rows(source, view, chunk)
+
+
+def view_header(source_id: str, view_id: str) -> dict:
+    """Metadata, headers and total row count of a view, without its rows."""
+    source = get_source(source_id)
+    view = _find_view(source, view_id)
+    payload = _view_header(source, view, view_id)
+    payload['total_rows'] = _count_grid(view)
+    return payload
+
+
+def clear_view_cache():
+    """Drop all cached view payloads."""
+    with _view_cache_lock:
+        _view_cache.clear()
+
 
+def _find_view(source: PropertySource, view_id: str) -> ViewConfig:
     # Find the view
     view = next((v for v in source.views if v.id == view_id), None)
 
@@ -175,23 +385,14 @@ def generate_view(source_id: str, view_id: str) -> dict:
         view = source.views[0]
 
     if not view:
-        raise RegistryError(f"View '{view_id}' not found in source '{source_id}'")
+        raise RegistryError(f"View '{view_id}' not found in source '{source.id}'")
+    return view
 
-    # Build grid points
-    grid_points = {}
-    for input_name, grid_spec in view.grid.items():
-        if grid_spec.type == "list" and grid_spec.values:
-            grid_points[input_name] = grid_spec.values
-        elif grid_spec.type == "range":
-            start = grid_spec.start or 0
-            end = grid_spec.end or 100
-            step = grid_spec.step or 10
-            grid_points[input_name] = list(_frange(start, end, step))
-        elif grid_spec.type == "computed":
-            # Computed grids are handled per-row in nested layouts
-            grid_points[input_name] = None
-        else:
-            grid_points[input_name] = grid_spec.values or []
+
+def _view_header(source: PropertySource, view: ViewConfig, view_id: str) -> dict:
+    """Metadata and column headers of a view."""
+    input_defs = {i.name: i for i in source.inputs}
+    output_defs = {o.name: o for o in source.outputs}
 
     # Build headers - first add input columns, then output columns
     headers = []
@@ -201,7 +402,7 @@ def generate_view(source_id: str, view_id: str) -> dict:
         # Get unit from grid spec or from source input definition
         input_unit = grid_spec.unit or ''
         if not input_unit:
-            input_def = next((i for i in source.inputs if i.name == input_name), None)
+            input_def = input_defs.get(input_name)
             if input_def and input_def.unit != 'none':
                 input_unit = input_def.unit
 
@@ -227,7 +428,7 @@ def generate_view(source_id: str, view_id: str) -> dict:
         # Get SI unit from source output definition
         si_unit = ''
         if col.output:
-            output_def = next((o for o in source.outputs if o.name == col.output), None)
+            output_def = output_defs.get(col.output)
             if output_def:
                 si_unit = output_def.unit or ''
 
@@ -240,126 +441,198 @@ def generate_view(source_id: str, view_id: str) -> dict:
             'is_input': False
         })
 
-    # Generate rows
+    return {
+        'metadata': {
+            'source_id': source.id,
+            'source_name': source.name,
+            'view_id': view_id,
+            'view_name': view.name,
+        },
+        'headers': headers,
+    }
+
+
+def _view_rows(source: PropertySource, view: ViewConfig, grid: List[Tuple[dict, Optional[dict]]]) -> List[dict]:
+    """Rows for a list of (input point, section) grid entries."""
+    input_defs = {i.name: i for i in source.inputs}
+    points = [point for point, _ in grid]
+    columns = _evaluate_view_columns(source, view, points)
+
+    # Display unit conversion for input values, one factor per grid input
+    display_factors = {}
+    for name, grid_spec in view.grid.items():
+        input_def = input_defs.get(name)
+        if grid_spec.unit and input_def and input_def.unit != grid_spec.unit:
+            # Convert from SI to display unit
+            display_factors[name] = _get_conversion_factor(input_def.unit, grid_spec.unit)
+
     rows = []
+    for index, (point, section) in enumerate(grid):
+        values = {}
+        for name, val in point.items():
+            factor = display_factors.get(name)
+            values[name] = val * factor if factor is not None else val
+
+        # Return SI values - frontend handles unit conversion based on user prefs
+        for col in view.columns:
+            if col.output:
+                values[col.output + ('_' + col.phase if col.phase else '')] = columns[(col.phase, col.output)][index]
+            elif col.computed:
+                # Computed column - need to evaluate expression
+                # For now, skip computed columns (need more implementation)
+                values[col.header] = None
+
+        if section is not None:
+            rows.append({'section': section, 'values': values})
+        else:
+            rows.append({'values': values})
+    return rows
+
+
+def _grid_values(grid_spec: GridSpec):
+    """Lazily produce one grid axis."""
+    if grid_spec.type == "list" and grid_spec.values:
+        return grid_spec.values
+    elif grid_spec.type == "range":
+        start = grid_spec.start or 0
+        end = grid_spec.end or 100
+        step = grid_spec.step or 10
+        return _frange(start, end, step)
+    elif grid_spec.type == "computed":
+        # Computed grids are handled per-row in nested layouts
+        return ()
+    return grid_spec.values or []
+
+
+def _iter_grid(view: ViewConfig) -> Iterator[Tuple[dict, Optional[dict]]]:
+    """(input point, section) per row in display order; section is None for flat layouts."""
+    input_names = list(view.grid.keys())
 
     if view.layout == "flat":
         # Single-level iteration
-        input_names = list(grid_points.keys())
         if len(input_names) == 1:
             # Single input grid
             input_name = input_names[0]
-            for val in grid_points[input_name]:
-                row_values = _generate_row_values(
-                    source, view, {input_name: val}, lookup
-                )
-                rows.append({'values': row_values})
+            for val in _grid_values(view.grid[input_name]):
+                yield {input_name: val}, None
 
         elif len(input_names) == 2:
             # Two input grids - iterate over both
             name1, name2 = input_names
-            for val1 in grid_points[name1]:
-                for val2 in grid_points[name2]:
-                    row_values = _generate_row_values(
-                        source, view, {name1: val1, name2: val2}, lookup
-                    )
-                    rows.append({'values': row_values})
-
-    elif view.layout == "nested":
-        # Nested layout - outer input becomes sections
-        input_names = list(grid_points.keys())
-        if len(input_names) >= 1:
-            outer_name = input_names[0]
-            inner_name = input_names[1] if len(input_names) > 1 else None
-
-            for outer_val in grid_points[outer_name]:
-                section = {
-                    'label': outer_name,
-                    'value': outer_val,
-                    'unit': view.grid[outer_name].unit or ''
-                }
-
-                if inner_name:
-                    inner_values = grid_points[inner_name] or []
-                    for inner_val in inner_values:
-                        row_values = _generate_row_values(
-                            source, view,
-                            {outer_name: outer_val, inner_name: inner_val},
-                            lookup
-                        )
-                        rows.append({'section': section, 'values': row_values})
-                else:
-                    row_values = _generate_row_values(
-                        source, view, {outer_name: outer_val}, lookup
-                    )
-                    rows.append({'section': section, 'values': row_values})
-
-    return {
-        'metadata': {
-            'source_id': source_id,
-            'source_name': source.name,
-            'view_id': view_id,
-            'view_name': view.name,
-        },
-        'headers': headers,
-        'rows': rows
-    }
-
+            for val1 in _grid_values(view.grid[name1]):
+                for val2 in _grid_values(view.grid[name2]):
+                    yield {name1: val1, name2: val2}, None
 
-def _generate_row_values(
+    elif view.layout == "nested" and input_names:
+        # Nested layout - outer input becomes sections
+        outer_name = input_names[0]
+        inner_name = input_names[1] if len(input_names) > 1 else None
+
+        for outer_val in _grid_values(view.grid[outer_name]):
+            section = {
+                'label': outer_name,
+                'value': outer_val,
+                'unit': view.grid[outer_name].unit or ''
+            }
+            if inner_name:
+                for inner_val in _grid_values(view.grid[inner_name]):
+                    yield {outer_name: outer_val, inner_name: inner_val}, section
+            else:
+                yield {outer_name: outer_val}, section
+
+
+def _count_grid(view: ViewConfig) -> int:
+    """Number of rows _iter_grid() yields, without building them."""
+    input_names = list(view.grid.keys())
+    if not ((view.layout == "flat" and len(input_names) in (1, 2)) or (view.layout == "nested" and input_names)):
+        return 0
+    return math.prod(sum(1 for _ in _grid_values(view.grid[name])) for name in input_names[:2])
+
+
+def _evaluate_view_columns(
     source: PropertySource,
     view: ViewConfig,
-    inputs: dict,
-    lookup_fn
-) -> dict:
-    """Generate values for a single row."""
-    values = {}
-
-    # Add input values to row (with display unit conversion)
-    for name, val in inputs.items():
-        display_val = val
-        # Check if grid specifies a display unit different from input's base unit
-        if name in view.grid:
-            grid_spec = view.grid[name]
-            if grid_spec.unit:
-                input_def = next((i for i in source.inputs if i.name == name), None)
-                if input_def and input_def.unit != grid_spec.unit:
-                    # Convert from SI to display unit
-                    conversion_key = (input_def.unit, grid_spec.unit)
-                    if conversion_key in _UNIT_CONVERSIONS:
-                        display_val = val * _UNIT_CONVERSIONS[conversion_key]
-        values[name] = display_val
-
-    # Apply constraints
-    all_inputs = {**inputs}
-    for name, val in view.constraints.items():
-        all_inputs[name] = val
+    points: List[dict]
+) -> Dict[Tuple[Optional[str], str], list]:
+    """
+    Values for every (phase, output) column over all grid points.
 
-    for col in view.columns:
-        if col.output:
-            # Direct output lookup
-            try:
-                # Handle phase-specific lookups
-                if col.phase:
-                    phase_inputs = {**all_inputs}
-                    phase_inputs['Q'] = 0.0 if col.phase == "liquid" else 1.0
-                    value = lookup_fn(source.id, col.output, **phase_inputs)
-                else:
-                    value = lookup_fn(source.id, col.output, **all_inputs)
+    Each column is one batched lookup over the whole grid. Library sources
+    read all outputs of a phase from one state sweep. Independent columns
+    of large grids run on the view thread pool.
+    """
+    from .router import lookup, lookup_many_outputs
 
-                # Return SI values - frontend handles unit conversion based on user prefs
-                # (Previously converted here, now done in frontend)
+    vectorized = source.type in ("library", "equation") or (
+        source.type == "table" and get_prepared_table(source) is not None
+    )
+
+    # Columns sharing a phase share their input points
+    by_phase: Dict[Optional[str], List[str]] = {}
+    for col in view.columns:
+        if col.output and col.output not in by_phase.setdefault(col.phase, []):
+            by_phase[col.phase].append(col.output)
+
+    if source.type == "library":
+        tasks = list(by_phase.items())
+    else:
+        tasks = [(phase, [name]) for phase, names in by_phase.items() for name in names]
+
+    def phase_inputs(phase: Optional[str]) -> Dict[str, Any]:
+        # Apply constraints
+        inputs = {name: [point[name] for point in points] for name in (points[0] if points else {})}
+        inputs.update(view.constraints)
+        # Handle phase-specific lookups
+        if phase:
+            inputs['Q'] = 0.0 if phase == "liquid" else 1.0
+        return inputs
+
+    def run(task) -> Dict[Tuple[Optional[str], str], list]:
+        phase, output_names = task
+        inputs = phase_inputs(phase)
+
+        if not vectorized:
+            results = {}
+            for name in output_names:
+                column = []
+                for index in range(len(points)):
+                    point = {k: (v[index] if isinstance(v, list) else v) for k, v in inputs.items()}
+                    try:
+                        column.append(lookup(source.id, name, **point))
+                    except Exception:
+                        column.append(None)
+                results[(phase, name)] = column
+            return results
+
+        try:
+            arrays = lookup_many_outputs(source.id, output_names, inputs) if points else {}
+        except Exception:
+            arrays = {}
+        return {
+            (phase, name): [
+                None if math.isnan(v) else v
+                for v in np.broadcast_to(arrays[name], (len(points),)).tolist()
+            ] if name in arrays else [None] * len(points)
+            for name in output_names
+        }
 
-                values[col.output + ('_' + col.phase if col.phase else '')] = value
-            except Exception as e:
-                values[col.output + ('_' + col.phase if col.phase else '')] = None
+    columns: Dict[Tuple[Optional[str], str], list] = {}
+    if len(tasks) > 1 and len(points) * len(tasks) >= VIEW_PARALLEL_MIN_CELLS:
+        for result in _get_view_executor().map(run, tasks):
+            columns.update(result)
+    else:
+        for task in tasks:
+            columns.update(run(task))
+    return columns
 
-        elif col.computed:
-            # Computed column - need to evaluate expression
-            # For now, skip computed columns (need more implementation)
-            values[col.header] = None
 
-    return values
+def _get_view_executor() -> ThreadPoolExecutor:
+    global _view_executor
+    if _view_executor is None:
+        with _view_cache_lock:
+            if _view_executor is None:
+                _view_executor = ThreadPoolExecutor(max_workers=VIEW_WORKERS, thread_name_prefix="property-view")
+    return _view_executor
 
 
 def _frange(start: float, end: float, step: float):
@@ -430,7 +703,19 @@ def _convert_display_unit(
 
 
 def reload_sources():
-    """Force reload all sources from disk."""
-    global _loaded
-    _loaded = False
-    load_all_sources(force_reload=True)
+    """
+    Force reload all sources from disk and rebuild the compiled cache.
+
+    Cached lookup results are dropped for every source whose definition
+    changed or disappeared, and cached errors are dropped for all of them
+    (a source added on disk no longer fails as unknown).
+    """
+    from .router import lookup_cache
+
+    previous = _sources
+    load_all_sources(force_reload=True, use_cache=False)
+
+    for source_id, old_source in previous.items():
+        if _sources.get(source_id) != old_source:
+            lookup_cache.invalidate_source(source_id)
+    lookup_cache.clear_errors()
@@ -1,12 +1,22 @@
 """LOOKUP router - dispatches lookups to appropriate backend based on source type."""
 
-from typing import Dict, Any, Union
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union, Mapping
+import math
+import os
+import threading
+import time
+
+import numpy as np
 
 from .registry import get_source
 from .schemas import PropertySource
-from .backends.table import resolve_table, TableLookupError
-from .backends.equation import resolve_equation, EquationError
-from .backends.coolprop import resolve_coolprop, CoolPropError
+from .discrete import get_discrete_index, INVALID
+from .backends.table import resolve_table, resolve_table_many, get_prepared_table, TableLookupError
+from .backends.equation import resolve_equation, resolve_equation_many, EquationError
+from .backends.coolprop import (
+    resolve_coolprop, resolve_coolprop_outputs, resolve_coolprop_many, CoolPropError,
+)
 
 
 class LookupError(Exception):
@@ -14,6 +24,113 @@ class LookupError(Exception):
     pass
 
 
+class LookupCache:
+    """
+    Bounded LRU cache of lookup() results.
+
+    Keys are (source_id, output_name, inputs) with numeric inputs rounded to
+    `significant_digits`, so points that differ only by float noise share an
+    entry. Failed lookups are cached as well, but only for `error_ttl`
+    seconds.
+    """
+
+    def __init__(self, maxsize: int = 10000, significant_digits: int = 10, error_ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.significant_digits = significant_digits
+        self.error_ttl = error_ttl
+        # key -> (value, error message, expires_at); value entries never expire
+        self._entries: "OrderedDict[tuple, Tuple[Any, Optional[str], Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.error_hits = 0
+
+    def make_key(self, source_id: str, output_name: str, inputs: Dict[str, Any]) -> Optional[tuple]:
+        """Cache key for a lookup, or None if the inputs can't be keyed."""
+        items = []
+        for name, value in inputs.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if math.isfinite(value):
+                    value = float(f"{value:.{self.significant_digits}g}")
+            elif not isinstance(value, str):
+                try:
+                    hash(value)
+                except TypeError:
+                    return None
+            items.append((name, value))
+        return (source_id, output_name, tuple(sorted(items)))
+
+    def get(self, key: tuple) -> Optional[Tuple[Any, Optional[str]]]:
+        """(value, error) for a cached lookup, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, error, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if error is not None:
+                self.error_hits += 1
+            return value, error
+
+    def put(self, key: tuple, value: Any = None, error: Optional[str] = None):
+        expires_at = time.monotonic() + self.error_ttl if error is not None else None
+        with self._lock:
+            self._entries[key] = (value, error, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_source(self, source_id: str) -> int:
+        """Drop every entry for one source. Returns the number removed."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == source_id]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear_errors(self) -> int:
+        """Drop every cached failure. Returns the number removed."""
+        with self._lock:
+            failed = [key for key, entry in self._entries.items() if entry[1] is not None]
+            for key in failed:
+                del self._entries[key]
+            return len(failed)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.error_hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "error_hits": self.error_hits,
+                "hit_rate": self.hits / total if total else 0.0,
+                "significant_digits": self.significant_digits,
+                "error_ttl": self.error_ttl,
+            }
+
+
+lookup_cache = LookupCache(
+    maxsize=int(os.getenv("LOOKUP_CACHE_SIZE", "10000")),
+    significant_digits=int(os.getenv("LOOKUP_CACHE_SIGNIFICANT_DIGITS", "10")),
+    error_ttl=float(os.getenv("LOOKUP_CACHE_ERROR_TTL", "30")),
+)
+
+
 def lookup(
     source_id: str,
     output_name: str,
@@ -44,7 +161,32 @@ def lookup(
 
         >>> lookup("al_6061_t6", "Sy", T=373.15)
         250000000.0
+
+    Results (and, briefly, errors) are served from lookup_cache when the
+    same point was looked up before.
     """
+    key = lookup_cache.make_key(source_id, output_name, inputs)
+    if key is None:
+        return _lookup_uncached(source_id, output_name, inputs)
+
+    cached = lookup_cache.get(key)
+    if cached is not None:
+        value, error = cached
+        if error is not None:
+            raise LookupError(error)
+        return value
+
+    try:
+        value = _lookup_uncached(source_id, output_name, inputs)
+    except LookupError as e:
+        lookup_cache.put(key, error=str(e))
+        raise
+    lookup_cache.put(key, value)
+    return value
+
+
+def _lookup_uncached(source_id: str, output_name: str, inputs: Dict[str, Any]) -> float:
+    """Resolve a lookup without consulting the cache."""
     # Get the source definition
     try:
         source = get_source(source_id)
@@ -99,27 +241,7 @@ def _validate_inputs(source: PropertySource, inputs: Dict[str, Any]) -> Dict[str
 
         # Validate discrete inputs
         if input_def.type == "discrete":
-            if input_def.values:
-                # Case-insensitive matching for string values
-                if isinstance(value, str):
-                    value_lower = value.lower()
-                    matched = None
-                    for v in input_def.values:
-                        if isinstance(v, str) and v.lower() == value_lower:
-                            matched = v
-                            break
-                    if matched is not None:
-                        normalized[name] = matched  # Use canonical case
-                    else:
-                        raise LookupError(
-                            f"Invalid value for '{name}': '{value}'. "
-                            f"Must be one of: {input_def.values[:10]}{'...' if len(input_def.values) > 10 else ''}"
-                        )
-                elif value not in input_def.values:
-                    raise LookupError(
-                        f"Invalid value for '{name}': '{value}'. "
-                        f"Must be one of: {input_def.values[:10]}{'...' if len(input_def.values) > 10 else ''}"
-                    )
+            normalized[name] = _canonical_discrete(source, input_def, value)
 
         # Validate continuous inputs
         else:
@@ -138,10 +260,333 @@ def _validate_inputs(source: PropertySource, inputs: Dict[str, Any]) -> Dict[str
                             f"Input '{name}'={float_value} outside valid range "
                             f"[{min_val}, {max_val}]"
                         )
+                    if input_def.extrap == "clamp":
+                        normalized[name] = min(max(float_value, min_val), max_val)
 
     return normalized
 
 
+def _canonical_discrete(source: PropertySource, input_def, value):
+    """Validate a discrete input value and return it in its canonical case."""
+    if not input_def.values:
+        return value
+
+    # Case-insensitive match through the source's prebuilt value index
+    canonical = get_discrete_index(source).canonical(input_def.name, value)
+    if canonical is not INVALID:
+        return canonical
+
+    raise LookupError(
+        f"Invalid value for '{input_def.name}': '{value}'. "
+        f"Must be one of: {input_def.values[:10]}{'...' if len(input_def.values) > 10 else ''}"
+    )
+
+
+def lookup_many(
+    source_id: str,
+    output_name: str,
+    inputs: Union[Mapping[str, Any], np.ndarray]
+) -> np.ndarray:
+    """
+    Look up a property value at many points in one call.
+
+    Table sources with continuous inputs are interpolated and equation
+    sources evaluated in a single vectorized pass, library sources sweep one
+    pooled CoolProp state over all points; other sources fall back to one
+    lookup() per point.
+
+    Args:
+        source_id: ID of the property source
+        output_name: Name of the output property
+        inputs: Input name -> array of values (scalars are broadcast), or a
+            2D array with one column per source input, in definition order
+
+    Returns:
+        Float array with one value per point. Points that cannot be resolved
+        (out of range, unknown discrete value, non-numeric result) are NaN.
+
+    Raises:
+        LookupError: If the source, output or a required input is unknown
+
+    Examples:
+        >>> lookup_many("water_table", "rho", {"T": np.linspace(280, 360, 1000)})
+    """
+    return lookup_many_outputs(source_id, [output_name], inputs)[output_name]
+
+
+def lookup_many_outputs(
+    source_id: str,
+    output_names: List[str],
+    inputs: Union[Mapping[str, Any], np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """
+    lookup_many() for several outputs of one source over the same points.
+
+    Inputs are validated and canonicalized once; library sources read every
+    output from a single state sweep.
+
+    Returns:
+        Output name -> float array (NaN where unresolvable)
+    """
+    try:
+        source = get_source(source_id)
+    except Exception:
+        raise LookupError(f"Unknown property source: '{source_id}'")
+
+    available = [o.name for o in source.outputs]
+    for output_name in output_names:
+        if output_name not in available:
+            raise LookupError(
+                f"Unknown output '{output_name}' for source '{source_id}'. "
+                f"Available outputs: {available}"
+            )
+
+    columns = _as_columns(source, inputs)
+    for input_def in source.inputs:
+        if input_def.name not in columns:
+            if not input_def.optional:
+                raise LookupError(f"Missing required input: '{input_def.name}'")
+            continue
+        if input_def.type == "discrete":
+            continue
+        # Backends take float columns; a non-numeric entry only fails its own point
+        columns[input_def.name] = _numeric_column(columns[input_def.name])
+        if input_def.range and input_def.extrap == "clamp":
+            columns[input_def.name] = np.clip(columns[input_def.name], *input_def.range)
+
+    vectorized = source.type == "equation" or (
+        source.type == "table" and get_prepared_table(source) is not None
+    )
+    if vectorized:
+        # Canonicalize each distinct discrete value once; invalid ones drop to NaN
+        for input_def in source.inputs:
+            if input_def.type == "discrete" and input_def.name in columns:
+                column = np.atleast_1d(np.asarray(columns[input_def.name], dtype=object))
+                canonical = {}
+                for value in set(column.tolist()):
+                    try:
+                        canonical[value] = _canonical_discrete(source, input_def, value)
+                    except LookupError:
+                        canonical[value] = None
+                columns[input_def.name] = np.array([canonical[v] for v in column], dtype=object)
+
+    try:
+        if source.type == "table" and vectorized:
+            results = {name: resolve_table_many(source, name, columns) for name in output_names}
+        elif source.type == "equation":
+            results = {
+                name: np.atleast_1d(resolve_equation_many(source, name, columns)) for name in output_names
+            }
+        elif source.type == "library":
+            results = resolve_coolprop_many(source, output_names, columns)
+        else:
+            return {name: _lookup_points(source_id, name, columns) for name in output_names}
+    except (TableLookupError, EquationError, CoolPropError) as e:
+        raise LookupError(str(e))
+    except (TypeError, ValueError) as e:
+        raise LookupError(f"Lookup failed: {str(e)}")
+
+    return {name: _mask_out_of_range(source, columns, result) for name, result in results.items()}
+
+
+def _numeric_column(values: Any) -> np.ndarray:
+    """
+    Float array of a continuous input column.
+
+    Entries float() rejects become NaN, so the point comes back unresolved
+    (lookup_batch retries it with lookup() to report why) instead of the
+    whole column failing to convert.
+    """
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        pass
+    column = np.asarray(values, dtype=object)
+    result = np.full(column.shape, np.nan)
+    for index, value in np.ndenumerate(column):
+        try:
+            result[index] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return result
+
+
+def _lookup_points(source_id: str, output_name: str, columns: Dict[str, Any]) -> np.ndarray:
+    """Other backends: point by point."""
+    arrays = np.broadcast_arrays(*[np.asarray(v, dtype=object) for v in columns.values()])
+    arrays = [np.atleast_1d(a) for a in arrays]
+    result = np.full(len(arrays[0]) if arrays else 1, np.nan)
+    for index in range(len(result)):
+        point = {name: column[index] for name, column in zip(columns, arrays)}
+        try:
+            result[index] = float(lookup(source_id, output_name, **point))
+        except (LookupError, TypeError, ValueError):
+            continue
+    return result
+
+
+def _mask_out_of_range(source: PropertySource, columns: Dict[str, Any], result: np.ndarray) -> np.ndarray:
+    """Match lookup(): out-of-range inputs are errors unless extrapolation is allowed."""
+    for input_def in source.inputs:
+        if input_def.type == "discrete" or input_def.name not in columns:
+            continue
+        if input_def.range and input_def.extrap == "error":
+            values = np.broadcast_to(np.asarray(columns[input_def.name], dtype=float), result.shape)
+            min_val, max_val = input_def.range
+            result[(values < min_val) | (values > max_val)] = np.nan
+    return result
+
+
+def lookup_outputs(
+    source_id: str,
+    output_names: List[str],
+    **inputs
+) -> Dict[str, Optional[float]]:
+    """
+    Look up several outputs of one source at the same input point.
+
+    Library sources set the thermodynamic state once and read every output
+    from it; other sources fall back to one lookup() per output.
+
+    Returns:
+        Output name -> value, None for outputs that could not be resolved
+
+    Raises:
+        LookupError: If the source is unknown or the inputs are invalid
+
+    Examples:
+        >>> lookup_outputs("steam", ["h", "s", "rho"], T=373.15, Q=0)
+    """
+    try:
+        source = get_source(source_id)
+    except Exception:
+        raise LookupError(f"Unknown property source: '{source_id}'")
+
+    if source.type != "library":
+        results = {}
+        for output_name in output_names:
+            try:
+                results[output_name] = lookup(source_id, output_name, **inputs)
+            except LookupError:
+                results[output_name] = None
+        return results
+
+    normalized_inputs = _validate_inputs(source, inputs)
+    known = {o.name for o in source.outputs}
+    results = {name: None for name in output_names if name not in known}
+    try:
+        results.update(resolve_coolprop_outputs(
+            source, [name for name in output_names if name in known], normalized_inputs
+        ))
+    except CoolPropError as e:
+        raise LookupError(str(e))
+    return results
+
+
+# Points of one batch whose failure is explained by a scalar lookup(); the
+# rest are reported with a generic message
+BATCH_ERROR_DETAILS = 100
+
+
+def lookup_batch(
+    source_id: str,
+    output_names: List[str],
+    inputs: Union[Mapping[str, Any], List[Mapping[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Columnar lookup of several outputs over many points, with per-point errors.
+
+    Points are evaluated through lookup_many_outputs(); only the points that
+    come back unresolved are retried with lookup(), which recovers string
+    values and the reason for each failure.
+
+    Args:
+        source_id: ID of the property source
+        output_names: Outputs to resolve at every point
+        inputs: Input name -> array of values (scalars are broadcast), or a
+            list of points ({input name: value})
+
+    Returns:
+        {"count": n, "outputs": {name: [value or None, ...]},
+         "errors": [{"index": i, "output": name, "error": message}, ...]}
+
+    Raises:
+        LookupError: If the source, an output or a required input is unknown
+    """
+    if isinstance(inputs, Mapping):
+        columns = dict(inputs)
+        points = None
+    else:
+        points = list(inputs)
+        names: List[str] = []
+        for point in points:
+            names.extend(name for name in point if name not in names)
+        columns = {name: _batch_column([point.get(name) for point in points]) for name in names}
+
+    results = lookup_many_outputs(source_id, output_names, columns)
+    count = len(next(iter(results.values()))) if results else (len(points) if points is not None else 0)
+
+    point_columns = None
+    errors: List[Dict[str, Any]] = []
+    outputs: Dict[str, List[Any]] = {}
+    for output_name in output_names:
+        values = results[output_name]
+        column: List[Any] = values.tolist()
+        for index in np.flatnonzero(~np.isfinite(values)).tolist():
+            column[index] = None
+            if len(errors) >= BATCH_ERROR_DETAILS:
+                errors.append({"index": index, "output": output_name, "error": "Lookup failed"})
+                continue
+
+            if points is not None:
+                point = points[index]
+            else:
+                if point_columns is None:
+                    point_columns = _point_columns(columns, count)
+                point = {name: col[index] for name, col in point_columns.items()}
+            try:
+                value = lookup(source_id, output_name, **point)
+            except LookupError as e:
+                errors.append({"index": index, "output": output_name, "error": str(e)})
+                continue
+            if isinstance(value, str) or math.isfinite(value):
+                column[index] = value
+            else:
+                errors.append({"index": index, "output": output_name, "error": f"Result is not finite: {value}"})
+        outputs[output_name] = column
+
+    return {"count": count, "outputs": outputs, "errors": errors}
+
+
+def _batch_column(values: List[Any]) -> np.ndarray:
+    """Float column when every value is a number (None for missing), else object."""
+    if all(v is None or (isinstance(v, (int, float)) and not isinstance(v, bool)) for v in values):
+        return np.asarray(values, dtype=float)
+    return np.asarray(values, dtype=object)
+
+
+def _point_columns(columns: Dict[str, Any], count: int) -> Dict[str, List[Any]]:
+    """Broadcast input columns to Python lists, for per-point lookups."""
+    return {
+        name: np.broadcast_to(np.asarray(value, dtype=object), (count,)).tolist()
+        for name, value in columns.items()
+    }
+
+
+def _as_columns(source: PropertySource, inputs) -> Dict[str, Any]:
+    """Normalize lookup_many inputs to a name -> column mapping."""
+    if isinstance(inputs, Mapping):
+        return dict(inputs)
+
+    matrix = np.asarray(inputs)
+    if matrix.ndim != 2 or matrix.shape[1] != len(source.inputs):
+        raise LookupError(
+            f"inputs array must have shape (n, {len(source.inputs)}) "
+            f"for inputs {[i.name for i in source.inputs]}"
+        )
+    return {input_def.name: matrix[:, k] for k, input_def in enumerate(source.inputs)}
+
+
 # Alias for the lookup function (capital case for formula compatibility)
 LOOKUP = lookup
 
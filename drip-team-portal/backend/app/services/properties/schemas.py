@@ -21,7 +21,8 @@ class InterpMethod(str, Enum):
     LINEAR = "linear"
     LOG = "log"
     STEP = "step"
-    SPLINE = "spline"
+    SPLINE = "spline"  # natural cubic
+    PCHIP = "pchip"    # monotone cubic (no overshoot)
 
 
 class ExtrapMethod(str, Enum):
@@ -122,10 +122,16 @@ Evaluation Flow
 ================================================================================
 """
 
-from typing import Optional, List, Dict, Any, Set, Tuple
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Any, Set, Tuple, Iterable
+from collections import OrderedDict, defaultdict, deque
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
+import math
 import re
+import threading
+import time
 import logging
 import sympy
 from sympy import sympify, Symbol, sqrt, sin, cos, tan, log, exp, pi, E
@@ -137,6 +143,7 @@ from app.models.component import Component
 from app.models.material import Material, MaterialProperty
 from app.models.property import ComponentProperty, PropertyDefinition
 from app.services.unit_engine import UnitEngine
+from app.services.dependency_graph import DependencyGraph, dependency_graph
 from app.services.dimensional_analysis import (
     Dimension, DimensionError, DIMENSIONLESS, UNIT_DIMENSIONS,
     get_unit_dimension, dimension_to_si_unit, dimension_to_string
@@ -426,6 +433,123 @@ class CircularDependencyError(Exception):
         }
 
 
+
+# ==================== COMPILED EXPRESSION CACHE ====================
+
+# Functions and constants available to expressions
+_EVAL_NAMESPACE = {
+    'sqrt': lambda x: x ** 0.5,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'log': math.log,
+    'ln': math.log,
+    'exp': math.exp,
+    'abs': abs,
+    'pi': 3.141592653589793,
+    'e': 2.718281828459045,
+}
+
+
+class CompiledExpression:
+    """
+    An expression node's parsed_expression compiled once for re-evaluation.
+
+    Holds everything about the expression that does not depend on the current
+    values of its sources: the compiled code object, constant placeholder
+    values, the reference -> placeholder map and the precomputed result
+    dimension. Evaluating it only costs the dependency values and the
+    arithmetic.
+
+    The result dimension is inferred partly from the sources' units, so
+    compile_key covers those units as well as the expression string.
+    """
+
+    __slots__ = (
+        "compile_key", "code", "constants", "placeholders_by_ref",
+        "bare_literals", "additive_dimension", "dimension", "dimension_error",
+        "si_unit",
+    )
+
+    def __init__(
+        self,
+        compile_key: int,
+        code,
+        constants: Dict[str, Any],
+        placeholders_by_ref: Dict[str, str],
+        bare_literals: Dict[str, float],
+        additive_dimension: Optional[str],
+        dimension: Optional[Dimension],
+        dimension_error: Optional[str],
+        si_unit: Optional[str],
+    ):
+        self.compile_key = compile_key
+        self.code = code
+        self.constants = constants
+        self.placeholders_by_ref = placeholders_by_ref
+        self.bare_literals = bare_literals
+        self.additive_dimension = additive_dimension
+        self.dimension = dimension
+        self.dimension_error = dimension_error
+        self.si_unit = si_unit
+
+
+class CompiledExpressionCache:
+    """
+    Process-wide LRU cache of CompiledExpression keyed by node id.
+
+    Each entry remembers the key it was compiled under (expression string
+    plus source units), so a node whose expression or sources' units changed
+    is recompiled on its next evaluation even without an explicit invalidate().
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, CompiledExpression]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, node_id: int, compile_key: int) -> Optional[CompiledExpression]:
+        with self._lock:
+            compiled = self._entries.get(node_id)
+            if compiled is None or compiled.compile_key != compile_key:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(node_id)
+            self.hits += 1
+            return compiled
+
+    def put(self, node_id: int, compiled: CompiledExpression):
+        with self._lock:
+            self._entries[node_id] = compiled
+            self._entries.move_to_end(node_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, node_id: int):
+        with self._lock:
+            self._entries.pop(node_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+compiled_expressions = CompiledExpressionCache()
+
+
 class ValueEngine:
     """
     Core engine for managing the value system.
@@ -444,6 +568,14 @@ class ValueEngine:
         self._evaluation_stack: Set[int] = set()  # For circular dependency detection
         self._user_unit_prefs: Optional[Dict[str, str]] = None  # Cache for user preferences
 
+        # Per-pass result cache: node_id -> compute_value() result tuple.
+        # Reset at the start of each recalculate()/recalculate_stale() pass so a
+        # dependency shared by many expressions is only evaluated once per pass.
+        self._result_cache: Dict[int, Tuple[Optional[float], Optional[int], bool, Optional[str], Optional[str]]] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._in_pass = False
+
     def _get_user_unit_preference(self, dimension: str) -> Optional[str]:
         """
         Get user's preferred unit symbol for a given dimension.
@@ -467,6 +599,23 @@ class ValueEngine:
 
         return self._user_unit_prefs.get(dimension)
 
+    # ==================== PER-PASS RESULT CACHE ====================
+
+    def _begin_pass(self):
+        """Clear the per-pass result cache and reset hit/miss counters."""
+        self._result_cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counts for the current (or most recent) evaluation pass."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._result_cache),
+        }
+
     # ==================== TABLE LOOKUP ====================
 
     def lookup_table(
@@ -571,16 +720,13 @@ class ValueEngine:
         # Extract and link dependencies
         if resolve_references:
             references = self._extract_references(expression)
-            for ref in references:
-                # Look up the referenced value node
-                source_node = self._resolve_reference(ref)
-                if source_node:
-                    dep = ValueDependency(
-                        dependent_id=node.id,
-                        source_id=source_node.id,
-                        variable_name=ref
-                    )
-                    self.db.add(dep)
+            for ref, source_node in self.resolve_references(references).items():
+                dep = ValueDependency(
+                    dependent_id=node.id,
+                    source_id=source_node.id,
+                    variable_name=ref
+                )
+                self.db.add(dep)
 
         self.db.flush()
         return node
@@ -859,14 +1005,7 @@ class ValueEngine:
         # Try Component
         component = self.db.query(Component).filter(Component.code == entity_code).first()
         if not component:
-            from sqlalchemy import func
-            generated_code_expr = func.trim(
-                func.regexp_replace(
-                    func.regexp_replace(func.upper(Component.name), '[^a-zA-Z0-9]', '_', 'g'),
-                    '_+', '_', 'g'
-                ), '_'
-            )
-            component = self.db.query(Component).filter(generated_code_expr == entity_code).first()
+            component = self.db.query(Component).filter(Component.generated_code == entity_code).first()
 
         if component:
             # Try exact match first
@@ -886,14 +1025,7 @@ class ValueEngine:
         # Try Material
         material = self.db.query(Material).filter(Material.code == entity_code).first()
         if not material:
-            from sqlalchemy import func
-            generated_code_expr = func.trim(
-                func.regexp_replace(
-                    func.regexp_replace(func.upper(Material.name), '[^a-zA-Z0-9]', '_', 'g'),
-                    '_+', '_', 'g'
-                ), '_'
-            )
-            material = self.db.query(Material).filter(generated_code_expr == entity_code).first()
+            material = self.db.query(Material).filter(Material.generated_code == entity_code).first()
 
         if material:
             # Try exact match first
@@ -915,203 +1047,201 @@ class ValueEngine:
 
     def _resolve_reference(self, ref: str) -> Optional[ValueNode]:
         """
-        Resolve a reference string to a ValueNode.
+        Resolve a single reference string to a ValueNode.
+
+        Thin wrapper around resolve_references(); see there for the
+        resolution order.
+        """
+        return self.resolve_references([ref]).get(ref)
+
+    def resolve_references(self, refs, create_literals: bool = True) -> Dict[str, ValueNode]:
+        """
+        Resolve many reference strings to ValueNodes in a constant number of queries.
 
         Reference formats:
         - "HEATBED_001.thermal_conductivity" -> Component property (by code)
         - "SS304_001.density" -> Material property (by code)
         - "FRAME.Height" -> Component by generated code from name
 
-        Resolution order:
+        Resolution order (per reference):
         1. Try Component by code
         2. Try Component by generated code from name
         3. Try Material by code
         4. Try Material by generated code from name
         5. Fallback: Try by description (legacy)
 
-        Returns the ValueNode or None if not found.
-        """
-        parts = ref.split(".")
-        if len(parts) != 2:
-            logger.warning(f"Invalid reference format: {ref} (expected CODE.property)")
-            return None
+        Properties that exist but have no value_node get a literal ValueNode
+        created from their legacy value (converted to SI), as before.
 
-        entity_code, prop_name = parts
-        # Normalize property name: underscores → spaces (Yield_Strength → "Yield Strength")
-        prop_name_normalized = prop_name.replace('_', ' ')
-
-        # Try to find Component by code
-        component = self.db.query(Component).filter(
-            Component.code == entity_code
-        ).first()
-
-        # If not found by code, try by generated code from name using SQL
-        if not component:
-            from sqlalchemy import func
-            # PostgreSQL: TRIM(BOTH '_' FROM REGEXP_REPLACE(REGEXP_REPLACE(UPPER(name), '[^a-zA-Z0-9]', '_', 'g'), '_+', '_', 'g'))
-            generated_code_expr = func.trim(
-                func.regexp_replace(
-                    func.regexp_replace(
-                        func.upper(Component.name),
-                        '[^a-zA-Z0-9]', '_', 'g'
-                    ),
-                    '_+', '_', 'g'
-                ),
-                '_'
-            )
-            component = self.db.query(Component).filter(
-                generated_code_expr == entity_code
-            ).first()
+        Args:
+            refs: Iterable of reference strings (e.g. every #ref in an
+                  expression, or in a whole recalculation batch)
+            create_literals: False for read-only callers (e.g. validation):
+                  properties without a value_node are left unresolved
+                  instead of getting a literal created
 
-        if component:
-            # Find the property definition (use normalized name with spaces)
-            prop_def = self.db.query(PropertyDefinition).filter(
-                PropertyDefinition.name == prop_name_normalized
-            ).first()
+        Returns:
+            {ref: ValueNode} for every reference that could be resolved.
+            Unresolvable references are omitted.
+        """
+        # ref -> (entity_code, normalized property name)
+        parsed_refs: Dict[str, Tuple[str, str]] = {}
+        for ref in set(refs):
+            parts = ref.split(".")
+            if len(parts) != 2:
+                logger.warning(f"Invalid reference format: {ref} (expected CODE.property)")
+                continue
+            entity_code, prop_name = parts
+            # Normalize property name: underscores → spaces (Yield_Strength → "Yield Strength")
+            parsed_refs[ref] = (entity_code, prop_name.replace('_', ' '))
+
+        resolved: Dict[str, ValueNode] = {}
+        if not parsed_refs:
+            return resolved
+
+        codes = {code for code, _ in parsed_refs.values()}
+        prop_names = {name for _, name in parsed_refs.values()}
+
+        components = self._entities_by_code(Component, codes)
+        materials = self._entities_by_code(Material, codes)
+
+        prop_defs: Dict[str, PropertyDefinition] = {}
+        if components or materials:
+            for pd in self.db.query(PropertyDefinition).filter(
+                PropertyDefinition.name.in_(prop_names)
+            ).all():
+                prop_defs.setdefault(pd.name, pd)
+
+        prop_def_ids = {pd.id for pd in prop_defs.values()}
+
+        comp_props: Dict[Tuple[int, int], ComponentProperty] = {}
+        if components and prop_def_ids:
+            for cp in self.db.query(ComponentProperty).filter(
+                ComponentProperty.component_id.in_({c.id for c in components.values()}),
+                ComponentProperty.property_definition_id.in_(prop_def_ids)
+            ).all():
+                comp_props.setdefault((cp.component_id, cp.property_definition_id), cp)
+
+        mat_props: Dict[Tuple[int, int], MaterialProperty] = {}
+        if materials and prop_def_ids:
+            for mp in self.db.query(MaterialProperty).filter(
+                MaterialProperty.material_id.in_({m.id for m in materials.values()}),
+                MaterialProperty.property_definition_id.in_(prop_def_ids)
+            ).all():
+                mat_props.setdefault((mp.material_id, mp.property_definition_id), mp)
+
+        linked_ids = {
+            p.value_node_id
+            for p in list(comp_props.values()) + list(mat_props.values())
+            if p.value_node_id
+        }
+        linked_nodes: Dict[int, ValueNode] = {}
+        if linked_ids:
+            linked_nodes = {
+                n.id: n for n in self.db.query(ValueNode).filter(ValueNode.id.in_(linked_ids)).all()
+            }
 
-            if prop_def:
-                # Find the ComponentProperty linking them
-                comp_prop = self.db.query(ComponentProperty).filter(
-                    ComponentProperty.component_id == component.id,
-                    ComponentProperty.property_definition_id == prop_def.id
-                ).first()
+        for ref, (entity_code, prop_name_normalized) in parsed_refs.items():
+            prop_def = prop_defs.get(prop_name_normalized)
 
+            component = components.get(entity_code)
+            if component:
+                comp_prop = comp_props.get((component.id, prop_def.id)) if prop_def else None
                 if comp_prop:
                     if comp_prop.value_node_id:
-                        node = self.db.query(ValueNode).filter(
-                            ValueNode.id == comp_prop.value_node_id
-                        ).first()
-                        logger.info(f"_resolve_reference: Found existing ValueNode for {entity_code}.{prop_name}: numeric_value={node.numeric_value if node else None}, computed_unit_symbol={node.computed_unit_symbol if node else None}")
-                        return node
-                    else:
-                        # Property exists but has no value_node - create one from the literal value
-                        literal_value = comp_prop.single_value or comp_prop.average_value or comp_prop.min_value
-                        logger.info(f"_resolve_reference: Creating new ValueNode for {entity_code}.{prop_name}: literal_value={literal_value}")
-                        if literal_value is not None:
-                            # Convert from property unit to SI base unit
-                            prop_unit = prop_def.unit if prop_def else None
-                            # Normalize unit for consistent lookup (mm^2 -> mm²)
-                            normalized_prop_unit = self._normalize_unit(prop_unit)
-                            si_value = literal_value
-                            si_unit_symbol = None
-                            logger.info(f"_resolve_reference: prop_unit={prop_unit}, normalized={normalized_prop_unit}, in UNIT_TO_SI? {normalized_prop_unit in self.UNIT_TO_SI if normalized_prop_unit else False}")
-
-                            if normalized_prop_unit and normalized_prop_unit in self.UNIT_TO_SI:
-                                conversion_factor = self.UNIT_TO_SI[normalized_prop_unit]
-                                si_value = literal_value * conversion_factor
-                                # Get the SI base unit for this dimension
-                                dimension = self.UNIT_TO_DIMENSION.get(normalized_prop_unit)
-                                if dimension:
-                                    si_unit_symbol = self.DIMENSION_SI_UNITS.get(dimension)
-
-                            # Create a new literal ValueNode for this property (in SI units)
-                            new_node = ValueNode(
-                                node_type=NodeType.LITERAL,
-                                numeric_value=si_value,
-                                computed_value=si_value,
-                                computed_unit_symbol=si_unit_symbol,
-                                computation_status=ComputationStatus.VALID,
-                                description=f"{entity_code}.{prop_name}"
-                            )
-                            self.db.add(new_node)
-                            self.db.flush()
-                            # Link it back to the ComponentProperty
-                            comp_prop.value_node_id = new_node.id
-                            self.db.flush()
-                            return new_node
-
-            logger.warning(f"Component {entity_code} found but property '{prop_name_normalized}' not found or has no value_node")
+                        resolved[ref] = linked_nodes.get(comp_prop.value_node_id)
+                        continue
+                    literal_value = comp_prop.single_value or comp_prop.average_value or comp_prop.min_value
+                    if literal_value is not None and create_literals:
+                        resolved[ref] = self._create_property_literal(ref, comp_prop, literal_value, prop_def.unit)
+                        continue
+                logger.warning(f"Component {entity_code} found but property '{prop_name_normalized}' not found or has no value_node")
+
+            material = materials.get(entity_code)
+            if material:
+                mat_prop = mat_props.get((material.id, prop_def.id)) if prop_def else None
+                if mat_prop:
+                    if mat_prop.value_node_id:
+                        resolved[ref] = linked_nodes.get(mat_prop.value_node_id)
+                        continue
+                    literal_value = mat_prop.value or mat_prop.value_min
+                    if literal_value is not None and create_literals:
+                        resolved[ref] = self._create_property_literal(ref, mat_prop, literal_value, prop_def.unit)
+                        continue
+                logger.debug(f"Material {entity_code} found but property '{prop_name_normalized}' not found or has no value")
 
-        # Try to find Material by code
-        material = self.db.query(Material).filter(
-            Material.code == entity_code
-        ).first()
+        # Fallback: Try to find by description (legacy/direct value node reference)
+        unresolved = [ref for ref in parsed_refs if resolved.get(ref) is None]
+        if unresolved:
+            for node in self.db.query(ValueNode).filter(ValueNode.description.in_(unresolved)).all():
+                if resolved.get(node.description) is None:
+                    resolved[node.description] = node
 
-        # If not found by code, try by generated code from name using SQL
-        if not material:
-            from sqlalchemy import func
-            generated_code_expr = func.trim(
-                func.regexp_replace(
-                    func.regexp_replace(
-                        func.upper(Material.name),
-                        '[^a-zA-Z0-9]', '_', 'g'
-                    ),
-                    '_+', '_', 'g'
-                ),
-                '_'
-            )
-            material = self.db.query(Material).filter(
-                generated_code_expr == entity_code
-            ).first()
+        for ref in parsed_refs:
+            if resolved.get(ref) is None:
+                resolved.pop(ref, None)
+                logger.warning(f"Could not resolve reference: {ref}")
 
-        if material:
-            # Find the property definition (use normalized name with spaces)
-            prop_def = self.db.query(PropertyDefinition).filter(
-                PropertyDefinition.name == prop_name_normalized
-            ).first()
+        return resolved
 
-            if prop_def:
-                # Find the MaterialProperty linking them
-                mat_prop = self.db.query(MaterialProperty).filter(
-                    MaterialProperty.material_id == material.id,
-                    MaterialProperty.property_definition_id == prop_def.id
-                ).first()
+    def _entities_by_code(self, model, codes: Set[str]) -> Dict[str, Any]:
+        """
+        Load Components or Materials matching any of the given codes.
 
-                if mat_prop:
-                    if mat_prop.value_node_id:
-                        return self.db.query(ValueNode).filter(
-                            ValueNode.id == mat_prop.value_node_id
-                        ).first()
-                    else:
-                        # Property exists but has no value_node - create one from the legacy value
-                        literal_value = mat_prop.value or mat_prop.value_min
-                        if literal_value is not None:
-                            # Convert from property unit to SI base unit
-                            prop_unit = prop_def.unit if prop_def else None
-                            # Normalize unit for consistent lookup (mm^2 -> mm²)
-                            normalized_prop_unit = self._normalize_unit(prop_unit)
-                            si_value = literal_value
-                            si_unit_symbol = None
-
-                            if normalized_prop_unit and normalized_prop_unit in self.UNIT_TO_SI:
-                                conversion_factor = self.UNIT_TO_SI[normalized_prop_unit]
-                                si_value = literal_value * conversion_factor
-                                # Get the SI base unit for this dimension
-                                dimension = self.UNIT_TO_DIMENSION.get(normalized_prop_unit)
-                                if dimension:
-                                    si_unit_symbol = self.DIMENSION_SI_UNITS.get(dimension)
-                                logger.info(f"Converting material property: {literal_value} {prop_unit} -> {si_value} {si_unit_symbol}")
-                            else:
-                                logger.info(f"Creating literal ValueNode for material property with value={literal_value} (no unit conversion)")
-
-                            # Create a new literal ValueNode for this property (in SI units)
-                            new_node = ValueNode(
-                                node_type=NodeType.LITERAL,
-                                numeric_value=si_value,
-                                computed_value=si_value,
-                                computed_unit_symbol=si_unit_symbol,
-                                computation_status=ComputationStatus.VALID,
-                                description=f"{entity_code}.{prop_name}"
-                            )
-                            self.db.add(new_node)
-                            self.db.flush()
-                            # Link it back to the MaterialProperty
-                            mat_prop.value_node_id = new_node.id
-                            self.db.flush()
-                            return new_node
+        Explicit codes win over codes generated from the entity name.
+        Returns {code: entity}.
+        """
+        found: Dict[str, Any] = {}
+        for entity in self.db.query(model).filter(model.code.in_(codes)).all():
+            found.setdefault(entity.code, entity)
 
-            logger.debug(f"Material {entity_code} found but property '{prop_name_normalized}' not found or has no value")
+        remaining = codes - found.keys()
+        if remaining:
+            for entity in self.db.query(model).filter(model.generated_code.in_(remaining)).all():
+                found.setdefault(entity.generated_code, entity)
 
-        # Fallback: Try to find by description (legacy/direct value node reference)
-        node = self.db.query(ValueNode).filter(
-            ValueNode.description == ref
-        ).first()
+        return found
 
-        if node:
-            return node
+    def _create_property_literal(
+        self,
+        ref: str,
+        prop,
+        literal_value: float,
+        prop_unit: Optional[str]
+    ) -> ValueNode:
+        """
+        Create a literal ValueNode (in SI units) for a property that has a
+        legacy value but no value_node, and link it back to the property.
+        """
+        # Normalize unit for consistent lookup (mm^2 -> mm²)
+        normalized_prop_unit = self._normalize_unit(prop_unit)
+        si_value = literal_value
+        si_unit_symbol = None
+
+        if normalized_prop_unit and normalized_prop_unit in self.UNIT_TO_SI:
+            si_value = literal_value * self.UNIT_TO_SI[normalized_prop_unit]
+            # Get the SI base unit for this dimension
+            dimension = self.UNIT_TO_DIMENSION.get(normalized_prop_unit)
+            if dimension:
+                si_unit_symbol = self.DIMENSION_SI_UNITS.get(dimension)
+            logger.info(f"Converting property {ref}: {literal_value} {prop_unit} -> {si_value} {si_unit_symbol}")
+        else:
+            logger.info(f"Creating literal ValueNode for {ref} with value={literal_value} (no unit conversion)")
 
-        logger.warning(f"Could not resolve reference: {ref}")
-        return None
+        new_node = ValueNode(
+            node_type=NodeType.LITERAL,
+            numeric_value=si_value,
+            computed_value=si_value,
+            computed_unit_symbol=si_unit_symbol,
+            computation_status=ComputationStatus.VALID,
+            description=ref
+        )
+        self.db.add(new_node)
+        self.db.flush()
+        # Link it back to the ComponentProperty / MaterialProperty
+        prop.value_node_id = new_node.id
+        self.db.flush()
+        return new_node
 
     # ==================== EXPRESSION EVALUATION ====================
 
@@ -1128,7 +1258,42 @@ class ValueEngine:
             expected_unit: Optional unit symbol from PropertyDefinition for validation
 
         Returns: (value, unit_id, success, error_message, si_unit_symbol)
+
+        Dependencies (any node reached while another is being evaluated) are
+        served from the per-pass result cache when possible. VALID expression
+        and reference nodes reuse their stored computed_value instead of being
+        walked again. The node passed to recalculate() is always recomputed.
         """
+        is_dependency = bool(self._evaluation_stack)
+        if is_dependency:
+            cached = self._result_cache.get(node.id)
+            if cached is not None:
+                self._cache_hits += 1
+                return cached
+
+            if (node.node_type in (NodeType.EXPRESSION, NodeType.REFERENCE)
+                    and node.computation_status == ComputationStatus.VALID
+                    and node.computed_value is not None):
+                self._cache_hits += 1
+                result = (node.computed_value, node.computed_unit_id, True, None, node.computed_unit_symbol)
+                self._result_cache[node.id] = result
+                return result
+
+        # Circular dependency check happens in _compute_node; don't cache that outcome
+        if node.id in self._evaluation_stack:
+            return self._compute_node(node, expected_unit)
+
+        self._cache_misses += 1
+        result = self._compute_node(node, expected_unit)
+        self._result_cache[node.id] = result
+        return result
+
+    def _compute_node(
+        self,
+        node: ValueNode,
+        expected_unit: Optional[str] = None
+    ) -> Tuple[float, Optional[int], bool, Optional[str], Optional[str]]:
+        """Compute a node's value without consulting the per-pass cache."""
         node_desc = f"Node(id={node.id}, type={node.node_type.value})"
         logger.debug(
             f"compute_value: Starting computation for {node_desc}"
@@ -1202,7 +1367,9 @@ class ValueEngine:
         Evaluate an expression node.
 
         Resolves all dependencies, substitutes values, and computes result.
-        Also tracks unit propagation through the expression.
+        Also tracks unit propagation through the expression. The expression
+        itself is compiled once (see _get_compiled_expression); only LOOKUP(),
+        MODEL() and the dependency values are evaluated on each call.
 
         Args:
             node: The expression ValueNode to evaluate
@@ -1217,75 +1384,42 @@ class ValueEngine:
         if not parsed.get("valid"):
             return (None, None, False, "Invalid parsed expression", None)
 
-        # Get values for all dependencies
-        values = {}
-        units = {}
+        # Get values for all dependencies (first, so their units are current)
+        results_by_ref = {}
+        source_units = []
 
         for dep in node.dependencies:
             source = dep.source_node
             val, unit_id, success, error, _ = self.compute_value(source)
-            logger.info(f"_evaluate_expression: Dependency '{dep.variable_name}' -> val={val}, success={success}")
+            logger.debug(f"_evaluate_expression: Dependency '{dep.variable_name}' -> val={val}, success={success}")
 
             if not success:
                 return (None, None, False, f"Dependency '{dep.variable_name}' failed: {error}", None)
 
-            placeholder = None
-            for p, ref in parsed.get("placeholders", {}).items():
-                if ref == dep.variable_name:
-                    placeholder = p
-                    break
+            results_by_ref[dep.variable_name] = (val, unit_id)
+            source_units.append((dep.variable_name, source.computed_unit_symbol))
 
+        try:
+            compiled = self._get_compiled_expression(node, source_units)
+        except Exception as e:
+            logger.error(f"Failed to compile expression: {e}")
+            return (None, None, False, f"Evaluation error: {e}", None)
+
+        values = {}
+        units = {}
+        for ref, (val, unit_id) in results_by_ref.items():
+            placeholder = compiled.placeholders_by_ref.get(ref)
             if placeholder:
                 values[placeholder] = val
                 units[placeholder] = unit_id
-                logger.info(f"_evaluate_expression: placeholder {placeholder} = {val}")
 
         # Substitute values into the expression
         try:
-            modified_expr = parsed["modified"]
-
-            # Define functions and constants
-            local_dict = {
-                'sqrt': lambda x: x ** 0.5,
-                'sin': lambda x: __import__('math').sin(x),
-                'cos': lambda x: __import__('math').cos(x),
-                'tan': lambda x: __import__('math').tan(x),
-                'log': lambda x: __import__('math').log(x),
-                'ln': lambda x: __import__('math').log(x),
-                'exp': lambda x: __import__('math').exp(x),
-                'abs': abs,
-                'pi': 3.141592653589793,
-                'e': 2.718281828459045,
-            }
-
-            # Add placeholder values (from references)
-            # NOTE: Values from referenced ValueNodes are ALREADY in SI (stored that way)
-            # So we do NOT convert them again. We only use ref_units to track dimensions.
-            ref_units = parsed.get("ref_units", {})
-            dimensions_used = set()  # Track dimensions for SI unit determination
-            for p, val in values.items():
-                # Value is already in SI from compute_value, no conversion needed
-                local_dict[p] = val
-                # Track the dimension for bare literal handling
-                unit_symbol = ref_units.get(p)
-                if unit_symbol:
-                    # Normalize unit for consistent lookup (mm^2 -> mm²)
-                    normalized_unit = self._normalize_unit(unit_symbol)
-                    dimension = self.UNIT_TO_DIMENSION.get(normalized_unit)
-                    if dimension:
-                        dimensions_used.add(dimension)
-
-            # Add literal values with units (already converted to SI)
-            for p, lit_info in parsed.get("literal_values", {}).items():
-                local_dict[p] = lit_info['si_value']
-                # Track the dimension from literal
-                lit_unit = lit_info.get('unit')
-                if lit_unit:
-                    # Normalize unit for consistent lookup (mm^2 -> mm²)
-                    normalized_lit_unit = self._normalize_unit(lit_unit)
-                    dimension = self.UNIT_TO_DIMENSION.get(normalized_lit_unit)
-                    if dimension:
-                        dimensions_used.add(dimension)
+            # Functions, constants, literal values and raw bare literals are
+            # precompiled. Values from referenced ValueNodes are ALREADY in SI
+            # (stored that way), so they are substituted as-is.
+            local_dict = dict(compiled.constants)
+            local_dict.update(values)
 
             # Evaluate LOOKUP() function calls
             for p, lookup_info in parsed.get("lookup_calls", {}).items():
@@ -1296,11 +1430,7 @@ class ValueEngine:
                 if key_val_expr.startswith('#'):
                     # It's a reference - look it up in values dict
                     ref_name = key_val_expr[1:]  # Remove # prefix
-                    key_val = None
-                    for placeholder, ref in parsed.get("placeholders", {}).items():
-                        if ref == ref_name:
-                            key_val = values.get(placeholder)
-                            break
+                    key_val = values.get(compiled.placeholders_by_ref.get(ref_name))
                     if key_val is None:
                         return (None, None, False, f"LOOKUP key reference '{key_val_expr}' could not be resolved", None)
                 elif key_val_expr.startswith('"') and key_val_expr.endswith('"'):
@@ -1446,93 +1576,137 @@ class ValueEngine:
                 except Exception as e:
                     return (None, None, False, f"MODEL() evaluation failed: {e}", None)
 
-            # Handle bare literals (numbers without units)
-            # Only convert them using user's preferred unit for ADDITIVE expressions
-            # For expressions with * or /, bare literals should be dimensionless scalars
-            bare_literals = parsed.get("bare_literals", {})
-            original_expr = parsed.get("original", "")
-
-            # Check if expression has multiplication/division operators
-            # If so, bare literals should NOT be unit-converted (they're dimensionless scalars like "divide by 2")
-            has_mult_div = '*' in original_expr or '/' in original_expr
-
-            if bare_literals and len(dimensions_used) == 1 and not has_mult_div:
-                # Pure additive expression - convert bare literals using user's preferred unit
-                dimension = list(dimensions_used)[0]
-                user_unit = self._get_user_unit_preference(dimension)
+            # Bare literals default to their raw (dimensionless) values. Only a
+            # pure additive expression over a single dimension converts them
+            # using the user's preferred unit for that dimension.
+            if compiled.additive_dimension:
+                user_unit = self._get_user_unit_preference(compiled.additive_dimension)
                 if user_unit:
                     # Normalize unit for consistent lookup (mm^2 -> mm²)
                     normalized_user_unit = self._normalize_unit(user_unit)
                     conversion_factor = self.UNIT_TO_SI.get(normalized_user_unit, 1)
-                    logger.info(f"Converting bare literals using user preference: {user_unit} (factor: {conversion_factor})")
-                    for p, bare_info in bare_literals.items():
-                        si_val = bare_info['value'] * conversion_factor
-                        logger.debug(f"Bare literal {p}: {bare_info['value']} {user_unit} -> {si_val} SI")
-                        local_dict[p] = si_val
-                else:
-                    # No user preference - use raw value (interpreted as SI)
-                    for p, bare_info in bare_literals.items():
-                        local_dict[p] = bare_info['value']
-            else:
-                # Has * or /, no dimension context, or multiple dimensions - use raw values (dimensionless)
-                for p, bare_info in bare_literals.items():
-                    local_dict[p] = bare_info['value']
+                    logger.debug(f"Converting bare literals using user preference: {user_unit} (factor: {conversion_factor})")
+                    for p, value in compiled.bare_literals.items():
+                        local_dict[p] = value * conversion_factor
 
             # Evaluate
-            result = eval(modified_expr, {"__builtins__": {}}, local_dict)
-
-            # Compute the result dimension through full dimensional analysis
-            # This handles *, /, ^, **, sqrt, (), +, - operators correctly
-            computed_dimension, dim_error = self._compute_expression_dimension(parsed)
-
-            result_si_unit = None
-            dimension_warning = None
-            logger.info(f"_evaluate_expression: computed result={result}, computed_dimension={dimension_to_string(computed_dimension) if computed_dimension else 'None'}, dim_error={dim_error}")
-            if computed_dimension is not None:
-                # Get the SI unit symbol for the computed dimension
-                result_si_unit = dimension_to_si_unit(computed_dimension)
-                logger.info(f"_evaluate_expression: dimension_to_si_unit returned '{result_si_unit}'")
-                if result_si_unit is None and not computed_dimension.is_dimensionless():
-                    # Fallback: construct from dimension string
-                    result_si_unit = dimension_to_string(computed_dimension)
-                    logger.info(f"_evaluate_expression: Using dimension_to_string fallback: '{result_si_unit}'")
-                logger.info(f"Expression '{parsed.get('original', '')}' has dimension {dimension_to_string(computed_dimension)} -> SI unit '{result_si_unit}'")
-
-                # Validate against expected unit from PropertyDefinition
-                if expected_unit:
-                    expected_dimension = get_unit_dimension(expected_unit)
-                    if expected_dimension is not None and computed_dimension != expected_dimension:
-                        # Dimension mismatch!
-                        dimension_warning = (
-                            f"Unit mismatch: expression produces {dimension_to_string(computed_dimension)} "
-                            f"(SI: {result_si_unit or 'dimensionless'}), but property expects "
-                            f"{dimension_to_string(expected_dimension)} ({expected_unit})"
-                        )
-                        logger.warning(f"Dimension validation warning: {dimension_warning}")
-                        # Store the warning but don't fail - let the user see the computed value
-                        # The warning will be visible in the computation_error field
-            elif dim_error:
-                # Dimension error - log warning but don't fail the computation
-                logger.warning(f"Dimension analysis warning for '{parsed.get('original', '')}': {dim_error}")
-                dimension_warning = dim_error
-            else:
-                # Fallback to old behavior for simple expressions
-                if len(dimensions_used) == 1:
-                    dimension = list(dimensions_used)[0]
-                    result_si_unit = self.DIMENSION_SI_UNITS.get(dimension)
+            result = eval(compiled.code, {"__builtins__": {}}, local_dict)
+
+            # Result dimension and SI unit were computed when the expression was compiled
+            computed_dimension = compiled.dimension
+            result_si_unit = compiled.si_unit
+            dimension_warning = compiled.dimension_error
+
+            # Validate against expected unit from PropertyDefinition
+            if computed_dimension is not None and expected_unit:
+                expected_dimension = get_unit_dimension(expected_unit)
+                if expected_dimension is not None and computed_dimension != expected_dimension:
+                    # Dimension mismatch!
+                    dimension_warning = (
+                        f"Unit mismatch: expression produces {dimension_to_string(computed_dimension)} "
+                        f"(SI: {result_si_unit or 'dimensionless'}), but property expects "
+                        f"{dimension_to_string(expected_dimension)} ({expected_unit})"
+                    )
+                    logger.warning(f"Dimension validation warning: {dimension_warning}")
+                    # Store the warning but don't fail - let the user see the computed value
+                    # The warning will be visible in the computation_error field
 
-            # Store SI unit symbol in parsed_expression for later use
             result_unit_id = self._compute_result_unit(parsed, units)
 
             # Return with warning if there's a dimension issue
             # We still return success=True so the value is stored, but include warning in error slot
-            logger.info(f"_evaluate_expression: FINAL returning result={float(result)}, result_unit_id={result_unit_id}, result_si_unit='{result_si_unit}'")
+            logger.debug(f"_evaluate_expression: returning result={float(result)}, result_unit_id={result_unit_id}, result_si_unit='{result_si_unit}'")
             return (float(result), result_unit_id, True, dimension_warning, result_si_unit)
 
         except Exception as e:
             logger.error(f"Failed to evaluate expression: {e}")
             return (None, None, False, f"Evaluation error: {e}", None)
 
+    def _get_compiled_expression(
+        self, node: ValueNode, source_units: List[Tuple[str, Optional[str]]]
+    ) -> CompiledExpression:
+        """
+        Return the compiled form of an expression node, compiling on a miss.
+
+        Entries are keyed by node id and checked against a hash of the node's
+        expression string and its (reference, source unit symbol) pairs, since
+        dimension inference reads the sources' units. Unsaved nodes (no id)
+        are compiled each time.
+        """
+        compile_key = hash((node.expression_string, tuple(sorted(source_units, key=repr))))
+        if node.id is not None:
+            compiled = compiled_expressions.get(node.id, compile_key)
+            if compiled is not None:
+                return compiled
+
+        compiled = self._compile_expression(node.parsed_expression, compile_key)
+        if node.id is not None:
+            compiled_expressions.put(node.id, compiled)
+        return compiled
+
+    def _compile_expression(self, parsed: Dict, compile_key: int) -> CompiledExpression:
+        """Compile a parsed_expression and precompute everything value-independent."""
+        constants = dict(_EVAL_NAMESPACE)
+
+        # Track dimensions of units used, for bare literal handling
+        dimensions_used = set()
+        for unit_symbol in parsed.get("ref_units", {}).values():
+            if unit_symbol:
+                # Normalize unit for consistent lookup (mm^2 -> mm²)
+                dimension = self.UNIT_TO_DIMENSION.get(self._normalize_unit(unit_symbol))
+                if dimension:
+                    dimensions_used.add(dimension)
+
+        # Literal values with units (already converted to SI)
+        for p, lit_info in parsed.get("literal_values", {}).items():
+            constants[p] = lit_info['si_value']
+            lit_unit = lit_info.get('unit')
+            if lit_unit:
+                dimension = self.UNIT_TO_DIMENSION.get(self._normalize_unit(lit_unit))
+                if dimension:
+                    dimensions_used.add(dimension)
+
+        bare_literals = {p: info['value'] for p, info in parsed.get("bare_literals", {}).items()}
+        constants.update(bare_literals)
+
+        # For expressions with * or /, bare literals are dimensionless scalars
+        # (like "divide by 2"); only additive ones take the user's preferred unit
+        original_expr = parsed.get("original", "")
+        has_mult_div = '*' in original_expr or '/' in original_expr
+        additive_dimension = None
+        if bare_literals and len(dimensions_used) == 1 and not has_mult_div:
+            additive_dimension = next(iter(dimensions_used))
+
+        # Compute the result dimension through full dimensional analysis
+        # This handles *, /, ^, **, sqrt, (), +, - operators correctly
+        dimension, dim_error = self._compute_expression_dimension(parsed)
+
+        si_unit = None
+        if dimension is not None:
+            si_unit = dimension_to_si_unit(dimension)
+            if si_unit is None and not dimension.is_dimensionless():
+                # Fallback: construct from dimension string
+                si_unit = dimension_to_string(dimension)
+            logger.debug(f"Expression '{original_expr}' has dimension {dimension_to_string(dimension)} -> SI unit '{si_unit}'")
+        elif dim_error:
+            # Dimension error - reported as a warning, the computation still succeeds
+            logger.warning(f"Dimension analysis warning for '{original_expr}': {dim_error}")
+        elif len(dimensions_used) == 1:
+            # Fallback to old behavior for simple expressions
+            si_unit = self.DIMENSION_SI_UNITS.get(next(iter(dimensions_used)))
+
+        return CompiledExpression(
+            compile_key=compile_key,
+            code=compile(parsed["modified"], "<expression>", "eval"),
+            constants=constants,
+            placeholders_by_ref={ref: p for p, ref in parsed.get("placeholders", {}).items()},
+            bare_literals=bare_literals,
+            additive_dimension=additive_dimension,
+            dimension=dimension,
+            dimension_error=dim_error,
+            si_unit=si_unit,
+        )
+
     def _compute_result_unit(self, parsed: Dict, units: Dict[str, int]) -> Optional[int]:
         """
         Compute the resulting unit of an expression through dimensional analysis.
@@ -1604,24 +1778,29 @@ class ValueEngine:
         # This can happen if _get_reference_unit couldn't find the PropertyDefinition
         # but the ValueNode still has a computed_unit_symbol
         missing_units = []  # Track refs with missing unit info for warning
-        for placeholder, ref in parsed.get("placeholders", {}).items():
-            if placeholder not in placeholder_dimensions:
-                # Try to resolve the reference and get its computed_unit_symbol
-                source_node = self._resolve_reference(ref)
-                if source_node and source_node.computed_unit_symbol:
-                    dim = get_unit_dimension(source_node.computed_unit_symbol)
-                    if dim:
-                        placeholder_dimensions[placeholder] = dim
-                        logger.debug(f"Resolved dimension for {placeholder} ({ref}) from ValueNode: {dimension_to_string(dim)}")
-                    else:
-                        placeholder_dimensions[placeholder] = DIMENSIONLESS
-                        missing_units.append(ref)
+        unresolved = {
+            placeholder: ref
+            for placeholder, ref in parsed.get("placeholders", {}).items()
+            if placeholder not in placeholder_dimensions
+        }
+        # Resolve all of them at once and use each node's computed_unit_symbol
+        source_nodes = self.resolve_references(unresolved.values()) if unresolved else {}
+        for placeholder, ref in unresolved.items():
+            source_node = source_nodes.get(ref)
+            if source_node and source_node.computed_unit_symbol:
+                dim = get_unit_dimension(source_node.computed_unit_symbol)
+                if dim:
+                    placeholder_dimensions[placeholder] = dim
+                    logger.debug(f"Resolved dimension for {placeholder} ({ref}) from ValueNode: {dimension_to_string(dim)}")
                 else:
-                    # No unit info available - default to dimensionless
                     placeholder_dimensions[placeholder] = DIMENSIONLESS
                     missing_units.append(ref)
-                    logger.warning(f"No unit info for reference '{ref}', treating as dimensionless. "
-                                   "Dimension inference may be incorrect.")
+            else:
+                # No unit info available - default to dimensionless
+                placeholder_dimensions[placeholder] = DIMENSIONLESS
+                missing_units.append(ref)
+                logger.warning(f"No unit info for reference '{ref}', treating as dimensionless. "
+                               "Dimension inference may be incorrect.")
 
         # Bare literals are dimensionless scalars (like "* 2" or "/ 3")
         for placeholder in parsed.get("bare_literals", {}).keys():
@@ -1860,6 +2039,8 @@ class ValueEngine:
         Returns: (success, error_message)
         """
         self._evaluation_stack.clear()
+        if not self._in_pass:
+            self._begin_pass()
 
         value, unit_id, success, error_or_warning, si_unit_symbol = self.compute_value(node, expected_unit)
         logger.info(f"recalculate: compute_value returned value={value}, si_unit_symbol='{si_unit_symbol}', success={success}")
@@ -1882,20 +2063,18 @@ class ValueEngine:
         self.db.flush()
         return (success, error_or_warning)
 
-    def mark_dependents_stale(self, node: ValueNode):
+    def mark_dependents_stale(self, node: ValueNode) -> List[int]:
         """
         Mark all nodes that depend on this node as stale.
 
-        This triggers a cascade through the dependency graph.
-        """
-        for dep in node.dependents:
-            dependent = dep.dependent_node
-            if dependent.computation_status == ComputationStatus.VALID:
-                dependent.computation_status = ComputationStatus.STALE
-                # Recursively mark dependents
-                self.mark_dependents_stale(dependent)
+        The whole downstream closure is found with one recursive query and
+        its VALID nodes are flipped to STALE with a single UPDATE.
 
-        self.db.flush()
+        Returns the ids of the downstream closure.
+        """
+        downstream_ids = self._downstream_closure([node.id])
+        self._mark_stale(downstream_ids)
+        return downstream_ids
 
     def transfer_dependents(self, old_node: ValueNode, new_node: ValueNode):
         """
@@ -1903,7 +2082,7 @@ class ValueEngine:
 
         Used when replacing a node (e.g., expression -> literal) to maintain
         dependency relationships. Also marks all transferred dependents as stale
-        recursively (including their dependents).
+        along with their downstream dependents.
         """
         # Get all dependencies where old_node is the source
         deps_to_transfer = self.db.query(ValueDependency).filter(
@@ -1915,152 +2094,328 @@ class ValueEngine:
         for dep in deps_to_transfer:
             # Update the source_id to point to new node
             dep.source_id = new_node.id
-            # Mark the dependent AND all its downstream dependents as stale (recursive)
-            self._mark_node_and_dependents_stale(dep.dependent_node)
-
         self.db.flush()
 
-    def _mark_node_and_dependents_stale(self, node: ValueNode):
-        """Mark this node and all its downstream dependents as stale (recursive)."""
-        if node.computation_status == ComputationStatus.VALID:
-            node.computation_status = ComputationStatus.STALE
-        # Recursively mark all downstream dependents
-        for dep in node.dependents:
-            self._mark_node_and_dependents_stale(dep.dependent_node)
+        # Mark the transferred dependents AND all their downstream dependents as stale
+        transferred_ids = {dep.dependent_id for dep in deps_to_transfer}
+        self._mark_stale(self._downstream_closure(transferred_ids, include_seeds=True))
+        self.db.flush()
 
     def recalculate_stale(self, node: ValueNode) -> List[ValueNode]:
         """
         Recalculate all stale dependents of this node.
 
-        Walks downstream (dependents) to find stale nodes, then recalculates
-        them in proper order (dependencies first).
+        Marks the downstream closure stale, then recalculates its stale nodes
+        in proper order (dependencies first).
 
         Returns list of recalculated nodes.
         """
-        # First ensure all downstream dependents are marked stale (recursive)
-        self.mark_dependents_stale(node)
+        # First ensure all downstream dependents are marked stale
+        downstream_ids = self.mark_dependents_stale(node)
 
-        # Then collect all stale dependents (walking downstream)
-        stale_nodes = self._collect_stale_dependents(node)
+        # Then pick the stale ones out of the closure
+        stale_ids = self._stale_ids(downstream_ids)
 
-        if not stale_nodes:
+        if not stale_ids:
             logger.debug(f"No stale dependents found for node {node.id}")
             return []
 
-        logger.info(f"Found {len(stale_nodes)} stale dependents to recalculate")
-
-        # Sort by dependency order (nodes with fewer dependencies first)
-        # This ensures we recalculate in the right order
-        stale_nodes = self._sort_by_dependency_order(stale_nodes)
+        logger.info(f"Found {len(stale_ids)} stale dependents to recalculate")
 
-        recalculated = []
-        for n in stale_nodes:
-            logger.debug(f"Recalculating stale node {n.id}: {n.expression_string}")
-            success, error = self.recalculate(n)
-            if success:
-                recalculated.append(n)
-                logger.info(f"Successfully recalculated node {n.id}, new value: {n.computed_value}")
-            else:
-                logger.warning(f"Failed to recalculate node {n.id}: {error}")
+        # Evaluate each stale node once, in topological order, in one pass
+        result = self.recalculate_batch(stale_ids)
+        recalculated = result["recalculated"]
 
+        for error in result["errors"]:
+            logger.warning(f"Failed to recalculate node {error['node_id']}: {error['error']}")
+        logger.info(
+            f"recalculate_stale: {len(recalculated)}/{len(stale_ids)} nodes recalculated "
+            f"(cache hits={self._cache_hits}, misses={self._cache_misses})"
+        )
         self.db.flush()
         return recalculated
 
-    def _collect_stale_dependents(self, node: ValueNode, visited: Set[int] = None) -> List[ValueNode]:
-        """Collect all stale nodes that depend on this node (walk downstream)."""
-        if visited is None:
-            visited = set()
+    def _downstream_closure(self, node_ids: Iterable[int], include_seeds: bool = False) -> List[int]:
+        """
+        Ids of every node downstream of the given nodes.
 
-        result = []
+        Walks value_dependencies with a recursive CTE, so the cost is one
+        query regardless of graph size or depth. UNION (not UNION ALL) keeps
+        the walk finite if the graph contains a cycle.
+        """
+        seeds = {node_id for node_id in node_ids if node_id is not None}
+        if not seeds:
+            return []
 
-        # Walk through dependents (things that depend ON this node)
-        for dep in node.dependents:
-            dependent = dep.dependent_node
-            if dependent.id in visited:
-                continue
-            visited.add(dependent.id)
+        closure = (
+            select(ValueDependency.dependent_id.label("id"))
+            .where(ValueDependency.source_id.in_(seeds))
+            .cte("downstream", recursive=True)
+        )
+        closure = closure.union(
+            select(ValueDependency.dependent_id)
+            .join(closure, ValueDependency.source_id == closure.c.id)
+        )
+        downstream = set(self.db.execute(select(closure.c.id)).scalars())
+
+        if include_seeds:
+            downstream |= seeds
+        return sorted(downstream)
+
+    def _mark_stale(self, node_ids: List[int]):
+        """Flip the VALID nodes among node_ids to STALE with one UPDATE."""
+        if not node_ids:
+            return
+        self.db.execute(
+            update(ValueNode)
+            .where(
+                ValueNode.id.in_(node_ids),
+                ValueNode.computation_status == ComputationStatus.VALID,
+            )
+            .values(computation_status=ComputationStatus.STALE)
+        )
 
-            # If this dependent is stale, add it
-            if dependent.is_stale():
-                result.append(dependent)
+    def _stale_ids(self, node_ids: List[int]) -> List[int]:
+        """The subset of node_ids that needs recalculation (STALE or PENDING)."""
+        if not node_ids:
+            return []
+        return list(self.db.execute(
+            select(ValueNode.id)
+            .where(
+                ValueNode.id.in_(node_ids),
+                ValueNode.computation_status.in_([ComputationStatus.STALE, ComputationStatus.PENDING]),
+            )
+            .order_by(ValueNode.id)
+        ).scalars())
 
-            # Recursively collect from this dependent's dependents
-            result.extend(self._collect_stale_dependents(dependent, visited))
+    # ==================== BATCH RECALCULATION ====================
 
-        return result
+    def recalculate_batch(self, node_ids: Iterable[int]) -> Dict[str, Any]:
+        """
+        Recalculate a set of nodes, each exactly once, in dependency order.
 
-    def _sort_by_dependency_order(self, nodes: List[ValueNode]) -> List[ValueNode]:
-        """Sort nodes so dependencies are calculated before dependents."""
-        node_ids = {n.id for n in nodes}
+        The nodes and their dependency edges are loaded up front, ordered
+        with Kahn's algorithm so every node is evaluated after the in-batch
+        nodes it depends on, and evaluated in a single cache pass (sources
+        outside the batch are reused from their stored values when VALID).
+        Nodes caught in a cycle are evaluated last so compute_value() can
+        flag them CIRCULAR. Results are written back with one bulk UPDATE.
 
-        # Calculate dependency depth for each node
-        depths = {}
-        for node in nodes:
-            depths[node.id] = self._get_dependency_depth(node, node_ids)
+        Args:
+            node_ids: IDs of the nodes to recalculate
 
-        # Sort by depth (lower depth = fewer dependencies = calculate first)
-        return sorted(nodes, key=lambda n: depths[n.id])
+        Returns:
+            Dict with total, successful, failed, recalculated (ValueNodes),
+            errors, elapsed_seconds, nodes_per_second, cache_hits, cache_misses
+        """
+        started = time.perf_counter()
+
+        node_ids = list(dict.fromkeys(node_ids))
+        nodes_by_id: Dict[int, ValueNode] = {}
+        if node_ids:
+            nodes_by_id = {
+                n.id: n for n in self.db.query(ValueNode).options(
+                    selectinload(ValueNode.dependencies).selectinload(ValueDependency.source_node)
+                ).filter(ValueNode.id.in_(node_ids)).all()
+            }
 
-    def _get_dependency_depth(self, node: ValueNode, relevant_ids: Set[int]) -> int:
-        """Get the dependency depth of a node within a set of relevant nodes."""
-        max_depth = 0
-        for dep in node.dependencies:
-            if dep.source_id in relevant_ids:
-                source_node = dep.source_node
-                max_depth = max(max_depth, 1 + self._get_dependency_depth(source_node, relevant_ids))
-        return max_depth
+        expected_units = self._expected_units(nodes_by_id)
+        order, cyclic = self._topological_order(nodes_by_id)
+
+        self._begin_pass()
+        self._in_pass = True
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        recalculated: List[ValueNode] = []
+        errors: List[Dict[str, Any]] = []
+        try:
+            for node in order + cyclic:
+                self._evaluation_stack.clear()
+                try:
+                    value, unit_id, success, error, si_unit_symbol = self.compute_value(
+                        node, expected_units.get(node.id)
+                    )
+                except Exception as e:
+                    logger.error(f"recalculate_batch: node {node.id} raised {type(e).__name__}: {e}")
+                    success, error = False, str(e)
+
+                if success:
+                    rows.append({
+                        "id": node.id,
+                        "computed_value": value,
+                        "computed_unit_id": unit_id,
+                        "computed_unit_symbol": si_unit_symbol or node.computed_unit_symbol,
+                        "computation_status": ComputationStatus.VALID,
+                        # Dimension warning (or None) - value is still valid
+                        "computation_error": error,
+                        "last_computed": now,
+                    })
+                    recalculated.append(node)
+                else:
+                    status = (ComputationStatus.CIRCULAR
+                              if node.computation_status == ComputationStatus.CIRCULAR
+                              else ComputationStatus.ERROR)
+                    rows.append({
+                        "id": node.id,
+                        "computed_value": node.computed_value,
+                        "computed_unit_id": node.computed_unit_id,
+                        "computed_unit_symbol": node.computed_unit_symbol,
+                        "computation_status": status,
+                        "computation_error": error,
+                        "last_computed": node.last_computed,
+                    })
+                    errors.append({"node_id": node.id, "error": error})
+        finally:
+            self._in_pass = False
+
+        self._write_results(rows, nodes_by_id)
+
+        elapsed = time.perf_counter() - started
+        total = len(nodes_by_id)
+        logger.info(
+            f"recalculate_batch: {total} nodes in {elapsed * 1000:.1f}ms "
+            f"({len(recalculated)} ok, {len(errors)} failed, {len(cyclic)} in cycles; "
+            f"cache hits={self._cache_hits}, misses={self._cache_misses})"
+        )
+        return {
+            "total": total,
+            "successful": len(recalculated),
+            "failed": len(errors),
+            "recalculated": recalculated,
+            "errors": errors,
+            "elapsed_seconds": elapsed,
+            "nodes_per_second": (total / elapsed) if elapsed > 0 else 0.0,
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+        }
+
+    def _expected_units(self, nodes_by_id: Dict[int, ValueNode]) -> Dict[int, str]:
+        """
+        PropertyDefinition unit of each node that backs a component property,
+        fetched with one query - the expected_unit recalculate() is given
+        for the same node by the properties API.
+        """
+        if not nodes_by_id:
+            return {}
+        return dict(self.db.execute(
+            select(ComponentProperty.value_node_id, PropertyDefinition.unit)
+            .join(PropertyDefinition, ComponentProperty.property_definition_id == PropertyDefinition.id)
+            .where(ComponentProperty.value_node_id.in_(nodes_by_id))
+        ).all())
+
+    def _topological_order(self, nodes_by_id: Dict[int, ValueNode]) -> Tuple[List[ValueNode], List[ValueNode]]:
+        """
+        Order nodes so in-batch dependencies come first (Kahn's algorithm).
+
+        Only edges whose source is also in the batch constrain the order.
+
+        Returns:
+            (ordered, cyclic) - cyclic holds nodes that are part of, or
+            downstream of, a cycle and therefore couldn't be ordered.
+        """
+        in_degree = {node_id: 0 for node_id in nodes_by_id}
+        downstream: Dict[int, List[int]] = defaultdict(list)
+        for node_id, node in nodes_by_id.items():
+            for dep in node.dependencies:
+                if dep.source_id in nodes_by_id:
+                    in_degree[node_id] += 1
+                    downstream[dep.source_id].append(node_id)
+
+        queue = deque(sorted(node_id for node_id, degree in in_degree.items() if degree == 0))
+        ordered: List[ValueNode] = []
+        while queue:
+            node_id = queue.popleft()
+            ordered.append(nodes_by_id[node_id])
+            for dependent_id in downstream[node_id]:
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+        cyclic = [nodes_by_id[node_id] for node_id in sorted(in_degree) if in_degree[node_id] > 0]
+        return ordered, cyclic
+
+    def _write_results(self, rows: List[Dict[str, Any]], nodes_by_id: Dict[int, ValueNode]):
+        """
+        Persist computed results with a single bulk UPDATE by primary key and
+        mirror them onto the already-loaded ValueNode instances.
+        """
+        if not rows:
+            return
+
+        self.db.execute(update(ValueNode), rows)
+
+        for row in rows:
+            node = nodes_by_id[row["id"]]
+            for key, value in row.items():
+                if key != "id":
+                    set_committed_value(node, key, value)
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """The process-wide dependency index, loaded on first use."""
+        dependency_graph.ensure_loaded(self.db)
+        return dependency_graph
 
     def get_dependency_tree(self, node: ValueNode, depth: int = 10) -> Dict[str, Any]:
         """
         Get the dependency tree for a node.
 
-        Returns a nested dict structure showing all dependencies.
+        Returns a nested dict structure showing all dependencies. The shape
+        comes from the dependency index; the nodes within reach are loaded
+        with a single query.
         """
-        if depth <= 0:
-            return {"id": node.id, "truncated": True}
-
-        result = {
-            "id": node.id,
-            "type": node.node_type.value,
-            "status": node.computation_status.value,
-            "value": node.computed_value,
-            "expression": node.expression_string,
-            "dependencies": []
+        graph = self.graph
+
+        # Nodes fewer than `depth` hops away are expanded, so they need loading
+        within_reach = {node.id}
+        frontier = [node.id]
+        for _ in range(depth - 1):
+            frontier = [
+                source_id
+                for node_id in frontier
+                for source_id in graph.sources(node_id)
+                if source_id not in within_reach
+            ]
+            if not frontier:
+                break
+            within_reach.update(frontier)
+
+        nodes_by_id = {
+            n.id: n for n in self.db.query(ValueNode).filter(ValueNode.id.in_(within_reach))
         }
+        nodes_by_id[node.id] = node
 
-        for dep in node.dependencies:
-            result["dependencies"].append(
-                self.get_dependency_tree(dep.source_node, depth - 1)
-            )
+        def build(node_id: int, remaining: int) -> Dict[str, Any]:
+            current = nodes_by_id.get(node_id)
+            if remaining <= 0 or current is None:
+                return {"id": node_id, "truncated": True}
+            return {
+                "id": current.id,
+                "type": current.node_type.value,
+                "status": current.computation_status.value,
+                "value": current.computed_value,
+                "expression": current.expression_string,
+                "dependencies": [build(source_id, remaining - 1) for source_id in graph.sources(node_id)],
+            }
 
-        return result
+        return build(node.id, depth)
+
+    def get_dependency_depth(self, node: ValueNode) -> int:
+        """Length of the longest dependency chain below this node (0 for a leaf)."""
+        return self.graph.depth(node.id)
 
-    def check_circular_dependency(self, node_id: int, target_id: int, visited: Set[int] = None) -> bool:
+    def check_circular_dependency(self, node_id: int, target_id: int) -> bool:
         """
         Check if adding a dependency from node_id to target_id would create a cycle.
 
+        Answered from the in-memory dependency index without querying the DB;
+        edges this session has flushed but not committed are included.
+
         Returns True if it would create a circular dependency.
         """
-        if visited is None:
-            visited = set()
-
         if node_id == target_id:
             return True
-
-        if target_id in visited:
-            return False
-
-        visited.add(target_id)
-
-        target = self.db.query(ValueNode).get(target_id)
-        if not target:
-            return False
-
-        for dep in target.dependencies:
-            if self.check_circular_dependency(node_id, dep.source_id, visited):
-                return True
-
-        return False
+        return target_id in self.graph.downstream([node_id], include_seeds=True, session=self.db)
 
     # ==================== UPDATE HANDLERS ====================
 
@@ -2089,7 +2444,9 @@ class ValueEngine:
         if node.node_type != NodeType.EXPRESSION:
             raise ValueError("Can only update expression on expression nodes")
 
-        # Clear old dependencies
+        # Clear old dependencies. The bulk delete bypasses the flush hook
+        # that maintains the dependency index, so record the removal first.
+        dependency_graph.remove_sources(node.id, session=self.db)
         self.db.query(ValueDependency).filter(
             ValueDependency.dependent_id == node.id
         ).delete()
@@ -2099,18 +2456,17 @@ class ValueEngine:
         node.expression_string = expression
         node.parsed_expression = parsed
         node.computation_status = ComputationStatus.PENDING
+        compiled_expressions.invalidate(node.id)
 
         # Create new dependencies
         references = self._extract_references(expression)
-        for ref in references:
-            source_node = self._resolve_reference(ref)
-            if source_node:
-                dep = ValueDependency(
-                    dependent_id=node.id,
-                    source_id=source_node.id,
-                    variable_name=ref
-                )
-                self.db.add(dep)
+        for ref, source_node in self.resolve_references(references).items():
+            dep = ValueDependency(
+                dependent_id=node.id,
+                source_id=source_node.id,
+                variable_name=ref
+            )
+            self.db.add(dep)
 
         # Mark dependents as stale
         self.mark_dependents_stale(node)
@@ -5,16 +5,58 @@ Manages WebSocket connections and broadcasts analysis changes to connected clien
 Supports multiple connection types:
 - Global listeners (receive all analysis updates)
 - Analysis-specific listeners (receive updates for specific analyses)
+- Subscription-only listeners (receive updates only for analyses they subscribed to)
+
+Broadcast pipeline:
+- Each connection has a bounded outgoing queue drained by its own writer
+  task, so a broadcast only enqueues: a slow client never delays the others.
+- A message is serialized once and fanned out to every recipient's queue.
+- Rapid "updated"/"evaluated" events for the same analysis are coalesced:
+  within WS_COALESCE_WINDOW only the latest payload is sent.
+- A client whose queue fills up (or whose send exceeds WS_SEND_TIMEOUT) is
+  dropped as too slow: it is disconnected and closed with code 1013, and
+  can reconnect and reload.
+
+With several workers, start_backplane() routes analysis updates through an
+event backplane (see event_backplane.py): broadcasts are batched, compacted
+and published, and every worker fans received events out to its own
+connections through the pipeline above.
 """
 
-from typing import Dict, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 from fastapi import WebSocket
 import asyncio
 import json
 import logging
 
+from app.core.concurrency import spawn
+from app.core.config import settings
+from app.services.event_backplane import Backplane, compact_events, pack_events
+
 logger = logging.getLogger(__name__)
 
+# Events where only the latest state matters; merged within the coalesce window
+COALESCED_EVENTS = frozenset({"updated", "evaluated"})
+
+# Close code for slow consumers ("Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Outbox:
+    """Bounded outgoing queue and writer task for one connection."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.writer: Optional[asyncio.Task] = None
+
+    def close(self):
+        if self.writer is not None and self.writer is not asyncio.current_task():
+            self.writer.cancel()
+        # Discard undelivered messages so flush() does not wait on them
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
 
 class ConnectionManager:
     """
@@ -36,7 +78,22 @@ class ConnectionManager:
         await manager.broadcast_analysis_update(analysis_id, data)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        coalesce_window: Optional[float] = None,
+        batch_window: Optional[float] = None,
+    ):
+        self.queue_size = queue_size if queue_size is not None else settings.WS_SEND_QUEUE_SIZE
+        self.send_timeout = send_timeout if send_timeout is not None else settings.WS_SEND_TIMEOUT
+        self.coalesce_window = (
+            coalesce_window if coalesce_window is not None else settings.WS_COALESCE_WINDOW
+        )
+        self.batch_window = (
+            batch_window if batch_window is not None else settings.WS_BACKPLANE_BATCH_WINDOW
+        )
+
         # All active connections
         self.active_connections: Set[WebSocket] = set()
 
@@ -48,17 +105,45 @@ class ConnectionManager:
         # Key: WebSocket, Value: set of analysis_ids
         self.connection_subscriptions: Dict[WebSocket, Set[int]] = {}
 
-    async def connect(self, websocket: WebSocket) -> None:
+        # Connections that only want analyses they subscribed to
+        self.subscriptions_only: Set[WebSocket] = set()
+
+        # Outgoing queue + writer per connection
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+
+        # Coalesced events waiting for their window to end
+        # Key: (analysis_id, event_type), Value: (message, timer, loop)
+        self._pending: Dict[Tuple[int, str], Tuple[dict, asyncio.TimerHandle, asyncio.AbstractEventLoop]] = {}
+
+        # Cross-worker backplane (None = this worker's connections only)
+        self.backplane: Optional[Backplane] = None
+        self._outgoing: List[dict] = []
+        self._publisher: Optional[asyncio.Task] = None
+
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.published_count = 0
+
+    async def connect(self, websocket: WebSocket, subscriptions_only: bool = False) -> None:
         """Accept and register a new WebSocket connection."""
         await websocket.accept()
         self.active_connections.add(websocket)
         self.connection_subscriptions[websocket] = set()
+        if subscriptions_only:
+            self.subscriptions_only.add(websocket)
+        self._outbox(websocket)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection and clean up subscriptions."""
         # Remove from active connections
         self.active_connections.discard(websocket)
+        self.subscriptions_only.discard(websocket)
+
+        # Stop the writer and drop anything still queued
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox is not None:
+            outbox.close()
 
         # Clean up analysis subscriptions
         if websocket in self.connection_subscriptions:
@@ -95,24 +180,19 @@ class ConnectionManager:
 
         logger.debug(f"WebSocket unsubscribed from analysis {analysis_id}")
 
+    def set_subscriptions_only(self, websocket: WebSocket, enabled: bool) -> None:
+        """Switch a connection between all updates and subscribed analyses only."""
+        if enabled:
+            self.subscriptions_only.add(websocket)
+        else:
+            self.subscriptions_only.discard(websocket)
+
     async def broadcast_to_all(self, message: dict) -> None:
         """Broadcast a message to all connected clients."""
         if not self.active_connections:
             return
 
-        message_text = json.dumps(message)
-        disconnected = []
-
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_text)
-            except Exception as e:
-                logger.warning(f"Failed to send to connection: {e}")
-                disconnected.append(connection)
-
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        self._fan_out(list(self.active_connections), json.dumps(message))
 
     async def broadcast_analysis_update(
         self,
@@ -125,6 +205,14 @@ class ConnectionManager:
         1. All global listeners
         2. Connections subscribed to this specific analysis
 
+        With a backplane, the update is queued for the next published batch
+        and delivered (on every worker) when it comes back from the backplane.
+
+        "updated" and "evaluated" events are held for the coalesce window;
+        a newer event of the same type for the same analysis replaces the
+        held one. Other events first release anything held for the analysis,
+        so clients still see events in order.
+
         Args:
             analysis_id: The ID of the analysis that changed
             event_type: Type of event (created, updated, deleted, evaluated)
@@ -137,43 +225,196 @@ class ConnectionManager:
             "data": data
         }
 
-        # Get unique set of connections to notify
-        connections_to_notify: Set[WebSocket] = set()
+        if self.backplane is not None:
+            self._outgoing.append(message)
+            if self._publisher is None or self._publisher.done():
+                self._publisher = asyncio.get_running_loop().create_task(self._publish_after(self.batch_window))
+            return
 
-        # Add all active connections (global listeners)
-        connections_to_notify.update(self.active_connections)
+        self._dispatch(message)
 
-        # Add analysis-specific subscribers (they're already in active_connections,
-        # but this ensures we don't miss any edge cases)
-        if analysis_id in self.analysis_subscriptions:
-            connections_to_notify.update(self.analysis_subscriptions[analysis_id])
+    def _dispatch(self, message: dict) -> None:
+        """Deliver an update to this worker's connections (coalescing as needed)."""
+        if not self.active_connections:
+            return
 
-        if not connections_to_notify:
+        analysis_id = message["analysis_id"]
+        event_type = message["event"]
+        loop = asyncio.get_running_loop()
+        if event_type in COALESCED_EVENTS and self.coalesce_window > 0:
+            key = (analysis_id, event_type)
+            held = self._pending.get(key)
+            if held is not None and held[2] is loop:
+                self.coalesced_count += 1
+                self._pending[key] = (message, held[1], loop)
+            else:
+                timer = loop.call_later(self.coalesce_window, self._release, key)
+                self._pending[key] = (message, timer, loop)
             return
 
-        message_text = json.dumps(message)
-        disconnected = []
+        self._release_analysis(analysis_id)
+        self._send_update(message)
+
+    def _release(self, key: Tuple[int, str]) -> None:
+        """Send a held event (coalesce window over)."""
+        held = self._pending.pop(key, None)
+        if held is not None:
+            held[1].cancel()
+            self._send_update(held[0])
+
+    def _release_analysis(self, analysis_id: int) -> None:
+        for key in [k for k in self._pending if k[0] == analysis_id]:
+            self._release(key)
+
+    async def start_backplane(self, backplane: Backplane) -> None:
+        """Route analysis updates through backplane (shared by all workers)."""
+        await backplane.start(self._on_backplane_events)
+        self.backplane = backplane
+        logger.info(f"WebSocket broadcasts using {type(backplane).__name__}")
+
+    async def stop_backplane(self) -> None:
+        """Publish anything still batched and detach from the backplane."""
+        if self.backplane is None:
+            return
+        await self._publish()
+        await self.backplane.stop()
+        self.backplane = None
+
+    async def _publish_after(self, delay: float) -> None:
+        # Updates queued while a batch is in flight don't start a new
+        # publisher (this one isn't done yet), so keep going until none are left
+        while True:
+            await asyncio.sleep(delay)
+            await self._publish()
+            if not self._outgoing:
+                return
+
+    async def _publish(self) -> None:
+        """Compact and publish the batched updates."""
+        batch, self._outgoing = compact_events(self._outgoing), []
+        if not batch or self.backplane is None:
+            return
+        try:
+            await self.backplane.publish(pack_events(batch, self.backplane.max_payload_bytes))
+            self.published_count += len(batch)
+        except Exception as e:
+            # This worker's clients still get the updates
+            logger.error(f"Backplane publish failed, delivering locally only: {e}")
+            for message in batch:
+                self._dispatch(message)
 
-        for connection in connections_to_notify:
-            try:
-                await connection.send_text(message_text)
-            except Exception as e:
-                logger.warning(f"Failed to broadcast analysis update: {e}")
-                disconnected.append(connection)
+    def _on_backplane_events(self, events: List[dict]) -> None:
+        """Deliver a batch received from the backplane (any worker's)."""
+        for message in events:
+            if isinstance(message, dict) and message.get("type") == "analysis_update":
+                self._dispatch(message)
 
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+    def _send_update(self, message: dict) -> None:
+        analysis_id = message["analysis_id"]
 
-        logger.info(f"Broadcast analysis {event_type} for ID {analysis_id} to {len(connections_to_notify)} clients")
+        # Global listeners plus subscribers of this analysis
+        recipients: Set[WebSocket] = self.active_connections - self.subscriptions_only
+        recipients |= self.analysis_subscriptions.get(analysis_id, set())
 
-    async def send_personal_message(self, websocket: WebSocket, message: dict) -> None:
-        """Send a message to a specific connection."""
+        if not recipients:
+            return
+
+        self._fan_out(recipients, json.dumps(message))
+        logger.info(
+            f"Broadcast analysis {message['event']} for ID {analysis_id} to {len(recipients)} clients"
+        )
+
+    def _fan_out(self, connections, message_text: str) -> None:
+        """Queue one serialized message for each connection (never waits on a client)."""
+        for connection in connections:
+            if connection not in self.active_connections:
+                continue
+            outbox = self._outbox(connection)
+            try:
+                outbox.queue.put_nowait(message_text)
+            except asyncio.QueueFull:
+                self.drop_slow_consumer(connection, f"{self.queue_size} messages queued")
+
+    def _outbox(self, websocket: WebSocket) -> _Outbox:
+        """The connection's outbox, starting its writer on first use."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            outbox = _Outbox(self.queue_size)
+            outbox.writer = asyncio.get_running_loop().create_task(self._write(websocket, outbox))
+            self._outboxes[websocket] = outbox
+        return outbox
+
+    async def _write(self, websocket: WebSocket, outbox: _Outbox) -> None:
+        """Writer task: send queued messages to one connection, in order."""
+        while True:
+            message_text = await outbox.queue.get()
+            try:
+                await asyncio.wait_for(websocket.send_text(message_text), timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                self.drop_slow_consumer(websocket, f"send took over {self.send_timeout}s")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to send to connection: {e}")
+                self.disconnect(websocket)
+                return
+            finally:
+                outbox.queue.task_done()
+
+    def drop_slow_consumer(self, websocket: WebSocket, reason: str) -> None:
+        """Disconnect a client that cannot keep up and close its socket."""
+        if websocket not in self.active_connections:
+            return
+        self.dropped_count += 1
+        logger.warning(f"Dropping slow WebSocket client: {reason}")
+        self.disconnect(websocket)
+        spawn(self._close(websocket, SLOW_CONSUMER_CLOSE_CODE))
+
+    async def _close(self, websocket: WebSocket, code: int) -> None:
         try:
-            await websocket.send_text(json.dumps(message))
+            await asyncio.wait_for(websocket.close(code=code), timeout=self.send_timeout)
         except Exception as e:
-            logger.warning(f"Failed to send personal message: {e}")
+            logger.debug(f"Closing WebSocket failed: {e}")
+
+    async def send_personal_message(self, websocket: WebSocket, message: dict) -> None:
+        """Send a message to a specific connection (queued behind its broadcasts)."""
+        if websocket not in self.active_connections:
+            try:
+                await websocket.send_text(json.dumps(message))
+            except Exception as e:
+                logger.warning(f"Failed to send personal message: {e}")
+                self.disconnect(websocket)
+            return
+
+        self._fan_out([websocket], json.dumps(message))
+        outbox = self._outboxes.get(websocket)
+        if outbox is not None:
+            # Replies are sent before the client's next request is read
+            await outbox.queue.join()
+
+    async def flush(self) -> None:
+        """
+        Release held events and wait until every queued message is sent.
+
+        Batched updates are published first; with a backplane they are
+        delivered once they come back from it.
+        """
+        if self._outgoing:
+            await self._publish()
+        for key in list(self._pending):
+            self._release(key)
+        await asyncio.gather(*(outbox.queue.join() for outbox in list(self._outboxes.values())))
+
+    async def close(self) -> None:
+        """Stop the backplane and disconnect every client (shutdown)."""
+        await self.stop_backplane()
+        for _, timer, _ in self._pending.values():
+            timer.cancel()
+        self._pending.clear()
+
+        writers = [outbox.writer for outbox in self._outboxes.values() if outbox.writer is not None]
+        for websocket in list(self.active_connections | set(self._outboxes)):
             self.disconnect(websocket)
+        await asyncio.gather(*writers, return_exceptions=True)
 
     @property
     def connection_count(self) -> int:
@@ -184,6 +425,19 @@ class ConnectionManager:
         """Get the number of subscribers for a specific analysis."""
         return len(self.analysis_subscriptions.get(analysis_id, set()))
 
+    def stats(self) -> dict:
+        """Connection, queue and drop counters for /health."""
+        return {
+            "connections": len(self.active_connections),
+            "subscriptions_only": len(self.subscriptions_only),
+            "queued": sum(outbox.queue.qsize() for outbox in self._outboxes.values()),
+            "held": len(self._pending),
+            "coalesced": self.coalesced_count,
+            "dropped_slow": self.dropped_count,
+            "backplane": type(self.backplane).__name__ if self.backplane else None,
+            "published": self.published_count,
+        }
+
 
 # Global instance for use across the application
 manager = ConnectionManager()
@@ -0,0 +1,41 @@
+"""add generated_code to components and materials
+
+Revision ID: l0k1b2c3d4e5
+Revises: k9j0a1b2c3d4
+Create Date: 2026-10-16 09:00:00.000000
+
+Persists the name-derived reference code ("Heat Bed" -> "HEAT_BED") so
+#CODE.property resolution and entity autocomplete can use an index instead
+of evaluating REGEXP_REPLACE over every row.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'l0k1b2c3d4e5'
+down_revision = 'k9j0a1b2c3d4'
+branch_labels = None
+depends_on = None
+
+# Same normalization as app.models.generated_code.generate_code_from_name
+BACKFILL_SQL = """
+    UPDATE {table}
+    SET generated_code = TRIM(BOTH '_' FROM REGEXP_REPLACE(
+        REGEXP_REPLACE(UPPER(name), '[^a-zA-Z0-9]', '_', 'g'),
+        '_+', '_', 'g'
+    ))
+"""
+
+
+def upgrade():
+    for table in ('components', 'materials'):
+        op.add_column(table, sa.Column('generated_code', sa.String(), nullable=True))
+        op.execute(BACKFILL_SQL.format(table=table))
+        op.create_index(f'ix_{table}_generated_code', table, ['generated_code'], unique=False)
+
+
+def downgrade():
+    for table in ('components', 'materials'):
+        op.drop_index(f'ix_{table}_generated_code', table_name=table)
+        op.drop_column(table, 'generated_code')
@@ -0,0 +1,29 @@
+"""index value_dependencies source and dependent ids
+
+Revision ID: m1l2c3d4e5f6
+Revises: l0k1b2c3d4e5
+Create Date: 2026-10-16 11:00:00.000000
+
+Stale propagation walks value_dependencies by source_id with a recursive
+CTE, and recalculation loads edges by dependent_id; both need an index.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'm1l2c3d4e5f6'
+down_revision = 'l0k1b2c3d4e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_value_dependencies_source_id', 'value_dependencies', ['source_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_value_dependencies_dependent_id', 'value_dependencies', ['dependent_id'],
+                    unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_value_dependencies_dependent_id', table_name='value_dependencies')
+    op.drop_index('ix_value_dependencies_source_id', table_name='value_dependencies')
@@ -0,0 +1,33 @@
+"""index analysis listing lookups
+
+Revision ID: n2m3d4e5f6a7
+Revises: m1l2c3d4e5f6
+Create Date: 2026-10-16 15:00:00.000000
+
+/analyses loads output ValueNodes by source_model_instance_id and inputs by
+model_instance_id for a page of instances at a time, and pages by
+(created_at, id) keyset.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'n2m3d4e5f6a7'
+down_revision = 'm1l2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_value_nodes_source_model_instance_id', 'value_nodes', ['source_model_instance_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_model_inputs_model_instance_id', 'model_inputs', ['model_instance_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_model_instances_created_at_id', 'model_instances', ['created_at', 'id'],
+                    unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_model_instances_created_at_id', table_name='model_instances')
+    op.drop_index('ix_model_inputs_model_instance_id', table_name='model_inputs')
+    op.drop_index('ix_value_nodes_source_model_instance_id', table_name='value_nodes')
@@ -0,0 +1,37 @@
+"""make model_instances.created_at non-null
+
+Revision ID: o3n4e5f6a7b8
+Revises: n2m3d4e5f6a7
+Create Date: 2026-10-16 18:00:00.000000
+
+/analyses pages by (created_at, id) keyset; a NULL created_at compares as
+unknown and silently ends the walk. Legacy rows without one take their
+last_computed time, or the epoch so they sort oldest.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'o3n4e5f6a7b8'
+down_revision = 'n2m3d4e5f6a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "UPDATE model_instances SET created_at = COALESCE(last_computed, TIMESTAMP '1970-01-01 00:00:00') "
+        "WHERE created_at IS NULL"
+    )
+    op.alter_column('model_instances', 'created_at',
+                    existing_type=sa.DateTime(),
+                    nullable=False,
+                    server_default=sa.func.now())
+
+
+def downgrade():
+    op.alter_column('model_instances', 'created_at',
+                    existing_type=sa.DateTime(),
+                    nullable=True,
+                    server_default=None)
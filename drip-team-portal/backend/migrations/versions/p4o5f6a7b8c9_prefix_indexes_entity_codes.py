@@ -0,0 +1,37 @@
+"""prefix-match indexes on entity codes
+
+Revision ID: p4o5f6a7b8c9
+Revises: o3n4e5f6a7b8
+Create Date: 2026-10-17 09:00:00.000000
+
+/search/entities matches code and generated_code by prefix (LIKE 'Q%').
+A default btree only serves LIKE under the C collation, so these use
+varchar_pattern_ops. PostgreSQL only; other databases keep the plain indexes.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'p4o5f6a7b8c9'
+down_revision = 'o3n4e5f6a7b8'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('code', 'generated_code')
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in ('components', 'materials'):
+        for column in COLUMNS:
+            op.create_index(f'ix_{table}_{column}_prefix', table, [column], unique=False,
+                            postgresql_ops={column: 'varchar_pattern_ops'}, if_not_exists=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in ('components', 'materials'):
+        for column in COLUMNS:
+            op.drop_index(f'ix_{table}_{column}_prefix', table_name=table)
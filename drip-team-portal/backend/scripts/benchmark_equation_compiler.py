@@ -0,0 +1,42 @@
+"""Benchmark compiled equations against the AST tree walker.
+
+Run with: PYTHONPATH=. python scripts/benchmark_equation_compiler.py [iterations]
+"""
+
+import sys
+import os
+import timeit
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.equation_engine import parse_equation, evaluate_equation, compile_equation
+
+
+EQUATIONS = [
+    ("thermal expansion", "CTE * delta_T * L0", {"CTE": 2.3e-5, "delta_T": 100, "L0": 1.0}),
+    ("beam deflection", "F * L^3 / (3 * E * I)", {"F": 1000, "L": 2.0, "E": 200e9, "I": 8e-6}),
+    ("convection", "h * A * (T_s - T_inf)", {"h": 25, "A": 0.5, "T_s": 350, "T_inf": 293}),
+    ("pendulum", "2 * pi * sqrt(L / g)", {"L": 1.2, "g": 9.81}),
+    ("damped", "A * exp(-zeta * omega * t) * cos(omega * sqrt(1 - zeta^2) * t)",
+     {"A": 1.0, "zeta": 0.1, "omega": 12.0, "t": 0.3}),
+]
+
+
+def main(iterations: int = 20000):
+    print(f"{'equation':<20} {'tree walk':>12} {'compiled':>12} {'speedup':>9}")
+    for name, text, inputs in EQUATIONS:
+        ast = parse_equation(text, allowed_inputs=list(inputs))["ast"]
+        compiled = compile_equation(ast)
+        assert compiled(inputs) == evaluate_equation(ast, inputs)
+
+        walk = min(timeit.repeat(lambda: evaluate_equation(ast, inputs), number=iterations, repeat=3))
+        fast = min(timeit.repeat(lambda: compiled(inputs), number=iterations, repeat=3))
+        print(
+            f"{name:<20} {walk / iterations * 1e6:>10.2f}us {fast / iterations * 1e6:>10.2f}us "
+            f"{walk / fast:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,48 @@
+"""Shared fixtures for backend tests."""
+
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_value_engine_caches():
+    """Node ids are reused across in-memory test databases; start each test cold."""
+    value_engine = sys.modules.get("app.services.value_engine")
+    if value_engine is not None:
+        value_engine.compiled_expressions.clear()
+    dependency_graph = sys.modules.get("app.services.dependency_graph")
+    if dependency_graph is not None:
+        dependency_graph.dependency_graph.invalidate()
+    model_evaluation = sys.modules.get("app.services.model_evaluation")
+    if model_evaluation is not None:
+        model_evaluation.compiled_models.clear()
+    properties_router = sys.modules.get("app.services.properties.router")
+    if properties_router is not None:
+        properties_router.lookup_cache.clear()
+    properties_registry = sys.modules.get("app.services.properties.registry")
+    if properties_registry is not None:
+        properties_registry.clear_view_cache()
+    yield
+
+
+@pytest.fixture
+def engine_and_db():
+    """In-memory SQLite session plus a statement counter."""
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.database import Base
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    yield session, statements
+    session.close()
@@ -0,0 +1,199 @@
+"""
+Event Backplane Tests
+
+Tests for:
+- compact_events() / pack_events() batching
+- Analysis updates crossing "workers" (ConnectionManagers on one InMemoryHub)
+- Falling back to local delivery when publishing fails
+- create_backplane() configuration
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.services.event_backplane import (
+    InMemoryBackplane,
+    InMemoryHub,
+    compact_events,
+    create_backplane,
+    pack_events,
+)
+from app.services.websocket_manager import ConnectionManager
+
+
+def _event(analysis_id, event, **data):
+    return {"type": "analysis_update", "event": event, "analysis_id": analysis_id, "data": data}
+
+
+def _ws():
+    ws = MagicMock()
+    ws.accept = AsyncMock()
+    ws.send_text = AsyncMock()
+    return ws
+
+
+def _received(ws):
+    return [json.loads(call[0][0]) for call in ws.send_text.call_args_list]
+
+
+async def _worker(hub):
+    manager = ConnectionManager(coalesce_window=0, batch_window=0.01)
+    await manager.start_backplane(InMemoryBackplane(hub))
+    return manager
+
+
+async def _settle(*managers):
+    """Let batches publish and loop back, then drain the writers."""
+    await asyncio.sleep(0.03)
+    for manager in managers:
+        await manager.flush()
+
+
+class TestBatching:
+    """Compaction and payload packing."""
+
+    def test_compact_keeps_latest_update(self):
+        events = [
+            _event(1, "updated", v=1),
+            _event(2, "created"),
+            _event(1, "updated", v=2),
+            _event(1, "evaluated", v=3),
+        ]
+        compacted = compact_events(events)
+        assert [(e["analysis_id"], e["event"]) for e in compacted] == [
+            (2, "created"), (1, "updated"), (1, "evaluated")
+        ]
+        assert compacted[1]["data"]["v"] == 2
+
+    def test_compact_drops_updates_before_delete(self):
+        events = [_event(1, "updated"), _event(1, "evaluated"), _event(1, "deleted"), _event(2, "updated")]
+        assert [(e["analysis_id"], e["event"]) for e in compact_events(events)] == [
+            (1, "deleted"), (2, "updated")
+        ]
+
+    def test_pack_respects_size_limit(self):
+        events = [_event(i, "created", name="x" * 200) for i in range(100)]
+        payloads = pack_events(events, max_bytes=2000)
+
+        assert len(payloads) > 1
+        assert all(len(p.encode()) <= 2000 for p in payloads)
+        unpacked = [e for p in payloads for e in json.loads(p)]
+        assert unpacked == events
+
+    def test_pack_truncates_oversized_event(self):
+        payloads = pack_events([_event(7, "evaluated", blob="x" * 5000)], max_bytes=1000)
+
+        event = json.loads(payloads[0])[0]
+        assert event["truncated"] is True
+        assert event["data"] == {"id": 7}
+
+
+class TestCrossWorker:
+    """Updates published on one worker reach clients on every worker."""
+
+    @pytest.mark.asyncio
+    async def test_update_reaches_other_worker(self):
+        hub = InMemoryHub()
+        worker_a, worker_b = await _worker(hub), await _worker(hub)
+        client_a, client_b = _ws(), _ws()
+        await worker_a.connect(client_a)
+        await worker_b.connect(client_b)
+
+        await worker_a.broadcast_analysis_update(1, "evaluated", {"id": 1})
+        await _settle(worker_a, worker_b)
+
+        assert [e["analysis_id"] for e in _received(client_a)] == [1]
+        assert [e["analysis_id"] for e in _received(client_b)] == [1]
+        await worker_a.close()
+        await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_burst_published_as_one_compacted_batch(self):
+        hub = InMemoryHub()
+        worker_a, worker_b = await _worker(hub), await _worker(hub)
+        client_b = _ws()
+        await worker_b.connect(client_b)
+
+        for version in range(20):
+            await worker_a.broadcast_analysis_update(1, "updated", {"version": version})
+        await _settle(worker_a, worker_b)
+
+        assert len(hub.published) == 1
+        assert [e["data"]["version"] for e in _received(client_b)] == [19]
+        assert worker_a.stats()["published"] == 1
+        await worker_a.close()
+        await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_delivers_locally(self):
+        hub = InMemoryHub()
+        worker = await _worker(hub)
+        worker.backplane.publish = AsyncMock(side_effect=ConnectionError("backplane down"))
+        client = _ws()
+        await worker.connect(client)
+
+        await worker.broadcast_analysis_update(1, "created", {"id": 1})
+        await _settle(worker)
+
+        assert [e["event"] for e in _received(client)] == ["created"]
+        await worker.close()
+
+    @pytest.mark.asyncio
+    async def test_update_queued_during_slow_publish_is_sent(self):
+        hub = InMemoryHub()
+        worker_a, worker_b = await _worker(hub), await _worker(hub)
+        client_b = _ws()
+        await worker_b.connect(client_b)
+
+        publish = worker_a.backplane.publish
+
+        async def slow_publish(payloads):
+            await asyncio.sleep(0.05)
+            await publish(payloads)
+
+        worker_a.backplane.publish = slow_publish
+
+        await worker_a.broadcast_analysis_update(1, "created", {"id": 1})
+        await asyncio.sleep(0.03)  # first batch is now in flight
+        await worker_a.broadcast_analysis_update(2, "created", {"id": 2})
+        await asyncio.sleep(0.15)
+        await worker_b.flush()
+
+        assert worker_a._outgoing == []
+        assert [e["analysis_id"] for e in _received(client_b)] == [1, 2]
+        await worker_a.close()
+        await worker_b.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_publishes_pending(self):
+        hub = InMemoryHub()
+        worker = await _worker(hub)
+
+        await worker.broadcast_analysis_update(1, "deleted", {"id": 1})
+        await worker.stop_backplane()
+
+        assert len(hub.published) == 1
+        assert worker.backplane is None
+        assert hub.subscribers == []
+
+
+class TestCreateBackplane:
+    """settings.WS_BACKPLANE values."""
+
+    def test_local(self):
+        assert create_backplane("local") is None
+
+    def test_memory(self):
+        assert isinstance(create_backplane("memory"), InMemoryBackplane)
+
+    def test_postgres_needs_postgres_database(self):
+        engine = create_engine("sqlite://")
+        assert create_backplane("postgres", engine) is None
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            create_backplane("carrier-pigeon")
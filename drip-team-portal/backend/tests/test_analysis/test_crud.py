@@ -8,6 +8,7 @@ Tests for:
 - PATCH /api/v1/analyses/{id} - Update analysis
 - DELETE /api/v1/analyses/{id} - Delete analysis
 - POST /api/v1/analyses/{id}/evaluate - Force re-evaluation
+- PATCH /api/v1/physics-models/{id} - MODEL() picks up the new version
 
 NOTE: These tests define the expected API behavior.
 All tests are SKIPPED until the analysis router is implemented.
@@ -19,9 +20,12 @@ To run tests once the endpoint is implemented:
 4. Run: pytest tests/test_analysis/test_crud.py -v
 """
 
+import base64
+
 import pytest
 from app.models.physics_model import ModelInstance, ModelInput
 from app.models.values import ValueNode, ComputationStatus
+from app.services.equation_engine import parse_equation
 
 
 class TestListAnalyses:
@@ -100,7 +104,6 @@ class TestListAnalyses:
         assert 'model' in data[0]
         assert data[0]['model']['name'] == "Thermal Expansion"
 
-    @pytest.mark.skip(reason="Filter params not implemented in API")
     def test_filter_by_status(self, client, db, multiple_analyses):
         """Filter analyses by computation status."""
         # Set different statuses
@@ -122,7 +125,6 @@ class TestListAnalyses:
         assert len(data) == 2
         assert all(item['computation_status'] == 'valid' for item in data)
 
-    @pytest.mark.skip(reason="Filter params not implemented in API")
     def test_filter_by_model_id(self, client, db, multiple_analyses, thermal_model):
         """Filter analyses by physics model."""
         model_id = thermal_model.id
@@ -139,7 +141,6 @@ class TestListAnalyses:
         assert len(data) == 3
         assert all(item['model']['name'] == thermal_model.name for item in data)
 
-    @pytest.mark.skip(reason="Filter params not implemented in API")
     def test_filter_by_model_name(self, client, db, multiple_analyses, thermal_model):
         """Filter analyses by model name."""
         response = client.get("/api/v1/analyses?model_name=Thermal")
@@ -153,6 +154,87 @@ class TestListAnalyses:
         # Should match "Thermal Expansion"
         assert len(data) == 3
 
+    def test_filter_invalid_status(self, client, db, multiple_analyses):
+        """Unknown status values are rejected."""
+        response = client.get("/api/v1/analyses?status=bogus")
+        assert response.status_code == 400
+
+    def test_keyset_pagination(self, client, db, multiple_analyses):
+        """limit + X-Next-Cursor walk every analysis once, newest first."""
+        names = []
+        cursor = None
+        for _ in range(5):
+            url = "/api/v1/analyses?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            response = client.get(url)
+            assert response.status_code == 200
+            names += [item['name'] for item in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert names == ["Analysis E", "Analysis D", "Analysis C", "Analysis B", "Analysis A"]
+
+    def test_invalid_cursor(self, client, db, multiple_analyses):
+        response = client.get("/api/v1/analyses?limit=2&cursor=not-a-cursor")
+        assert response.status_code == 400
+
+        # A cursor without a timestamp can't be compared against created_at
+        cursor = base64.urlsafe_b64encode(b"|3").decode()
+        response = client.get(f"/api/v1/analyses?limit=2&cursor={cursor}")
+        assert response.status_code == 400
+
+    def test_next_cursor_exposed_to_browsers(self, client, db, multiple_analyses):
+        response = client.get("/api/v1/analyses?limit=2", headers={"Origin": "http://localhost:3000"})
+
+        assert response.headers.get("X-Next-Cursor")
+        assert "x-next-cursor" in response.headers["Access-Control-Expose-Headers"].lower()
+
+    def test_query_count_independent_of_size(self, client, db, thermal_model, simple_model):
+        """Listing runs a fixed number of queries however many analyses exist."""
+        from sqlalchemy import event
+        from app.services.model_evaluation import evaluate_and_attach
+
+        def add(count):
+            for i in range(count):
+                instance = ModelInstance(
+                    model_version_id=simple_model.current_version.id,
+                    name=f"Analysis {db.query(ModelInstance).count()}",
+                    component_id=None,
+                    created_by="test@drip-3d.com"
+                )
+                db.add(instance)
+                db.flush()
+                db.add(ModelInput(model_instance_id=instance.id, input_name="x", literal_value=float(i)))
+                db.flush()
+                db.refresh(instance)
+                evaluate_and_attach(instance, db)
+            db.commit()
+
+        engine = db.get_bind()
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        def queries_for_list():
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", count)
+            try:
+                response = client.get("/api/v1/analyses")
+            finally:
+                event.remove(engine, "before_cursor_execute", count)
+            assert response.status_code == 200
+            return len(statements), response.json()
+
+        add(2)
+        small, _ = queries_for_list()
+        add(20)
+        large, data = queries_for_list()
+
+        assert len(data) == 22
+        assert all(len(item['output_value_nodes']) == 1 for item in data)
+        assert large == small
+
 
 class TestGetAnalysis:
     """Test GET /api/v1/analyses/{id} endpoint."""
@@ -738,3 +820,130 @@ class TestMultiOutputAnalysis:
 
         assert area['computed_value'] == 15.0  # 5 * 3
         assert perimeter['computed_value'] == 16.0  # 2 * (5 + 3)
+
+
+class TestSweepAnalysis:
+    """Test POST /api/v1/analyses/{id}/sweep endpoint."""
+
+    def test_sweep_range(self, client, db, thermal_analysis, auth_headers):
+        """A range sweep evaluates every point against the other bindings."""
+        response = client.post(
+            f"/api/v1/analyses/{thermal_analysis.id}/sweep",
+            json={"inputs": {"delta_T": {"start": 0, "stop": 500, "num": 11}}},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 11
+        assert data['inputs']['delta_T'][-1] == 500.0
+
+        delta_L = data['outputs']['delta_L']
+        assert delta_L['unit'] == 'm'
+        assert delta_L['errors'] == {}
+        assert delta_L['values'][-1] == pytest.approx(2.3e-5 * 500 * 0.003)
+
+    def test_sweep_does_not_persist(self, client, db, thermal_analysis, get_analysis_outputs, auth_headers):
+        """Sweeping writes no output ValueNodes."""
+        client.post(
+            f"/api/v1/analyses/{thermal_analysis.id}/sweep",
+            json={"inputs": {"delta_T": [1, 2, 3]}},
+            headers=auth_headers
+        )
+
+        assert get_analysis_outputs(thermal_analysis.id) == []
+
+    def test_sweep_grid(self, client, db, thermal_analysis, auth_headers):
+        """grid=true evaluates every combination of the swept values."""
+        response = client.post(
+            f"/api/v1/analyses/{thermal_analysis.id}/sweep",
+            json={"inputs": {"delta_T": [100, 200, 300], "L0": [1, 2]}, "grid": True},
+            headers=auth_headers
+        )
+
+        data = response.json()
+        assert data['count'] == 6
+        assert data['inputs']['delta_T'] == [100, 100, 200, 200, 300, 300]
+        assert data['inputs']['L0'] == [1, 2, 1, 2, 1, 2]
+        assert data['outputs']['delta_L']['values'][5] == pytest.approx(2.3e-5 * 300 * 2)
+
+    def test_sweep_error_mask(self, client, db, simple_analysis, auth_headers):
+        """Failing points are null and listed by reason; the rest still evaluate."""
+        version = simple_analysis.model_version
+        version.equations = {"y": "1 / x"}
+        version.equation_ast = {"y": parse_equation("1 / x", allowed_inputs=["x"])["ast"]}
+        db.commit()
+
+        response = client.post(
+            f"/api/v1/analyses/{simple_analysis.id}/sweep",
+            json={"inputs": {"x": [-1, 0, 2]}},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        y = response.json()['outputs']['y']
+        assert y['values'] == [-1.0, None, 0.5]
+        assert y['errors'] == {"Division by zero": [1]}
+
+    def test_sweep_mismatched_lengths(self, client, db, thermal_analysis, auth_headers):
+        """Zipped sweeps need equal lengths."""
+        response = client.post(
+            f"/api/v1/analyses/{thermal_analysis.id}/sweep",
+            json={"inputs": {"delta_T": [1, 2, 3], "L0": [1, 2]}},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_sweep_unknown_input(self, client, db, thermal_analysis, auth_headers):
+        """Sweeping a name the model does not have is rejected."""
+        response = client.post(
+            f"/api/v1/analyses/{thermal_analysis.id}/sweep",
+            json={"inputs": {"pressure": [1, 2]}},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert "pressure" in response.json()['detail']
+
+    def test_sweep_too_many_points(self, client, db, thermal_analysis, auth_headers):
+        """Sweeps are capped at MAX_SWEEP_POINTS."""
+        response = client.post(
+            f"/api/v1/analyses/{thermal_analysis.id}/sweep",
+            json={"inputs": {"delta_T": {"start": 0, "stop": 1, "num": 1000},
+                             "L0": {"start": 0, "stop": 1, "num": 1000}}, "grid": True},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_sweep_nonexistent_analysis(self, client, db, auth_headers):
+        """404 for an unknown analysis."""
+        response = client.post(
+            "/api/v1/analyses/99999/sweep",
+            json={"inputs": {"x": [1]}},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 404
+
+
+class TestPatchPhysicsModel:
+    """PATCH /api/v1/physics-models/{id} and the compiled model cache."""
+
+    def test_patch_invalidates_compiled_model(self, client, db, simple_model, auth_headers, monkeypatch):
+        """MODEL() evaluates the new equations right after the PATCH."""
+        from app.services.model_evaluation import compiled_models, evaluate_inline_model
+
+        # Only the PATCH's own invalidation can refresh the cache here
+        monkeypatch.setattr(compiled_models, "recheck_seconds", 3600)
+        assert evaluate_inline_model("Simple", {"x": 5}, None, db) == 10
+
+        response = client.patch(
+            f"/api/v1/physics-models/{simple_model.id}",
+            json={"equations": {"y": "x * 3"}},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert evaluate_inline_model("Simple", {"x": 5}, None, db) == 15
@@ -313,7 +313,6 @@ class TestMultiOutputAnalysis:
 class TestAnalysisFiltering:
     """Tests for filtering and sorting analyses."""
 
-    @pytest.mark.skip(reason="Filter params not implemented in API")
     def test_filter_by_multiple_criteria(self, client, db, multiple_analyses, thermal_model):
         """Can filter by model and status together."""
         # Set specific status on thermal analyses
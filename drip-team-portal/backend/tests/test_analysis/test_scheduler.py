@@ -0,0 +1,227 @@
+"""
+Analysis Scheduler Tests
+
+Tests for:
+- AnalysisGraph edges from source_value_node_id and #REF bindings
+- Cycle detection at build time and topological waves
+- reevaluate_downstream() cascading through chains and diamonds
+- PATCH / evaluate endpoints refreshing downstream analyses
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.models.physics_model import ModelInstance, ModelInput
+from app.models.values import ValueNode, ComputationStatus
+from app.services import analysis_scheduler
+from app.services.analysis_scheduler import AnalysisGraph, reevaluate_downstream
+from app.services.model_evaluation import evaluate_and_attach
+
+
+def _analysis(db, model, name, **binding):
+    """Create and evaluate an analysis of the simple (y = x * 2) model."""
+    instance = ModelInstance(
+        model_version_id=model.current_version.id,
+        name=name,
+        component_id=None,
+        created_by="test@drip-3d.com"
+    )
+    db.add(instance)
+    db.flush()
+    db.add(ModelInput(model_instance_id=instance.id, input_name="x", **binding))
+    db.flush()
+    db.refresh(instance)
+    evaluate_and_attach(instance, db)
+    db.commit()
+    return instance
+
+
+def _output(db, instance):
+    return db.query(ValueNode).filter(ValueNode.source_model_instance_id == instance.id).one()
+
+
+def _chain(db, model, length):
+    """root -> a1 -> a2 ... each doubling the previous output."""
+    chain = [_analysis(db, model, "root", literal_value=1.0)]
+    for i in range(1, length):
+        upstream = _output(db, chain[-1])
+        binding = (
+            {"source_value_node_id": upstream.id} if i % 2
+            else {"source_lookup": {"expression": f"#REF:{upstream.id}"}}
+        )
+        chain.append(_analysis(db, model, f"a{i}", **binding))
+    return chain
+
+
+def _set_root(db, root, value):
+    root.inputs[0].literal_value = value
+    evaluate_and_attach(root, db)
+    db.commit()
+
+
+class TestAnalysisGraph:
+    """Graph structure, cycles and waves."""
+
+    def test_edges_from_bindings(self, db, simple_model):
+        chain = _chain(db, simple_model, 3)
+        graph = AnalysisGraph.build(db)
+
+        ids = [a.id for a in chain]
+        assert graph.downstream[ids[0]] == {ids[1]}
+        assert graph.upstream[ids[2]] == {ids[1]}
+        assert graph.affected([ids[1]]) == {ids[1], ids[2]}
+        assert graph.cyclic == set()
+
+    def test_waves_group_independent_branches(self):
+        # 1 -> 2, 1 -> 3, (2, 3) -> 4
+        graph = AnalysisGraph([(1, 2), (1, 3), (2, 4), (3, 4)])
+        waves, unordered = graph.waves({1, 2, 3, 4})
+        assert waves == [[1], [2, 3], [4]]
+        assert unordered == []
+
+    def test_cycles_found_at_build(self):
+        # 1 -> 2 -> 3 -> 2, 3 -> 4
+        graph = AnalysisGraph([(1, 2), (2, 3), (3, 2), (3, 4)])
+        assert graph.cyclic == {2, 3}
+        waves, unordered = graph.waves({1, 2, 3, 4})
+        assert waves == [[1]]
+        assert unordered == [2, 3, 4]
+
+
+class TestReevaluateDownstream:
+    """Cascading re-evaluation."""
+
+    def test_chain_of_50(self, db, simple_model):
+        chain = _chain(db, simple_model, 50)
+        _set_root(db, chain[0], 3.0)
+
+        result = reevaluate_downstream(db, [chain[0].id])
+
+        assert result["evaluated"] == [a.id for a in chain[1:]]
+        assert result["waves"] == 49
+        assert _output(db, chain[-1]).computed_value == pytest.approx(3.0 * 2 ** 50)
+
+    def test_diamond_concurrently(self, db, simple_model):
+        root = _analysis(db, simple_model, "root", literal_value=1.0)
+        root_out = _output(db, root)
+        branches = [
+            _analysis(db, simple_model, f"branch{i}", source_value_node_id=root_out.id)
+            for i in range(3)
+        ]
+        _set_root(db, root, 5.0)
+
+        result = reevaluate_downstream(db, [root.id], max_workers=3)
+
+        assert sorted(result["evaluated"]) == sorted(b.id for b in branches)
+        assert result["waves"] == 1
+        for branch in branches:
+            node = _output(db, branch)
+            assert node.computed_value == 20.0
+            assert node.computation_status == ComputationStatus.VALID
+
+    def test_workers_share_process_pool(self, db, simple_model, monkeypatch):
+        root = _analysis(db, simple_model, "root", literal_value=1.0)
+        root_out = _output(db, root)
+        branches = [
+            _analysis(db, simple_model, f"branch{i}", source_value_node_id=root_out.id)
+            for i in range(3)
+        ]
+        _set_root(db, root, 2.0)
+
+        # One shared worker session: max_workers per call can't exceed it
+        monkeypatch.setattr(analysis_scheduler, "_wave_executor", ThreadPoolExecutor(max_workers=1))
+        evaluate_in_session = analysis_scheduler._evaluate_in_session
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def tracked(session_factory, instance_id):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            try:
+                return evaluate_in_session(session_factory, instance_id)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        monkeypatch.setattr(analysis_scheduler, "_evaluate_in_session", tracked)
+        result = reevaluate_downstream(db, [root.id], max_workers=3)
+
+        assert sorted(result["evaluated"]) == sorted(b.id for b in branches)
+        assert peak[0] == 1
+
+    def test_failed_upstream_skips_downstream(self, db, simple_model):
+        chain = _chain(db, simple_model, 3)
+        # a1 now reads a node that does not exist
+        chain[1].inputs[0].source_value_node_id = 999999
+        db.commit()
+
+        result = reevaluate_downstream(db, [chain[1].id], include_roots=True)
+
+        assert [f["id"] for f in result["failed"]] == [chain[1].id]
+        assert result["skipped"] == [chain[2].id]
+        assert _output(db, chain[2]).computation_status == ComputationStatus.STALE
+
+    def test_cycle_marked_error(self, db, simple_model):
+        a = _analysis(db, simple_model, "a", literal_value=1.0)
+        b = _analysis(db, simple_model, "b", source_value_node_id=_output(db, a).id)
+        a.inputs[0].literal_value = None
+        a.inputs[0].source_value_node_id = _output(db, b).id
+        db.commit()
+
+        result = reevaluate_downstream(db, [a.id])
+
+        assert result["cyclic"] == sorted([a.id, b.id])
+        assert result["evaluated"] == []
+        db.refresh(b)
+        assert b.computation_status == ComputationStatus.ERROR
+        assert "Circular dependency" in b.error_message
+
+
+class TestCascadeEndpoints:
+    """Endpoints refresh downstream analyses in the same request."""
+
+    def test_patch_refreshes_chain(self, client, db, simple_model, auth_headers):
+        chain = _chain(db, simple_model, 10)
+
+        response = client.patch(
+            f"/api/v1/analyses/{chain[0].id}",
+            json={"bindings": {"x": "4"}},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["downstream"]["evaluated"] == [a.id for a in chain[1:]]
+        db.expire_all()
+        assert _output(db, chain[-1]).computed_value == pytest.approx(4.0 * 2 ** 10)
+
+    def test_evaluate_reports_downstream(self, client, db, simple_model, auth_headers):
+        chain = _chain(db, simple_model, 3)
+
+        response = client.post(f"/api/v1/analyses/{chain[0].id}/evaluate", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["downstream"]["evaluated"] == [chain[1].id, chain[2].id]
+
+    def test_downstream_events_carry_full_analysis(self, client, db, simple_model, auth_headers, monkeypatch):
+        from app.api.v1 import physics_models
+
+        chain = _chain(db, simple_model, 3)
+        chain[0].inputs[0].literal_value = 5.0
+        db.commit()
+        events = []
+        monkeypatch.setattr(physics_models, "_broadcast", lambda *event: events.append(event))
+
+        response = client.post(f"/api/v1/analyses/{chain[0].id}/evaluate", headers=auth_headers)
+
+        assert response.status_code == 200
+        downstream = {analysis_id: data for analysis_id, _, data in events if analysis_id != chain[0].id}
+        assert set(downstream) == {chain[1].id, chain[2].id}
+        for data in downstream.values():
+            assert (data["triggered_by"], data["outcome"]) == (chain[0].id, "evaluated")
+            # Same body GET /analyses/{id} returns, so it can replace a coalesced event
+            assert {"name", "inputs", "model", "output_value_nodes", "computation_status"} <= set(data)
+        assert downstream[chain[2].id]["output_value_nodes"][0]["computed_value"] == pytest.approx(40.0)
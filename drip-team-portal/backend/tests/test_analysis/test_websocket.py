@@ -7,11 +7,14 @@ Tests for:
 - Broadcasts on CRUD operations
 - Multiple client handling
 - Connection cleanup
+- Broadcast pipeline (per-client queues, coalescing, subscription-only
+  mode, dropping slow clients)
 
 NOTE: Requires the WebSocket endpoint to be registered in main.py.
 """
 
 import pytest
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.models.physics_model import ModelInstance, ModelInput
@@ -46,6 +49,7 @@ class TestConnectionManagerUnit:
         assert mock_websocket in manager.active_connections
         assert mock_websocket in manager.connection_subscriptions
         assert len(manager.active_connections) == 1
+        await manager.close()
 
     @pytest.mark.asyncio
     async def test_connect_accepts_websocket(self, manager, mock_websocket):
@@ -53,6 +57,7 @@ class TestConnectionManagerUnit:
         await manager.connect(mock_websocket)
 
         mock_websocket.accept.assert_called_once()
+        await manager.close()
 
     @pytest.mark.asyncio
     async def test_disconnect_removes_from_active(self, manager, mock_websocket):
@@ -63,6 +68,7 @@ class TestConnectionManagerUnit:
         assert mock_websocket not in manager.active_connections
         assert mock_websocket not in manager.connection_subscriptions
         assert len(manager.active_connections) == 0
+        await manager.close()
 
     @pytest.mark.asyncio
     async def test_disconnect_cleans_up_subscriptions(self, manager, mock_websocket):
@@ -84,6 +90,7 @@ class TestConnectionManagerUnit:
         assert manager.get_subscription_count(1) == 0
         assert manager.get_subscription_count(2) == 0
         assert manager.get_subscription_count(3) == 0
+        await manager.close()
 
     def test_subscribe_to_analysis(self, manager, mock_websocket):
         """subscribe_to_analysis() adds connection to analysis subscribers."""
@@ -120,10 +127,12 @@ class TestConnectionManagerUnit:
 
         message = {"type": "test", "data": "hello"}
         await manager.broadcast_to_all(message)
+        await manager.flush()
 
         expected_json = json.dumps(message)
         ws1.send_text.assert_called_once_with(expected_json)
         ws2.send_text.assert_called_once_with(expected_json)
+        await manager.close()
 
     @pytest.mark.asyncio
     async def test_broadcast_to_all_handles_disconnected(self, manager):
@@ -140,10 +149,12 @@ class TestConnectionManagerUnit:
         manager.connection_subscriptions[ws_bad] = set()
 
         await manager.broadcast_to_all({"type": "test"})
+        await manager.flush()
 
         # Bad connection should be removed
         assert ws_good in manager.active_connections
         assert ws_bad not in manager.active_connections
+        await manager.close()
 
     @pytest.mark.asyncio
     async def test_broadcast_analysis_update(self, manager, mock_websocket):
@@ -163,6 +174,7 @@ class TestConnectionManagerUnit:
 
         data = {"id": 123, "name": "Test"}
         await manager.broadcast_analysis_update(123, "created", data)
+        await manager.flush()
 
         # Both should receive (global gets all, subscribed gets specific)
         assert ws_global.send_text.called
@@ -175,6 +187,7 @@ class TestConnectionManagerUnit:
         assert message["event"] == "created"
         assert message["analysis_id"] == 123
         assert message["data"]["name"] == "Test"
+        await manager.close()
 
     @pytest.mark.asyncio
     async def test_send_personal_message(self, manager, mock_websocket):
@@ -184,6 +197,7 @@ class TestConnectionManagerUnit:
         await manager.send_personal_message(mock_websocket, {"type": "test"})
 
         mock_websocket.send_text.assert_called_with('{"type": "test"}')
+        await manager.close()
 
     def test_connection_count(self, manager, mock_websocket):
         """connection_count property returns active connection count."""
@@ -197,6 +211,129 @@ class TestConnectionManagerUnit:
         assert manager.get_subscription_count(999) == 0
 
 
+class TestBroadcastPipeline:
+    """Per-connection queues, coalescing and slow-client handling."""
+
+    @staticmethod
+    def _ws(send=None):
+        ws = MagicMock()
+        ws.accept = AsyncMock()
+        ws.close = AsyncMock()
+        ws.send_text = send or AsyncMock()
+        return ws
+
+    @staticmethod
+    async def _hang(text):
+        await asyncio.Event().wait()
+
+    @staticmethod
+    def _events(ws):
+        return [json.loads(call[0][0]) for call in ws.send_text.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self):
+        manager = ConnectionManager(coalesce_window=0)
+        release = asyncio.Event()
+
+        async def stuck(text):
+            await release.wait()
+
+        slow = self._ws(AsyncMock(side_effect=stuck))
+        fast = self._ws()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        await manager.broadcast_analysis_update(1, "created", {"id": 1})
+        await asyncio.sleep(0.01)
+
+        assert fast.send_text.call_count == 1
+        release.set()
+        await manager.flush()
+        assert slow.send_text.call_count == 1
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_client(self):
+        manager = ConnectionManager(queue_size=2, coalesce_window=0)
+        slow = self._ws(AsyncMock(side_effect=self._hang))
+        fast = self._ws()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        for i in range(5):
+            await manager.broadcast_analysis_update(i, "created", {"id": i})
+            await asyncio.sleep(0.01)  # a client that keeps up drains its queue
+        await manager.flush()
+
+        assert slow not in manager.active_connections
+        assert manager.stats()["dropped_slow"] == 1
+        assert fast.send_text.call_count == 5
+        await asyncio.sleep(0)
+        slow.close.assert_called_once_with(code=1013)
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_drops_client(self):
+        manager = ConnectionManager(send_timeout=0.01, coalesce_window=0)
+        slow = self._ws(AsyncMock(side_effect=self._hang))
+        await manager.connect(slow)
+
+        await manager.broadcast_analysis_update(1, "created", {"id": 1})
+        await manager.flush()
+
+        assert slow not in manager.active_connections
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_rapid_updates_coalesced(self):
+        manager = ConnectionManager(coalesce_window=0.02)
+        ws = self._ws()
+        await manager.connect(ws)
+
+        for version in range(10):
+            await manager.broadcast_analysis_update(1, "updated", {"version": version})
+        await manager.broadcast_analysis_update(2, "updated", {"version": 0})
+        assert ws.send_text.call_count == 0
+
+        await asyncio.sleep(0.05)
+        await manager.flush()
+
+        events = self._events(ws)
+        assert [(e["analysis_id"], e["data"]["version"]) for e in events] == [(1, 9), (2, 0)]
+        assert manager.stats()["coalesced"] == 9
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_other_events_release_held_update_first(self):
+        manager = ConnectionManager(coalesce_window=10)
+        ws = self._ws()
+        await manager.connect(ws)
+
+        await manager.broadcast_analysis_update(1, "updated", {"name": "x"})
+        await manager.broadcast_analysis_update(1, "deleted", {"id": 1})
+        await manager.flush()
+
+        assert [e["event"] for e in self._events(ws)] == ["updated", "deleted"]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_subscriptions_only(self):
+        manager = ConnectionManager(coalesce_window=0)
+        everything = self._ws()
+        selective = self._ws()
+        await manager.connect(everything)
+        await manager.connect(selective, subscriptions_only=True)
+        manager.subscribe_to_analysis(selective, 2)
+
+        await manager.broadcast_analysis_update(1, "created", {"id": 1})
+        await manager.broadcast_analysis_update(2, "created", {"id": 2})
+        await manager.flush()
+
+        assert [e["analysis_id"] for e in self._events(everything)] == [1, 2]
+        assert [e["analysis_id"] for e in self._events(selective)] == [2]
+        await manager.close()
+
+
 # ==================== INTEGRATION TESTS: WebSocket Endpoint ====================
 
 class TestWebSocketConnection:
@@ -315,6 +452,22 @@ class TestWebSocketConnection:
             raise
 
 
+    def test_websocket_subscriptions_only(self, client, db, thermal_analysis, simple_analysis, auth_headers):
+        """Subscription-only clients get updates for their analyses only."""
+        with client.websocket_connect("/ws/analyses") as websocket:
+            websocket.send_json({"action": "subscriptions_only", "enabled": True})
+            assert websocket.receive_json() == {"type": "subscriptions_only", "enabled": True}
+            websocket.send_json({"action": "subscribe", "analysis_id": thermal_analysis.id})
+            websocket.receive_json()
+
+            client.delete(f"/api/v1/analyses/{simple_analysis.id}", headers=auth_headers)
+            client.delete(f"/api/v1/analyses/{thermal_analysis.id}", headers=auth_headers)
+
+            response = websocket.receive_json()
+            assert response["event"] == "deleted"
+            assert response["analysis_id"] == thermal_analysis.id
+
+
 class TestWebSocketBroadcasts:
     """Test WebSocket broadcasts on CRUD operations.
 
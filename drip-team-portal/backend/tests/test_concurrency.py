@@ -0,0 +1,124 @@
+"""
+Blocking Work Tests
+
+run_blocking() moves sync work off the event loop under a concurrency cap,
+spawn() schedules coroutines from worker threads, and LoopLagMonitor sees
+work that blocks the loop.
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core import concurrency
+from app.core.concurrency import run_blocking, spawn, blocking_stats, LoopLagMonitor
+
+
+@pytest.fixture
+def cap(monkeypatch):
+    """Set BLOCKING_WORK_CONCURRENCY for the test."""
+    def _cap(n):
+        monkeypatch.setattr(concurrency.settings, "BLOCKING_WORK_CONCURRENCY", n)
+        concurrency._limiters.clear()
+    yield _cap
+    concurrency._limiters.clear()
+
+
+class TestRunBlocking:
+    """Sync work runs in worker threads."""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_loop_thread(self):
+        loop_thread = threading.get_ident()
+        worker_thread = await run_blocking(threading.get_ident)
+        assert worker_thread != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_args_and_exceptions(self):
+        assert await run_blocking(int, "ff", base=16) == 255
+        with pytest.raises(ZeroDivisionError):
+            await run_blocking(lambda: 1 / 0)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self, cap):
+        cap(2)
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def work():
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+
+        waiting = []
+
+        async def sample():
+            await asyncio.sleep(0.02)
+            waiting.append(blocking_stats())
+
+        await asyncio.gather(*(run_blocking(work) for _ in range(6)), sample())
+
+        assert active["max"] == 2
+        assert waiting[0]["running"] == 2
+        assert waiting[0]["waiting"] == 4
+        assert blocking_stats()["running"] == 0
+        assert blocking_stats()["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive(self, cap):
+        cap(4)
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.gather(*(run_blocking(time.sleep, 0.1) for _ in range(4)))
+        await monitor.stop()
+        assert monitor.stats()["max_ms"] < 50
+
+
+class TestSpawn:
+    """Coroutines scheduled from worker threads run on the loop."""
+
+    @pytest.mark.asyncio
+    async def test_spawn_from_worker(self):
+        ran = asyncio.Event()
+
+        async def mark():
+            ran.set()
+
+        await run_blocking(lambda: spawn(mark()))
+        await asyncio.wait_for(ran.wait(), timeout=1)
+
+    def test_spawn_without_loop_is_dropped(self):
+        async def never():
+            raise AssertionError("should not run")
+
+        spawn(never())
+
+
+class TestLoopLagMonitor:
+    """Lag is measured when the loop is blocked."""
+
+    @pytest.mark.asyncio
+    async def test_records_blocking(self):
+        monitor = LoopLagMonitor(interval=0.01, warn_ms=50)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)  # block the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        stats = monitor.stats()
+        assert stats["max_ms"] >= 50
+        assert stats["stalls"] >= 1
+        assert not monitor.running
+
+    def test_empty_stats(self):
+        assert LoopLagMonitor().stats()["samples"] == 0
@@ -0,0 +1,128 @@
+"""
+Tests for the pooled AbstractState CoolProp backend.
+
+Results must match PropsSI, states are reused across lookups, and batch
+sweeps report unresolvable points as NaN.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+CP = pytest.importorskip("CoolProp.CoolProp")
+
+import numpy as np
+
+from app.services.properties import registry
+from app.services.properties.router import lookup, lookup_many, lookup_outputs, LookupError
+from app.services.properties.schemas import PropertySource
+from app.services.properties.backends.coolprop import (
+    CoolPropError, AbstractStatePool, resolve_coolprop, resolve_coolprop_outputs,
+    resolve_coolprop_many, state_pool,
+)
+
+
+WATER = PropertySource(
+    id="test_cp_water",
+    name="Water",
+    category="process",
+    source="test",
+    type="library",
+    inputs=[
+        {"name": "T", "unit": "K", "range": [273.16, 647.0], "optional": True},
+        {"name": "P", "unit": "Pa", "optional": True},
+        {"name": "Q", "unit": "none", "range": [0, 1], "optional": True},
+    ],
+    outputs=[
+        {"name": "h", "unit": "J/kg"},
+        {"name": "rho", "unit": "kg/m³"},
+        {"name": "v", "unit": "m³/kg"},
+        {"name": "P_sat", "unit": "Pa"},
+    ],
+    resolution={
+        "type": "library",
+        "fluid": "Water",
+        "output_mapping": {"h": "H", "rho": "D", "v": "1/D", "P_sat": "P"},
+    },
+)
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    monkeypatch.setattr(registry, "_sources", {WATER.id: WATER})
+    monkeypatch.setattr(registry, "_loaded", True)
+
+
+class TestResolve:
+
+    def test_matches_propssi(self):
+        assert resolve_coolprop(WATER, "h", {"T": 350.0, "P": 2e5}) == pytest.approx(
+            CP.PropsSI("H", "T", 350.0, "P", 2e5, "Water"), rel=1e-12)
+        assert resolve_coolprop(WATER, "P_sat", {"T": 373.15, "Q": 0.0}) == pytest.approx(
+            CP.PropsSI("P", "T", 373.15, "Q", 0.0, "Water"), rel=1e-12)
+        assert resolve_coolprop(WATER, "v", {"T": 300.0, "P": 1e5}) == pytest.approx(
+            1.0 / CP.PropsSI("D", "T", 300.0, "P", 1e5, "Water"), rel=1e-12)
+
+    def test_invalid_state_raises(self):
+        with pytest.raises(CoolPropError, match="CoolProp error for Water"):
+            resolve_coolprop(WATER, "h", {"T": 373.15, "Q": 2.0})
+        with pytest.raises(CoolPropError, match="exactly 2 inputs"):
+            resolve_coolprop(WATER, "h", {"T": 373.15})
+
+    def test_outputs_share_one_state_update(self):
+        values = resolve_coolprop_outputs(WATER, ["h", "rho", "v"], {"T": 373.15, "Q": 1.0})
+        assert values["v"] == pytest.approx(1.0 / values["rho"])
+        assert values["h"] == pytest.approx(CP.PropsSI("H", "T", 373.15, "Q", 1.0, "Water"))
+
+
+class TestStatePool:
+
+    def test_states_are_reused(self):
+        pool = AbstractStatePool(max_idle=1)
+        with pool.state("HEOS", "Water") as first:
+            pass
+        with pool.state("HEOS", "Water") as second:
+            # Nested checkout gets its own state
+            with pool.state("HEOS", "Water") as third:
+                assert third is not second
+        assert second is first
+        assert pool.stats()["created"] == 2
+        assert pool.stats()["idle"] == 1
+
+    def test_unknown_fluid(self):
+        with pytest.raises(CoolPropError, match="Unobtainium"):
+            with AbstractStatePool().state("HEOS", "Unobtainium"):
+                pass
+
+
+class TestBatch:
+
+    def test_many_matches_scalar_and_masks_failures(self):
+        ts = np.array([300.0, 350.0, 400.0])
+        results = resolve_coolprop_many(WATER, ["h", "rho"], {"T": ts, "Q": [0.0, 1.0, 2.0]})
+        assert results["h"][:2] == pytest.approx([
+            resolve_coolprop(WATER, "h", {"T": 300.0, "Q": 0.0}),
+            resolve_coolprop(WATER, "h", {"T": 350.0, "Q": 1.0}),
+        ])
+        assert np.isnan(results["h"][2]) and np.isnan(results["rho"][2])
+
+    def test_lookup_many_library(self, registered):
+        ts = np.linspace(280.0, 640.0, 40)
+        values = lookup_many(WATER.id, "P_sat", {"T": np.append(ts, 700.0), "Q": 0.0})
+        assert values[:-1] == pytest.approx([lookup(WATER.id, "P_sat", T=t, Q=0.0) for t in ts])
+        # Outside the declared T range
+        assert np.isnan(values[-1])
+
+    def test_lookup_many_non_numeric_point(self, registered):
+        values = lookup_many(WATER.id, "P_sat", {"T": [300.0, "warm", None], "Q": 0.0})
+        assert values[0] == pytest.approx(lookup(WATER.id, "P_sat", T=300.0, Q=0.0))
+        assert np.isnan(values[1]) and np.isnan(values[2])
+
+    def test_lookup_outputs(self, registered):
+        values = lookup_outputs(WATER.id, ["h", "v", "missing"], T=300.0, P=1e5)
+        assert values["h"] == pytest.approx(lookup(WATER.id, "h", T=300.0, P=1e5))
+        assert values["missing"] is None
+        with pytest.raises(LookupError, match="outside valid range"):
+            lookup_outputs(WATER.id, ["h"], T=700.0, P=1e5)
@@ -0,0 +1,185 @@
+"""
+Tests for the in-memory dependency graph index.
+
+Closures and depth queries are answered without touching the database, and
+the index follows ValueDependency changes once the session that made them
+commits (inserts, re-points, bulk deletes). Cycle checks overlay the
+session's uncommitted edges on the index instead of querying the database.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+
+from app.models.values import ValueNode, ValueDependency, NodeType, ComputationStatus
+from app.services.dependency_graph import DependencyGraph, dependency_graph
+from app.services.value_engine import ValueEngine
+
+
+def _nodes(db, count):
+    nodes = [
+        ValueNode(node_type=NodeType.LITERAL, numeric_value=float(i),
+                  computation_status=ComputationStatus.VALID)
+        for i in range(count)
+    ]
+    db.add_all(nodes)
+    db.flush()
+    return nodes
+
+
+def _link(db, dependent, source):
+    db.add(ValueDependency(dependent_id=dependent.id, source_id=source.id, variable_name=f"N.v{source.id}"))
+    db.flush()
+
+
+class TestGraphQueries:
+
+    def test_closures_cycles_and_depth(self):
+        graph = DependencyGraph()
+        graph._loaded_at = 0.0
+        graph.max_age = float("inf")
+        # 4 reads 3 reads 2 reads 1; 5 reads 1
+        for dependent, source in ((2, 1), (3, 2), (4, 3), (5, 1)):
+            graph.add_edge(dependent, source)
+
+        assert graph.downstream([1]) == {2, 3, 4, 5}
+        assert graph.upstream([4], include_seeds=True) == {1, 2, 3, 4}
+        assert graph.depth(4) == 3
+        assert graph.depth(1) == 0
+
+        graph.apply([(False, 2, 1), (False, 3, 2)])
+        assert graph.downstream([1]) == {5}
+        assert graph.depth(4) == 1
+
+    def test_depth_ignores_cycles(self):
+        graph = DependencyGraph()
+        graph._loaded_at = 0.0
+        graph.max_age = float("inf")
+        for dependent, source in ((1, 2), (2, 3), (3, 1)):
+            graph.add_edge(dependent, source)
+
+        assert graph.depth(1) == 2
+
+
+class TestIncrementalMaintenance:
+
+    def test_cycle_check_does_not_query(self, engine_and_db):
+        db, statements = engine_and_db
+        a, b, c = _nodes(db, 3)
+        _link(db, b, a)
+        _link(db, c, b)
+        db.commit()
+        engine = ValueEngine(db)
+        engine.graph  # load
+        a_id, b_id, c_id = a.id, b.id, c.id
+
+        statements.clear()
+        assert engine.check_circular_dependency(a_id, c_id)
+        assert engine.check_circular_dependency(b_id, b_id)
+        assert not engine.check_circular_dependency(c_id, a_id)
+        assert statements == []
+
+    def test_cycle_check_sees_uncommitted_edges(self, engine_and_db):
+        db, _ = engine_and_db
+        a, b, c = _nodes(db, 3)
+        _link(db, b, a)
+        db.commit()
+        engine = ValueEngine(db)
+        engine.graph  # load
+
+        _link(db, c, b)
+        assert engine.graph.dependents(b.id) == []
+        assert engine.check_circular_dependency(a.id, c.id)
+
+        db.delete(db.query(ValueDependency).filter(ValueDependency.dependent_id == b.id).one())
+        db.flush()
+        assert not engine.check_circular_dependency(a.id, c.id)
+
+    def test_follows_inserts_and_repoints_on_commit(self, engine_and_db):
+        db, _ = engine_and_db
+        a, b, c = _nodes(db, 3)
+        engine = ValueEngine(db)
+        engine.graph  # load before any edges exist
+
+        _link(db, b, a)
+        assert dependency_graph.dependents(a.id) == []
+        db.commit()
+        assert dependency_graph.dependents(a.id) == [b.id]
+
+        replacement = _nodes(db, 1)[0]
+        engine.transfer_dependents(a, replacement)
+        db.commit()
+        assert dependency_graph.dependents(a.id) == []
+        assert dependency_graph.dependents(replacement.id) == [b.id]
+
+    def test_update_expression_drops_old_sources(self, engine_and_db):
+        db, _ = engine_and_db
+        a, b = _nodes(db, 2)
+        expr = ValueNode(node_type=NodeType.EXPRESSION, expression_string="#N.a",
+                         computation_status=ComputationStatus.PENDING)
+        db.add(expr)
+        db.flush()
+        _link(db, expr, a)
+        db.commit()
+        engine = ValueEngine(db)
+        engine._get_reference_unit = MagicMock(return_value=None)
+        engine.resolve_references = MagicMock(return_value={"N.b": b})
+        engine.graph
+
+        engine.update_expression(expr, "#N.b * 2")
+        db.commit()
+
+        assert dependency_graph.sources(expr.id) == [b.id]
+        assert dependency_graph.dependents(a.id) == []
+
+    def test_load_excludes_uncommitted_edges(self, engine_and_db):
+        db, _ = engine_and_db
+        a, b, c = _nodes(db, 3)
+        _link(db, b, a)
+        db.commit()
+
+        _link(db, c, a)
+        engine = ValueEngine(db)
+        assert engine.graph.dependents(a.id) == [b.id]
+        db.commit()
+        assert engine.graph.dependents(a.id) == [b.id, c.id]
+
+    def test_rollback_discards_recorded_changes(self, engine_and_db):
+        db, _ = engine_and_db
+        a, b = _nodes(db, 2)
+        db.commit()
+        engine = ValueEngine(db)
+        engine.graph
+
+        _link(db, b, a)
+        db.rollback()
+
+        assert dependency_graph.loaded
+        assert engine.graph.dependents(a.id) == []
+
+
+class TestDependencyTree:
+
+    def test_tree_uses_one_node_query(self, engine_and_db):
+        db, statements = engine_and_db
+        nodes = _nodes(db, 5)
+        for dependent, source in zip(nodes[1:], nodes):
+            _link(db, dependent, source)
+        db.commit()
+        db.refresh(nodes[4])
+        engine = ValueEngine(db)
+        engine.graph
+
+        statements.clear()
+        tree = engine.get_dependency_tree(nodes[4], depth=3)
+
+        assert len(statements) == 1
+        assert tree["id"] == nodes[4].id
+        child = tree["dependencies"][0]
+        assert child["id"] == nodes[3].id
+        assert child["dependencies"][0]["dependencies"] == [{"id": nodes[1].id, "truncated": True}]
+        assert engine.get_dependency_depth(nodes[4]) == 4
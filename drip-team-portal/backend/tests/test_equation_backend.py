@@ -0,0 +1,139 @@
+"""
+Tests for the compiled equation backend.
+
+Formulas are compiled once per (source, output); scalar results match the
+formula text, and the NumPy path evaluates whole arrays with conditionals
+applied per element.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import math
+import numpy as np
+
+from app.services.properties import registry
+from app.services.properties.router import lookup, lookup_many
+from app.services.properties.schemas import PropertySource
+from app.services.properties.backends.equation import (
+    EquationError, resolve_equation, resolve_equation_many, get_compiled_equations,
+)
+
+
+def _source(formulas, constants, inputs=None):
+    return PropertySource(
+        id="test_alloy",
+        name="Alloy",
+        category="material",
+        source="test",
+        type="equation",
+        inputs=inputs or [{"name": "T", "unit": "K", "range": [200, 900]}],
+        outputs=[{"name": name, "unit": "none"} for name in formulas],
+        resolution={"type": "equation", "formulas": formulas, "constants": constants},
+    )
+
+
+ALLOY = _source(
+    {
+        "Sy": "Sy_ref * (1 - Sy_slope * (T - T_ref)) if T < T_crit else Sy_ref * 0.5 * exp(-0.01 * (T - T_crit))",
+        "E": "E_ref * (1 - E_slope * (T - T_ref))",
+        "k": "T < T_crit ? k_lo : k_hi",
+        "cp": "cp_ref + 2T",
+        "nu": "nu_ref",
+    },
+    {"T_ref": 293.15, "T_crit": 500.0, "Sy_ref": "276e6", "Sy_slope": 0.0005,
+     "E_ref": "68.9e9", "E_slope": 0.0004, "k_lo": 167, "k_hi": 150,
+     "cp_ref": 896, "nu_ref": 0.33},
+)
+
+WIRE = _source(
+    {"R": "rho_0[material] * (1 + alpha * (T - 293.15))", "R_cu": "rho_0[copper]"},
+    {"rho_0": {"copper": 1.68e-8, "aluminum": 2.65e-8}, "alpha": 0.0039},
+    inputs=[{"name": "material", "type": "discrete", "values": ["copper", "aluminum"]},
+            {"name": "T", "unit": "K"}],
+)
+
+
+class TestScalar:
+
+    def test_formulas(self):
+        assert resolve_equation(ALLOY, "Sy", {"T": 400.0}) == pytest.approx(276e6 * (1 - 0.0005 * (400 - 293.15)))
+        assert resolve_equation(ALLOY, "Sy", {"T": 600.0}) == pytest.approx(276e6 * 0.5 * math.exp(-1.0))
+        assert resolve_equation(ALLOY, "k", {"T": 300.0}) == 167.0
+        assert resolve_equation(ALLOY, "k", {"T": 600.0}) == 150.0
+        assert resolve_equation(ALLOY, "nu", {"T": 300.0}) == 0.33
+        # Implicit multiplication goes through SymPy at compile time
+        assert resolve_equation(ALLOY, "cp", {"T": 300.0}) == pytest.approx(1496.0)
+
+    def test_array_constants(self):
+        assert resolve_equation(WIRE, "R", {"material": "aluminum", "T": 293.15}) == pytest.approx(2.65e-8)
+        assert resolve_equation(WIRE, "R_cu", {"material": "aluminum", "T": 0}) == pytest.approx(1.68e-8)
+        with pytest.raises(EquationError, match="Key 'gold' not found in array constant 'rho_0'"):
+            resolve_equation(WIRE, "R", {"material": "gold", "T": 293.15})
+
+    def test_errors(self):
+        with pytest.raises(EquationError, match="No formula defined"):
+            resolve_equation(ALLOY, "G", {"T": 300.0})
+        broken = _source({"x": "log(T)"}, {})
+        with pytest.raises(EquationError, match="Failed to evaluate formula 'log\\(T\\)'"):
+            resolve_equation(broken, "x", {"T": -1.0})
+
+    def test_compiled_once(self):
+        compiled = get_compiled_equations(ALLOY)
+        assert get_compiled_equations(ALLOY) is compiled
+        assert compiled.get("E") is compiled.formulas["E"]
+
+
+class TestVectorized:
+
+    def test_many_matches_scalar(self):
+        ts = np.linspace(250, 800, 201)
+        for output in ("Sy", "E", "k", "cp", "nu"):
+            batch = resolve_equation_many(ALLOY, output, {"T": ts})
+            assert batch == pytest.approx([resolve_equation(ALLOY, output, {"T": t}) for t in ts])
+
+    def test_text_inputs_grouped(self):
+        values = resolve_equation_many(
+            WIRE, "R", {"material": np.array(["copper", "gold", "aluminum"], dtype=object), "T": 293.15}
+        )
+        assert values[[0, 2]] == pytest.approx([1.68e-8, 2.65e-8])
+        assert np.isnan(values[1])
+
+    def test_domain_errors_are_nan(self):
+        broken = _source({"x": "log(T)"}, {})
+        values = resolve_equation_many(broken, "x", {"T": [-1.0, math.e]})
+        assert np.isnan(values[0]) and values[1] == pytest.approx(1.0)
+
+    def test_lookup_many(self, monkeypatch):
+        monkeypatch.setattr(registry, "_sources", {ALLOY.id: ALLOY})
+        monkeypatch.setattr(registry, "_loaded", True)
+
+        values = lookup_many(ALLOY.id, "Sy", {"T": [300.0, 600.0, 950.0]})
+        assert values[:2] == pytest.approx([lookup(ALLOY.id, "Sy", T=300.0), lookup(ALLOY.id, "Sy", T=600.0)])
+        # Outside the declared T range
+        assert np.isnan(values[2])
+
+
+class TestBinding:
+    """Inputs bind as the per-call evaluator bound them: over constants, declared or not."""
+
+    def test_optional_input_shadows_constant(self):
+        source = _source({"a": "T * k", "b": "2T * k"}, {"k": 3.0},
+                         inputs=[{"name": "T", "unit": "K"}, {"name": "k", "unit": "none", "optional": True}])
+        for output, factor in (("a", 1), ("b", 2)):
+            assert resolve_equation(source, output, {"T": 10.0, "k": 5.0}) == pytest.approx(factor * 50.0)
+            # Omitted: the same-named constant stands in (SymPy path included)
+            assert resolve_equation(source, output, {"T": 10.0}) == pytest.approx(factor * 30.0)
+            assert resolve_equation_many(source, output, {"T": [10.0, 20.0]}) == pytest.approx(
+                [factor * 30.0, factor * 60.0]
+            )
+
+    def test_undeclared_input_binds(self):
+        source = _source({"a": "T * k", "b": "2T * k + e"}, {"k": 3.0})
+        assert resolve_equation(source, "a", {"T": 10.0, "k": 5.0}) == pytest.approx(50.0)
+        assert resolve_equation(source, "b", {"T": 10.0, "k": 5.0}) == pytest.approx(100.0 + math.e)
+        with pytest.raises(EquationError, match="no value for 'T'"):
+            resolve_equation(source, "b", {})
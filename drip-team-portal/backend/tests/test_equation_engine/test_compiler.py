@@ -0,0 +1,107 @@
+"""
+Equation Compiler Tests
+
+compile_equation() must give the same results and raise the same errors as
+the evaluate_equation() tree walker.
+"""
+
+import pytest
+import math
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from app.services.equation_engine import (
+    parse_equation,
+    evaluate_equation,
+    compile_equation,
+    EvaluationError,
+    UnknownInputError
+)
+
+
+def _both(text, inputs, allowed=None):
+    ast = parse_equation(text, allowed_inputs=allowed or list(inputs))['ast']
+    return evaluate_equation(ast, inputs), compile_equation(ast)(inputs)
+
+
+def _errors(ast, inputs):
+    with pytest.raises((EvaluationError, UnknownInputError)) as walked:
+        evaluate_equation(ast, inputs)
+    with pytest.raises(type(walked.value)) as compiled:
+        compile_equation(ast)(inputs)
+    return str(walked.value), str(compiled.value)
+
+
+class TestMatchesTreeWalker:
+    """Same values as evaluate_equation()."""
+
+    @pytest.mark.parametrize("text,inputs", [
+        ("a + b - c", {"a": 1.5, "b": 2, "c": 0.25}),
+        ("a * b * c", {"a": 1e-5, "b": 300, "c": 2}),
+        ("F * L^3 / (3 * E * I)", {"F": 1000, "L": 2.0, "E": 200e9, "I": 8e-6}),
+        ("2 * pi * sqrt(L / g)", {"L": 1.2, "g": 9.81}),
+        ("exp(-a) * cos(b) + abs(-c) - ln(d) + tan(a)", {"a": 0.3, "b": 1.1, "c": 2, "d": 5}),
+        ("-a^2", {"a": 3}),
+    ])
+    def test_values(self, text, inputs):
+        walked, compiled = _both(text, inputs)
+        assert compiled == walked
+
+    def test_case_insensitive_inputs(self):
+        ast = parse_equation("Delta_T * 2", allowed_inputs=["Delta_T"])['ast']
+        assert compile_equation(ast)({"delta t": 4}) == 8.0
+
+
+class TestErrorSemantics:
+    """Same errors as evaluate_equation()."""
+
+    @pytest.mark.parametrize("text,inputs", [
+        ("a / b", {"a": 1, "b": 0}),
+        ("sqrt(a)", {"a": -1}),
+        ("ln(a)", {"a": 0}),
+        ("a ^ b", {"a": -2, "b": 0.5}),
+        ("a ^ b", {"a": 0, "b": -1}),
+        ("exp(a)", {"a": 1000}),
+        ("a ^ b", {"a": 10.0, "b": 400}),
+    ])
+    def test_math_errors(self, text, inputs):
+        ast = parse_equation(text, allowed_inputs=list(inputs))['ast']
+        walked, compiled = _errors(ast, inputs)
+        assert compiled == walked
+
+    def test_unknown_input(self):
+        ast = parse_equation("a + b", allowed_inputs=["a", "b"])['ast']
+        walked, compiled = _errors(ast, {"a": 1})
+        assert compiled == walked
+
+    def test_malformed_nodes_fail_when_evaluated(self):
+        for ast in ({"value": 1}, {"type": "matrix"}, {"type": "div", "numerator": {"type": "const", "value": 1}}):
+            compiled = compile_equation(ast)
+            walked, result = _errors(ast, {})
+            assert result == walked
+
+    def test_error_context(self):
+        ast = parse_equation("a / b", allowed_inputs=["a", "b"])['ast']
+        with pytest.raises(EvaluationError) as exc:
+            compile_equation(ast, expression="a / b")({"a": 1, "b": 0})
+        assert exc.value.expression == "a / b"
+        assert exc.value.node_type == "div"
+
+
+class TestCachedOnVersion:
+    """PhysicsModelVersion compiles each output's AST once."""
+
+    def test_compiled_once_per_ast(self):
+        from app.models.physics_model import PhysicsModelVersion
+
+        parsed = parse_equation("x * 2", allowed_inputs=["x"])
+        version = PhysicsModelVersion(equation_ast={"y": parsed['ast']})
+        compiled = version.compiled_equation("y")
+        assert version.compiled_equation("y") is compiled
+        assert compiled({"x": 4}) == 8.0
+        assert version.compiled_equation("z") is None
+
+        version.equation_ast = {"y": parse_equation("x * 3", allowed_inputs=["x"])['ast']}
+        assert version.compiled_equation("y")({"x": 4}) == 12.0
@@ -0,0 +1,121 @@
+"""
+Vectorized Evaluator Tests
+
+evaluate_equation_many() must agree with evaluate_equation() element by
+element, and flag (not raise) the elements the scalar walker would reject.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from app.services.equation_engine import (
+    parse_equation,
+    evaluate_equation,
+    evaluate_equation_many,
+    EvaluationError,
+    UnknownInputError
+)
+
+
+def _ast(text, inputs):
+    return parse_equation(text, allowed_inputs=list(inputs))['ast']
+
+
+def _scalar(ast, inputs, i):
+    """evaluate_equation() at point i of the broadcast inputs (None if it raises)."""
+    arrays = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in inputs.values()])
+    point = {k: float(a[i]) for k, a in zip(inputs, arrays)}
+    try:
+        return evaluate_equation(ast, point)
+    except EvaluationError:
+        return None
+
+
+class TestMatchesScalar:
+    """Same values as evaluate_equation() at every point."""
+
+    @pytest.mark.parametrize("text,inputs", [
+        ("CTE * delta_T * L0", {"CTE": 2.3e-5, "delta_T": np.linspace(0, 500, 101), "L0": 1.0}),
+        ("F * L^3 / (3 * E * I)", {"F": np.linspace(100, 1000, 10), "L": np.linspace(0.5, 2, 10),
+                                   "E": 200e9, "I": 8e-6}),
+        ("exp(-a) * cos(b) + abs(-c) - ln(d) + tan(a)",
+         {"a": np.linspace(0, 1, 11), "b": 1.1, "c": np.linspace(-2, 2, 11), "d": 5}),
+        ("2 * pi * sqrt(L / g)", {"L": np.linspace(0.1, 3, 30), "g": 9.81}),
+    ])
+    def test_values(self, text, inputs):
+        ast = _ast(text, inputs)
+        result = evaluate_equation_many(ast, inputs)
+        assert result.error_count == 0
+        for i, value in enumerate(result.values):
+            assert value == pytest.approx(_scalar(ast, inputs, i), rel=1e-12)
+
+    def test_scalar_inputs(self):
+        result = evaluate_equation_many(_ast("a * b", {"a": 0, "b": 0}), {"a": 2, "b": 3})
+        assert result.values.shape == ()
+        assert float(result.values) == 6.0
+
+    def test_broadcast_grid(self):
+        ast = _ast("a + b", {"a": 0, "b": 0})
+        result = evaluate_equation_many(ast, {"a": np.arange(3)[:, None], "b": np.arange(4)[None, :]})
+        assert result.values.shape == (3, 4)
+        assert result.values[2, 3] == 5.0
+
+    def test_case_insensitive_inputs(self):
+        ast = _ast("Delta_T * 2", {"Delta_T": 0})
+        result = evaluate_equation_many(ast, {"delta t": np.array([1.0, 2.0])})
+        assert result.values.tolist() == [2.0, 4.0]
+
+
+class TestErrorMasks:
+    """Elements the scalar walker rejects are NaN and flagged with a reason."""
+
+    @pytest.mark.parametrize("text,inputs,reason", [
+        ("a / b", {"a": 1.0, "b": np.array([1.0, 0.0, 2.0])}, "Division by zero"),
+        ("sqrt(a)", {"a": np.array([4.0, -1.0, 9.0])}, "Cannot take square root of negative number"),
+        ("ln(a)", {"a": np.array([1.0, 0.0, 2.0])}, "Cannot take logarithm of non-positive number"),
+        ("a ^ b", {"a": np.array([2.0, -2.0, 3.0]), "b": 0.5},
+         "Cannot raise negative number to non-integer power"),
+        ("exp(a)", {"a": np.array([1.0, 1000.0, 2.0])}, "Overflow in exp() - argument too large"),
+    ])
+    def test_flags_failing_element(self, text, inputs, reason):
+        ast = _ast(text, inputs)
+        result = evaluate_equation_many(ast, inputs)
+        assert result.error_mask.tolist() == [False, True, False]
+        assert np.isnan(result.values[1])
+        assert result.errors() == {reason: [1]}
+        for i in (0, 2):
+            assert result.values[i] == pytest.approx(_scalar(ast, inputs, i))
+        assert _scalar(ast, inputs, 1) is None
+
+    def test_first_failure_wins(self):
+        ast = _ast("sqrt(a) / b", {"a": 0, "b": 0})
+        result = evaluate_equation_many(ast, {"a": np.array([-1.0, 1.0]), "b": 0.0})
+        assert result.reasons.tolist() == [
+            "Cannot take square root of negative number",
+            "Division by zero",
+        ]
+
+
+class TestStructuralErrors:
+    """Problems that affect every element still raise."""
+
+    def test_unknown_input(self):
+        with pytest.raises(UnknownInputError):
+            evaluate_equation_many(_ast("a + b", {"a": 0, "b": 0}), {"a": np.ones(3)})
+
+    def test_unknown_node_type(self):
+        with pytest.raises(EvaluationError):
+            evaluate_equation_many({"type": "matrix"}, {})
+
+    def test_inputs_not_broadcastable(self):
+        with pytest.raises(EvaluationError):
+            evaluate_equation_many(_ast("a + b", {"a": 0, "b": 0}), {"a": np.ones(3), "b": np.ones(4)})
+
+    def test_non_numeric_input(self):
+        with pytest.raises(EvaluationError):
+            evaluate_equation_many(_ast("a * 2", {"a": 0}), {"a": ["x", "y"]})
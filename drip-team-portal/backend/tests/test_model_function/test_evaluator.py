@@ -9,6 +9,7 @@ PHASE 2 ACTIVE: Using real implementation from app.services.model_evaluation
 import pytest
 import math
 
+from app.models.physics_model import PhysicsModelVersion
 from app.services.model_evaluation import ModelEvaluationError
 
 
@@ -151,6 +152,69 @@ class TestEvaluateErrors:
             pass
 
 
+class TestCompiledModelCache:
+    """Repeated MODEL() calls reuse the compiled current version."""
+
+    def test_repeated_calls_skip_database(self, db, simple_model, evaluate_model, monkeypatch):
+        from app.models.physics_model import PhysicsModel
+        from app.services.model_evaluation import compiled_models
+
+        calls = []
+        original = PhysicsModel.find_by_name.__func__
+        monkeypatch.setattr(
+            PhysicsModel, "find_by_name",
+            classmethod(lambda cls, session, name: calls.append(name) or original(cls, session, name))
+        )
+
+        assert [evaluate_model("Simple", {"x": x}) for x in (1, 2, 1)] == [2, 4, 2]
+        assert evaluate_model("SIMPLE", {"X": 3}) == 6
+        assert calls == ["Simple"]
+        assert compiled_models.stats()["hits"] == 3
+
+    def test_new_version_from_another_worker(self, db, simple_model, evaluate_model, monkeypatch):
+        from app.services.model_evaluation import compiled_models
+
+        assert evaluate_model("Simple", {"x": 5}) == 10
+
+        # What PATCH /physics-models/{id} does when the equations change
+        current = simple_model.current_version
+        current.is_current = False
+        db.add(PhysicsModelVersion(
+            physics_model_id=simple_model.id, version=2, is_current=True,
+            inputs=current.inputs, outputs=current.outputs, equations={"y": "x * 3"},
+        ))
+        db.commit()
+        db.expire_all()
+
+        # No invalidate() here: the PATCH ran elsewhere. Within the recheck
+        # interval the cached version is served, after it the new one is found
+        assert evaluate_model("Simple", {"x": 5}) == 10
+        monkeypatch.setattr(compiled_models, "recheck_seconds", 0)
+        assert evaluate_model("Simple", {"x": 5}) == 15
+
+    def test_unchanged_version_reused_after_recheck(self, db, simple_model, evaluate_model, monkeypatch):
+        from app.services.model_evaluation import compiled_models
+
+        monkeypatch.setattr(compiled_models, "recheck_seconds", 0)
+        assert evaluate_model("Simple", {"x": 1}) == 2
+        first = compiled_models.get_version("Simple", simple_model.current_version.id)
+        assert evaluate_model("Simple", {"x": 2}) == 4
+        assert compiled_models.get_version("Simple", simple_model.current_version.id) is first
+        assert compiled_models.stats()["size"] == 1
+
+    def test_rename_invalidates_old_name(self, db, simple_model, evaluate_model):
+        from app.services.model_evaluation import compiled_models
+
+        assert evaluate_model("Simple", {"x": 1}) == 2
+        simple_model.name = "Doubler"
+        db.commit()
+        compiled_models.invalidate("Simple")
+
+        with pytest.raises(ModelEvaluationError, match="not found"):
+            evaluate_model("Simple", {"x": 1})
+        assert evaluate_model("Doubler", {"x": 1}) == 2
+
+
 class TestComplexModel:
     """Test complex model with functions."""
 
@@ -0,0 +1,153 @@
+"""
+Tests for batched, cached property view generation.
+
+Each view column is evaluated over the whole grid in one call; payloads are
+cached per (source_id, view_id, registry version).
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.properties import registry
+from app.services.properties.router import lookup
+from app.services.properties.schemas import PropertySource
+
+
+ALLOY = PropertySource(
+    id="test_view_alloy",
+    name="Alloy",
+    category="material",
+    source="test",
+    type="equation",
+    inputs=[{"name": "T", "unit": "K", "range": [200, 900]},
+            {"name": "grade", "type": "discrete", "values": ["A", "B"]}],
+    outputs=[{"name": "E", "unit": "Pa"}, {"name": "k", "unit": "W/(m·K)"}],
+    resolution={
+        "type": "equation",
+        "formulas": {"E": "E_0[grade] * (1 - 0.0004 * (T - 293.15))", "k": "150 + 0.01 * T"},
+        "constants": {"E_0": {"A": 70e9, "B": 200e9}},
+    },
+    views=[
+        {"id": "default", "name": "By temperature",
+         "grid": {"T": {"type": "list", "values": [250, 300, 1000]}},
+         "constraints": {"grade": "A"},
+         "columns": [{"output": "E", "header": "E"}, {"output": "k", "header": "k"},
+                     {"computed": "E / k", "header": "ratio"}]},
+        {"id": "grades", "name": "By grade", "layout": "nested",
+         "grid": {"grade": {"type": "list", "values": ["A", "B"]},
+                  "T": {"type": "range", "start": 300, "end": 500, "step": 100, "unit": "K"}},
+         "columns": [{"output": "E", "header": "E"}]},
+    ],
+)
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    monkeypatch.setattr(registry, "_sources", {ALLOY.id: ALLOY})
+    monkeypatch.setattr(registry, "_loaded", True)
+
+
+class TestGenerateView:
+
+    def test_flat_view(self, registered):
+        view = registry.generate_view(ALLOY.id, "default")
+
+        assert [h["key"] for h in view["headers"]] == ["T", "E", "k", "E / k"]
+        first, _, out_of_range = view["rows"]
+        assert first["values"]["E"] == pytest.approx(lookup(ALLOY.id, "E", T=250, grade="A"))
+        assert first["values"]["k"] == pytest.approx(152.5)
+        assert first["values"]["ratio"] is None
+        assert out_of_range["values"] == {"T": 1000, "E": None, "k": None, "ratio": None}
+
+    def test_nested_view(self, registered):
+        view = registry.generate_view(ALLOY.id, "grades")
+
+        assert len(view["rows"]) == 6
+        assert [r["section"]["value"] for r in view["rows"]] == ["A"] * 3 + ["B"] * 3
+        assert view["rows"][4]["values"]["E"] == pytest.approx(lookup(ALLOY.id, "E", T=400, grade="B"))
+
+    def test_parallel_matches_serial(self, registered, monkeypatch):
+        view = ALLOY.views[0]
+        grid = list(registry._iter_grid(view))
+        serial = registry._view_rows(ALLOY, view, grid)
+        monkeypatch.setattr(registry, "VIEW_PARALLEL_MIN_CELLS", 0)
+        assert registry._view_rows(ALLOY, view, grid) == serial
+
+    def test_cached_until_reload(self, registered, monkeypatch):
+        view = registry.generate_view(ALLOY.id, "default")
+        assert registry.generate_view(ALLOY.id, "default") is view
+
+        monkeypatch.setattr(registry, "_registry_version", registry._registry_version + 1)
+        assert registry.generate_view(ALLOY.id, "default") is not view
+
+    def test_unknown_view(self, registered):
+        with pytest.raises(registry.RegistryError, match="View 'nope' not found"):
+            registry.generate_view(ALLOY.id, "nope")
+
+
+RANGE_VIEW = {
+    "id": "sweep", "name": "Sweep",
+    "grid": {"T": {"type": "range", "start": 200, "end": 899, "step": 1}},
+    "constraints": {"grade": "B"},
+    "columns": [{"output": "k", "header": "k"}],
+}
+
+
+class TestWindowedViews:
+
+    @pytest.fixture
+    def swept(self, monkeypatch):
+        source = ALLOY.model_copy(update={"views": ALLOY.views + [ALLOY.views[0].model_validate(RANGE_VIEW)]})
+        monkeypatch.setattr(registry, "_sources", {source.id: source})
+        monkeypatch.setattr(registry, "_loaded", True)
+        return source
+
+    def test_window_matches_full_view(self, swept):
+        full = registry.generate_view(swept.id, "sweep")["rows"]
+        registry.clear_view_cache()
+
+        page = registry.generate_view_window(swept.id, "sweep", offset=650, limit=100)
+        assert page["rows"] == full[650:]
+        assert (page["total_rows"], page["next_offset"]) == (700, None)
+
+        first = registry.generate_view_window(swept.id, "sweep", limit=10)
+        assert first["rows"] == full[:10] and first["next_offset"] == 10
+
+    def test_rows_generated_in_chunks(self, swept, monkeypatch):
+        sizes = []
+        original = registry._evaluate_view_columns
+        monkeypatch.setattr(
+            registry, "_evaluate_view_columns",
+            lambda source, view, points: sizes.append(len(points)) or original(source, view, points),
+        )
+
+        rows = registry.iter_view_rows(swept.id, "sweep", chunk_size=300)
+        assert next(rows)["values"]["T"] == 200
+        assert sizes == [300]
+
+        assert len(list(rows)) == 699
+        assert sizes == [300, 300, 100]
+
+    def test_ndjson_endpoint(self, swept):
+        import json
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.api.v1.engineering_properties import router
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+        url = f"/api/v1/eng-properties/sources/{swept.id}/views/sweep"
+
+        response = client.get(url, params={"format": "ndjson", "offset": 10, "limit": 5})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["total_rows"] == 700 and "rows" not in lines[0]
+        assert [line["values"]["T"] for line in lines[1:]] == [210, 211, 212, 213, 214]
+
+        page = client.get(url, params={"offset": 695}).json()
+        assert len(page["rows"]) == 5 and page["next_offset"] is None
+        assert client.get(url, params={"format": "xml"}).status_code == 422
@@ -0,0 +1,144 @@
+"""
+Tests for the compiled property-source registry cache.
+
+Unchanged YAML files are loaded from the pickle cache; only files whose
+mtime or size changed are parsed again.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.properties import registry
+from app.services.properties.backends import table
+from app.services.properties.router import LookupError, lookup
+
+
+WATER_YAML = """
+id: cache_water
+name: Water
+category: process
+source: test
+type: table
+inputs:
+  - name: T
+    unit: K
+outputs:
+  - name: rho
+    unit: kg/m³
+resolution:
+  type: table
+  data:
+    T: [280, 300, 320]
+    rho: [{rho}, 996.5, 989.3]
+"""
+
+SHAPES_YAML = """
+id: cache_shapes
+name: Shapes
+category: structural
+source: test
+type: table
+inputs:
+  - name: designation
+    type: discrete
+outputs:
+  - name: A
+    unit: m²
+resolution:
+  type: table
+  data:
+    W8X10: {A: 0.0019}
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    (data / "process").mkdir(parents=True)
+    (data / "structural").mkdir()
+    (data / "process" / "water.yaml").write_text(WATER_YAML.format(rho=999.9))
+    (data / "structural" / "shapes.yml").write_text(SHAPES_YAML)
+
+    monkeypatch.setattr(registry, "_get_data_dir", lambda: data)
+    monkeypatch.setenv("PROPERTY_SOURCES_CACHE", str(tmp_path / "registry.pickle"))
+    monkeypatch.setattr(registry, "_sources", {})
+    monkeypatch.setattr(registry, "_loaded", False)
+    yield data
+    table.clear_prepared_tables()
+
+
+def _parse_count(monkeypatch):
+    calls = []
+    original = registry._load_yaml_file
+
+    def counting(path):
+        calls.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(registry, "_load_yaml_file", counting)
+    return calls
+
+
+class TestRegistryCache:
+
+    def test_second_load_uses_cache(self, data_dir, monkeypatch):
+        registry.load_all_sources(force_reload=True)
+        assert (data_dir.parent / "registry.pickle").exists()
+
+        calls = _parse_count(monkeypatch)
+        sources = registry.load_all_sources(force_reload=True)
+
+        assert calls == []
+        assert set(sources) == {"cache_water", "cache_shapes"}
+        # Prepared grids come back with the cached source
+        assert table.get_prepared_table(sources["cache_water"]) is table._prepared["cache_water"]
+
+    def test_changed_file_is_reparsed(self, data_dir, monkeypatch):
+        registry.load_all_sources(force_reload=True)
+        (data_dir / "process" / "water.yaml").write_text(WATER_YAML.format(rho=1000.25))
+
+        calls = _parse_count(monkeypatch)
+        sources = registry.load_all_sources(force_reload=True)
+
+        assert calls == ["water.yaml"]
+        assert sources["cache_water"].resolution.data["rho"][0] == 1000.25
+
+    def test_reload_rebuilds_from_yaml(self, data_dir, monkeypatch):
+        registry.load_all_sources(force_reload=True)
+
+        calls = _parse_count(monkeypatch)
+        registry.reload_sources()
+
+        assert sorted(calls) == ["shapes.yml", "water.yaml"]
+
+    def test_reload_swaps_in_new_sources(self, data_dir, monkeypatch):
+        previous = registry.load_all_sources(force_reload=True)
+        (data_dir / "process" / "water.yaml").unlink()
+
+        registry.reload_sources()
+
+        # Readers holding the old registry never see it emptied mid-reload
+        assert set(previous) == {"cache_water", "cache_shapes"}
+        assert set(registry._sources) == {"cache_shapes"}
+
+    def test_reload_forgets_unknown_source_errors(self, data_dir, monkeypatch):
+        registry.load_all_sources(force_reload=True)
+        with pytest.raises(LookupError, match="Unknown property source"):
+            lookup("cache_added", "rho", T=300.0)
+
+        (data_dir / "process" / "added.yaml").write_text(
+            WATER_YAML.format(rho=999.9).replace("id: cache_water", "id: cache_added")
+        )
+        registry.reload_sources()
+
+        assert lookup("cache_added", "rho", T=300.0) == pytest.approx(996.5)
+
+    def test_unreadable_cache_is_ignored(self, data_dir, monkeypatch):
+        (data_dir.parent / "registry.pickle").write_bytes(b"not a pickle")
+
+        sources = registry.load_all_sources(force_reload=True)
+
+        assert set(sources) == {"cache_water", "cache_shapes"}
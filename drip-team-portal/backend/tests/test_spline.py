@@ -0,0 +1,143 @@
+"""
+Tests for spline interpolation and extrapolation modes of table sources.
+
+Coefficients are built once per (grid, output); natural splines match the
+hand-solved curve, PCHIP never overshoots monotone data, and clamp /
+extrapolate behave the same for single and batched lookups.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from app.services.properties import registry
+from app.services.properties.router import lookup, lookup_many
+from app.services.properties.backends.spline import CubicSpline, SplineError
+from app.services.properties.backends.table import (
+    TableLookupError, resolve_table, resolve_table_many, get_prepared_table,
+)
+from tests.test_table_backend import _source
+
+
+def _curve(extrap="error", interp="spline"):
+    return _source(
+        f"test_curve_{interp}_{extrap}",
+        [{"name": "x", "unit": "none", "extrap": extrap}],
+        [{"name": "y", "unit": "none", "interp": interp}],
+        {"x": [0.0, 1.0, 2.0], "y": [0.0, 1.0, 0.0]},
+    )
+
+
+class TestCubicSpline:
+
+    def test_natural_matches_hand_solution(self):
+        # M1 = -3 for knots (0,0) (1,1) (2,0): y(0.5) = 1.5 * 0.5 - 0.5 * 0.5^3
+        spline = CubicSpline.natural([0.0, 1.0, 2.0], [0.0, 1.0, 0.0])
+        assert spline(np.array([0.5, 1.5]))[0] == pytest.approx(0.6875)
+        assert spline(np.array([0.5, 1.5]))[1] == pytest.approx(0.6875)
+        assert spline(np.array([0.0, 1.0, 2.0])) == pytest.approx([0.0, 1.0, 0.0])
+
+    def test_reproduces_linear_data(self):
+        xs = np.array([0.0, 0.5, 2.0, 3.5, 10.0])
+        for build in (CubicSpline.natural, CubicSpline.pchip):
+            spline = build(xs, 3 * xs - 1)
+            x = np.linspace(-1, 11, 50)
+            assert spline(x) == pytest.approx(3 * x - 1)
+
+    def test_sparse_grid_accuracy(self):
+        xs = np.linspace(0, np.pi, 9)
+        x = np.linspace(0, np.pi, 400)
+        natural = CubicSpline.natural(xs, np.sin(xs))(x)
+        linear = np.interp(x, xs, np.sin(xs))
+        assert np.max(np.abs(natural - np.sin(x))) < 2e-3
+        assert np.max(np.abs(natural - np.sin(x))) < np.max(np.abs(linear - np.sin(x))) / 5
+
+    def test_pchip_is_monotone(self):
+        xs = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+        ys = np.array([0.0, 0.0, 0.1, 5.0, 5.0, 5.2])
+        x = np.linspace(0, 5, 1001)
+        values = CubicSpline.pchip(xs, ys)(x)
+        assert np.all(np.diff(values) >= -1e-12)
+        assert values.min() >= 0.0 and values.max() <= 5.2
+        # The natural spline rings on the same data
+        assert CubicSpline.natural(xs, ys)(x).min() < 0.0
+
+    def test_rejects_bad_grids(self):
+        with pytest.raises(SplineError):
+            CubicSpline.natural([0.0, 1.0, 1.0], [0.0, 1.0, 2.0])
+        with pytest.raises(SplineError):
+            CubicSpline.pchip([0.0], [1.0])
+
+
+class TestTableSplines:
+
+    def test_coefficients_prepared_once(self):
+        source = _curve()
+        grid = get_prepared_table(source).grid()
+        assert grid.spline("y", "spline") is grid.spline("y", "spline")
+        assert grid._splines
+
+    def test_scalar_and_batch_agree(self):
+        for interp in ("spline", "pchip"):
+            source = _curve(interp=interp)
+            xs = np.linspace(0, 2, 17)
+            batch = resolve_table_many(source, "y", {"x": xs})
+            assert batch == pytest.approx([resolve_table(source, "y", {"x": x}) for x in xs])
+        assert resolve_table(_curve(), "y", {"x": 0.5}) == pytest.approx(0.6875)
+
+    def test_out_of_range_errors(self):
+        source = _curve()
+        with pytest.raises(TableLookupError, match="outside range"):
+            resolve_table(source, "y", {"x": 2.5})
+        assert np.isnan(resolve_table_many(source, "y", {"x": [2.5]})[0])
+
+
+class TestExtrapolation:
+
+    def test_clamp(self):
+        for interp in ("linear", "spline"):
+            source = _curve("clamp", interp)
+            assert resolve_table(source, "y", {"x": -1.0}) == pytest.approx(0.0)
+            assert resolve_table_many(source, "y", {"x": [3.0, 1.0]}) == pytest.approx([0.0, 1.0])
+
+    def test_extrapolate_linear_and_step(self):
+        source = _curve("extrapolate", "linear")
+        assert resolve_table(source, "y", {"x": 3.0}) == pytest.approx(-1.0)
+        assert resolve_table_many(source, "y", {"x": [-1.0, 0.5]}) == pytest.approx([-1.0, 0.5])
+        step = _curve("extrapolate", "step")
+        assert resolve_table(step, "y", {"x": -1.0}) == 0.0
+
+    def test_extrapolate_spline_continues_end_segment(self):
+        source = _curve("extrapolate", "spline")
+        spline = CubicSpline.natural([0.0, 1.0, 2.0], [0.0, 1.0, 0.0])
+        assert resolve_table(source, "y", {"x": 2.5}) == pytest.approx(spline(np.array([2.5]))[0])
+
+    def test_two_dimensional_per_axis(self):
+        source = _source(
+            "test_surface",
+            [{"name": "T", "unit": "K", "extrap": "extrapolate"}, {"name": "P", "unit": "Pa"}],
+            [{"name": "h", "unit": "J/kg"}],
+            {"xs": [300, 400], "ys": [1.0, 2.0], "h": [[1.0, 2.0], [3.0, 4.0]]},
+        )
+        assert resolve_table(source, "h", {"T": 500, "P": 1.0}) == pytest.approx(3.0)
+        with pytest.raises(TableLookupError, match="y=3.0 outside range"):
+            resolve_table(source, "h", {"T": 350, "P": 3.0})
+
+    def test_router_clamps_declared_range(self, monkeypatch):
+        source = _source(
+            "test_clamped",
+            [{"name": "T", "unit": "K", "range": [300, 400], "extrap": "clamp"}],
+            [{"name": "k", "unit": "W/(m·K)", "interp": "pchip"}],
+            {"T": [250, 300, 350, 400, 450], "k": [1.0, 2.0, 3.0, 4.0, 5.0]},
+        )
+        monkeypatch.setattr(registry, "_sources", {source.id: source})
+        monkeypatch.setattr(registry, "_loaded", True)
+
+        assert lookup(source.id, "k", T=1000) == pytest.approx(4.0)
+        assert lookup_many(source.id, "k", {"T": [200, 325, 1000]}) == pytest.approx([2.0, 2.5, 4.0])
+        # A non-numeric point is unresolved on its own rather than failing the column
+        assert np.isnan(lookup_many(source.id, "k", {"T": ["hot", 325]})[0])
@@ -0,0 +1,279 @@
+"""
+Tests for the NumPy table interpolation backend and batched lookups.
+
+Scalar lookups keep their range errors; lookup_many interpolates whole
+arrays in one call and reports unresolvable points as NaN.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from app.services.properties import registry
+from app.services.properties.router import lookup, lookup_many, lookup_batch, LookupError
+from app.services.properties.schemas import PropertySource
+from app.services.properties.backends.table import (
+    TableLookupError, interp_1d_linear, interp_1d_step, interp_1d_log,
+    interp_2d_bilinear, resolve_table, resolve_table_many, get_prepared_table,
+)
+from app.services.properties.discrete import get_discrete_index
+
+
+def _source(source_id, inputs, outputs, data):
+    return PropertySource(
+        id=source_id,
+        name=source_id,
+        category="process",
+        source="test",
+        type="table",
+        inputs=inputs,
+        outputs=outputs,
+        resolution={"type": "table", "data": data},
+    )
+
+
+WATER = _source(
+    "test_water",
+    [{"name": "T", "unit": "K", "range": [280, 360]}],
+    [
+        {"name": "rho", "unit": "kg/m³"},
+        {"name": "grade", "unit": "none", "interp": "step"},
+    ],
+    {"T": [280, 300, 320, 340, 360], "rho": [999.9, 996.5, 989.3, 979.4, 967.4],
+     "grade": [1, 2, 3, 4, 5]},
+)
+
+STEAM = _source(
+    "test_steam",
+    [{"name": "T", "unit": "K"}, {"name": "P", "unit": "Pa"}],
+    [{"name": "h", "unit": "J/kg"}],
+    {"xs": [300, 400, 500], "ys": [1e5, 2e5],
+     "h": [[1.0, 2.0, 3.0], [10.0, 20.0, 30.0]]},
+)
+
+BOLTS = _source(
+    "test_bolts",
+    [{"name": "size", "type": "discrete", "values": ["M6", "M8"]}, {"name": "T", "unit": "K"}],
+    [{"name": "preload", "unit": "N"}],
+    {"M6": {"T": [300, 400], "preload": [100.0, 80.0]},
+     "M8": {"T": [300, 400], "preload": [200.0, 160.0]}},
+)
+
+GRADES = _source(
+    "test_grades",
+    [{"name": "grade", "type": "discrete", "values": ["IT6", "IT7"]},
+     {"name": "size", "type": "discrete", "values": ["0-3", "3-6"]}],
+    [{"name": "tol", "unit": "µm"}],
+    {"IT6": {"0-3": {"tol": 6.0}, "3-6": {"tol": 8.0}},
+     "IT7|0-3": {"tol": 10.0}, "IT7": {"0-3": {"tol": 99.0}}},
+)
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    sources = {s.id: s for s in (WATER, STEAM, BOLTS, GRADES)}
+    monkeypatch.setattr(registry, "_sources", sources)
+    monkeypatch.setattr(registry, "_loaded", True)
+    return sources
+
+
+class TestScalarInterpolation:
+
+    def test_linear_matches_grid_and_midpoints(self):
+        xs, ys = [0.0, 1.0, 3.0], [0.0, 10.0, 30.0]
+        assert interp_1d_linear(xs, ys, 1.0) == 10.0
+        assert interp_1d_linear(xs, ys, 2.0) == pytest.approx(20.0)
+        assert interp_1d_linear(xs, ys, 3.0) == 30.0
+        with pytest.raises(TableLookupError, match="outside range"):
+            interp_1d_linear(xs, ys, 3.5)
+
+    def test_step_and_log(self):
+        assert interp_1d_step([0, 1, 2], [5, 6, 7], 1.9) == 6
+        assert interp_1d_step([0, 1, 2], [5, 6, 7], 9.0) == 7
+        with pytest.raises(TableLookupError, match="below minimum"):
+            interp_1d_step([0, 1, 2], [5, 6, 7], -1)
+        assert interp_1d_log([1, 100], [1, 10000], 10) == pytest.approx(100.0)
+
+    def test_bilinear(self):
+        zs = [[1.0, 2.0, 3.0], [10.0, 20.0, 30.0]]
+        assert interp_2d_bilinear([300, 400, 500], [1e5, 2e5], zs, 350, 1.5e5) == pytest.approx(8.25)
+        assert interp_2d_bilinear([300, 400, 500], [1e5, 2e5], zs, 500, 2e5) == pytest.approx(30.0)
+        with pytest.raises(TableLookupError, match="y="):
+            interp_2d_bilinear([300, 400, 500], [1e5, 2e5], zs, 350, 3e5)
+
+
+class TestPreparedTables:
+
+    def test_grids_converted_once(self):
+        prepared = get_prepared_table(WATER)
+        assert get_prepared_table(WATER) is prepared
+        assert isinstance(prepared.grid().axes[0], np.ndarray)
+
+    def test_resolve_table_uses_prepared_grids(self):
+        assert resolve_table(WATER, "rho", {"T": 310}) == pytest.approx((996.5 + 989.3) / 2)
+        assert resolve_table(WATER, "grade", {"T": 335}) == 3.0
+        assert resolve_table(BOLTS, "preload", {"size": "M8", "T": 350}) == pytest.approx(180.0)
+        with pytest.raises(TableLookupError, match="No data for M10"):
+            resolve_table(BOLTS, "preload", {"size": "M10", "T": 350})
+
+    def test_many_matches_scalar(self):
+        ts = np.linspace(280, 360, 1001)
+        batch = resolve_table_many(WATER, "rho", {"T": ts})
+        assert batch == pytest.approx([resolve_table(WATER, "rho", {"T": t}) for t in ts])
+
+        hs = resolve_table_many(STEAM, "h", {"T": [300, 350, 600], "P": 1.5e5})
+        assert hs[:2] == pytest.approx([5.5, 8.25])
+        assert np.isnan(hs[2])
+
+
+class TestDiscreteIndex:
+
+    def test_rows_indexed_once(self):
+        index = get_discrete_index(GRADES)
+        assert get_discrete_index(GRADES) is index
+        assert index.nested[("IT6", "3-6")] == {"tol": 8.0}
+
+    def test_compound_and_nested_keys(self):
+        assert resolve_table(GRADES, "tol", {"grade": "IT6", "size": "3-6"}) == 8.0
+        # Compound keys win over nested ones
+        assert resolve_table(GRADES, "tol", {"grade": "IT7", "size": "0-3"}) == 10.0
+        with pytest.raises(TableLookupError, match="No match for grade='IT7', size='3-6'"):
+            resolve_table(GRADES, "tol", {"grade": "IT7", "size": "3-6"})
+
+    def test_canonical_case(self, registered):
+        assert lookup("test_grades", "tol", grade="it6", size="0-3") == 6.0
+        with pytest.raises(LookupError, match="Invalid value for 'grade': 'IT9'"):
+            lookup("test_grades", "tol", grade="IT9", size="0-3")
+        with pytest.raises(LookupError, match="Invalid value"):
+            lookup("test_grades", "tol", grade=["IT6"], size="0-3")
+
+
+class TestLookupMany:
+
+    def test_matches_lookup(self, registered):
+        ts = np.linspace(280, 360, 50)
+        values = lookup_many("test_water", "rho", {"T": ts})
+        assert values == pytest.approx([lookup("test_water", "rho", T=t) for t in ts])
+
+    def test_two_dimensional_array_input(self, registered):
+        points = np.array([[300, 1e5], [400, 2e5]])
+        assert lookup_many("test_steam", "h", points) == pytest.approx([1.0, 20.0])
+
+    def test_out_of_range_points_are_nan(self, registered):
+        values = lookup_many("test_water", "rho", {"T": [270, 300, 370]})
+        assert np.isnan(values[0]) and np.isnan(values[2])
+        assert values[1] == pytest.approx(996.5)
+
+    def test_mixed_discrete_groups(self, registered):
+        values = lookup_many(
+            "test_bolts", "preload",
+            {"size": ["m6", "M8", "M10", "M8"], "T": [300, 350, 300, 400]}
+        )
+        assert values[[0, 1, 3]] == pytest.approx([100.0, 180.0, 160.0])
+        assert np.isnan(values[2])
+
+    def test_unknown_output_raises(self, registered):
+        with pytest.raises(LookupError, match="Unknown output"):
+            lookup_many("test_water", "mu", {"T": [300]})
+
+
+class TestLookupBatch:
+
+    def test_columnar_with_point_errors(self, registered):
+        batch = lookup_batch("test_water", ["rho", "grade"], {"T": [300, 370, 335]})
+        assert batch["count"] == 3
+        assert batch["outputs"]["rho"][0] == pytest.approx(996.5)
+        assert batch["outputs"]["rho"][1] is None
+        assert batch["outputs"]["grade"] == [2.0, None, 3.0]
+        assert [(e["index"], e["output"]) for e in batch["errors"]] == [(1, "rho"), (1, "grade")]
+        assert "outside valid range" in batch["errors"][0]["error"]
+
+    def test_non_numeric_point_fails_alone(self, registered):
+        batch = lookup_batch("test_water", ["rho"], {"T": [300, "hot", 320]})
+        assert batch["outputs"]["rho"] == [pytest.approx(996.5), None, pytest.approx(989.3)]
+        assert [e["index"] for e in batch["errors"]] == [1]
+        assert "Input 'T' must be numeric" in batch["errors"][0]["error"]
+
+    def test_points(self, registered):
+        batch = lookup_batch("test_bolts", ["preload"], [
+            {"size": "M8", "T": 350}, {"size": "M10", "T": 300}, {"T": 300},
+        ])
+        assert batch["outputs"]["preload"] == [pytest.approx(180.0), None, None]
+        errors = {e["index"]: e["error"] for e in batch["errors"]}
+        assert "Invalid value for 'size'" in errors[1]
+        assert "Missing required input: 'size'" in errors[2]
+
+    def test_endpoint(self, registered):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.api.v1.engineering_properties import router
+
+        app = FastAPI()
+        app.include_router(router)
+        client = TestClient(app)
+
+        response = client.post("/api/v1/eng-properties/lookup/batch", json={"queries": [
+            {"source_id": "test_steam", "outputs": ["h"], "inputs": {"T": [300, 400], "P": 1e5}},
+            {"source_id": "test_grades", "outputs": ["tol"], "points": [{"grade": "IT6", "size": "0-3"}]},
+            {"source_id": "nope", "outputs": ["x"], "inputs": {"T": 1}},
+        ]})
+        assert response.status_code == 200
+        steam, grades, unknown = response.json()["results"]
+        assert steam["outputs"]["h"] == [1.0, 2.0] and steam["errors"] == []
+        assert grades["outputs"]["tol"] == [6.0]
+        assert "Unknown property source" in unknown["error"]
+
+        for inputs in ({"T": [300, 400], "P": [1e5, 2e5, 3e5]}, {"T": [[300], [400]], "P": 1e5}):
+            response = client.post("/api/v1/eng-properties/lookup/batch", json={"queries": [
+                {"source_id": "test_steam", "outputs": ["h"], "inputs": inputs},
+            ]})
+            assert response.status_code == 400
+
+
+class TestLookupCache:
+
+    def test_repeated_points_hit_cache(self, registered, monkeypatch):
+        from app.services.properties import router
+
+        calls = []
+        original = router._lookup_uncached
+        monkeypatch.setattr(router, "_lookup_uncached", lambda *a: calls.append(a) or original(*a))
+
+        first = lookup("test_water", "rho", T=310.0)
+        # Differs only past the rounding tolerance
+        second = lookup("test_water", "rho", T=310.0 + 1e-12)
+
+        assert first == second
+        assert len(calls) == 1
+        assert router.lookup_cache.stats()["hit_rate"] == pytest.approx(0.5)
+
+    def test_errors_cached_briefly(self, registered, monkeypatch):
+        from app.services.properties import router
+
+        monkeypatch.setattr(router.lookup_cache, "error_ttl", 0.0)
+        with pytest.raises(LookupError):
+            lookup("test_water", "rho", T=500.0)
+        # Expired immediately, so this is a miss rather than a cached error
+        with pytest.raises(LookupError):
+            lookup("test_water", "rho", T=500.0)
+        assert router.lookup_cache.stats()["error_hits"] == 0
+
+        monkeypatch.setattr(router.lookup_cache, "error_ttl", 60.0)
+        with pytest.raises(LookupError):
+            lookup("test_water", "rho", T=501.0)
+        with pytest.raises(LookupError, match="outside"):
+            lookup("test_water", "rho", T=501.0)
+        assert router.lookup_cache.stats()["error_hits"] == 1
+
+    def test_invalidate_source(self, registered):
+        from app.services.properties.router import lookup_cache
+
+        lookup("test_water", "rho", T=300.0)
+        lookup("test_steam", "h", T=300.0, P=1e5)
+
+        assert lookup_cache.invalidate_source("test_water") == 1
+        assert lookup_cache.stats()["size"] == 1
@@ -274,8 +274,8 @@ class TestMissingUnitHandling:
 
         # Mock _get_reference_unit to return None (unit not found)
         engine._get_reference_unit = MagicMock(return_value=None)
-        # Mock _resolve_reference to return None (no ValueNode)
-        engine._resolve_reference = MagicMock(return_value=None)
+        # Mock resolve_references to resolve nothing (no ValueNode)
+        engine.resolve_references = MagicMock(return_value={})
 
         with caplog.at_level(logging.WARNING):
             result = engine._parse_expression('#REF.Height^2')
@@ -298,10 +298,10 @@ class TestMissingUnitHandling:
         # Mock _get_reference_unit to return None (no PropertyDefinition)
         engine._get_reference_unit = MagicMock(return_value=None)
 
-        # Mock _resolve_reference to return a ValueNode WITH computed_unit_symbol
+        # Mock resolve_references to return a ValueNode WITH computed_unit_symbol
         mock_node = MagicMock()
         mock_node.computed_unit_symbol = 'mm'
-        engine._resolve_reference = MagicMock(return_value=mock_node)
+        engine.resolve_references = MagicMock(return_value={'REF.Height': mock_node})
 
         result = engine._parse_expression('#REF.Height^2')
         dim, err = engine._compute_expression_dimension(result)
@@ -0,0 +1,307 @@
+"""
+Tests for the ValueEngine result caches and batch recalculation.
+
+A diamond-shaped graph (many expressions sharing one source) should evaluate
+each shared node once per pass, and VALID upstream expressions should be
+reused from their stored computed_value.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.component import Component, ComponentCategory
+from app.models.property import ComponentProperty, PropertyDefinition, PropertyType
+from app.models.values import ValueNode, ValueDependency, NodeType, ComputationStatus
+from app.services.value_engine import ValueEngine, compiled_expressions
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _make_engine(db):
+    engine = ValueEngine(db)
+    # Reference units are only needed for dimension tracking
+    engine._get_reference_unit = MagicMock(return_value=None)
+    engine.resolve_references = MagicMock(return_value={})
+    return engine
+
+
+def _expression(db, engine, expression, sources):
+    """Create an expression node wired to the given {ref: ValueNode} sources."""
+    node = ValueNode(
+        node_type=NodeType.EXPRESSION,
+        expression_string=expression,
+        parsed_expression=engine._parse_expression(expression),
+        computation_status=ComputationStatus.PENDING,
+    )
+    db.add(node)
+    db.flush()
+    for ref, source in sources.items():
+        db.add(ValueDependency(dependent_id=node.id, source_id=source.id, variable_name=ref))
+    db.flush()
+    return node
+
+
+def _build_diamond(db, engine, layers=6):
+    """Each layer has two nodes that both read both nodes of the layer below."""
+    base = engine.create_literal(2.0, description="STEEL.density")
+    below = {"STEEL.density": base}
+    nodes = []
+    for i in range(layers):
+        left = _expression(db, engine, " + ".join(f"#{r}" for r in below), below)
+        right = _expression(db, engine, " + ".join(f"#{r}" for r in below), below)
+        left.description = f"L{i}.v"
+        right.description = f"R{i}.v"
+        nodes.extend([left, right])
+        below = {f"L{i}.v": left, f"R{i}.v": right}
+    top = _expression(db, engine, " + ".join(f"#{r}" for r in below), below)
+    db.flush()
+    return base, nodes, top
+
+
+class TestPerPassCache:
+
+    def test_diamond_evaluates_each_node_once(self, db):
+        engine = _make_engine(db)
+        _, nodes, top = _build_diamond(db, engine, layers=6)
+
+        success, error = engine.recalculate(top)
+
+        assert success, error
+        # Layer 0 copies the base, each later layer and the top double it
+        assert top.computed_value == pytest.approx(2.0 * 2 ** 6)
+        # One miss per distinct node (base literal, 12 layer nodes, top)
+        assert engine.cache_stats["misses"] == len(nodes) + 2
+        assert engine.cache_stats["hits"] > 0
+
+    def test_valid_dependencies_are_not_walked(self, db):
+        engine = _make_engine(db)
+        base, nodes, top = _build_diamond(db, engine, layers=3)
+        engine.recalculate(top)
+
+        # Pretend the upper layer has a stored result; it must be reused as-is
+        upper = nodes[-2:]
+        for n in upper:
+            n.computation_status = ComputationStatus.VALID
+            n.computed_value = 100.0
+        base.numeric_value = 999.0
+
+        engine.recalculate(top)
+
+        assert top.computed_value == pytest.approx(200.0)
+        assert engine.cache_stats["misses"] == 1  # only the top node itself
+
+    def test_cache_resets_between_passes(self, db):
+        engine = _make_engine(db)
+        base = engine.create_literal(3.0, description="A.x")
+        expr = _expression(db, engine, "#A.x * 2", {"A.x": base})
+
+        engine.recalculate(expr)
+        assert expr.computed_value == pytest.approx(6.0)
+
+        engine.update_literal(base, 5.0)
+        engine.recalculate(expr)
+        assert expr.computed_value == pytest.approx(10.0)
+
+    def test_recalculate_stale_shares_one_pass(self, db):
+        engine = _make_engine(db)
+        base, nodes, top = _build_diamond(db, engine, layers=4)
+        engine.recalculate(top)
+        for n in nodes:
+            engine.recalculate(n)
+
+        engine.update_literal(base, 1.0)
+        recalculated = engine.recalculate_stale(base)
+
+        assert len(recalculated) == len(nodes) + 1
+        assert top.computed_value == pytest.approx(2 ** 4)
+        # Every stale node (plus the base literal) computed exactly once
+        assert engine.cache_stats["misses"] == len(nodes) + 2
+
+    def test_recalculate_endpoint_counts_both_passes(self, db, monkeypatch):
+        import asyncio
+        from app.api.v1 import values
+
+        engine = _make_engine(db)
+        base, nodes, top = _build_diamond(db, engine, layers=2)
+        engine.recalculate(top)
+        db.commit()
+        monkeypatch.setattr(values, "ValueEngine", lambda session, user_id=None: _make_engine(session))
+
+        response = asyncio.run(values.recalculate_value(base.id, cascade=True, db=db, current_user={}))
+
+        assert response.nodes_recalculated == len(nodes) + 2
+        # The base's own pass plus the cascade's pass (base and every dependent)
+        assert response.cache_misses == 1 + len(nodes) + 2
+        assert response.cache_hits > 0
+
+
+class TestRecalculateBatch:
+
+    def test_evaluates_in_dependency_order(self, db):
+        engine = _make_engine(db)
+        base = engine.create_literal(1.0, description="A.x")
+        # Create the chain so later IDs are upstream of earlier ones
+        c = ValueNode(node_type=NodeType.EXPRESSION, computation_status=ComputationStatus.STALE)
+        db.add(c)
+        db.flush()
+        b = _expression(db, engine, "#A.x + 1", {"A.x": base})
+        b.description = "B.x"
+        c.expression_string = "#B.x * 10"
+        c.parsed_expression = engine._parse_expression("#B.x * 10")
+        db.add(ValueDependency(dependent_id=c.id, source_id=b.id, variable_name="B.x"))
+        db.flush()
+
+        result = engine.recalculate_batch([c.id, b.id])
+
+        assert result["successful"] == 2
+        assert b.computed_value == pytest.approx(2.0)
+        assert c.computed_value == pytest.approx(20.0)
+        assert c.computation_status == ComputationStatus.VALID
+        assert result["cache_misses"] == 3  # b, c and the base literal
+        assert result["nodes_per_second"] > 0
+
+    def test_results_are_persisted(self, db):
+        engine = _make_engine(db)
+        base, nodes, top = _build_diamond(db, engine, layers=2)
+
+        engine.recalculate_batch([n.id for n in nodes] + [top.id])
+        db.expire_all()
+
+        stored = db.query(ValueNode).filter(ValueNode.id == top.id).one()
+        assert stored.computed_value == pytest.approx(8.0)
+        assert stored.computation_status == ComputationStatus.VALID
+
+    def test_cycle_is_flagged(self, db):
+        engine = _make_engine(db)
+        a = ValueNode(node_type=NodeType.EXPRESSION, description="A.x",
+                      computation_status=ComputationStatus.PENDING)
+        b = ValueNode(node_type=NodeType.EXPRESSION, description="B.x",
+                      computation_status=ComputationStatus.PENDING)
+        db.add_all([a, b])
+        db.flush()
+        a.expression_string, a.parsed_expression = "#B.x + 1", engine._parse_expression("#B.x + 1")
+        b.expression_string, b.parsed_expression = "#A.x + 1", engine._parse_expression("#A.x + 1")
+        db.add_all([
+            ValueDependency(dependent_id=a.id, source_id=b.id, variable_name="B.x"),
+            ValueDependency(dependent_id=b.id, source_id=a.id, variable_name="A.x"),
+        ])
+        db.flush()
+
+        result = engine.recalculate_batch([a.id, b.id])
+
+        assert result["failed"] == 2
+        assert {a.computation_status, b.computation_status} <= {
+            ComputationStatus.CIRCULAR, ComputationStatus.ERROR
+        }
+        assert ComputationStatus.CIRCULAR in {a.computation_status, b.computation_status}
+
+    def test_passes_property_expected_unit(self, db):
+        engine = _make_engine(db)
+        base = engine.create_literal(1.0, description="A.x")
+        prop = _expression(db, engine, "#A.x * 2", {"A.x": base})
+        loose = _expression(db, engine, "#A.x * 3", {"A.x": base})
+        length = PropertyDefinition(name="Length", property_type=PropertyType.DIMENSIONAL, unit="mm")
+        comp = Component(component_id="CMP-U", name="Unit Part", category=ComponentCategory.MECHANICAL)
+        db.add_all([length, comp])
+        db.flush()
+        db.add(ComponentProperty(component_id=comp.id, property_definition_id=length.id, value_node_id=prop.id))
+        db.flush()
+
+        seen = {}
+        compute_value = engine.compute_value
+
+        def spy(node, expected_unit=None):
+            seen.setdefault(node.id, expected_unit)
+            return compute_value(node, expected_unit)
+
+        engine.compute_value = spy
+        engine.recalculate_batch([prop.id, loose.id])
+
+        assert (seen[prop.id], seen[loose.id]) == ("mm", None)
+        # Same dimension warning recalculate(prop, expected_unit="mm") would store
+        assert "mm" in prop.computation_error
+        assert loose.computation_error is None
+
+
+class TestCompiledExpressionCache:
+
+    def test_expression_compiled_once(self, db):
+        engine = _make_engine(db)
+        base = engine.create_literal(3.0, description="A.x")
+        expr = _expression(db, engine, "#A.x * 2 + 1", {"A.x": base})
+        engine._compute_expression_dimension = MagicMock(
+            wraps=engine._compute_expression_dimension
+        )
+
+        for value in (1.0, 2.0, 3.0):
+            engine.update_literal(base, value)
+            engine.recalculate(expr)
+            assert expr.computed_value == pytest.approx(value * 2 + 1)
+
+        # Dimension analysis only runs when the expression is compiled
+        assert engine._compute_expression_dimension.call_count == 1
+        stats = compiled_expressions.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+
+    def test_update_expression_invalidates(self, db):
+        engine = _make_engine(db)
+        base = engine.create_literal(3.0, description="A.x")
+        expr = _expression(db, engine, "#A.x * 2", {"A.x": base})
+        engine.recalculate(expr)
+        assert expr.computed_value == pytest.approx(6.0)
+
+        engine.update_expression(expr, "#A.x * 10")
+        # The mocked resolver returns no sources, so re-wire the dependency
+        db.add(ValueDependency(dependent_id=expr.id, source_id=base.id, variable_name="A.x"))
+        db.flush()
+        db.refresh(expr)
+        engine.recalculate(expr)
+
+        assert expr.computed_value == pytest.approx(30.0)
+
+    def test_source_unit_change_recompiles(self, db):
+        engine = _make_engine(db)
+        base = engine.create_literal(3.0, description="A.x")
+        base.computed_unit_symbol = "m"
+        expr = _expression(db, engine, "#A.x * 2", {"A.x": base})
+        engine.resolve_references = MagicMock(return_value={"A.x": base})
+
+        engine.recalculate(expr)
+        assert expr.computed_unit_symbol == "m"
+
+        base.computed_unit_symbol = "kg"
+        db.flush()
+        engine.recalculate(expr)
+
+        assert expr.computed_unit_symbol == "kg"
+        assert compiled_expressions.stats()["misses"] == 2
+
+    def test_lru_eviction(self):
+        from app.services.value_engine import CompiledExpressionCache, CompiledExpression
+
+        cache = CompiledExpressionCache(maxsize=2)
+        for node_id in (1, 2, 3):
+            cache.put(node_id, CompiledExpression(node_id, None, {}, {}, {}, None, None, None, None))
+
+        assert cache.get(1, 1) is None
+        assert cache.get(3, 3) is not None
+        # A changed expression hash is a miss
+        assert cache.get(3, 99) is None
+        assert cache.stats()["size"] == 2
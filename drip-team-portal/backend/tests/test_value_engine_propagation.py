@@ -0,0 +1,86 @@
+"""
+Tests for set-based stale propagation in ValueEngine.
+
+Marking a node's downstream closure stale must cost a constant number of
+statements and must not recurse in Python, however deep the chain.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.values import ValueNode, ValueDependency, NodeType, ComputationStatus
+from app.services.value_engine import ValueEngine
+
+
+def _chain(db, length):
+    """A literal followed by `length` VALID expression nodes, each reading the previous one."""
+    nodes = [ValueNode(node_type=NodeType.LITERAL, numeric_value=1.0,
+                       computation_status=ComputationStatus.VALID)]
+    nodes += [
+        ValueNode(node_type=NodeType.EXPRESSION, computation_status=ComputationStatus.VALID)
+        for _ in range(length)
+    ]
+    db.add_all(nodes)
+    db.flush()
+    db.add_all([
+        ValueDependency(dependent_id=nodes[i + 1].id, source_id=nodes[i].id, variable_name=f"N.v{i}")
+        for i in range(length)
+    ])
+    db.flush()
+    return nodes
+
+
+class TestMarkDependentsStale:
+
+    def test_deep_chain_in_constant_statements(self, engine_and_db):
+        db, statements = engine_and_db
+        nodes = _chain(db, 2000)  # deeper than the default recursion limit
+        engine = ValueEngine(db)
+
+        statements.clear()
+        affected = engine.mark_dependents_stale(nodes[0])
+
+        assert affected == [n.id for n in nodes[1:]]
+        assert len(statements) <= 3
+        assert all(n.computation_status == ComputationStatus.STALE for n in nodes[1:])
+        assert nodes[0].computation_status == ComputationStatus.VALID
+
+    def test_propagates_past_already_stale_nodes(self, engine_and_db):
+        db, _ = engine_and_db
+        nodes = _chain(db, 4)
+        nodes[2].computation_status = ComputationStatus.STALE
+        nodes[3].computation_status = ComputationStatus.ERROR
+        db.flush()
+
+        ValueEngine(db).mark_dependents_stale(nodes[0])
+
+        assert nodes[1].computation_status == ComputationStatus.STALE
+        assert nodes[3].computation_status == ComputationStatus.ERROR  # only VALID nodes are flipped
+        assert nodes[4].computation_status == ComputationStatus.STALE
+
+    def test_cycle_terminates(self, engine_and_db):
+        db, _ = engine_and_db
+        nodes = _chain(db, 3)
+        db.add(ValueDependency(dependent_id=nodes[1].id, source_id=nodes[3].id, variable_name="N.loop"))
+        db.flush()
+
+        affected = ValueEngine(db).mark_dependents_stale(nodes[0])
+
+        assert affected == [n.id for n in nodes[1:]]
+
+    def test_transfer_dependents_marks_downstream(self, engine_and_db):
+        db, _ = engine_and_db
+        nodes = _chain(db, 3)
+        replacement = ValueNode(node_type=NodeType.LITERAL, numeric_value=2.0,
+                                computation_status=ComputationStatus.VALID)
+        db.add(replacement)
+        db.flush()
+
+        ValueEngine(db).transfer_dependents(nodes[0], replacement)
+
+        assert db.query(ValueDependency).filter(ValueDependency.source_id == replacement.id).count() == 1
+        assert all(n.computation_status == ComputationStatus.STALE for n in nodes[1:])
+        assert replacement.computation_status == ComputationStatus.VALID
@@ -0,0 +1,180 @@
+"""
+Tests for ValueEngine.resolve_references (bulk #CODE.property resolution).
+
+Resolving many references must cost a constant number of queries, independent
+of how many references are passed in.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.component import Component, ComponentCategory
+from app.models.material import Material, MaterialProperty
+from app.models.property import ComponentProperty, PropertyDefinition, PropertyType
+from app.models.values import ValueNode, NodeType, ComputationStatus
+from app.services.value_engine import ValueEngine
+
+
+def _seed(db, n_components=10):
+    """Components PART_0..N with a 'Length' property each, plus one material."""
+    length = PropertyDefinition(name="Length", property_type=PropertyType.DIMENSIONAL, unit="mm")
+    density = PropertyDefinition(name="Density", property_type=PropertyType.PHYSICAL, unit="kg/m³")
+    db.add_all([length, density])
+    db.flush()
+
+    for i in range(n_components):
+        comp = Component(
+            component_id=f"CMP-{i}",
+            name=f"Part {i}",
+            code=f"PART_{i}",
+            category=ComponentCategory.MECHANICAL,
+        )
+        db.add(comp)
+        db.flush()
+        node = ValueNode(
+            node_type=NodeType.LITERAL,
+            numeric_value=float(i),
+            computed_value=float(i),
+            computation_status=ComputationStatus.VALID,
+        )
+        db.add(node)
+        db.flush()
+        db.add(ComponentProperty(
+            component_id=comp.id,
+            property_definition_id=length.id,
+            value_node_id=node.id,
+        ))
+
+    steel = Material(name="Steel", category="Metal", code="STEEL")
+    db.add(steel)
+    db.flush()
+    # Legacy material value with no value_node yet
+    db.add(MaterialProperty(material_id=steel.id, property_definition_id=density.id, value=7.85))
+    db.flush()
+
+
+class TestResolveReferences:
+
+    def test_resolves_components_in_constant_queries(self, engine_and_db):
+        db, statements = engine_and_db
+        _seed(db, n_components=10)
+        engine = ValueEngine(db)
+
+        refs = [f"PART_{i}.Length" for i in range(10)]
+        statements.clear()
+        resolved = engine.resolve_references(refs)
+
+        assert set(resolved) == set(refs)
+        assert [resolved[f"PART_{i}.Length"].computed_value for i in range(10)] == [float(i) for i in range(10)]
+        # Independent of the number of references
+        assert len(statements) <= 8
+
+    def test_matches_single_reference_resolution(self, engine_and_db):
+        db, _ = engine_and_db
+        _seed(db, n_components=3)
+        engine = ValueEngine(db)
+
+        bulk = engine.resolve_references(["PART_1.Length", "PART_2.Length"])
+        assert engine._resolve_reference("PART_1.Length").id == bulk["PART_1.Length"].id
+
+    def test_material_legacy_value_creates_si_literal(self, engine_and_db):
+        db, _ = engine_and_db
+        _seed(db, n_components=1)
+        engine = ValueEngine(db)
+
+        resolved = engine.resolve_references(["STEEL.Density"])
+
+        node = resolved["STEEL.Density"]
+        assert node.node_type == NodeType.LITERAL
+        assert node.computed_value == pytest.approx(7.85)
+        mat_prop = db.query(MaterialProperty).first()
+        assert mat_prop.value_node_id == node.id
+
+    def test_read_only_resolution_creates_nothing(self, engine_and_db):
+        db, _ = engine_and_db
+        _seed(db, n_components=1)
+        engine = ValueEngine(db)
+        node_count = db.query(ValueNode).count()
+
+        resolved = engine.resolve_references(["PART_0.Length", "STEEL.Density"], create_literals=False)
+
+        assert set(resolved) == {"PART_0.Length"}
+        assert db.query(ValueNode).count() == node_count
+        assert db.query(MaterialProperty).first().value_node_id is None
+
+    def test_unresolvable_and_malformed_refs_are_omitted(self, engine_and_db):
+        db, _ = engine_and_db
+        _seed(db, n_components=1)
+        engine = ValueEngine(db)
+
+        resolved = engine.resolve_references(["PART_0.Length", "PART_0.Width", "a.b.c", "NOPE.Length"])
+
+        assert set(resolved) == {"PART_0.Length"}
+
+    def test_description_fallback(self, engine_and_db):
+        db, _ = engine_and_db
+        legacy = ValueNode(node_type=NodeType.LITERAL, numeric_value=1.0, description="OLD.value")
+        db.add(legacy)
+        db.flush()
+        engine = ValueEngine(db)
+
+        assert engine.resolve_references(["OLD.value"])["OLD.value"].id == legacy.id
+
+
+class TestGeneratedCode:
+
+    def test_generated_code_set_on_insert_and_rename(self, engine_and_db):
+        db, _ = engine_and_db
+        comp = Component(component_id="CMP-X", name="Heat Bed #2", category=ComponentCategory.THERMAL)
+        mat = Material(name="SS 304 (annealed)", category="Metal")
+        db.add_all([comp, mat])
+        db.flush()
+
+        assert comp.generated_code == "HEAT_BED_2"
+        assert mat.generated_code == "SS_304_ANNEALED"
+
+        comp.name = "Frame - Main"
+        assert comp.generated_code == "FRAME_MAIN"
+
+    def test_resolves_by_generated_code(self, engine_and_db):
+        db, statements = engine_and_db
+        length = PropertyDefinition(name="Length", property_type=PropertyType.DIMENSIONAL, unit="mm")
+        comp = Component(component_id="CMP-F", name="Main Frame", category=ComponentCategory.MECHANICAL)
+        db.add_all([length, comp])
+        db.flush()
+        node = ValueNode(node_type=NodeType.LITERAL, numeric_value=2.0, computed_value=2.0)
+        db.add(node)
+        db.flush()
+        db.add(ComponentProperty(component_id=comp.id, property_definition_id=length.id, value_node_id=node.id))
+        db.flush()
+        engine = ValueEngine(db)
+
+        statements.clear()
+        resolved = engine.resolve_references(["MAIN_FRAME.Length"])
+
+        assert resolved["MAIN_FRAME.Length"].id == node.id
+        assert not any("regexp_replace" in stmt.lower() for stmt in statements)
+
+    def test_entity_search_prefers_indexed_prefix(self, engine_and_db):
+        from app.api.v1.search import _match_entities
+
+        db, statements = engine_and_db
+        db.add_all([
+            Component(component_id=f"CMP-{i}", name=name, category=ComponentCategory.THERMAL)
+            for i, name in enumerate(["Heat Bed", "Heater Core", "Main Heat Sink", "HeatXBlock"])
+        ])
+        db.flush()
+
+        statements.clear()
+        found = _match_entities(db, Component, "heat", limit=2)
+        assert [c.generated_code for c in found] == ["HEAT_BED", "HEATER_CORE"]
+        assert len(statements) == 1 and "like" in statements[0].lower()
+
+        # Substring matches only fill what prefixes leave
+        found = _match_entities(db, Component, "heat", limit=5)
+        assert [c.generated_code for c in found] == ["HEAT_BED", "HEATER_CORE", "HEATXBLOCK", "MAIN_HEAT_SINK"]
+        # '_' in the normalized code is literal, not a LIKE wildcard
+        assert [c.generated_code for c in _match_entities(db, Component, "heat b", limit=5)] == ["HEAT_BED"]